@@ -0,0 +1,107 @@
+import os
+from fnmatch import fnmatch
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache import ConversionCache
+from .core import convert_file, detect_file_type
+
+# RETURNS WHETHER A RELATIVE PATH (OR ITS FILE NAME) MATCHES ONE OF THE GLOB PATTERNS
+def _matches(relpath: str, patterns: Iterable[str]) -> bool:
+    return any(fnmatch(relpath, pattern) or fnmatch(os.path.basename(relpath), pattern) for pattern in patterns)
+
+# RETURNS THE (INPUT, OUTPUT) PAIRS OF A BATCH, SORTED BY INPUT PATH
+# - EVERY FILE UNDER src_dir MATCHING includes (DEFAULT: ALL) AND NONE OF excludes, WITH ITS OUTPUT AT THE SAME RELATIVE PATH UNDER dst_dir
+# - FILES THAT CANNOT BE CONVERTED TO output_format (README.md OR .DS_Store IN AN IMAGE BATCH) ARE LEFT OUT, SEE _plan
+# - A dst_dir INSIDE src_dir IS NOT WALKED, SO EARLIER OUTPUTS ARE NEVER TAKEN AS INPUTS; FILES THAT WOULD BE THEIR OWN OUTPUT ARE LEFT OUT
+# - TWO INPUTS MAPPING TO ONE OUTPUT (photo.png AND photo.jpg -> photo.webp) RAISE: NARROW THE BATCH WITH includes/excludes
+def plan_batch(src_dir: str, dst_dir: str, output_format: str, includes: Optional[Iterable[str]] = None,
+               excludes: Optional[Iterable[str]] = None, input_type: Optional[str] = None, output_type: Optional[str] = None) -> List[Tuple[str, str]]:
+    return _plan(src_dir, dst_dir, output_format, includes, excludes, input_type, output_type)[0]
+
+# RETURNS (PAIRS, UNSUPPORTED): THE PAIRS OF plan_batch AND THE MATCHING FILES LEFT OUT BECAUSE THEY CANNOT BE CONVERTED
+# - A FILE CAN BE CONVERTED WHEN ITS TYPE (input_type, OTHERWISE DETECTED FROM ITS EXTENSION) IS THE OUTPUT TYPE
+# - output_type DEFAULTS TO THE TYPE OF output_format; AN UNKNOWN OUTPUT FORMAT RAISES
+def _plan(src_dir: str, dst_dir: str, output_format: str, includes: Optional[Iterable[str]], excludes: Optional[Iterable[str]],
+          input_type: Optional[str], output_type: Optional[str]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    if not os.path.isdir(src_dir):
+        raise FileNotFoundError(f"INPUT DIRECTORY NOT FOUND: {src_dir}")
+    if output_type is None: output_type = detect_file_type(f"output.{output_format}")
+    if output_type == 'unknown':
+        raise ValueError(f"UNSUPPORTED OUTPUT FORMAT: {output_format}")
+    includes, excludes = list(includes or []), list(excludes or [])
+    src_root, dst_root = Path(src_dir).resolve(), Path(dst_dir).resolve()
+    pairs, unsupported = [], []
+
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(name for name in dirs if src_root == dst_root or Path(root, name).resolve() != dst_root)
+        for name in files:
+            relpath = os.path.relpath(os.path.join(root, name), src_dir)
+            if includes and not _matches(relpath, includes): continue
+            if _matches(relpath, excludes): continue
+            input_path, output_path = os.path.join(root, name), str(Path(dst_dir, relpath).with_suffix(f'.{output_format}'))
+            if os.path.abspath(input_path) == os.path.abspath(output_path): continue
+            if (input_type or detect_file_type(input_path)) == output_type: pairs.append((input_path, output_path))
+            else: unsupported.append(input_path)
+
+    pairs.sort()
+    outputs = {}
+    for input_path, output_path in pairs:
+        if output_path in outputs:
+            raise ValueError(f"SEVERAL INPUTS MAP TO THE SAME OUTPUT: {outputs[output_path]} AND {input_path} -> {output_path}")
+        outputs[output_path] = input_path
+    return pairs, sorted(unsupported)
+
+# RETURNS WHETHER AN OUTPUT EXISTS AND IS AT LEAST AS RECENT AS ITS INPUT
+def is_up_to_date(input_path: str, output_path: str) -> bool:
+    try: return os.stat(output_path).st_mtime >= os.stat(input_path).st_mtime
+    except FileNotFoundError: return False
+
+# CONVERTS ONE (INPUT, OUTPUT) PAIR (RUNS IN WORKER PROCESSES) AND RETURNS (INPUT, OUTPUT, SUCCESS, MESSAGE)
+def _convert_pair(pair: Tuple[str, str], input_type: Optional[str], output_type: Optional[str],
+                  cache: Optional[ConversionCache] = None, audio_options: Optional[Dict] = None) -> Tuple[str, str, bool, str]:
+    input_path, output_path = pair
+    try:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        success, message = convert_file(input_path, output_path, input_type, output_type, cache, **(audio_options or {}))
+    except Exception as e:
+        success, message = False, f"CONVERSION FAILED: {str(e)}"
+    return input_path, output_path, success, message
+
+# CONVERTS EVERY MATCHING FILE UNDER src_dir TO output_format, MIRRORING THE DIRECTORY LAYOUT UNDER dst_dir
+# - OUTPUTS AT LEAST AS RECENT AS THEIR INPUT ARE SKIPPED (force=True CONVERTS THEM AGAIN)
+# - jobs > 1 CONVERTS IN A PROCESS POOL (IMAGE AND MEDIA ENCODING IS CPU-BOUND); 0 USES ALL CPU CORES
+# - cache (OPTIONAL) IS SHARED BY ALL WORKERS: IDENTICAL INPUTS ARE ENCODED ONCE AND OTHER RUNS' OUTPUTS ARE REUSED
+# - bitrate AND sample_rate (OPTIONAL) APPLY TO AUDIO OUTPUTS
+# - on_result (OPTIONAL) IS CALLED WITH (INPUT, OUTPUT, SUCCESS, MESSAGE) AS EACH CONVERSION FINISHES
+# - FILES THAT CANNOT BE CONVERTED TO output_format ARE NOT ATTEMPTED: THEY ARE COUNTED AS 'unsupported', NOT AS FAILURES
+# - RETURNS {'converted': N, 'skipped': N, 'unsupported': N, 'failed': [(INPUT, MESSAGE), ...]}
+def convert_directory(src_dir: str, dst_dir: str, output_format: str, input_type: Optional[str] = None, output_type: Optional[str] = None,
+                      includes: Optional[Iterable[str]] = None, excludes: Optional[Iterable[str]] = None, jobs: int = 1, force: bool = False,
+                      on_result: Optional[Callable[[str, str, bool, str], None]] = None, cache: Optional[ConversionCache] = None,
+                      bitrate: Optional[str] = None, sample_rate: Optional[int] = None) -> Dict:
+    output_format = output_format.lstrip('.').lower()
+    if output_type is None: output_type = detect_file_type(f"output.{output_format}")
+    jobs = jobs if jobs > 0 else os.cpu_count() or 1
+    audio_options = {'bitrate': bitrate, 'sample_rate': sample_rate}
+
+    pairs, unsupported = _plan(src_dir, dst_dir, output_format, includes, excludes, input_type, output_type)
+    pending = [pair for pair in pairs if force or not is_up_to_date(*pair)]
+    report = {'converted': 0, 'skipped': len(pairs) - len(pending), 'unsupported': len(unsupported), 'failed': []}
+
+    def record(result):
+        if result[2]: report['converted'] += 1
+        else: report['failed'].append((result[0], result[3]))
+        if on_result is not None: on_result(*result)
+
+    if jobs == 1 or len(pending) < 2:
+        for pair in pending: record(_convert_pair(pair, input_type, output_type, cache, audio_options))
+        return report
+
+    chunksize = max(1, len(pending) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+        for result in pool.map(_convert_pair, pending, repeat(input_type), repeat(output_type), repeat(cache), repeat(audio_options), chunksize=chunksize):
+            record(result)
+    return report
@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from importlib.metadata import version as get_version, PackageNotFoundError
+
+from .conversion.convert_audio import audio_engine
+from .conversion.convert_video import find_moviepy_ffmpeg
+
+# BUMPED WHEN THE KEY OR THE ENTRY LAYOUT CHANGES, SO OLD ENTRIES ARE NEVER HIT AGAIN
+CACHE_FORMAT = 1
+
+# DEFAULT SIZE CAP OF THE CACHE DIRECTORY (MB)
+DEFAULT_CACHE_SIZE_MB = 1024
+
+# EVICTION REMOVES ENTRIES UNTIL THE CACHE IS BACK UNDER THIS SHARE OF ITS CAP, SO A FULL CACHE IS NOT RESCANNED ON EVERY STORE
+EVICTION_TARGET = 0.9
+
+# BYTES READ PER CHUNK WHEN HASHING INPUTS
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# CONVERSIONS WORTH CACHING (TEXT CONVERSIONS STREAM AT DISK SPEED, SO A CACHE HIT WOULD SAVE NOTHING)
+CACHED_TYPES = ('image', 'audio', 'video')
+
+# SECONDS TO WAIT FOR '<encoder> -version' BEFORE THE ENCODER VERSION IS TAKEN AS UNKNOWN
+ENCODER_VERSION_TIMEOUT = 10
+
+# SIZE ESTIMATE OF EACH CACHE DIRECTORY IN THIS PROCESS (SHARED BY ALL ITS ConversionCache OBJECTS, INCLUDING ONES UNPICKLED BY WORKERS)
+_known_sizes = {}
+
+# LINUX ioctl THAT SHARES THE EXTENTS OF ONE FILE WITH ANOTHER (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+# RETURNS THE DEFAULT CACHE DIRECTORY ($AUTOTOOLS_CONVERT_CACHE, OTHERWISE THE USER CACHE DIRECTORY OF THE PLATFORM)
+def default_cache_dir() -> Path:
+    custom_path = os.getenv('AUTOTOOLS_CONVERT_CACHE')
+    if custom_path: return Path(custom_path)
+
+    if os.name == 'nt':
+        cache_root = Path(os.getenv('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local')
+    elif sys.platform == 'darwin':
+        cache_root = Path.home() / 'Library' / 'Caches'
+    else:
+        cache_root = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache')
+
+    return cache_root / 'Open-AutoTools' / 'autoconvert'
+
+# RETURNS THE INSTALLED VERSION OF A DISTRIBUTION ('unknown' WHEN IT IS NOT INSTALLED)
+@lru_cache(maxsize=None)
+def _distribution_version(name: str) -> str:
+    try: return get_version(name)
+    except PackageNotFoundError: return 'unknown'
+
+# RETURNS THE FIRST LINE OF '<executable> -version' (EXAMPLE: 'ffmpeg version 7.0.2 ...'; 'unknown' WHEN IT CANNOT BE RUN)
+# - RUN ONCE PER EXECUTABLE AND MODIFICATION TIME, SO AN UPGRADE IN PLACE IS STILL SEEN
+def encoder_version(executable: Optional[str]) -> str:
+    if not executable: return 'unknown'
+    try: return _encoder_version(executable, os.stat(executable).st_mtime_ns)
+    except OSError: return 'unknown'
+
+@lru_cache(maxsize=None)
+def _encoder_version(executable: str, modified: int) -> str:
+    try:
+        result = subprocess.run([executable, '-version'], stdin=subprocess.DEVNULL, capture_output=True, timeout=ENCODER_VERSION_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return 'unknown'
+    lines = result.stdout.decode('utf-8', errors='replace').strip().splitlines()
+    return lines[0] if result.returncode == 0 and lines else 'unknown'
+
+# RETURNS THE VERSION OF THE CONVERTER OF A FILE TYPE: OPEN-AUTOTOOLS, THE ENCODING LIBRARY AND THE ENCODER EXECUTABLE IT RUNS
+# - AUDIO: THE ENGINE convert_audio PICKS (FFMPEG OR PYDUB), SO THE TWO NEVER SHARE ENTRIES, AND ITS EXECUTABLE'S VERSION
+# - VIDEO: MOVIEPY AND THE VERSION OF THE FFMPEG IT SHELLS OUT TO
+def converter_version(file_type: str) -> str:
+    version = f"Open-AutoTools=={_distribution_version('Open-AutoTools')}"
+    if file_type == 'image': return f"{version};Pillow=={_distribution_version('Pillow')}"
+    if file_type == 'audio':
+        engine, executable = audio_engine()
+        if engine == 'pydub': version += f";pydub=={_distribution_version('pydub')}"
+        return f"{version};engine={engine};encoder={encoder_version(executable)}"
+    if file_type == 'video':
+        return f"{version};moviepy=={_distribution_version('moviepy')};encoder={encoder_version(find_moviepy_ffmpeg())}"
+    return version
+
+# RETURNS THE SHA-256 OF A FILE'S CONTENT, READ IN CHUNKS
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE): digest.update(chunk)
+    return digest.hexdigest()
+
+# CLONES A FILE WITHOUT COPYING ITS DATA (COPY-ON-WRITE), RAISING OSError WHERE THE FILE SYSTEM OR PLATFORM CANNOT
+# - LINUX: FICLONE ioctl; MACOS: clonefile(2) (APFS)
+def reflink(src: str, dst: str) -> None:
+    if sys.platform == 'darwin':
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            raise OSError(ctypes.get_errno(), "clonefile FAILED", dst)
+        return
+
+    try:
+        import fcntl
+    except ImportError as e:
+        raise OSError("REFLINKS ARE NOT SUPPORTED ON THIS PLATFORM") from e
+
+    try:
+        with open(src, 'rb') as source, open(dst, 'wb') as target: fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    except OSError:
+        if os.path.exists(dst): os.unlink(dst)
+        raise
+
+# MAKES dst (WHICH MUST NOT EXIST) HOLD THE CONTENT OF src BY THE CHEAPEST MEANS AVAILABLE AND RETURNS WHICH ONE WAS USED
+# - 'reflink' (SHARED COPY-ON-WRITE EXTENTS), THEN 'copy'
+# - NEVER A HARD LINK: AN ENTRY SHARING ITS INODE WITH AN OUTPUT WOULD BE CORRUPTED BY ANY IN-PLACE EDIT OF THAT OUTPUT
+def materialise(src: str, dst: str) -> str:
+    try:
+        reflink(src, dst)
+        return 'reflink'
+    except OSError:
+        pass
+    shutil.copyfile(src, dst)
+    return 'copy'
+
+# MOVES src TO dst THROUGH A TEMPORARY FILE NEXT TO dst, SO dst IS NEVER SEEN HALF WRITTEN, AND RETURNS HOW IT WAS MATERIALISED
+def _materialise_atomically(src: str, dst: str) -> str:
+    temp_path = os.path.join(os.path.dirname(dst) or '.', f".{os.path.basename(dst)}.{os.getpid()}.tmp")
+    if os.path.lexists(temp_path): os.unlink(temp_path)
+    try:
+        method = materialise(src, temp_path)
+        os.replace(temp_path, dst)
+    except OSError:
+        if os.path.lexists(temp_path): os.unlink(temp_path)
+        raise
+    return method
+
+# ON-DISK CACHE OF CONVERTED OUTPUTS, KEYED ON THE INPUT CONTENT HASH, THE CONVERSION PARAMETERS AND THE CONVERTER VERSION
+# - ENTRIES LIVE AT <directory>/<KEY[:2]>/<KEY>; HITS ARE MATERIALISED BY REFLINK OR COPY INSTEAD OF RE-ENCODING
+# - ENTRIES NEVER SHARE AN INODE WITH AN OUTPUT, SO EDITING AN OUTPUT NEVER CHANGES AN ENTRY AND TOUCHING AN ENTRY NEVER CHANGES AN OUTPUT
+# - AN ENTRY'S MTIME IS ITS LAST USE: WHEN THE CACHE GROWS PAST max_size BYTES, THE LEAST RECENTLY USED ENTRIES ARE EVICTED
+# - THE CACHE IS BEST EFFORT: AN UNUSABLE CACHE DIRECTORY NEVER FAILS A CONVERSION, IT ONLY MISSES
+# - SEVERAL PROCESSES MAY SHARE ONE DIRECTORY (ENTRIES ARE WRITTEN ATOMICALLY AND EVERY PROCESS KEEPS ITS OWN SIZE ESTIMATE,
+#   MEASURED ON ITS FIRST STORE)
+class ConversionCache:
+    def __init__(self, directory: Optional[str] = None, max_size: int = DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        if max_size <= 0: raise ValueError("CACHE SIZE MUST BE GREATER THAN 0")
+        self.directory = str(directory or default_cache_dir())
+        self.max_size = max_size
+
+    # RETURNS WHETHER A CONVERSION BETWEEN TWO FILE TYPES GOES THROUGH THE CACHE
+    def handles(self, input_type: str, output_type: str) -> bool:
+        return input_type == output_type and output_type in CACHED_TYPES
+
+    # RETURNS THE KEY OF CONVERTING input_path TO output_path (THE OUTPUT FORMAT IS ITS EXTENSION) WITH THE CONVERTER'S options
+    def key(self, input_path: str, output_path: str, input_type: str, output_type: str, options: Optional[Dict] = None) -> str:
+        parameters = {
+            'format': CACHE_FORMAT,
+            'input': hash_file(input_path),
+            'input_ext': Path(input_path).suffix[1:].lower(),
+            'output_ext': Path(output_path).suffix[1:].lower(),
+            'types': [input_type, output_type],
+            'options': options or {},
+            'converter': converter_version(output_type),
+        }
+        return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode('utf-8')).hexdigest()
+
+    # RETURNS THE PATH OF AN ENTRY
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    # WRITES THE ENTRY OF key TO output_path AND RETURNS HOW IT WAS MATERIALISED (None ON A MISS)
+    def restore(self, key: str, output_path: str) -> Optional[str]:
+        entry = self.entry_path(key)
+        try:
+            os.utime(entry)
+            return _materialise_atomically(entry, output_path)
+        except OSError:
+            return None
+
+    # SAVES A CONVERTED OUTPUT AS THE ENTRY OF key (OUTPUTS LARGER THAN THE WHOLE CACHE ARE NOT KEPT) AND RETURNS WHETHER IT WAS SAVED
+    def store(self, key: str, output_path: str) -> bool:
+        entry = self.entry_path(key)
+        try:
+            size = os.path.getsize(output_path)
+            if size > self.max_size: return False
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            _materialise_atomically(output_path, entry)
+        except OSError:
+            return False
+
+        try:
+            known = _known_sizes.get(self.directory)
+            total = sum(entry_size for _, entry_size, _ in self._entries()) if known is None else known + size
+            _known_sizes[self.directory] = self.evict(int(self.max_size * EVICTION_TARGET)) if total > self.max_size else total
+        except OSError:
+            _known_sizes.pop(self.directory, None)
+        return True
+
+    # RETURNS (PATH, SIZE, MTIME) FOR EVERY ENTRY (TEMPORARY FILES OF WRITES IN PROGRESS ARE LEFT OUT)
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir(follow_symlinks=False) or len(shard.name) != 2: continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith('.') or not entry.is_file(follow_symlinks=False): continue
+                stat = entry.stat(follow_symlinks=False)
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    # REMOVES THE LEAST RECENTLY USED ENTRIES UNTIL THE CACHE HOLDS AT MOST target BYTES AND RETURNS ITS NEW SIZE
+    def evict(self, target: int) -> int:
+        entries = sorted(self._entries(), key=lambda item: item[2])
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for path, entry_size, _ in entries:
+            if size <= target: break
+            try: os.unlink(path)
+            except FileNotFoundError: pass
+            size -= entry_size
+        return size
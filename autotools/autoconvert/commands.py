@@ -1,6 +1,8 @@
 import os
 import click
 from pathlib import Path
+from .batch import convert_directory
+from .cache import CACHED_TYPES, DEFAULT_CACHE_SIZE_MB, ConversionCache
 from .core import convert_file, detect_file_type
 from ..utils.loading import LoadingAnimation
 from ..utils.updates import check_for_updates
@@ -8,9 +10,10 @@ from ..utils.updates import check_for_updates
 # TOOL CATEGORY (USED BY 'autotools smoke')
 TOOL_CATEGORY = 'Files'
 
-# SMOKE TEST CASES (USED BY 'autotools smoke')
+# SMOKE TEST CASES (USED BY 'autotools smoke'; 'rows' LETS THE BENCHMARK RUNNER REPORT ROWS PER SECOND)
 SMOKE_TESTS = [
     {'name': 'md-json', 'args': ['README.md', '.autotools-smoke/autoconvert-smoke.json']},
+    {'name': 'csv-jsonl', 'args': ['docker/benchmarks/fixtures/autoconvert-rows.csv', '.autotools-smoke/autoconvert-rows.jsonl'], 'rows': 5000},
 ]
 
 # CLI COMMAND TO CONVERT FILES BETWEEN DIFFERENT FORMATS
@@ -19,14 +22,24 @@ SMOKE_TESTS = [
 @click.argument('output_file', type=click.Path())
 @click.option('--input-type', '-i', help='FORCE INPUT FILE TYPE (text/image/audio/video)')
 @click.option('--output-type', '-o', help='FORCE OUTPUT FILE TYPE (text/image/audio/video)')
-@click.option('--format', '-f', help='OUTPUT FORMAT (OVERRIDES OUTPUT FILE EXTENSION)')
-def autoconvert(input_file, output_file, input_type, output_type, format):
+@click.option('--format', '-f', '--to', 'format', help='OUTPUT FORMAT (OVERRIDES OUTPUT FILE EXTENSION; REQUIRED FOR A DIRECTORY)')
+@click.option('--jobs', '-j', type=int, default=1, help='DIRECTORY MODE: WORKER PROCESSES (0 = ALL CPU CORES, DEFAULT: 1)')
+@click.option('--include', 'includes', metavar='PATTERN', multiple=True, help='DIRECTORY MODE: ONLY CONVERT FILES MATCHING THIS GLOB (REPEATABLE)')
+@click.option('--exclude', 'excludes', metavar='PATTERN', multiple=True, help='DIRECTORY MODE: SKIP FILES MATCHING THIS GLOB (REPEATABLE)')
+@click.option('--force', is_flag=True, help='DIRECTORY MODE: CONVERT AGAIN EVEN WHEN THE OUTPUT IS UP TO DATE')
+@click.option('--bitrate', help='AUDIO: OUTPUT BITRATE (EXAMPLES: 128k, 320k; DEFAULT: THE ENCODER DEFAULT)')
+@click.option('--sample-rate', type=click.IntRange(min=1), help='AUDIO: OUTPUT SAMPLE RATE IN HZ (EXAMPLE: 44100; DEFAULT: THE INPUT RATE)')
+@click.option('--no-cache', is_flag=True, help='ALWAYS ENCODE IMAGES, AUDIO AND VIDEO AGAIN (DO NOT READ OR FILL THE CONVERSION CACHE)')
+@click.option('--cache-dir', type=click.Path(file_okay=False), help='CONVERSION CACHE DIRECTORY (DEFAULT: $AUTOTOOLS_CONVERT_CACHE OR THE USER CACHE DIRECTORY)')
+@click.option('--cache-size', type=click.IntRange(min=1), default=DEFAULT_CACHE_SIZE_MB, show_default=True, help='CONVERSION CACHE SIZE CAP IN MB (LEAST RECENTLY USED ENTRIES ARE EVICTED)')
+def autoconvert(input_file, output_file, input_type, output_type, format, jobs=1, includes=(), excludes=(), force=False,
+                bitrate=None, sample_rate=None, no_cache=False, cache_dir=None, cache_size=DEFAULT_CACHE_SIZE_MB):
     """
         CONVERTS FILES BETWEEN DIFFERENT FORMATS.
 
         \b
         SUPPORTS:
-            - TEXT: txt, md, markdown, json, xml, html, htm, csv
+            - TEXT: txt, md, markdown, json, jsonl, ndjson, xml, html, htm, csv
             - IMAGES: jpg, jpeg, png, gif, webp, bmp, tiff, tif, ico, svg
             - AUDIO: mp3, wav, ogg, flac, aac, m4a, wma, opus
             - VIDEO: mp4, avi, mov, mkv, wmv, flv, webm, m4v
@@ -36,15 +49,25 @@ def autoconvert(input_file, output_file, input_type, output_type, format):
             autoconvert input.txt output.json
             autoconvert image.jpg image.png
             autoconvert audio.mp3 audio.wav
+            autoconvert podcast.wav podcast.mp3 --bitrate 96k --sample-rate 44100
             autoconvert video.mp4 video.avi
+            autoconvert photos/ webp/ --to webp --jobs 0 --include '*.png' --include '*.jpg'
+            autoconvert clip.mov clip.mp4 --cache-dir .cache/autoconvert
     """
 
     # TRY TO CONVERT FILE
     # - CHECK IF INPUT FILE EXISTS, OTHERWISE FAIL
     # - HANDLE --FORMAT: UPDATE OUTPUT NAME/EXT, DETECT OUTPUT TYPE IF UNSET
+    # - OPEN THE CONVERSION CACHE FOR MEDIA OUTPUTS UNLESS --NO-CACHE (CONVERSIONS OF ALREADY SEEN CONTENT ARE RESTORED FROM IT)
     # - MAKE OUTPUT DIRECTORY IF IT DOESN'T EXIST, RUN CONVERT WITH LOADING SPINNER
     # - SHOW RESULT, PRINT UPDATE NOTICE
     try:
+        if os.path.isdir(input_file):
+            batch_type = output_type or (detect_file_type(f"output.{format}") if format else None)
+            cache = _open_cache(batch_type, no_cache, cache_dir, cache_size)
+            _run_batch(input_file, output_file, format, input_type, output_type, jobs, includes, excludes, force, cache, bitrate, sample_rate)
+            return
+
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"INPUT FILE NOT FOUND: {input_file}")
 
@@ -55,8 +78,9 @@ def autoconvert(input_file, output_file, input_type, output_type, format):
 
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        cache = _open_cache(output_type or detect_file_type(output_file), no_cache, cache_dir, cache_size)
         
-        with LoadingAnimation(): success, message = convert_file(input_file, output_file, input_type, output_type)
+        with LoadingAnimation(): success, message = convert_file(input_file, output_file, input_type, output_type, cache, bitrate, sample_rate)
         
         if success:
             click.echo(click.style(f"✓ {message}", fg='green'))
@@ -77,3 +101,30 @@ def autoconvert(input_file, output_file, input_type, output_type, format):
     except Exception as e:
         click.echo(click.style(f"✗ ERROR: {str(e)}", fg='red'), err=True)
         raise click.Abort()
+
+# RETURNS THE CONVERSION CACHE OF CONVERSIONS TO output_type (None WITH --no-cache OR WHEN THE TYPE IS NOT CACHED, E.G. TEXT)
+def _open_cache(output_type, no_cache, cache_dir, cache_size):
+    if no_cache or output_type not in CACHED_TYPES: return None
+    return ConversionCache(cache_dir, cache_size * 1024 * 1024)
+
+# CONVERTS EVERY MATCHING FILE OF A DIRECTORY (MIRRORING ITS LAYOUT UNDER output_dir) AND PRINTS ONE AGGREGATE REPORT
+# - FAILED FILES ARE LISTED WITH THEIR ERROR, AND ANY FAILURE MAKES THE COMMAND FAIL; FILES OF ANOTHER TYPE ARE ONLY COUNTED
+def _run_batch(input_dir, output_dir, format, input_type, output_type, jobs, includes, excludes, force, cache=None, bitrate=None, sample_rate=None):
+    if not format: raise ValueError("--to FORMAT IS REQUIRED TO CONVERT A DIRECTORY")
+    if jobs < 0: raise ValueError("JOBS MUST BE 0 (ALL CORES) OR GREATER")
+
+    with LoadingAnimation():
+        report = convert_directory(input_dir, output_dir, format, input_type, output_type, includes, excludes, jobs, force,
+                                   cache=cache, bitrate=bitrate, sample_rate=sample_rate)
+
+    for path, message in report['failed']: click.echo(click.style(f"✗ {path}: {message}", fg='red'), err=True)
+    summary = f"CONVERTED: {report['converted']}, SKIPPED (UP TO DATE): {report['skipped']}, FAILED: {len(report['failed'])}"
+    if report['unsupported']: summary += f", SKIPPED (NOT CONVERTIBLE TO {format.lstrip('.').upper()}): {report['unsupported']}"
+    click.echo(summary)
+    if report['failed']:
+        raise RuntimeError(f"{len(report['failed'])} OF {report['converted'] + len(report['failed'])} CONVERSIONS FAILED")
+    click.echo(click.style(f"✓ DIRECTORY CONVERTED TO {format.lstrip('.').upper()}", fg='green'))
+    click.echo(click.style(f"OUTPUT: {output_dir}", fg='blue'))
+
+    update_msg = check_for_updates()
+    if update_msg: click.echo(update_msg)
@@ -1,23 +1,81 @@
 import os
+import re
+import shutil
+import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+
+# FFMPEG MUXERS OF THE AUDIO EXTENSIONS THAT ARE NOT MUXER NAMES THEMSELVES
+_FFMPEG_MUXERS = {'m4a': 'ipod', 'aac': 'adts', 'wma': 'asf'}
+
+# BITRATES AS FFMPEG TAKES THEM (BITS PER SECOND, OPTIONALLY WITH A k OR M SUFFIX)
+_BITRATE = re.compile(r'\d+(?:\.\d+)?[kKmM]?')
+
+# RETURNS THE PATH OF THE FFMPEG EXECUTABLE (None WHEN IT IS NOT ON THE PATH)
+def find_ffmpeg() -> Optional[str]:
+    return shutil.which('ffmpeg')
+
+# RETURNS THE ENGINE convert_audio RUNS AND THE EXECUTABLE IT ENCODES WITH
+# - ('ffmpeg', PATH) WHEN FFMPEG IS ON THE PATH
+# - OTHERWISE ('pydub', PATH): PYDUB THEN SHELLS OUT TO avconv (None WHEN THERE IS NONE EITHER)
+def audio_engine() -> Tuple[str, Optional[str]]:
+    ffmpeg = find_ffmpeg()
+    if ffmpeg: return 'ffmpeg', ffmpeg
+    return 'pydub', shutil.which('avconv')
+
+# RETURNS THE FFMPEG COMMAND CONVERTING input_path TO output_path IN ONE STREAMING PASS (DECODED AUDIO GOES STRAIGHT TO THE ENCODER)
+# - AUDIO ONLY (-vn DROPS COVER ART AND OTHER STREAMS) WITH THE TAGS KEPT; THE CODEC IS THE DEFAULT ONE OF THE OUTPUT FORMAT
+# - PATHS GET THE file: PREFIX SO NAMES STARTING WITH '-' OR CONTAINING ':' ARE NEVER TAKEN AS OPTIONS OR PROTOCOLS
+def ffmpeg_audio_command(ffmpeg: str, input_path: str, output_path: str, output_format: str, bitrate: Optional[str] = None,
+                         sample_rate: Optional[int] = None) -> List[str]:
+    command = [ffmpeg, '-hide_banner', '-nostdin', '-loglevel', 'error', '-y', '-i', f"file:{input_path}", '-vn', '-map_metadata', '0']
+    if bitrate: command += ['-b:a', str(bitrate)]
+    if sample_rate: command += ['-ar', str(sample_rate)]
+    return command + ['-f', _FFMPEG_MUXERS.get(output_format, output_format), f"file:{output_path}"]
+
+# CONVERTS WITH ONE FFMPEG PROCESS; ON FAILURE THE PARTIAL OUTPUT IS REMOVED AND THE LAST FFMPEG ERROR LINE IS RAISED
+def _convert_with_ffmpeg(ffmpeg: str, input_path: str, output_path: str, output_format: str, bitrate: Optional[str],
+                         sample_rate: Optional[int]) -> None:
+    command = ffmpeg_audio_command(ffmpeg, input_path, output_path, output_format, bitrate, sample_rate)
+    result = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode == 0: return
+
+    if os.path.exists(output_path): os.unlink(output_path)
+    errors = result.stderr.decode('utf-8', errors='replace').strip().splitlines()
+    raise ValueError(f"FFMPEG EXITED WITH CODE {result.returncode}: {errors[-1] if errors else 'NO ERROR OUTPUT'}")
+
+# CONVERTS WITH PYDUB (DECODES THE WHOLE FILE TO PCM IN MEMORY, THEN ENCODES IT)
+def _convert_with_pydub(input_path: str, output_path: str, output_format: str, bitrate: Optional[str], sample_rate: Optional[int]) -> None:
+    from pydub import AudioSegment
+
+    options = {}
+    if bitrate: options['bitrate'] = str(bitrate)
+    if sample_rate: options['parameters'] = ['-ar', str(sample_rate)]
+    AudioSegment.from_file(input_path).export(output_path, format=output_format, **options)
 
 # CONVERTS AUDIO BETWEEN FORMATS
-def convert_audio(input_path: str, output_path: str, output_format: Optional[str] = None) -> bool:
+# - FFMPEG (WHEN ON THE PATH) STREAMS THE INPUT TO THE OUTPUT CODEC, SO MEMORY STAYS FLAT WHATEVER THE DURATION
+# - PYDUB IS THE FALLBACK WITHOUT AN FFMPEG EXECUTABLE
+# - bitrate (EXAMPLE: '192k') AND sample_rate (HZ) DEFAULT TO THE ENCODER'S CHOICE
+def convert_audio(input_path: str, output_path: str, output_format: Optional[str] = None, bitrate: Optional[str] = None,
+                  sample_rate: Optional[int] = None) -> bool:
     try:
-        from pydub import AudioSegment
-
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"INPUT FILE NOT FOUND: {input_path}")
         if output_format is None: output_format = Path(output_path).suffix[1:].lower()
+        if bitrate is not None and not _BITRATE.fullmatch(str(bitrate)):
+            raise ValueError(f"INVALID BITRATE: {bitrate} (EXAMPLES: 128k, 320k, 96000)")
+        if sample_rate is not None and sample_rate <= 0:
+            raise ValueError(f"SAMPLE RATE MUST BE GREATER THAN 0: {sample_rate}")
 
-        audio = AudioSegment.from_file(input_path)
-        audio.export(output_path, format=output_format)
+        engine, ffmpeg = audio_engine()
+        if engine == 'ffmpeg': _convert_with_ffmpeg(ffmpeg, input_path, output_path, output_format, bitrate, sample_rate)
+        else: _convert_with_pydub(input_path, output_path, output_format, bitrate, sample_rate)
 
         return True
 
     except ImportError:
-        raise ImportError("PYDUB is required for audio conversion. Install with: pip install pydub. Also install FFMPEG.")
+        raise ImportError("FFMPEG is required for audio conversion (PYDUB is the fallback without it). Install FFMPEG, or: pip install pydub.")
     except (OSError, ValueError, IOError) as e:
         raise RuntimeError(f"AUDIO CONVERSION FAILED: {str(e)}")
     except Exception as e:
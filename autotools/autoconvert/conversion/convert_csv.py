@@ -0,0 +1,142 @@
+import io
+import csv
+import json
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Type
+
+from .json_stream import iter_json_items
+
+# ROWS READ, FORMATTED AND WRITTEN TOGETHER
+ROW_BATCH = 1000
+
+# CHARACTERS AT THE START OF A CSV FILE USED TO DETECT ITS DIALECT AND HEADER
+SNIFF_SIZE = 64 * 1024
+
+# JSON FORMATS HOLDING ONE VALUE PER LINE
+JSON_LINES = ('jsonl', 'ndjson')
+
+# RETURNS WHETHER A CONVERSION BETWEEN TWO EXTENSIONS IS HANDLED ROW BY ROW (CSV TO JSON/JSONL, OR JSON/JSONL TO CSV)
+def is_table_conversion(input_ext: str, output_ext: str) -> bool:
+    json_formats = ('json',) + JSON_LINES
+    return (input_ext == 'csv' and output_ext in json_formats) or (input_ext in json_formats and output_ext == 'csv')
+
+# RETURNS WHETHER A CSV CELL HOLDS A NUMBER
+def _is_number(cell: str) -> bool:
+    try: float(cell)
+    except ValueError: return False
+    return True
+
+# DETECTS THE DIALECT OF AN OPEN CSV FILE AND WHETHER ITS FIRST ROW IS A HEADER, FROM ITS FIRST LINES, THEN REWINDS IT
+# - DELIMITERS TRIED: ',', ';', TAB AND '|' (THE EXCEL DIALECT IS USED WHEN NONE FITS)
+# - A FIRST ROW OF DISTINCT, NON-EMPTY, NON-NUMERIC CELLS IS TAKEN AS A HEADER, AS IS ONE csv.Sniffer RECOGNISES
+def sniff_csv(source: TextIO) -> Tuple[Type[csv.Dialect], bool]:
+    sample = source.read(SNIFF_SIZE)
+    source.seek(0)
+    if len(sample) == SNIFF_SIZE and '\n' in sample: sample = sample[:sample.rindex('\n') + 1]
+
+    sniffer = csv.Sniffer()
+    try: dialect = sniffer.sniff(sample, delimiters=',;\t|')
+    except csv.Error: dialect = csv.excel
+
+    first = next(csv.reader(io.StringIO(sample), dialect), [])
+    if not first: return dialect, False
+    try: recognised = sniffer.has_header(sample)
+    except csv.Error: recognised = False
+    plain_names = all(cell.strip() for cell in first) and len(set(first)) == len(first) and not any(_is_number(cell) for cell in first)
+    return dialect, plain_names or recognised
+
+# ADDS column_N NAMES UNTIL THERE ARE count COLUMNS (FOR HEADERLESS FILES AND ROWS LONGER THAN THE HEADER)
+def _add_columns(names: List[str], count: int) -> None:
+    while len(names) < count:
+        name, suffix = f"column_{len(names) + 1}", 2
+        while name in names: name, suffix = f"column_{len(names) + 1}_{suffix}", suffix + 1
+        names.append(name)
+
+# RETURNS THE COLUMN NAMES OF A HEADER ROW (EMPTY CELLS ARE NAMED column_N, REPEATED NAMES GET A _2, _3... SUFFIX)
+def _header_names(row: List[str]) -> List[str]:
+    names = []
+    for index, cell in enumerate(row, 1):
+        name = base = cell.strip() or f"column_{index}"
+        suffix = 2
+        while name in names: name, suffix = f"{base}_{suffix}", suffix + 1
+        names.append(name)
+    return names
+
+# CONVERTS A CSV FILE TO A JSON ARRAY OF OBJECTS (lines=False) OR TO JSON LINES, batch_size ROWS AT A TIME, AND RETURNS THE ROW COUNT
+# - header=None INFERS WHETHER THE FIRST ROW NAMES THE COLUMNS (SEE sniff_csv); WITHOUT ONE, COLUMNS ARE NAMED column_1, column_2...
+# - CELLS STAY STRINGS; CELLS MISSING FROM A SHORT ROW ARE null AND EXTRA CELLS GET column_N KEYS
+def csv_to_json(input_path: str, output_path: str, lines: bool = False, header: Optional[bool] = None, batch_size: int = ROW_BATCH) -> int:
+    with open(input_path, 'r', encoding='utf-8-sig', newline='') as source, open(output_path, 'w', encoding='utf-8') as output:
+        dialect, has_header = sniff_csv(source)
+        reader = csv.reader(source, dialect)
+        names = _header_names(next(reader, [])) if (has_header if header is None else header) else []
+        rows = 0
+
+        if not lines: output.write('[')
+        while batch := list(islice(reader, batch_size)):
+            records = []
+            for row in batch:
+                if not row: continue
+                _add_columns(names, len(row))
+                record = json.dumps({name: row[i] if i < len(row) else None for i, name in enumerate(names)}, ensure_ascii=False)
+                records.append(f"{record}\n" if lines else f"{',' if rows else ''}\n  {record}")
+                rows += 1
+            output.write(''.join(records))
+        if not lines: output.write('\n]' if rows else ']')
+    return rows
+
+# YIELDS THE VALUES OF JSON LINES, OR THE ITEMS OF A JSON ARRAY (A SINGLE VALUE FOR ANY OTHER DOCUMENT), ONE AT A TIME
+def _iter_json_records(source: TextIO, lines: bool) -> Iterator[Any]:
+    if lines:
+        for number, line in enumerate(source, 1):
+            if not line.strip(): continue
+            try: yield json.loads(line)
+            except ValueError as e: raise ValueError(f"INVALID JSON ON LINE {number}: {e}") from e
+        return
+
+    yield from iter_json_items(source)
+
+# RETURNS THE CSV CELL OF A JSON VALUE (STRINGS AS IS, null EMPTY, ANYTHING ELSE AS JSON)
+def _cell(value: Any) -> str:
+    if value is None: return ''
+    if isinstance(value, str): return value
+    return json.dumps(value, ensure_ascii=False)
+
+# WRITES JSON OBJECTS AS CSV ROWS UNDER A HEADER OF columns (EXTENDED WITH THE KEYS OF THE FIRST BATCH) AND RETURNS (ROWS, COMPLETE)
+# - KEYS FIRST SEEN AFTER THE HEADER WAS WRITTEN ARE ADDED TO columns AND MAKE THE OUTPUT INCOMPLETE (COMPLETE IS THEN False)
+def _write_csv_rows(input_path: str, lines: bool, output: TextIO, columns: Dict[str, None], batch_size: int) -> Tuple[int, bool]:
+    writer, rows, complete, header_written = csv.writer(output), 0, True, False
+    with open(input_path, 'r', encoding='utf-8-sig') as source:
+        records = _iter_json_records(source, lines)
+        while batch := list(islice(records, batch_size)):
+            for number, record in enumerate(batch, rows + 1):
+                if not isinstance(record, dict):
+                    raise ValueError(f"JSON TO CSV NEEDS OBJECTS: RECORD {number} IS NOT AN OBJECT")
+                for key in record:
+                    if key in columns: continue
+                    columns[key] = None
+                    complete = not header_written and complete
+            if not header_written: writer.writerow(columns)
+            header_written = True
+            writer.writerows([_cell(record.get(key)) for key in columns] for record in batch)
+            rows += len(batch)
+    return rows, complete
+
+# CONVERTS A JSON ARRAY OF OBJECTS (OR JSON LINES) TO CSV, batch_size RECORDS AT A TIME, AND RETURNS THE ROW COUNT
+# - THE HEADER IS THE UNION OF THE KEYS IN ORDER OF FIRST APPEARANCE; IT COMES FROM THE FIRST BATCH, AND ONLY A KEY FIRST SEEN
+#   LATER MAKES A SECOND PASS (WITH THE FULL HEADER) NECESSARY
+# - NESTED VALUES ARE WRITTEN AS JSON, null AS AN EMPTY CELL
+def json_to_csv(input_path: str, output_path: str, lines: bool = False, batch_size: int = ROW_BATCH) -> int:
+    columns = {}
+    with open(output_path, 'w', encoding='utf-8', newline='') as output:
+        rows, complete = _write_csv_rows(input_path, lines, output, columns, batch_size)
+        if not complete:
+            output.seek(0)
+            output.truncate()
+            rows, _ = _write_csv_rows(input_path, lines, output, columns, batch_size)
+    return rows
+
+# CONVERTS BETWEEN CSV AND JSON (ARRAY) OR JSON LINES BY EXTENSION AND RETURNS THE ROW COUNT
+def convert_table(input_path: str, output_path: str, input_ext: str, output_ext: str) -> int:
+    if input_ext == 'csv': return csv_to_json(input_path, output_path, lines=output_ext in JSON_LINES)
+    return json_to_csv(input_path, output_path, lines=input_ext in JSON_LINES)
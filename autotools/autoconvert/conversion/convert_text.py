@@ -1,8 +1,30 @@
+import io
 import os
 import json
 import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Iterator, TextIO, Tuple
+
+from .convert_csv import convert_table, is_table_conversion
+from .json_stream import CHUNK_SIZE, iter_json_events, iter_json_text, load_json_value, skip_json_value
+
+# HTML PAGE WRAPPED AROUND TEXT (THE TEXT GOES BETWEEN THE TWO PARTS)
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+</head>
+<body>
+    <pre>"""
+_HTML_FOOT = """</pre>
+</body>
+</html>"""
+
+# ESCAPES &, < AND > (AS ElementTree DOES FOR ELEMENT TEXT)
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 # CONVERTS TEXT TO JSON FORMAT
 def text_to_json(text: str, indent: int = 2) -> str:
@@ -17,16 +39,7 @@ def text_to_xml(text: str, root_tag: str = "text") -> str:
 
 # CONVERTS TEXT TO HTML FORMAT
 def text_to_html(text: str, title: str = "Document") -> str:
-    escaped_text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    return f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{title}</title>
-</head>
-<body>
-    <pre>{escaped_text}</pre>
-</body>
-</html>"""
+    return _HTML_HEAD.format(title=title) + _escape(text) + _HTML_FOOT
 
 # CONVERTS TEXT TO MARKDOWN FORMAT
 def text_to_markdown(text: str) -> str:
@@ -41,61 +54,167 @@ def json_to_text(json_str: str) -> str:
     except json.JSONDecodeError:
         return json_str
 
+# YIELDS THE NON-BLANK TEXT AND TAILS OF AN XML DOCUMENT (STRIPPED, IN DOCUMENT ORDER) WHILE PARSING IT INCREMENTALLY
+# - EVERY ELEMENT IS DROPPED FROM THE TREE ONCE ITS TAIL HAS BEEN READ, SO MEMORY DOES NOT GROW WITH THE DOCUMENT
+def _iter_xml_text(source) -> Iterator[str]:
+    stack, done = [], None
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start' and stack and not stack[-1][1]:
+            stack[-1][1] = True
+            if stack[-1][0].text and stack[-1][0].text.strip(): yield stack[-1][0].text.strip()
+        if done is not None:
+            if done.tail and done.tail.strip(): yield done.tail.strip()
+            stack[-1][0].remove(done)
+            done.clear()
+            done = None
+        if event == 'start':
+            stack.append([elem, False])
+            continue
+        if not stack[-1][1] and elem.text and elem.text.strip(): yield elem.text.strip()
+        done = stack.pop()[0]
+
 # CONVERTS XML TO TEXT
 def xml_to_text(xml_str: str) -> str:
-    try:
-        root = ET.fromstring(xml_str)
-        text_parts = []
+    try: return " ".join(_iter_xml_text(io.StringIO(xml_str)))
+    except ET.ParseError: return xml_str
+
+# COLLECTS THE TEXT OF AN HTML DOCUMENT FED IN CHUNKS, JOINING SEPARATE RUNS OF TEXT WITH ' '
+# - A RUN ENDS AT A TAG, COMMENT OR DECLARATION, SO TEXT SPLIT BETWEEN TWO CHUNKS STAYS IN ONE RUN
+class _HTMLTextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.pieces, self._started, self._in_run = [], False, False
+
+    def handle_data(self, data):
+        if self._started and not self._in_run: self.pieces.append(' ')
+        self.pieces.append(data)
+        self._started = self._in_run = True
+
+    def _end_run(self, *args):
+        self._in_run = False
+
+    handle_starttag = handle_endtag = handle_startendtag = handle_comment = handle_decl = handle_pi = unknown_decl = _end_run
+
+# READS A BINARY FILE AS UTF-8 TEXT FROM ITS START, LEAVING THE FILE OPEN AFTERWARDS
+@contextmanager
+def _decoded(source: BinaryIO) -> Iterator[TextIO]:
+    source.seek(0)
+    text = io.TextIOWrapper(source, encoding='utf-8')
+    try: yield text
+    finally: text.detach()
+
+# YIELDS A TEXT FILE IN CHUNKS
+def _read_plain(source: BinaryIO, chunk_size: int) -> Iterator[str]:
+    with _decoded(source) as text:
+        while chunk := text.read(chunk_size): yield chunk
+
+# YIELDS THE TEXT OF AN HTML FILE, FEEDING THE PARSER ONE CHUNK AT A TIME
+def _read_html(source: BinaryIO, chunk_size: int) -> Iterator[str]:
+    parser = _HTMLTextExtractor()
+    for chunk in _read_plain(source, chunk_size):
+        parser.feed(chunk)
+        yield from parser.pieces
+        parser.pieces.clear()
 
-        for elem in root.iter():
-            if elem.text and elem.text.strip(): text_parts.append(elem.text.strip())
-            if elem.tail and elem.tail.strip(): text_parts.append(elem.tail.strip())
+# YIELDS THE TEXT OF AN XML FILE (INVALID XML RAISES ET.ParseError, POSSIBLY AFTER SOME TEXT)
+def _read_xml(source: BinaryIO, chunk_size: int) -> Iterator[str]:
+    source.seek(0)
+    for index, part in enumerate(_iter_xml_text(source)):
+        yield f" {part}" if index else part
 
-        result = " ".join(text_parts)
-        return result
-    except ET.ParseError:
-        return xml_str
+# YIELDS THE TEXT OF A JSON FILE AS json_to_text WOULD RETURN IT (INVALID JSON RAISES ValueError BEFORE ANY TEXT)
+# - A FIRST PASS CHECKS THE DOCUMENT AND FINDS ITS TOP-LEVEL "text" KEY; THE SECOND STREAMS THAT VALUE, OR THE WHOLE DOCUMENT INDENTED
+def _read_json(source: BinaryIO, chunk_size: int) -> Iterator[str]:
+    text_key, is_object, depth, keys = None, False, 0, 0
+    with _decoded(source) as text:
+        for event, value in iter_json_events(text, chunk_size):
+            if not depth: is_object = event == 'start_object'
+            if event == 'key' and depth == 1 and is_object:
+                if value == 'text': text_key = keys
+                keys += 1
+            depth += 1 if event in ('start_object', 'start_array') else -1 if event in ('end_object', 'end_array') else 0
+
+    with _decoded(source) as text:
+        events = iter_json_events(text, chunk_size)
+        if text_key is None:
+            yield from iter_json_text(events, indent=2)
+            return
+        next(events)
+        for _ in range(text_key):
+            next(events)
+            skip_json_value(*next(events), events)
+        next(events)
+        event, value = next(events)
+        if event == 'string': yield from value
+        else: yield str(load_json_value(event, value, events))
+
+# TEXT EXTRACTORS BY INPUT EXTENSION (ANY OTHER FILE IS TAKEN AS IS)
+_READERS = {'json': _read_json, 'xml': _read_xml, 'html': _read_html, 'htm': _read_html}
+
+# WRITES TEXT CHUNKS TO AN OPEN FILE, FORMATTED AS text_to_json, text_to_xml OR text_to_html WOULD FORMAT THE WHOLE TEXT
+def _write_text(chunks: Iterator[str], output: TextIO, output_ext: str) -> None:
+    if output_ext == 'json':
+        output.write('{\n  "text": "')
+        for chunk in chunks: output.write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+        output.write('"\n}')
+    elif output_ext == 'xml':
+        empty = True
+        for chunk in chunks:
+            if empty and chunk: output.write('<text>')
+            empty = empty and not chunk
+            output.write(_escape(chunk))
+        output.write('<text />' if empty else '</text>')
+    elif output_ext in ['html', 'htm']:
+        output.write(_HTML_HEAD.format(title="Document"))
+        for chunk in chunks: output.write(_escape(chunk))
+        output.write(_HTML_FOOT)
+    else:
+        for chunk in chunks: output.write(chunk)
+
+# REMOVES output_path IF THE BLOCK FAILS, SO NO EMPTY OR PARTIAL OUTPUT IS LEFT BEHIND
+# - THE OUTPUT IS STILL WRITTEN IN PLACE (NOT RENAMED OVER), SO HARD LINKS TO AN EXISTING OUTPUT ARE KEPT ON SUCCESS
+@contextmanager
+def _removed_on_error(output_path: str) -> Iterator[None]:
+    try: yield
+    except BaseException:
+        if os.path.isfile(output_path): os.unlink(output_path)
+        raise
 
 # CONVERTS TEXT FILE FROM ONE FORMAT TO ANOTHER
-def convert_text_file(input_path: str, output_path: str) -> Tuple[bool, str]:
+# - THE INPUT IS READ AND THE OUTPUT WRITTEN chunk_size CHARACTERS AT A TIME, SO MEMORY STAYS FLAT WHATEVER THE FILE SIZE
+# - AN INPUT THAT FAILS PART WAY (INVALID JSON LINES, A NON-OBJECT RECORD) LEAVES NO OUTPUT FILE RATHER THAN A PARTIAL ONE
+# - JSON AND XML THAT FAIL TO PARSE ARE CONVERTED AS PLAIN TEXT
+# - CSV TO JSON/JSONL AND JSON/JSONL TO CSV CONVERT ROWS (SEE convert_csv)
+def convert_text_file(input_path: str, output_path: str, chunk_size: int = CHUNK_SIZE) -> Tuple[bool, str]:
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"INPUT FILE NOT FOUND: {input_path}")
-    with open(input_path, 'r', encoding='utf-8') as f: content = f.read()
     
     input_ext = Path(input_path).suffix[1:].lower()
     output_ext = Path(output_path).suffix[1:].lower()
     
-    # CONVERT BASED ON INPUT FORMAT
-    if input_ext == 'json':
-        content = json_to_text(content)
-    elif input_ext == 'xml':
-        content = xml_to_text(content)
-    elif input_ext in ['html', 'htm']:
-        from html.parser import HTMLParser
-        class TextExtractor(HTMLParser):
-            def __init__(self):
-                super().__init__()
-                self.text = []
-            def handle_data(self, data):
-                self.text.append(data)
-        parser = TextExtractor()
-        parser.feed(content)
-        content = ' '.join(parser.text)
-    
-    # CONVERT TO OUTPUT FORMAT
-    if output_ext == 'json': content = text_to_json(content)
-    elif output_ext == 'xml': content = text_to_xml(content)
-    elif output_ext in ['html', 'htm']: content = text_to_html(content)
-    
     # CREATE OUTPUT DIRECTORY IF IT DOESN'T EXIST
     output_dir = os.path.dirname(output_path)
     if output_dir and not os.path.exists(output_dir):
         try: os.makedirs(output_dir, exist_ok=True)
         except OSError as e: return False, f"CONVERSION FAILED: Cannot create output directory: {str(e)}"
     
-    try:
-        with open(output_path, 'w', encoding='utf-8') as f: f.write(content)
-    except OSError as e:
-        return False, f"CONVERSION FAILED: Cannot write output file: {str(e)}"
+    if is_table_conversion(input_ext, output_ext):
+        try:
+            with _removed_on_error(output_path): rows = convert_table(input_path, output_path, input_ext, output_ext)
+        except OSError as e: return False, f"CONVERSION FAILED: Cannot write output file: {str(e)}"
+        return True, f"TEXT CONVERTED FROM {input_ext.upper()} TO {output_ext.upper()} ({rows} ROWS)"
+    
+    with open(input_path, 'rb') as source:
+        reader = _READERS.get(input_ext, _read_plain)
+        unparsable = (ValueError, ET.ParseError) if input_ext in ('json', 'xml') else ()
+        try:
+            with _removed_on_error(output_path), open(output_path, 'w', encoding='utf-8') as output:
+                try: _write_text(reader(source, chunk_size), output, output_ext)
+                except unparsable:
+                    output.seek(0)
+                    output.truncate()
+                    _write_text(_read_plain(source, chunk_size), output, output_ext)
+        except OSError as e:
+            return False, f"CONVERSION FAILED: Cannot write output file: {str(e)}"
     
     return True, f"TEXT CONVERTED FROM {input_ext.upper()} TO {output_ext.upper()}"
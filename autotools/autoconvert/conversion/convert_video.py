@@ -1,8 +1,18 @@
 import os
+import shutil
 import importlib
 from pathlib import Path
 from typing import Optional
 
+# RETURNS THE FFMPEG EXECUTABLE MOVIEPY ENCODES WITH, RESOLVED AS MOVIEPY DOES BUT WITHOUT IMPORTING IT (None WHEN THERE IS NONE)
+# - $FFMPEG_BINARY: 'ffmpeg-imageio' (DEFAULT) IS THE ONE BUNDLED WITH imageio-ffmpeg, 'auto-detect' THE ONE ON THE PATH
+def find_moviepy_ffmpeg() -> Optional[str]:
+    binary = os.getenv('FFMPEG_BINARY', 'ffmpeg-imageio')
+    if binary == 'ffmpeg-imageio':
+        try: return importlib.import_module('imageio_ffmpeg').get_ffmpeg_exe()
+        except (ImportError, RuntimeError): return None
+    return shutil.which('ffmpeg' if binary == 'auto-detect' else binary)
+
 # CONVERTS VIDEO BETWEEN FORMATS
 def convert_video(input_path: str, output_path: str, output_format: Optional[str] = None) -> bool:
     try:
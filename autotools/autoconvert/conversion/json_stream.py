@@ -0,0 +1,194 @@
+import re
+import json
+from typing import Any, Iterator, TextIO, Tuple
+
+# CHARACTERS READ PER CHUNK
+CHUNK_SIZE = 1024 * 1024
+
+# JSON WHITESPACE, SCALARS (NUMBERS AND LITERALS, AS ACCEPTED BY json.loads) AND STRING CONTENT UP TO A QUOTE OR AN INCOMPLETE ESCAPE
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SCALAR = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|Infinity|-Infinity')
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*')
+
+# DECODER FOR WHOLE VALUES (C SCANNER)
+_DECODER = json.JSONDecoder()
+
+# SCALARS THAT ARE NOT NUMBERS
+_LITERALS = {'true': True, 'false': False, 'null': None}
+
+# LONGEST LITERAL ('-Infinity'): A SCALAR CLOSER THAN THIS TO THE END OF THE BUFFER MAY CONTINUE IN THE NEXT CHUNK
+_LOOKAHEAD = 9
+
+# SPLITS A JSON TEXT FILE INTO TOKENS, HOLDING ONE CHUNK (PLUS THE TOKEN BEING READ) IN MEMORY
+# - STRINGS ARE DECODED IN PIECES, SO A SINGLE HUGE STRING NEVER HAS TO FIT IN MEMORY
+class _Tokenizer:
+    def __init__(self, source: TextIO, chunk_size: int = CHUNK_SIZE):
+        self._source = source
+        self._chunk_size = chunk_size
+        self.buffer, self.pos, self.eof, self.value = '', 0, False, None
+
+    # APPENDS THE NEXT CHUNK TO THE UNREAD PART OF THE BUFFER (False AT THE END OF THE FILE)
+    def _fill(self) -> bool:
+        chunk = self._source.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer, self.pos = self.buffer[self.pos:] + chunk, 0
+        return True
+
+    # SKIPS WHITESPACE AND RETURNS THE NEXT CHARACTER WITHOUT CONSUMING IT ('' AT THE END)
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if len(self.buffer) - self.pos >= _LOOKAHEAD or not self._fill(): break
+        return self.buffer[self.pos:self.pos + 1]
+
+    # RETURNS THE NEXT TOKEN: ONE OF '{}[],:', '"' (A STRING STARTS: READ IT WITH string()), 'value' (A SCALAR, IN self.value) OR '' AT THE END
+    def next(self) -> str:
+        char = self.peek()
+        if not char: return ''
+        if char in '{}[],:"':
+            self.pos += 1
+            return char
+        match = _SCALAR.match(self.buffer, self.pos)
+        while match and len(self.buffer) - match.end() < _LOOKAHEAD and self._fill(): match = _SCALAR.match(self.buffer, self.pos)
+        if not match: raise ValueError(f"INVALID JSON: UNEXPECTED {char!r}")
+        scalar, self.pos = match.group(), match.end()
+        if scalar in _LITERALS: self.value = _LITERALS[scalar]
+        else: self.value = float(scalar) if any(c in scalar for c in '.eEIN') else int(scalar)
+        return 'value'
+
+    # YIELDS THE DECODED PIECES OF THE STRING WHOSE OPENING QUOTE WAS JUST READ, UP TO ITS CLOSING QUOTE
+    # - A PIECE NEVER ENDS BETWEEN THE TWO HALVES OF A SURROGATE PAIR ESCAPE
+    def string(self) -> Iterator[str]:
+        while True:
+            end = run_end = _STRING_RUN.match(self.buffer, self.pos).end()
+            closed = end < len(self.buffer) and self.buffer[end] == '"'
+            piece = self.buffer[self.pos:end]
+            if '\\' in piece: piece = json.loads(f'"{piece}"')
+            if not closed and piece and '\ud800' <= piece[-1] <= '\udbff' and not self.eof: end, piece = end - 6, piece[:-1]
+            self.pos = end
+            if piece: yield piece
+            if closed:
+                self.pos += 1
+                return
+            if len(self.buffer) - run_end >= 6 or not self._fill(): raise ValueError("INVALID JSON: BAD OR UNTERMINATED STRING")
+
+    # DECODES THE NEXT WHOLE VALUE WITH THE C DECODER, READING MORE CHUNKS UNTIL IT IS COMPLETE
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof: raise ValueError(f"INVALID JSON: {e}") from e
+            self._fill()
+
+# YIELDS THE ITEMS OF A JSON ARRAY ONE AT A TIME (ANY OTHER DOCUMENT IS YIELDED WHOLE), CHECKING THE DOCUMENT AS IT GOES
+# - EACH ITEM IS PARSED BY THE C DECODER, SO MEMORY IS BOUNDED BY THE LARGEST ITEM RATHER THAN BY THE DOCUMENT
+def iter_json_items(source: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    tokens = _Tokenizer(source, chunk_size)
+    if tokens.peek() != '[':
+        yield tokens.decode()
+    elif tokens.next() and tokens.peek() == ']':
+        tokens.next()
+    else:
+        while True:
+            yield tokens.decode()
+            token = tokens.next()
+            if token == ']': break
+            if token != ',': raise ValueError("INVALID JSON: EXPECTED ',' OR ']' IN THE ARRAY")
+    if tokens.next(): raise ValueError("INVALID JSON: EXTRA DATA AFTER THE DOCUMENT")
+
+# YIELDS (EVENT, VALUE) FOR A JSON DOCUMENT, CHECKING ITS GRAMMAR AS IT GOES (INVALID JSON RAISES ValueError)
+# - EVENTS: 'start_object', 'end_object', 'start_array', 'end_array', 'key' (THE KEY), 'scalar' (THE VALUE)
+#   AND 'string' (AN ITERATOR OF DECODED PIECES, DRAINED AUTOMATICALLY IF THE CONSUMER SKIPS IT)
+def iter_json_events(source: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    tokens = _Tokenizer(source, chunk_size)
+    stack, expect = [], 'value'
+
+    while True:
+        token = tokens.next()
+        if expect == 'end':
+            if token: raise ValueError("INVALID JSON: EXTRA DATA AFTER THE DOCUMENT")
+            return
+        if expect == 'colon':
+            if token != ':': raise ValueError("INVALID JSON: EXPECTED ':'")
+            expect = 'value'
+            continue
+        if expect == 'comma' and token == ',':
+            expect = 'key' if stack[-1] == '{' else 'value'
+            continue
+
+        closing = {'{': '}', '[': ']'}.get(stack[-1]) if stack else None
+        if token == closing and expect in ('comma', 'first'):
+            stack.pop()
+            yield ('end_object' if token == '}' else 'end_array'), None
+        elif expect in ('key', 'first') and stack[-1] == '{':
+            if token != '"': raise ValueError("INVALID JSON: EXPECTED A KEY")
+            yield 'key', ''.join(tokens.string())
+            expect = 'colon'
+            continue
+        elif expect in ('value', 'first') and token in ('{', '['):
+            stack.append(token)
+            yield ('start_object' if token == '{' else 'start_array'), None
+            expect = 'first'
+            continue
+        elif expect in ('value', 'first') and token == '"':
+            pieces = tokens.string()
+            yield 'string', pieces
+            for _ in pieces: pass
+        elif expect in ('value', 'first') and token == 'value':
+            yield 'scalar', tokens.value
+        else:
+            raise ValueError(f"INVALID JSON: UNEXPECTED {'END OF FILE' if not token else repr(token)}")
+        expect = 'comma' if stack else 'end'
+
+# BUILDS THE VALUE THAT STARTS WITH event FROM THE FOLLOWING EVENTS (FOR VALUES SMALL ENOUGH TO HOLD IN MEMORY)
+def load_json_value(event: str, value: Any, events: Iterator[Tuple[str, Any]]) -> Any:
+    if event == 'string': return ''.join(value)
+    if event == 'scalar': return value
+    if event == 'start_array':
+        return [load_json_value(item_event, item_value, events) for item_event, item_value in iter(lambda: next(events), ('end_array', None))]
+    return {key: load_json_value(*next(events), events) for _, key in iter(lambda: next(events), ('end_object', None))}
+
+# CONSUMES THE EVENTS OF THE VALUE THAT STARTS WITH event WITHOUT BUILDING IT
+def skip_json_value(event: str, value: Any, events: Iterator[Tuple[str, Any]]) -> None:
+    depth = 1 if event in ('start_object', 'start_array') else 0
+    while depth:
+        event, _ = next(events)
+        depth += 1 if event in ('start_object', 'start_array') else -1 if event in ('end_object', 'end_array') else 0
+
+# YIELDS THE TEXT OF json.dumps(document, indent=indent, ensure_ascii=False) PIECE BY PIECE FROM THE DOCUMENT'S EVENTS
+# - DUPLICATE KEYS ARE ALL WRITTEN (json.loads WOULD KEEP THE LAST VALUE ONLY)
+def iter_json_text(events: Iterator[Tuple[str, Any]], indent: int = 2) -> Iterator[str]:
+    counts, pending, after_key = [], None, False
+    for event, value in events:
+        closing = event in ('end_object', 'end_array')
+        if pending is not None:
+            yield pending + ('}' if pending == '{' else ']') if closing else pending
+            pending = None
+            if closing:
+                counts.pop()
+                continue
+        if closing:
+            counts.pop()
+            yield '\n' + ' ' * (indent * len(counts)) + ('}' if event == 'end_object' else ']')
+            continue
+
+        if not after_key and counts:
+            yield (',' if counts[-1] else '') + '\n' + ' ' * (indent * len(counts))
+            counts[-1] += 1
+        after_key = event == 'key'
+        if event == 'key': yield json.dumps(value, ensure_ascii=False) + ': '
+        elif event == 'scalar': yield json.dumps(value)
+        elif event == 'string':
+            yield '"'
+            for piece in value: yield json.dumps(piece, ensure_ascii=False)[1:-1]
+            yield '"'
+        else:
+            pending = '{' if event == 'start_object' else '['
+            counts.append(0)
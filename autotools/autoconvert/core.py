@@ -1,6 +1,8 @@
+import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
+from .cache import ConversionCache
 from .conversion.convert_text import convert_text_file
 from .conversion.convert_image import convert_image
 from .conversion.convert_audio import convert_audio
@@ -11,7 +13,7 @@ def detect_file_type(file_path: str) -> str:
     ext = Path(file_path).suffix[1:].lower()
 
     # TEXT FORMATS
-    text_formats = ['txt', 'md', 'markdown', 'json', 'xml', 'html', 'htm', 'csv']
+    text_formats = ['txt', 'md', 'markdown', 'json', 'jsonl', 'ndjson', 'xml', 'html', 'htm', 'csv']
     if ext in text_formats: return 'text'
 
     # IMAGE FORMATS
@@ -29,26 +31,51 @@ def detect_file_type(file_path: str) -> str:
     return 'unknown'
 
 # CONVERTS FILE FROM ONE FORMAT TO ANOTHER
-def convert_file(input_path: str, output_path: str, input_type: Optional[str] = None, output_type: Optional[str] = None) -> Tuple[bool, str]:
+# - WITH A cache, MEDIA CONVERSIONS ALREADY DONE ON THE SAME CONTENT ARE RESTORED FROM IT INSTEAD OF BEING ENCODED AGAIN
+# - bitrate AND sample_rate ONLY APPLY TO AUDIO OUTPUTS (SEE convert_audio)
+# - CACHED CONVERSIONS ARE WRITTEN TO A TEMPORARY FILE NEXT TO THE OUTPUT, STORED FROM IT, THEN MOVED OVER THE OUTPUT
+def convert_file(input_path: str, output_path: str, input_type: Optional[str] = None, output_type: Optional[str] = None,
+                 cache: Optional[ConversionCache] = None, bitrate: Optional[str] = None, sample_rate: Optional[int] = None) -> Tuple[bool, str]:
     try:
         if input_type is None: input_type = detect_file_type(input_path)
         if output_type is None: output_type = detect_file_type(output_path)
-        if input_type == 'text' and output_type == 'text': return convert_text_file(input_path, output_path)
-        
-        # HANDLE CONVERSIONS WITHIN THE SAME MEDIA TYPE
-        elif input_type == 'image' and output_type == 'image':
-            convert_image(input_path, output_path)
-            return True, "IMAGE CONVERTED SUCCESSFULLY"
-        elif input_type == 'audio' and output_type == 'audio':
-            convert_audio(input_path, output_path)
-            return True, "AUDIO CONVERTED SUCCESSFULLY"
-        elif input_type == 'video' and output_type == 'video':
-            convert_video(input_path, output_path)
-            return True, "VIDEO CONVERTED SUCCESSFULLY"
-        else:
-            return False, f"UNSUPPORTED CONVERSION: {input_type} TO {output_type}"
-    
+        audio_options = {'bitrate': bitrate, 'sample_rate': sample_rate}
+        if cache is None or not cache.handles(input_type, output_type):
+            return _convert(input_path, output_path, input_type, output_type, audio_options)
+
+        key = cache.key(input_path, output_path, input_type, output_type, audio_options if output_type == 'audio' else None)
+        method = cache.restore(key, output_path)
+        if method: return True, f"{output_type.upper()} RESTORED FROM CACHE ({method.upper()})"
+
+        output = Path(output_path)
+        temp_path = str(output.with_name(f".{output.stem}.{os.getpid()}.tmp{output.suffix}"))
+        try:
+            success, message = _convert(input_path, temp_path, input_type, output_type, audio_options)
+            if success:
+                cache.store(key, temp_path)
+                os.replace(temp_path, output_path)
+        finally:
+            if os.path.lexists(temp_path): os.unlink(temp_path)
+        return success, message
+
     except FileNotFoundError:
         raise
     except Exception as e:
         return False, f"CONVERSION FAILED: {str(e)}"
+
+# RUNS THE CONVERTER OF A (INPUT TYPE, OUTPUT TYPE) PAIR
+def _convert(input_path: str, output_path: str, input_type: str, output_type: str, audio_options: Dict) -> Tuple[bool, str]:
+    if input_type == 'text' and output_type == 'text': return convert_text_file(input_path, output_path)
+
+    # HANDLE CONVERSIONS WITHIN THE SAME MEDIA TYPE
+    elif input_type == 'image' and output_type == 'image':
+        convert_image(input_path, output_path)
+        return True, "IMAGE CONVERTED SUCCESSFULLY"
+    elif input_type == 'audio' and output_type == 'audio':
+        convert_audio(input_path, output_path, **audio_options)
+        return True, "AUDIO CONVERTED SUCCESSFULLY"
+    elif input_type == 'video' and output_type == 'video':
+        convert_video(input_path, output_path)
+        return True, "VIDEO CONVERTED SUCCESSFULLY"
+    else:
+        return False, f"UNSUPPORTED CONVERSION: {input_type} TO {output_type}"
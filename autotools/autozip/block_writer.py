@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# FILE-LIKE BASE WRITER THAT SPLITS A STREAM INTO BLOCKS AND COMPRESSES THEM IN A THREAD POOL
+# - SUBCLASSES MUST RETURN THE (CALLABLE, *ARGS) TASK FOR EACH BLOCK (ABSTRACT, CHECKED ON INSTANTIATION) AND MAY WRITE A HEADER/TRAILER
+# - COMPRESSED BLOCKS ARE WRITTEN IN STREAM ORDER BY THE CALLING THREAD
+# - AT MOST jobs * 2 BLOCKS ARE IN FLIGHT, SO MEMORY STAYS BOUNDED
+class ParallelBlockWriter(ABC):
+    # WHETHER close() MUST SUBMIT A FINAL BLOCK EVEN WHEN NO DATA IS LEFT
+    _always_finish = True
+
+    def __init__(self, fileobj, jobs=1, block_size=1024 * 1024, memory_limit=None):
+        if block_size <= 0: raise ValueError("BLOCK SIZE MUST BE GREATER THAN 0")
+
+        self._fileobj = fileobj
+        self._block_size = block_size
+        self._jobs = self._jobs_within_memory(jobs, memory_limit)
+        self._pool = ThreadPoolExecutor(max_workers=self._jobs)
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._blocks = 0
+        self._size = 0
+        self.closed = False
+
+    # APPROXIMATE BYTES ONE WORKER NEEDS (COMPRESSOR STATE PLUS QUEUED INPUT AND OUTPUT)
+    def _worker_memory(self):
+        return 3 * self._block_size
+
+    # LIMITS WORKER COUNT SO CONCURRENT COMPRESSORS AND BUFFERS FIT IN THE MEMORY CAP
+    def _jobs_within_memory(self, jobs, memory_limit):
+        if memory_limit is None: return jobs
+        return max(1, min(jobs, memory_limit // self._worker_memory()))
+
+    # RETURNS THE (CALLABLE, *ARGS) TASK THAT COMPRESSES ONE BLOCK
+    @abstractmethod
+    def _block_task(self, block, finish):
+        raise NotImplementedError
+
+    # WRITES ONE COMPRESSED BLOCK (BLOCKS ARRIVE IN STREAM ORDER)
+    def _write_block(self, data):
+        self._fileobj.write(data)
+
+    # WRITES ANYTHING THAT MUST FOLLOW THE LAST BLOCK
+    def _write_trailer(self):
+        pass
+
+    @property
+    def jobs(self):
+        return self._jobs
+
+    # BUFFERS DATA AND SUBMITS EVERY FULL BLOCK TO THE POOL
+    def write(self, data):
+        if self.closed: raise ValueError("WRITE TO CLOSED BLOCK WRITER")
+
+        self._buffer += data
+        self._size += len(data)
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[:self._block_size])
+            del self._buffer[:self._block_size]
+            self._submit(block, finish=False)
+        return len(data)
+
+    # RETURNS THE NUMBER OF UNCOMPRESSED BYTES WRITTEN (USED BY tarfile)
+    def tell(self):
+        return self._size
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    # QUEUES ONE BLOCK AND WRITES THE OLDEST RESULT ONCE THE IN-FLIGHT WINDOW IS FULL
+    def _submit(self, block, finish):
+        self._pending.append(self._pool.submit(*self._block_task(block, finish)))
+        self._blocks += 1
+        if len(self._pending) >= self._jobs * 2: self._write_block(self._pending.popleft().result())
+
+    # COMPRESSES THE TAIL BLOCK, DRAINS THE POOL AND WRITES THE TRAILER
+    def close(self):
+        if self.closed: return
+        self.closed = True
+
+        try:
+            tail = bytes(self._buffer)
+            self._buffer.clear()
+            if tail or self._always_finish or self._blocks == 0: self._submit(tail, finish=True)
+            while self._pending: self._write_block(self._pending.popleft().result())
+            self._write_trailer()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,94 @@
+import bz2
+import lzma
+import time
+import zlib
+import random
+
+AUTO = 'auto'
+
+# WHAT --compression auto OPTIMISES FOR
+# - fastest: HIGHEST THROUGHPUT
+# - smallest: LOWEST COMPRESSED SIZE
+# - balanced: MOST BYTES SAVED PER CPU-SECOND
+TARGETS = ('fastest', 'smallest', 'balanced')
+DEFAULT_TARGET = 'balanced'
+
+# LEVEL USED WHEN THE SAMPLE IS EMPTY
+DEFAULT_LEVEL = 6
+
+# MAXIMUM SAMPLE SIZE AND NUMBER OF FILES IT IS DRAWN FROM (EACH CONTRIBUTES AT MOST SAMPLE_SIZE // SAMPLE_FILES BYTES)
+SAMPLE_SIZE = 8 * 1024 * 1024
+SAMPLE_FILES = 64
+
+# CODEC NAME, CANDIDATE LEVELS AND ONE-SHOT COMPRESSOR PER ARCHIVE FORMAT
+_CODECS = {
+    'zip': ('deflate', (1, 3, 6, 9), lambda data, level: zlib.compress(data, level)),
+    'tar.gz': ('deflate', (1, 3, 6, 9), lambda data, level: zlib.compress(data, level)),
+    'tar.bz2': ('bzip2', (1, 5, 9), lambda data, level: bz2.compress(data, level)),
+    'tar.xz': ('xz', (0, 3, 6, 9), lambda data, level: lzma.compress(data, preset=level)),
+}
+
+# RETURNS THE TARGET OF AN 'auto[:TARGET]' COMPRESSION SETTING, OR None FOR A NUMERIC LEVEL
+def parse_auto(compression_level):
+    if not isinstance(compression_level, str) or not compression_level.lower().startswith(AUTO): return None
+    mode, _, target = compression_level.lower().partition(':')
+    target = target or DEFAULT_TARGET
+    if mode != AUTO or target not in TARGETS:
+        raise ValueError(f"INVALID COMPRESSION: {compression_level} (USE 0-9 OR auto[:{'|'.join(TARGETS)}])")
+    return target
+
+# PICKS UP TO count MEMBERS UNIFORMLY IN ONE PASS (RESERVOIR SAMPLING), KEEPING THEIR ORIGINAL ORDER
+# - ONLY THE CHOSEN MEMBERS ARE KEPT, SO MEMORY DOES NOT GROW WITH THE NUMBER OF SOURCE FILES
+def _pick_members(members, count, seed=0):
+    rng, reservoir = random.Random(seed), []
+    for position, member in enumerate(members):
+        if position < count: reservoir.append((position, member))
+        elif (slot := rng.randrange(position + 1)) < count: reservoir[slot] = (position, member)
+    return [member for _, member in sorted(reservoir, key=lambda item: item[0])]
+
+# READS A REPRESENTATIVE SAMPLE: THE START OF UP TO file_count FILES PICKED UNIFORMLY ACROSS THE SOURCES
+def collect_sample(members, sample_size=SAMPLE_SIZE, file_count=SAMPLE_FILES):
+    picked = _pick_members(members, file_count)
+    chunk_size, chunks = sample_size // file_count, []
+    for file_path, _ in picked:
+        with open(file_path, 'rb') as f: chunks.append(f.read(chunk_size))
+    return b''.join(chunks), len(picked)
+
+# COMPRESSES THE SAMPLE AT ONE LEVEL AND RETURNS ITS MEASUREMENTS
+def _measure(compress, data, level):
+    wall, cpu = time.perf_counter(), time.process_time()
+    compressed_size = len(compress(data, level))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {
+        'level': level,
+        'compressed_size': compressed_size,
+        'ratio': round(compressed_size / len(data), 4),
+        'mb_per_s': round(len(data) / (1024 * 1024) / max(wall, 1e-9), 2),
+        'cpu_seconds': round(cpu, 4),
+        'saved_per_cpu_s': round((len(data) - compressed_size) / max(cpu, 1e-9)),
+    }
+
+# PICKS THE BEST MEASURED LEVEL FOR A TARGET (TIES GO TO THE FASTER LEVEL)
+def select_level(results, target):
+    if target == 'fastest': return max(results, key=lambda row: (row['mb_per_s'], -row['compressed_size']))['level']
+    if target == 'smallest': return min(results, key=lambda row: (row['compressed_size'], -row['mb_per_s']))['level']
+    return max(results, key=lambda row: (row['saved_per_cpu_s'], row['mb_per_s']))['level']
+
+# MEASURES EVERY CANDIDATE LEVEL OF THE ARCHIVE FORMAT'S CODEC ON A SAMPLE OF members AND PICKS ONE FOR target
+# - RETURNS {'format', 'codec', 'target', 'level', 'sample_size', 'files', 'results': [ONE ROW PER LEVEL]}
+def calibrate(members, archive_format, target=DEFAULT_TARGET):
+    if archive_format not in _CODECS:
+        raise ValueError(f"COMPRESSION AUTO-TUNING NEEDS A COMPRESSED FORMAT, NOT {archive_format}")
+
+    codec, levels, compress = _CODECS[archive_format]
+    data, files = collect_sample(members)
+    results = [_measure(compress, data, level) for level in levels] if data else []
+    return {
+        'format': archive_format,
+        'codec': codec,
+        'target': target,
+        'level': select_level(results, target) if results else DEFAULT_LEVEL,
+        'sample_size': len(data),
+        'files': files,
+        'results': results,
+    }
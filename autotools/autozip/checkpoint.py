@@ -0,0 +1,135 @@
+import os
+import json
+import zipfile
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+# DEFAULT AMOUNT OF ARCHIVE DATA WRITTEN BETWEEN TWO CHECKPOINTS
+DEFAULT_CHECKPOINT_INTERVAL = 64 * 1024 * 1024
+
+# ZipInfo ATTRIBUTES SAVED FOR EVERY ZIP MEMBER SO THE CENTRAL DIRECTORY CAN BE REWRITTEN ON RESUME
+_ZIPINFO_FIELDS = ('compress_type', 'comment', 'create_system', 'create_version', 'extract_version', 'flag_bits', 'volume', 'internal_attr',
+                   'external_attr', 'header_offset', 'CRC', 'compress_size', 'file_size')
+
+# RETURNS THE CHECKPOINT JOURNAL PATH FOR AN ARCHIVE
+def checkpoint_path_for(archive_path):
+    return f"{archive_path}{CHECKPOINT_SUFFIX}"
+
+# SERIALISES A WRITTEN ZIP MEMBER (BYTES FIELDS AS HEX)
+def _zipinfo_to_json(zinfo):
+    fields = {name: getattr(zinfo, name) for name in _ZIPINFO_FIELDS}
+    fields['comment'] = zinfo.comment.hex()
+    return {'name': zinfo.filename, 'date_time': list(zinfo.date_time), 'extra': zinfo.extra.hex(), **fields}
+
+# REBUILDS A ZipInfo SAVED BY _zipinfo_to_json
+def _zipinfo_from_json(fields):
+    zinfo = zipfile.ZipInfo(fields['name'], tuple(fields['date_time']))
+    for name in _ZIPINFO_FIELDS: setattr(zinfo, name, fields[name])
+    zinfo.comment, zinfo.extra = bytes.fromhex(fields['comment']), bytes.fromhex(fields['extra'])
+    return zinfo
+
+# LOADS THE LAST GOOD CHECKPOINT OF AN INTERRUPTED RUN
+# - THE JOURNAL IS A HEADER LINE FOLLOWED BY ONE JSON LINE PER CHECKPOINT; A TORN LAST LINE (CRASH WHILE WRITING IT) IS IGNORED
+# - RETURNS {'offset', 'position', 'name', 'members'} (offset 0 AND position -1 WHEN NO CHECKPOINT WAS REACHED)
+def load_checkpoint(journal_path, archive_format, sources):
+    if not Path(journal_path).is_file():
+        raise FileNotFoundError(f"CHECKPOINT NOT FOUND: {journal_path}")
+
+    with open(journal_path, 'r', encoding='utf-8') as f: lines = f.read().splitlines()
+    try:
+        header = json.loads(lines[0]) if lines else None
+    except json.JSONDecodeError as e:
+        raise ValueError(f"INVALID CHECKPOINT: {journal_path}: {str(e)}")
+    if not isinstance(header, dict) or header.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"INVALID CHECKPOINT: {journal_path}")
+    if header.get('format') != archive_format or header.get('sources') != sources:
+        raise ValueError(f"CHECKPOINT DOES NOT MATCH THIS RUN (IT WAS WRITTEN FOR A {header.get('format')} ARCHIVE OF OTHER SOURCES)")
+
+    state = {'offset': 0, 'position': -1, 'name': None, 'members': []}
+    for line in lines[1:]:
+        try: checkpoint = json.loads(line)
+        except json.JSONDecodeError: break
+        state['members'].extend(checkpoint.pop('members', []))
+        state.update(checkpoint)
+    return state
+
+# RECORDS HOW FAR A .tar OR .zip ARCHIVE HAS BEEN WRITTEN, AND RESUMES AN INTERRUPTED RUN FROM THAT POINT
+# - EVERY interval BYTES, THE ARCHIVE IS SYNCED AND A LINE IS APPENDED TO <ARCHIVE>.checkpoint WITH THE END OFFSET OF THE LAST
+#   FULLY WRITTEN MEMBER, THE WALK POSITION OF ITS SOURCE ENTRY AND (ZIP) THE CENTRAL DIRECTORY RECORDS WRITTEN SINCE THE LAST LINE
+# - POSITIONS COUNT EVERY WALKED ENTRY, INCLUDING ONES THE FILTERS DROP, SO THEY DO NOT DEPEND ON WHAT WAS WRITTEN
+# - THE JOURNAL IS REMOVED ONCE THE ARCHIVE IS COMPLETE
+class Checkpointer:
+    def __init__(self, archive_path, archive_format, sources, interval=DEFAULT_CHECKPOINT_INTERVAL, resume=False):
+        self.archive_path = str(archive_path)
+        self.journal_path = checkpoint_path_for(archive_path)
+        self.header = {'version': CHECKPOINT_VERSION, 'format': archive_format, 'sources': sources}
+        self.interval = interval
+        self.state = load_checkpoint(self.journal_path, archive_format, sources) if resume else None
+        self._walked = deque()
+        self._members = []
+        self._saved = self._last = self.state['offset'] if resume else 0
+        self._position, self._name = (self.state['position'], self.state['name']) if resume else (-1, None)
+
+    # OPENS THE ARCHIVE FILE FOR WRITING: TRUNCATED TO THE LAST GOOD OFFSET WHEN RESUMING, NEW OTHERWISE
+    # - ON FAILURE, A LAST CHECKPOINT IS SAVED FOR THE MEMBERS COMPLETED SINCE THE PREVIOUS ONE; ON SUCCESS THE JOURNAL IS REMOVED
+    @contextmanager
+    def open(self):
+        if self.state is None:
+            raw = open(self.archive_path, 'wb')
+            with open(self.journal_path, 'w', encoding='utf-8') as journal: journal.write(json.dumps(self.header) + '\n')
+        else:
+            if not Path(self.archive_path).is_file(): raise FileNotFoundError(f"ARCHIVE NOT FOUND: {self.archive_path}")
+            raw = open(self.archive_path, 'r+b')
+            if raw.seek(0, os.SEEK_END) < self.state['offset']:
+                raw.close()
+                raise ValueError(f"ARCHIVE IS SHORTER THAN ITS CHECKPOINT: {self.archive_path}")
+            raw.truncate(self.state['offset'])
+            raw.seek(self.state['offset'])
+
+        with raw:
+            try:
+                yield raw
+            except BaseException:
+                if self._last > self._saved: self._save(raw)
+                raise
+        os.remove(self.journal_path)
+
+    # RETURNS THE ZIP MEMBERS WRITTEN BEFORE THE INTERRUPTION (TO PUT BACK INTO THE CENTRAL DIRECTORY)
+    def resumed_members(self):
+        return [_zipinfo_from_json(fields) for fields in self.state['members']] if self.state else []
+
+    # WRAPS THE SOURCE WALK: SKIPS THE ENTRIES A RESUMED RUN ALREADY WROTE AND REMEMBERS THE POSITION OF EVERY ENTRY HANDED OUT
+    def track(self, entries):
+        skip = self.state['position'] if self.state else -1
+        for position, (path, arcname) in enumerate(entries):
+            if position < skip: continue
+            if position == skip and arcname != self.state['name']:
+                raise ValueError(f"SOURCES CHANGED SINCE THE CHECKPOINT: EXPECTED {self.state['name']}, FOUND {arcname}")
+            if position == skip: continue
+            self._walked.append((position, arcname))
+            yield path, arcname
+
+    # MARKS THE ENTRY NAMED arcname (AND ANY FILTERED-OUT ENTRIES BEFORE IT) AS DONE, WITH THE ARCHIVE WRITTEN UP TO fp.tell()
+    # - zinfo IS THE ZIP MEMBER JUST WRITTEN (None FOR TAR)
+    def written(self, fp, arcname, zinfo=None):
+        self._position, self._name = self._walked.popleft()
+        while self._name != arcname: self._position, self._name = self._walked.popleft()
+        if zinfo is not None: self._members.append(_zipinfo_to_json(zinfo))
+        self._last = fp.tell()
+        if self._last - self._saved >= self.interval: self._save(fp)
+
+    # SYNCS THE ARCHIVE AND APPENDS A CHECKPOINT LINE FOR THE LAST COMPLETED MEMBER
+    def _save(self, fp):
+        fp.flush()
+        os.fsync(fp.fileno())
+        checkpoint = {'offset': self._last, 'position': self._position, 'name': self._name}
+        if self._members: checkpoint['members'] = self._members
+        with open(self.journal_path, 'a', encoding='utf-8') as journal:
+            journal.write(json.dumps(checkpoint, separators=(',', ':')) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._saved, self._members = self._last, []
@@ -1,7 +1,14 @@
+import json
 import click
+from itertools import chain
+from contextlib import nullcontext
 from pathlib import Path
-from .core import autozip_compress
-from ..utils.loading import LoadingAnimation
+from .calibrate import AUTO
+from .core import STDOUT, autozip_compress, autozip_extract, autozip_get, autozip_list, autozip_stat, autozip_verify
+from .filelist import iter_file_list, open_file_list
+from .gzip_index import index_path_for
+from .manifest import load_manifest, manifest_path_for
+from ..utils.loading import LoadingAnimation, _should_show_spinner
 from ..utils.updates import check_for_updates
 
 # TOOL CATEGORY (USED BY 'autotools smoke')
@@ -14,17 +21,84 @@ SMOKE_TESTS = [
 
 # CLI COMMAND TO COMPRESS FILES AND DIRECTORIES
 @click.command()
-@click.argument('sources', nargs=-1, required=True)
-@click.option('--output', '-o', 'output_path', required=True,
-              help='OUTPUT ARCHIVE PATH (EXTENSION DETERMINES FORMAT)')
+@click.argument('sources', nargs=-1)
+@click.option('--output', '-o', 'output_paths', multiple=True,
+              help="OUTPUT ARCHIVE PATH (EXTENSION DETERMINES FORMAT, '-' STREAMS A TAR FORMAT TO STDOUT), OR DESTINATION DIRECTORY WITH --extract. "
+                   "REPEAT TO WRITE SEVERAL ARCHIVES FROM ONE READ OF THE SOURCES")
 @click.option('--format', '-f', 'archive_format',
               type=click.Choice(['zip', 'tar.gz', 'tar.bz2', 'tar.xz', 'tar'], case_sensitive=False),
               help='ARCHIVE FORMAT (AUTO-DETECTED FROM OUTPUT EXTENSION IF NOT SPECIFIED)')
-@click.option('--compression', '-c', 'compression_level', type=int, default=6,
-              help='COMPRESSION LEVEL (0-9, DEFAULT: 6)')
-def autozip(sources, output_path, archive_format, compression_level):
+@click.option('--compression', '-c', 'compression_level', default='6', metavar='LEVEL|auto[:TARGET]',
+              help='COMPRESSION LEVEL (0-9, DEFAULT: 6), OR auto[:fastest|smallest|balanced] TO CALIBRATE ON A SAMPLE OF THE INPUT')
+@click.option('--jobs', '-j', 'jobs', type=int, default=1,
+              help='WORKER THREADS FOR COMPRESSION AND ZIP EXTRACTION (0 = ALL CPU CORES, DEFAULT: 1)')
+@click.option('--block-size', 'block_size', metavar='SIZE',
+              help='UNCOMPRESSED BLOCK SIZE FOR PARALLEL TAR.GZ/TAR.XZ (E.G. 128K, 24M)')
+@click.option('--memory-limit', 'memory_limit', metavar='SIZE',
+              help='MEMORY CAP FOR PARALLEL COMPRESSION WORKERS (E.G. 2G)')
+@click.option('--manifest', 'write_manifest', is_flag=True,
+              help='WRITE A SIDECAR MANIFEST (<ARCHIVE>.manifest.json) USABLE AS --incremental BASE')
+@click.option('--incremental', 'incremental', metavar='BASE_MANIFEST', type=click.Path(dir_okay=False),
+              help='ONLY ARCHIVE FILES NEW OR CHANGED SINCE BASE_MANIFEST (IMPLIES --manifest)')
+@click.option('--deflate-all', 'deflate_all', is_flag=True,
+              help='DEFLATE EVERY ZIP MEMBER (BY DEFAULT, ALREADY-COMPRESSED FILES ARE STORED AS-IS)')
+@click.option('--dedup', 'dedup', is_flag=True,
+              help='STORE IDENTICAL FILES ONCE (TAR HARDLINKS, OR A DEDUP MANIFEST IN ZIP)')
+@click.option('--files-from', '-T', 'files_from', metavar='FILE|-',
+              help="READ MORE SOURCE PATHS FROM FILE ('-' = STDIN), NUL- OR NEWLINE-SEPARATED")
+@click.option('--exclude', 'excludes', metavar='PATTERN', multiple=True,
+              help='SKIP FILES AND DIRECTORIES MATCHING A GITIGNORE-STYLE GLOB (REPEATABLE)')
+@click.option('--gitignore', 'gitignore', is_flag=True,
+              help='HONOUR .gitignore FILES IN SOURCE DIRECTORIES (AND SKIP .git)')
+@click.option('--checksums', 'checksums', metavar='FILE',
+              help='ALSO WRITE A SHA256SUMS-STYLE LIST OF THE SOURCE FILES, HASHED DURING THE SAME READ')
+@click.option('--shards', 'shards', type=int, metavar='N',
+              help='SPLIT THE ARCHIVE INTO N INDEPENDENT SHARDS OF ABOUT EQUAL SIZE, WRITTEN IN PARALLEL, PLUS A <OUTPUT>.shards.json INDEX')
+@click.option('--shard-size', 'shard_size', metavar='SIZE',
+              help='START A NEW SHARD EVERY SIZE BYTES OF INPUT (E.G. 1G) INSTEAD OF A FIXED --shards COUNT')
+@click.option('--prefetch', 'prefetch_depth', type=int, default=0, metavar='N',
+              help='READ UP TO N SMALL FILES AHEAD OF THE WRITER IN READER THREADS (FOR NETWORK FILESYSTEMS AND COLD CACHES, DEFAULT: 0 = OFF)')
+@click.option('--prefetch-memory', 'prefetch_memory', metavar='SIZE',
+              help='MEMORY CAP FOR FILES READ AHEAD BY --prefetch (DEFAULT: 64M)')
+@click.option('--checkpoint', 'checkpoint', is_flag=True,
+              help='RECORD PROGRESS IN <ARCHIVE>.checkpoint SO AN INTERRUPTED .tar OR .zip RUN CAN BE RESUMED')
+@click.option('--checkpoint-interval', 'checkpoint_interval', metavar='SIZE',
+              help='ARCHIVE DATA WRITTEN BETWEEN TWO CHECKPOINTS (DEFAULT: 64M)')
+@click.option('--resume', 'resume', is_flag=True,
+              help='CONTINUE AN INTERRUPTED --checkpoint RUN FROM ITS LAST CHECKPOINT (SAME SOURCES AND OUTPUT)')
+@click.option('--append', 'append', is_flag=True,
+              help='ADD SOURCES MISSING FROM AN EXISTING .tar OR .zip WITHOUT REWRITING IT')
+@click.option('--update', 'update', is_flag=True,
+              help='LIKE --append, AND ALSO REPLACE MEMBERS WHOSE SOURCE CHANGED (SIZE/MTIME, CONFIRMED BY CONTENT)')
+@click.option('--progress', 'progress', type=click.Choice(['auto', 'text', 'json', 'none']), default='auto', show_default=True,
+              help='LIVE PROGRESS WHILE COMPRESSING: A STATUS LINE (text), JSON LINES ON STDERR (json); auto SHOWS text ON A TERMINAL')
+@click.option('--index', 'build_index', is_flag=True,
+              help='WRITE A SEEKABLE INDEX (<ARCHIVE>.index.json) NEXT TO A TAR.GZ ARCHIVE FOR --get')
+@click.option('--index-interval', 'index_interval', metavar='SIZE',
+              help='UNCOMPRESSED DISTANCE BETWEEN INDEX ACCESS POINTS (DEFAULT: 4M)')
+@click.option('--extract', '-x', 'extract', is_flag=True,
+              help='EXTRACT THE ARCHIVE GIVEN AS SOURCE INTO --output (DEFAULT: CURRENT DIRECTORY)')
+@click.option('--get', 'get_member', metavar='MEMBER',
+              help="EXTRACT ONE MEMBER OF AN INDEXED TAR.GZ TO --output (DEFAULT: '-' = STDOUT)")
+@click.option('--list', 'list_entries', is_flag=True,
+              help='LIST THE ENTRIES OF THE GIVEN ARCHIVE FROM ITS METADATA (ZIP CENTRAL DIRECTORY OR TAR HEADERS)')
+@click.option('--stat', 'show_stat', is_flag=True,
+              help='SUMMARISE THE GIVEN ARCHIVE: ENTRY COUNTS, TOTAL SIZE, COMPRESSION RATIO AND LARGEST MEMBERS')
+@click.option('--verify', 'verify', is_flag=True,
+              help='CHECK EVERY MEMBER OF THE GIVEN ARCHIVE (ZIP CRC-32, TAR HEADERS AND CODEC CHECKSUMS) AND REPORT ANY CORRUPTION')
+@click.option('--verify-manifest', 'verify_manifest', metavar='MANIFEST', type=click.Path(dir_okay=False),
+              help='WITH --verify, ALSO COMPARE MEMBERS WITH THE SOURCE SHA-256 HASHES OF A MANIFEST (DEFAULT: <ARCHIVE>.manifest.json IF PRESENT)')
+@click.option('--json', 'as_json', is_flag=True,
+              help='PRINT --list/--stat OUTPUT AS JSON INSTEAD OF A TABLE (--verify: ONE JSON LINE PER MEMBER)')
+@click.option('--unsafe-paths', 'unsafe_paths', is_flag=True,
+              help='DISABLE PATH-TRAVERSAL CHECKS WHEN EXTRACTING (ABSOLUTE PATHS, .., OUTSIDE LINKS)')
+def autozip(sources, output_paths, archive_format, compression_level, jobs=1, block_size=None, memory_limit=None,
+            write_manifest=False, incremental=None, deflate_all=False, dedup=False, files_from=None, excludes=(), gitignore=False,
+            checksums=None, shards=None, shard_size=None, prefetch_depth=0, prefetch_memory=None, checkpoint=False, checkpoint_interval=None,
+            resume=False, append=False, update=False, progress='auto', build_index=False, index_interval=None, extract=False, get_member=None, list_entries=False,
+            show_stat=False, verify=False, verify_manifest=None, as_json=False, unsafe_paths=False):
     """
-        COMPRESSES FILES AND DIRECTORIES INTO VARIOUS ARCHIVE FORMATS.
+        COMPRESSES FILES AND DIRECTORIES INTO VARIOUS ARCHIVE FORMATS, OR EXTRACTS THEM.
 
         \b
         SUPPORTED FORMATS:
@@ -38,44 +112,94 @@ def autozip(sources, output_path, archive_format, compression_level):
         EXAMPLES:
             autozip file.txt dir/ -o archive.zip
             autozip file1.txt file2.txt -o backup.tar.gz --compression 9
+            autozip logs/ -o logs.tar.xz --compression auto:balanced
             autozip project/ -o release.tar.bz2 --format tar.bz2
             autozip data/ -o archive.tar.xz --compression 7
+            autozip backups/ -o nightly.zip --jobs 0
+            autozip photos/ -o photos.zip --deflate-all
+            autozip data/ -o archive.tar.xz -c 9 -j 0 --memory-limit 4G
+            autozip vendor/ -o vendor.tar.gz --dedup
+            autozip data/ -o full.tar.gz --manifest
+            autozip data/ -o hourly.tar.gz --incremental full.tar.gz.manifest.json
+            autozip data/ -o - -f tar.gz -j 0 | ssh backup 'cat > data.tar.gz'
+            find . -name '*.log' -print0 | autozip --files-from - -o logs.tar.xz
+            autozip project/ -o src.tar.gz --gitignore --exclude '*.map' -j 0
+            autozip dist/ -o app.zip -o app.tar.gz -o app.tar.xz --checksums SHA256SUMS
+            autozip dataset/ -o dataset.tar.gz --shards 16 -j 0
+            autozip dataset.tar.gz.shards.json -x -o restore/ -j 0
+            autozip /mnt/nfs/photos/ -o photos.tar --prefetch 64 --prefetch-memory 256M
+            autozip media/ -o media.tar --checkpoint
+            autozip media/ -o media.tar --resume
+            autozip logs/ -o logs.zip --update
+            autozip dataset/ -o dataset.tar.xz -j 0 --progress json 2> progress.jsonl
+            autozip backup.zip --extract -o restore/ -j 0
+            autozip release.tar.gz -x -o release/
+            autozip data/ -o backup.tar.gz --index -j 0
+            autozip backup.tar.gz --get data/config.yml -o config.yml
+            autozip backup.zip --list
+            autozip backup.tar --stat --json
+            autozip backup.zip --verify -j 0
+            autozip backup.tar --verify --verify-manifest backup.tar.manifest.json
     """
 
     # VALIDATE SOURCE PATHS
-    if not sources:
+    if not sources and files_from is None:
         click.echo(click.style("ERROR: AT LEAST ONE SOURCE PATH IS REQUIRED", fg='red'), err=True)
-        click.echo(click.get_current_context().get_help())
+        ctx = click.get_current_context()
+        click.echo(ctx.get_help())
+        ctx.exit(2)
         return
 
-    # VALIDATE COMPRESSION LEVEL
-    if compression_level < 0 or compression_level > 9:
-        click.echo(click.style("ERROR: COMPRESSION LEVEL MUST BE BETWEEN 0 AND 9", fg='red'), err=True)
+    # VALIDATE COMPRESSION LEVEL (auto[:TARGET] IS CHECKED AND RESOLVED BY THE CALIBRATION RUN)
+    compression_level = str(compression_level).strip().lower()
+    if not compression_level.startswith(AUTO):
+        if not compression_level.isdigit() or int(compression_level) > 9:
+            click.echo(click.style("ERROR: COMPRESSION LEVEL MUST BE BETWEEN 0 AND 9 (OR auto[:TARGET])", fg='red'), err=True)
+            raise click.Abort()
+        compression_level = int(compression_level)
+
+    # VALIDATE WORKER COUNT
+    if jobs < 0:
+        click.echo(click.style("ERROR: JOBS MUST BE 0 (ALL CORES) OR GREATER", fg='red'), err=True)
+        raise click.Abort()
+
+    # VALIDATE MODE-SPECIFIC ARGUMENTS
+    modes = [name for name, enabled in (('--extract', extract), ('--get', get_member is not None), ('--list', list_entries),
+                                        ('--stat', show_stat), ('--verify', verify)) if enabled]
+    mode = modes[0] if modes else None
+    if len(modes) > 1:
+        click.echo(click.style(f"ERROR: {' AND '.join(modes)} CANNOT BE COMBINED", fg='red'), err=True)
+        raise click.Abort()
+    if mode and (len(sources) != 1 or files_from is not None):
+        click.echo(click.style(f"ERROR: {mode} EXPECTS EXACTLY ONE ARCHIVE", fg='red'), err=True)
+        raise click.Abort()
+    if mode and (len(output_paths) > 1 or checksums is not None):
+        click.echo(click.style(f"ERROR: {mode} ACCEPTS ONE --output AND NO --checksums", fg='red'), err=True)
+        raise click.Abort()
+    output_path = output_paths[0] if len(output_paths) == 1 else list(output_paths) or None
+    if not mode and not output_path:
+        click.echo(click.style("ERROR: --output IS REQUIRED TO CREATE AN ARCHIVE", fg='red'), err=True)
         raise click.Abort()
 
-    # COMPRESS FILES AND DIRECTORIES
+    # COMPRESS, EXTRACT, GET ONE MEMBER OR INSPECT (WHEN STREAMING TO STDOUT, MESSAGES GO TO STDERR)
+    if get_member is not None: output_path = output_path or STDOUT
+    streaming = as_json or (mode in (None, '--get') and output_path == STDOUT)
     try:
-        with LoadingAnimation():
-            result = autozip_compress(
-                list(sources),
-                output_path,
-                archive_format=archive_format,
-                compression_level=compression_level
-            )
-        
-        click.echo(click.style(f"SUCCESS: CREATED ARCHIVE: {result}", fg='green'))
-        
-        archive_size = Path(result).stat().st_size
-        size_mb = archive_size / (1024 * 1024)
-
-        if size_mb >= 1:
-            click.echo(f"ARCHIVE SIZE: {size_mb:.2f} MB")
-        else:
-            size_kb = archive_size / 1024
-            click.echo(f"ARCHIVE SIZE: {size_kb:.2f} KB")
+        if extract: _run_extract(sources[0], output_path or '.', archive_format, jobs, not unsafe_paths)
+        elif get_member is not None: _run_get(sources[0], get_member, output_path)
+        elif list_entries: _run_list(sources[0], archive_format, as_json)
+        elif show_stat: _run_stat(sources[0], archive_format, as_json)
+        elif verify: _run_verify(sources[0], archive_format, verify_manifest, jobs, as_json)
+        else: _run_compress(sources, files_from, output_path, archive_format=archive_format, compression_level=compression_level, jobs=jobs,
+                            block_size=block_size, memory_limit=memory_limit, manifest=write_manifest, incremental=incremental,
+                            adaptive=not deflate_all, dedup=dedup, index=build_index, index_interval=index_interval,
+                            excludes=list(excludes), gitignore=gitignore, checksums=checksums, shards=shards, shard_size=shard_size,
+                            prefetch_depth=prefetch_depth, prefetch_memory=prefetch_memory, checkpoint=checkpoint,
+                            checkpoint_interval=checkpoint_interval, resume=resume, append=append, update=update,
+                            progress=_progress_callback(progress))
         
         update_msg = check_for_updates()
-        if update_msg: click.echo(update_msg)
+        if update_msg: click.echo(update_msg, err=streaming)
 
     except FileNotFoundError as e:
         click.echo(click.style(f"ERROR: {str(e)}", fg='red'), err=True)
@@ -86,3 +210,156 @@ def autozip(sources, output_path, archive_format, compression_level):
     except Exception as e:
         click.echo(click.style(f"UNEXPECTED ERROR: {str(e)}", fg='red'), err=True)
         raise click.Abort()
+
+# FORMATS A BYTE COUNT IN MB (WHEN >= 1 MB) OR KB
+def _format_size(size):
+    size_mb = size / (1024 * 1024)
+    if size_mb >= 1: return f"{size_mb:.2f} MB"
+    return f"{size / 1024:.2f} KB"
+
+# FORMATS A RATE (MB/S OR FILES/S), OR '-' WHEN IT IS NOT KNOWN YET
+def _format_rate(rate, digits=1):
+    return '-' if rate is None else f"{rate:.{digits}f}"
+
+# REWRITES THE --progress text STATUS LINE ON STDERR, ENDING IT AT THE FINAL SNAPSHOT
+def _echo_progress(snapshot):
+    percent = '-' if snapshot['percent'] is None else f"{snapshot['percent']:.1f}%"
+    eta = '-' if snapshot['eta'] is None else f"{int(snapshot['eta']) // 60}:{int(snapshot['eta']) % 60:02d}"
+    total = '?' if snapshot['total_files'] is None else snapshot['total_files']
+    ratio = _format_ratio(snapshot['ratio'])
+    line = (f"{percent} {snapshot['files']}/{total} FILES, IN: {_format_size(snapshot['bytes_in'])}, OUT: {_format_size(snapshot['bytes_out'])} "
+            f"({ratio}), {_format_rate(snapshot['files_per_s'], 0)} FILES/S, READ/COMPRESS/WRITE: {_format_rate(snapshot['read_mb_s'])}/"
+            f"{_format_rate(snapshot['compress_mb_s'])}/{_format_rate(snapshot['write_mb_s'])} MB/S, ETA: {eta}")
+    click.echo(f"\r{line}\x1b[K", nl=snapshot['done'], err=True)
+
+# RETURNS THE autozip_compress PROGRESS CALLBACK OF A --progress MODE (None: NO TELEMETRY)
+# - auto: THE STATUS LINE WHEN STDERR IS AN INTERACTIVE TERMINAL (LIKE THE SPINNER), NOTHING OTHERWISE
+# - json: ONE JSON OBJECT PER SNAPSHOT ON STDERR, SO A SCHEDULER CAN SPOT STALLED OR SLOW JOBS
+def _progress_callback(mode):
+    if mode == 'auto': mode = 'text' if _should_show_spinner() else 'none'
+    if mode == 'json': return lambda snapshot: click.echo(json.dumps(snapshot), err=True)
+    return _echo_progress if mode == 'text' else None
+
+# COMPRESSES SOURCES (PLUS AN OPTIONAL --files-from LIST) AND DISPLAYS THE RESULT
+# - WHEN STREAMING TO STDOUT THE SPINNER IS DISABLED AND THE SUMMARY IS WRITTEN TO STDERR
+# - LIVE PROGRESS (--progress) REPLACES THE SPINNER
+def _run_compress(sources, files_from, output_path, **options):
+    streaming = output_path == STDOUT
+    report = {}
+    with open_file_list(files_from) if files_from is not None else nullcontext() as file_list:
+        source_paths = list(sources) if file_list is None else chain(sources, iter_file_list(file_list))
+        with nullcontext() if streaming or options.get('progress') is not None else LoadingAnimation():
+            result = autozip_compress(source_paths, output_path, report=report, **options)
+
+    if 'calibration' in report: _echo_calibration(report['calibration'], streaming)
+    if 'resumed' in report: click.echo(f"RESUMED FROM: {_format_size(report['resumed'])}")
+    if streaming: click.echo(click.style("SUCCESS: STREAMED ARCHIVE TO STDOUT", fg='green'), err=True)
+    elif 'added' in report:
+        click.echo(click.style(f"SUCCESS: UPDATED ARCHIVE: {result}", fg='green'))
+        click.echo(f"ADDED: {report['added']}, REPLACED: {report['replaced']}, UNCHANGED: {report['unchanged']}")
+        click.echo(f"ARCHIVE SIZE: {_format_size(Path(result).stat().st_size)}")
+    elif 'shards' in report:
+        click.echo(click.style(f"SUCCESS: CREATED {len(report['shards'])} SHARDS: {result}", fg='green'))
+        click.echo(f"ARCHIVE SIZE: {_format_size(sum(Path(shard).stat().st_size for shard in report['shards']))}")
+    else:
+        for archive in result if isinstance(result, list) else [result]:
+            click.echo(click.style(f"SUCCESS: CREATED ARCHIVE: {archive}", fg='green'))
+            click.echo(f"ARCHIVE SIZE: {_format_size(Path(archive).stat().st_size)}")
+    if options.get('checksums') is not None: click.echo(f"CHECKSUMS: {options['checksums']} ({report['checksums']} FILES)")
+    if options.get('dedup'):
+        click.echo(f"DEDUPLICATED: {report['duplicates']} FILES (SAVED: {_format_size(report['bytes_saved'])})", err=streaming)
+    if options.get('manifest') or options.get('incremental'): _echo_manifest_summary(result)
+    if options.get('index'): click.echo(f"INDEX: {index_path_for(result)}")
+
+# FORMATS A COMPRESSION RATIO AS A PERCENTAGE ('-' WHEN UNKNOWN)
+def _format_ratio(ratio):
+    return '-' if ratio is None else f"{ratio * 100:.1f}%"
+
+# PRINTS ROWS AS AN ALIGNED TABLE (FIRST ROW IS THE HEADER; THE LAST COLUMN IS LEFT UNPADDED)
+def _echo_table(rows, err=False):
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+    for row in rows: click.echo('  '.join([cell.rjust(width) for cell, width in zip(row, widths)] + [row[-1]]).rstrip(), err=err)
+
+# PRINTS THE --compression auto MEASUREMENTS AND THE SELECTED LEVEL
+def _echo_calibration(calibration, err=False):
+    click.echo(f"CALIBRATION: {calibration['codec'].upper()} ON {_format_size(calibration['sample_size'])} SAMPLED FROM "
+               f"{calibration['files']} FILES (TARGET: {calibration['target'].upper()})", err=err)
+    if calibration['results']:
+        rows = [('LEVEL', 'RATIO', 'MB/S', 'CPU S', 'SAVED/CPU-S', '')]
+        for row in calibration['results']:
+            rows.append((str(row['level']), _format_ratio(row['ratio']), f"{row['mb_per_s']:.2f}", f"{row['cpu_seconds']:.3f}",
+                         _format_size(row['saved_per_cpu_s']), '<- SELECTED' if row['level'] == calibration['level'] else ''))
+        _echo_table(rows, err)
+    click.echo(f"SELECTED COMPRESSION LEVEL: {calibration['level']}", err=err)
+
+# RETURNS TABLE ROWS FOR ARCHIVE ENTRIES
+def _entry_rows(entries):
+    rows = [('SIZE', 'COMPRESSED', 'RATIO', 'MODIFIED', 'NAME')]
+    for entry in entries:
+        compressed = '-' if entry['compressed_size'] is None else str(entry['compressed_size'])
+        name = entry['name'] + ('/' if entry['type'] == 'dir' and not entry['name'].endswith('/') else '')
+        rows.append((str(entry['size']), compressed, _format_ratio(entry['ratio']), entry['mtime'] or '-', name))
+    return rows
+
+# LISTS ARCHIVE ENTRIES AS A TABLE OR JSON
+def _run_list(archive_path, archive_format, as_json):
+    entries = autozip_list(archive_path, archive_format=archive_format)
+    if as_json: click.echo(json.dumps(entries, indent=2))
+    else: _echo_table(_entry_rows(entries))
+
+# DISPLAYS ARCHIVE STATISTICS AS A SUMMARY PLUS A TABLE OF THE LARGEST MEMBERS, OR JSON
+def _run_stat(archive_path, archive_format, as_json):
+    stats = autozip_stat(archive_path, archive_format=archive_format)
+    if as_json:
+        click.echo(json.dumps(stats, indent=2))
+        return
+
+    click.echo(f"ARCHIVE: {stats['archive']} ({stats['format'].upper()}, {_format_size(stats['archive_size'])})")
+    click.echo(f"ENTRIES: {stats['entries']} (FILES: {stats['files']}, DIRECTORIES: {stats['directories']}, LINKS: {stats['links']})")
+    click.echo(f"TOTAL SIZE: {_format_size(stats['total_size'])}")
+    click.echo(f"COMPRESSED SIZE: {_format_size(stats['compressed_size'])} (RATIO: {_format_ratio(stats['ratio'])})")
+    if stats['largest']:
+        click.echo("LARGEST MEMBERS:")
+        _echo_table(_entry_rows(stats['largest']))
+
+# VERIFIES AN ARCHIVE, PRINTING EACH DAMAGED MEMBER AS SOON AS IT IS FOUND (OR EVERY RESULT AS A JSON LINE), THEN A SUMMARY
+# - RAISES (NON-ZERO EXIT) WHEN ANY MEMBER IS CORRUPT, DIFFERS FROM THE MANIFEST OR IS MISSING
+def _run_verify(archive_path, archive_format, manifest, jobs, as_json):
+    checked, failed, size = 0, 0, 0
+    for result in autozip_verify(archive_path, archive_format=archive_format, manifest=manifest, jobs=jobs):
+        checked += 1
+        size += result['size'] or 0
+        if as_json: click.echo(json.dumps(result))
+        if result['status'] == 'ok': continue
+
+        failed += 1
+        if not as_json:
+            name = f"{result['name']}: " if result['name'] is not None else ''
+            click.echo(click.style(f"{result['status'].upper()}: {name}{result['error']}", fg='red'))
+
+    if failed: raise ValueError(f"VERIFICATION FAILED: {failed} OF {checked} MEMBERS")
+    if not as_json: click.echo(click.style(f"SUCCESS: VERIFIED {checked} MEMBERS ({_format_size(size)}): {archive_path}", fg='green'))
+
+# EXTRACTS AN ARCHIVE AND DISPLAYS WHAT WAS WRITTEN
+def _run_extract(archive_path, destination, archive_format, jobs, safe):
+    with LoadingAnimation():
+        stats = autozip_extract(archive_path, destination, archive_format=archive_format, jobs=jobs, safe=safe)
+
+    click.echo(click.style(f"SUCCESS: EXTRACTED ARCHIVE: {archive_path} -> {destination}", fg='green'))
+    click.echo(f"FILES: {stats['files']}, DIRECTORIES: {stats['directories']}, LINKS: {stats['links']}")
+    click.echo(f"EXTRACTED SIZE: {_format_size(stats['bytes'])}")
+
+# WRITES ONE MEMBER OF AN INDEXED ARCHIVE AND DISPLAYS ITS SIZE
+def _run_get(archive_path, member, output_path):
+    streaming = output_path == STDOUT
+    size = autozip_get(archive_path, member, output_path)
+    click.echo(click.style(f"SUCCESS: EXTRACTED MEMBER: {member} -> {'STDOUT' if streaming else output_path}", fg='green'), err=streaming)
+    click.echo(f"MEMBER SIZE: {_format_size(size)}", err=streaming)
+
+# DISPLAYS THE MANIFEST PATH AND WHAT THE ARCHIVE CONTAINS COMPARED TO ITS BASE
+def _echo_manifest_summary(archive_path):
+    manifest_path = manifest_path_for(archive_path)
+    manifest = load_manifest(manifest_path)
+    click.echo(f"MANIFEST: {manifest_path}")
+    click.echo(f"FILES: {len(manifest['files'])} (ADDED: {len(manifest['added'])}, "
+               f"CHANGED: {len(manifest['changed'])}, DELETED: {len(manifest['deleted'])})")
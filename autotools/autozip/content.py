@@ -0,0 +1,62 @@
+import math
+from collections import Counter
+from pathlib import PurePosixPath
+
+# BYTES READ FROM THE START OF A FILE TO DECIDE HOW TO STORE IT
+SAMPLE_SIZE = 64 * 1024
+
+# SAMPLES SMALLER THAN THIS ARE TOO SHORT FOR A MEANINGFUL ENTROPY ESTIMATE
+_MIN_ENTROPY_SAMPLE = 4 * 1024
+
+# ORDER-0 ENTROPY (BITS PER BYTE) ABOVE WHICH DEFLATE CANNOT SAVE ENOUGH TO PAY FOR ITSELF
+ENTROPY_THRESHOLD = 7.5
+
+# EXTENSIONS OF FORMATS THAT ARE ALREADY COMPRESSED (IMAGES, AUDIO, VIDEO, ARCHIVES, PACKAGES, OFFICE DOCUMENTS, FONTS)
+COMPRESSED_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif', '.avif', '.jxl',
+    '.mp3', '.aac', '.m4a', '.ogg', '.opus', '.flac',
+    '.mp4', '.m4v', '.mkv', '.webm', '.mov', '.avi', '.wmv', '.flv',
+    '.zip', '.gz', '.tgz', '.bz2', '.tbz2', '.xz', '.txz', '.lz', '.lz4', '.lzma', '.zst', '.7z', '.rar', '.cab',
+    '.jar', '.war', '.apk', '.ipa', '.whl', '.egg', '.deb', '.rpm', '.nupkg',
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub',
+    '.woff', '.woff2',
+})
+
+# SIGNATURES (OFFSET, PREFIX) OF COMPRESSED PAYLOADS, FOR FILES WITH MISSING OR MISLEADING EXTENSIONS
+COMPRESSED_SIGNATURES = (
+    (0, b'\xff\xd8\xff'),                # JPEG
+    (0, b'\x89PNG\r\n\x1a\n'),           # PNG
+    (0, b'GIF87a'), (0, b'GIF89a'),      # GIF
+    (0, b'PK\x03\x04'),                  # ZIP AND ZIP-BASED PACKAGES
+    (0, b'\x1f\x8b'),                    # GZIP
+    (0, b'BZh'),                         # BZIP2
+    (0, b'\xfd7zXZ\x00'),                # XZ
+    (0, b'\x28\xb5\x2f\xfd'),            # ZSTANDARD
+    (0, b'\x04\x22\x4d\x18'),            # LZ4
+    (0, b"7z\xbc\xaf'\x1c"),             # 7-ZIP
+    (0, b'Rar!\x1a\x07'),                # RAR
+    (0, b'\x1a\x45\xdf\xa3'),            # MATROSKA / WEBM
+    (0, b'OggS'),                        # OGG
+    (0, b'fLaC'),                        # FLAC
+    (0, b'ID3'),                         # MP3 WITH ID3 TAG
+    (4, b'ftyp'),                        # MP4 / MOV / HEIC
+    (8, b'WEBP'),                        # WEBP (RIFF CONTAINER)
+    (0, b'wOFF'), (0, b'wOF2'),          # WEB FONTS
+)
+
+# RETURNS THE ORDER-0 SHANNON ENTROPY OF A BYTE SAMPLE IN BITS PER BYTE (0.0 TO 8.0)
+def sample_entropy(sample):
+    if not sample: return 0.0
+    total = len(sample)
+    return -sum(count / total * math.log2(count / total) for count in Counter(sample).values())
+
+# CHECKS WHETHER A SAMPLE STARTS WITH THE SIGNATURE OF A COMPRESSED FORMAT
+def has_compressed_signature(sample):
+    return any(sample[offset:offset + len(prefix)] == prefix for offset, prefix in COMPRESSED_SIGNATURES)
+
+# DECIDES WHETHER A FILE SHOULD BE STORED RATHER THAN DEFLATED, FROM ITS NAME AND THE START OF ITS CONTENT
+# - CHEAPEST CHECKS FIRST: EXTENSION, THEN MAGIC BYTES, THEN ENTROPY OF THE SAMPLE
+def is_incompressible(name, sample):
+    if PurePosixPath(name).suffix.lower() in COMPRESSED_EXTENSIONS: return True
+    if has_compressed_signature(sample): return True
+    return len(sample) >= _MIN_ENTROPY_SAMPLE and sample_entropy(sample) >= ENTROPY_THRESHOLD
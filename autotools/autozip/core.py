@@ -1,71 +1,372 @@
+import io
 import os
+import re
+import sys
+import bz2
+import gzip
+import zlib
+import shutil
 import zipfile
 import tarfile
+import tempfile
 import lzma
+import stat
+import time
+import hashlib
+from collections import deque
+from itertools import chain
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from .parallel_gzip import ParallelGzipWriter
+from .parallel_xz import ParallelXzWriter
+from .calibrate import calibrate, parse_auto
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL, Checkpointer
+from .content import SAMPLE_SIZE, is_incompressible
+from .dedup import DEDUP_MANIFEST_NAME, count_duplicates, dedup_manifest_bytes, find_duplicates
+from .extract import extract_tar, extract_zip, restore_directories
+from .fanout import fan_out
+from .gzip_index import DEFAULT_INDEX_INTERVAL, IndexingTarFile, read_member, write_index
+from .listing import archive_stat, list_tar, list_zip
+from .manifest import build_manifest, load_manifest, manifest_path_for, write_manifest
+from .prefetch import DEFAULT_PREFETCH_MEMORY, prefetch
+from .progress import ProgressTracker, scan_totals
+from .shards import ShardWalker, is_shard_index, load_shard_index, partition, shard_index_path_for, shard_path_for, \
+    shard_paths, write_shard_index
+from .update import scan_tar_members, tar_member_changed, zip_member_changed
+from .verify import manifest_hashes, verify_compressed_tar, verify_tar, verify_zip
+from .walker import SourceWalker
+from .zerocopy_tar import ZeroCopyTarFile
+
+# READ CHUNK SIZE FOR STREAMING FILE CONTENT INTO COMPRESSORS
+_CHUNK_SIZE = 1024 * 1024
+
+# COMPRESSED MEMBERS LARGER THAN THIS ARE SPOOLED TO DISK INSTEAD OF MEMORY
+_ZIP_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# OUTPUT PATH MEANING STANDARD OUTPUT (TAR FORMATS ONLY)
+STDOUT = '-'
+
+# BINARY MULTIPLIERS FOR HUMAN-READABLE SIZES (8M, 512KiB, 1G)
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+# PARSES A HUMAN-READABLE SIZE INTO BYTES (NONE STAYS NONE)
+def parse_size(value):
+    if value is None or isinstance(value, int): return value
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*', str(value), re.IGNORECASE)
+    if not match: raise ValueError(f"INVALID SIZE: {value} (EXAMPLES: 65536, 512K, 16M, 1G)")
+
+    size = int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+    if size <= 0: raise ValueError(f"SIZE MUST BE GREATER THAN 0: {value}")
+    return size
+
+# RESOLVES WORKER COUNT (0 OR LESS MEANS ALL CPU CORES)
+def _resolve_jobs(jobs):
+    if jobs > 0: return jobs
+    return os.cpu_count() or 1
+
+# YIELDS (FILE PATH, ARCHIVE NAME) PAIRS FOR EVERY FILE UNDER THE SOURCE PATHS
+# - 'zip' LAYOUT: DIRECTORY CONTENTS ARE STORED RELATIVE TO THE DIRECTORY
+# - 'tar' LAYOUT: DIRECTORY CONTENTS ARE STORED UNDER THE DIRECTORY NAME (LIKE tarfile.add)
+# - FILE PATHS ARE os.DirEntry OR Path OBJECTS, SO .stat() REUSES THE RESULT CACHED DURING THE WALK
+def _iter_source_files(source_paths, layout='zip', walker=None):
+    return (walker or SourceWalker()).files(source_paths, layout)
+
+# PICKS ZIP_STORED FOR ALREADY-COMPRESSED CONTENT AND ZIP_DEFLATED OTHERWISE (adaptive=False ALWAYS DEFLATES)
+def _zip_compress_type(arcname, sample, adaptive):
+    if adaptive and is_incompressible(arcname, sample): return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+# BUILDS A ZipInfo LIKE zipfile.ZipInfo.from_file, BUT FROM THE STAT CACHED BY THE WALKER INSTEAD OF A NEW os.stat
+# - SYMLINKS ARE FOLLOWED LIKE from_file: FOR ANY OTHER DirEntry THE STAT IS THE lstat TAKEN DURING THE WALK
+def _zip_info(path, arcname):
+    st = path.stat()
+    zinfo = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    return zinfo
+
+# WRITES ONE FILE TO AN OPEN ZIP (SERIAL WRITER), OPENING AND READING IT ONCE
+# - THE HEAD READ TO PICK THE COMPRESSION METHOD BECOMES THE START OF THE MEMBER, THEN THE REST IS STREAMED AFTER IT
+def _write_zip_source(zipf, file_path, arcname, adaptive=True):
+    zinfo = _zip_info(file_path, arcname)
+    zinfo._compresslevel = zipf.compresslevel
+    with open(file_path, 'rb') as src:
+        head = src.read(SAMPLE_SIZE) if adaptive else b''
+        zinfo.compress_type = _zip_compress_type(arcname, head, adaptive)
+        with zipf.open(zinfo, 'w') as member:
+            member.write(head)
+            shutil.copyfileobj(src, member, _CHUNK_SIZE)
+
+# READS AND COMPRESSES ONE ZIP MEMBER INTO A SPOOLED BUFFER (RUNS IN WORKER THREADS)
+# - THE FIRST CHUNK DOUBLES AS THE SAMPLE FOR THE STORE-VS-DEFLATE DECISION, SO NOTHING IS READ TWICE
+def _compress_zip_member(file_path, arcname, compression_level, adaptive=True):
+    zinfo = _zip_info(file_path, arcname)
+    spool = tempfile.SpooledTemporaryFile(max_size=_ZIP_SPOOL_MAX_SIZE)
+    compressor, crc, file_size = None, 0, 0
+
+    with open(file_path, 'rb') as f:
+        chunk = f.read(_CHUNK_SIZE)
+        zinfo.compress_type = _zip_compress_type(arcname, chunk[:SAMPLE_SIZE], adaptive)
+        if zinfo.compress_type == zipfile.ZIP_DEFLATED: compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15)
+
+        while chunk:
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            spool.write(chunk if compressor is None else compressor.compress(chunk))
+            chunk = f.read(_CHUNK_SIZE)
+    if compressor is not None: spool.write(compressor.flush())
+
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = spool.tell()
+    spool.seek(0)
+    return zinfo, spool
+
+# APPENDS A PRE-COMPRESSED MEMBER TO AN OPEN ZIP (SINGLE WRITER THREAD)
+def _write_zip_member(zipf, zinfo, spool):
+    with spool:
+        zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        zinfo.header_offset = zipf.fp.tell()
+        zipf.fp.write(zinfo.FileHeader(zip64))
+        shutil.copyfileobj(spool, zipf.fp, _CHUNK_SIZE)
+
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+# COMPRESSES ZIP MEMBERS IN A THREAD POOL AND WRITES THEM IN SOURCE ORDER
+# - on_written IS CALLED AFTER EACH MEMBER HAS BEEN WRITTEN
+def _compress_zip_parallel(zipf, members, compression_level, jobs, adaptive=True, on_written=None):
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for file_path, arcname in members:
+            pending.append(pool.submit(_compress_zip_member, file_path, arcname, compression_level, adaptive))
+            if len(pending) < jobs * 2: continue
+            _write_zip_member(zipf, *pending.popleft().result())
+            if on_written is not None: on_written()
+        while pending:
+            _write_zip_member(zipf, *pending.popleft().result())
+            if on_written is not None: on_written()
+
+# WRITES ONE FILE TO AN OPEN ZIP FROM ITS PREFETCHED CONTENT (None: NOT PREFETCHED, READ FROM DISK AS USUAL)
+def _write_zip_file(zipf, file_path, arcname, data, adaptive=True):
+    if data is None:
+        _write_zip_source(zipf, file_path, arcname, adaptive)
+        return
+
+    zinfo = _zip_info(file_path, arcname)
+    zipf.writestr(zinfo, data, compress_type=_zip_compress_type(arcname, data[:SAMPLE_SIZE], adaptive), compresslevel=zipf.compresslevel)
+
+# REPORTS THE LAST MEMBER WRITTEN TO AN OPEN ZIP TO A CHECKPOINTER
+def _zip_written(zipf, checkpointer):
+    checkpointer.written(zipf.fp, zipf.filelist[-1].filename, zipf.filelist[-1])
 
 # COMPRESSES FILES/DIRECTORIES TO ZIP FORMAT
-def _compress_zip(source_paths, output_path, compression_level=6):
+# - adaptive=True STORES ALREADY-COMPRESSED FILES (MEDIA, ARCHIVES, HIGH-ENTROPY DATA) INSTEAD OF DEFLATING THEM
+# - duplicates (FROM find_duplicates) STORES EACH CONTENT ONCE AND LISTS THE OTHER COPIES IN A DEDUP MANIFEST MEMBER
+# - read_ahead (A prefetch PARTIAL) LETS READER THREADS LOAD UPCOMING SMALL FILES WHILE THE SERIAL WRITER COMPRESSES
+# - checkpointer (A Checkpointer) RECORDS PROGRESS AS MEMBERS ARE WRITTEN AND, WHEN RESUMING, CONTINUES AFTER THE LAST CHECKPOINT
+# - offsets (OPTIONAL DICT) RECEIVES {NAME: [LOCAL HEADER OFFSET, SIZE]} FOR EVERY MEMBER WRITTEN
+def _compress_zip(source_paths, output_path, compression_level=6, jobs=1, member_filter=None, adaptive=True, duplicates=None, walker=None,
+                  read_ahead=None, checkpointer=None, offsets=None):
     compression_level = min(max(compression_level, 0), 9)
-    
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compression_level) as zipf:
-        for source_path in source_paths:
-            source = Path(source_path)
-            if not source.exists():
-                raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
-            
-            if source.is_file():
-                zipf.write(source, source.name)
-            elif source.is_dir():
-                for root, dirs, files in os.walk(source):
-                    for file in files:
-                        file_path = Path(root) / file
-                        arcname = file_path.relative_to(source)
-                        zipf.write(file_path, arcname)
+    jobs = _resolve_jobs(jobs)
+    on_written = None if checkpointer is None else lambda: _zip_written(zipf, checkpointer)
+
+    with checkpointer.open() if checkpointer is not None else nullcontext(output_path) as target, \
+            zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED, compresslevel=compression_level) as zipf:
+        members = _iter_source_files(source_paths, 'zip', walker)
+        if checkpointer is not None:
+            for zinfo in checkpointer.resumed_members(): zipf.filelist.append(zinfo)
+            zipf.NameToInfo.update((zinfo.filename, zinfo) for zinfo in zipf.filelist)
+            members = checkpointer.track(members)
+        if member_filter is not None: members = (m for m in members if member_filter(m[1]))
+        if duplicates: members = (m for m in members if duplicates.get(m[1], m[1]) == m[1])
+        if jobs > 1:
+            _compress_zip_parallel(zipf, members, compression_level, jobs, adaptive, on_written)
+        elif read_ahead is not None:
+            for file_path, arcname, data in read_ahead(members, follow_symlinks=True):
+                _write_zip_file(zipf, file_path, arcname, data, adaptive)
+                if on_written is not None: on_written()
+        else:
+            for file_path, arcname in members:
+                _write_zip_source(zipf, file_path, arcname, adaptive)
+                if on_written is not None: on_written()
+        if duplicates: zipf.writestr(DEDUP_MANIFEST_NAME, dedup_manifest_bytes(duplicates))
+        if offsets is not None: offsets.update((zinfo.filename, [zinfo.header_offset, zinfo.file_size]) for zinfo in zipf.filelist)
     
     return output_path
 
+# WRAPS AN ARCHIVE-NAME FILTER AS A tarfile.add FILTER (NON-REGULAR ENTRIES ARE ALWAYS KEPT)
+# - WITH duplicates, THE FIRST COPY OF EACH CONTENT ADDED IS STORED AND LATER COPIES BECOME HARDLINKS TO IT
+def _tar_member_filter(member_filter, duplicates=None):
+    if member_filter is None and not duplicates: return None
+    stored = {}
+
+    def tar_filter(tarinfo):
+        if not tarinfo.isreg(): return tarinfo
+        if member_filter is not None and not member_filter(tarinfo.name): return None
+        if duplicates and tarinfo.name in duplicates:
+            first = stored.setdefault(duplicates[tarinfo.name], tarinfo.name)
+            if first != tarinfo.name: tarinfo.type, tarinfo.linkname, tarinfo.size = tarfile.LNKTYPE, first, 0
+        return tarinfo
+
+    return tar_filter
+
+# CACHED OWNER NAME LOOKUPS (tarfile.gettarinfo QUERIES pwd/grp AGAIN FOR EVERY MEMBER)
+@lru_cache(maxsize=None)
+def _user_name(uid):
+    try: return tarfile.pwd.getpwuid(uid)[0]
+    except (AttributeError, KeyError): return ''
+
+@lru_cache(maxsize=None)
+def _group_name(gid):
+    try: return tarfile.grp.getgrgid(gid)[0]
+    except (AttributeError, KeyError): return ''
+
+# TAR MEMBER TYPES BY FILE TYPE (OTHER TYPES, E.G. SOCKETS, ARE SKIPPED LIKE tarfile.add DOES)
+_TAR_TYPES = ((stat.S_ISREG, tarfile.REGTYPE), (stat.S_ISDIR, tarfile.DIRTYPE), (stat.S_ISFIFO, tarfile.FIFOTYPE),
+              (stat.S_ISLNK, tarfile.SYMTYPE), (stat.S_ISCHR, tarfile.CHRTYPE), (stat.S_ISBLK, tarfile.BLKTYPE))
+
+# BUILDS A TarInfo LIKE tarfile.gettarinfo, BUT FROM THE lstat RESULT CACHED BY THE WALKER INSTEAD OF A NEW lstat
+def _tar_info(tar, path, arcname):
+    st = path.stat(follow_symlinks=False)
+    member_type = next((tar_type for is_type, tar_type in _TAR_TYPES if is_type(st.st_mode)), None)
+    if member_type is None: return None
+
+    tarinfo = tar.tarinfo(arcname.lstrip('/'))
+    tarinfo.tarfile = tar
+    if member_type == tarfile.REGTYPE:
+        inode = (st.st_ino, st.st_dev)
+        if st.st_nlink > 1 and tar.inodes.get(inode, tarinfo.name) != tarinfo.name:
+            member_type, tarinfo.linkname = tarfile.LNKTYPE, tar.inodes[inode]
+        elif st.st_ino:
+            tar.inodes[inode] = tarinfo.name
+    elif member_type == tarfile.SYMTYPE:
+        tarinfo.linkname = os.readlink(path)
+    elif member_type in (tarfile.CHRTYPE, tarfile.BLKTYPE):
+        tarinfo.devmajor, tarinfo.devminor = os.major(st.st_rdev), os.minor(st.st_rdev)
+
+    tarinfo.type, tarinfo.mode, tarinfo.uid, tarinfo.gid = member_type, st.st_mode, st.st_uid, st.st_gid
+    tarinfo.size = st.st_size if member_type == tarfile.REGTYPE else 0
+    tarinfo.mtime = st.st_mtime
+    tarinfo.uname, tarinfo.gname = _user_name(st.st_uid), _group_name(st.st_gid)
+    return tarinfo
+
+# ADDS ONE WALKED ENTRY TO AN OPEN TAR ARCHIVE (THE ARCHIVE ITSELF IS SKIPPED, LIKE tarfile.add)
+# - data IS THE PREFETCHED FILE CONTENT (None: THE FILE IS OPENED HERE)
+# - RETURNS THE TarInfo WRITTEN, OR None WHEN THE ENTRY IS SKIPPED
+def _add_tar_entry(tar, path, arcname, tar_filter=None, data=None):
+    if tar.name is not None and os.path.abspath(path) == tar.name: return None
+    tarinfo = _tar_info(tar, path, arcname)
+    if tarinfo is not None and tar_filter is not None: tarinfo = tar_filter(tarinfo)
+    if tarinfo is None: return None
+
+    if tarinfo.isreg() and data is not None:
+        tar.addfile(tarinfo, io.BytesIO(data))
+    elif tarinfo.isreg():
+        with open(path, 'rb') as f: tar.addfile(tarinfo, f)
+    else:
+        tar.addfile(tarinfo)
+    return tarinfo
+
+# ADDS EVERY SOURCE PATH (DIRECTORIES RECURSIVELY, THROUGH THE WALKER) TO AN OPEN TAR ARCHIVE
+# - read_ahead (A prefetch PARTIAL) READS UPCOMING SMALL FILES IN READER THREADS; FILES THE FILTERS DROP OR TURN INTO HARDLINKS ARE NOT READ
+# - checkpointer (A Checkpointer) RECORDS PROGRESS AFTER EVERY ENTRY AND, WHEN RESUMING, SKIPS THE ENTRIES ALREADY WRITTEN
+# - offsets (OPTIONAL DICT) RECEIVES {NAME: [DATA OFFSET IN THE UNCOMPRESSED TAR STREAM, SIZE]} AS EACH ENTRY IS WRITTEN
+def _add_tar_sources(tar, source_paths, member_filter=None, duplicates=None, walker=None, read_ahead=None, checkpointer=None, offsets=None):
+    tar_filter = _tar_member_filter(member_filter, duplicates)
+    entries = (walker or SourceWalker()).entries(source_paths, 'tar')
+    if checkpointer is not None: entries = checkpointer.track(entries)
+    entries = ((path, arcname, None) for path, arcname in entries) if read_ahead is None \
+        else read_ahead(entries, wanted=partial(_tar_member_stored, member_filter, duplicates))
+
+    for path, arcname, data in entries:
+        tarinfo = _add_tar_entry(tar, path, arcname, tar_filter, data)
+        if offsets is not None and tarinfo is not None:
+            offsets[tarinfo.name] = [tar.offset - tarinfo.size - (-tarinfo.size % tarfile.BLOCKSIZE), tarinfo.size]
+        if checkpointer is not None: checkpointer.written(tar.fileobj, arcname)
+
+# RETURNS WHETHER A REGULAR FILE'S CONTENT ENDS UP IN THE TAR (NOT FILTERED OUT, NOT A LATER DUPLICATE STORED AS A HARDLINK)
+def _tar_member_stored(member_filter, duplicates, arcname):
+    if member_filter is not None and not member_filter(arcname): return False
+    return not duplicates or duplicates.get(arcname, arcname) == arcname
+
 # COMPRESSES FILES/DIRECTORIES TO TAR.GZ FORMAT
-def _compress_tar_gz(source_paths, output_path, compression_level=6):
+# - index_interval WRITES A SIDECAR INDEX (ACCESS POINTS EVERY index_interval BYTES PLUS MEMBER OFFSETS) FOR autozip_get
+# - offsets (OPTIONAL DICT) RECEIVES THE OFFSET OF EVERY ENTRY (SEE _add_tar_sources)
+def _compress_tar_gz(source_paths, output_path, compression_level=6, jobs=1, block_size=None, memory_limit=None, member_filter=None,
+                     duplicates=None, index_interval=None, walker=None, read_ahead=None, offsets=None):
     compression_level = min(max(compression_level, 1), 9)
+    jobs = _resolve_jobs(jobs)
+
+    if jobs > 1 or index_interval:
+        tar_class = IndexingTarFile if index_interval else tarfile.TarFile
+        with open(output_path, 'wb') as raw, \
+                ParallelGzipWriter(raw, compression_level, jobs, block_size, memory_limit, index_interval=index_interval) as gz:
+            with tar_class.open(fileobj=gz, mode='w') as tar:
+                _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead, offsets=offsets)
+        if index_interval: write_index(output_path, gz.access_points, tar.member_offsets, index_interval)
+        return output_path
     
     with tarfile.open(output_path, 'w:gz', compresslevel=compression_level) as tar:
-        for source_path in source_paths:
-            source = Path(source_path)
-            if not source.exists():
-                raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
-            tar.add(source, arcname=source.name)
+        _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead, offsets=offsets)
     
     return output_path
 
 # COMPRESSES FILES/DIRECTORIES TO TAR.BZ2 FORMAT
-def _compress_tar_bz2(source_paths, output_path, compression_level=6):
+def _compress_tar_bz2(source_paths, output_path, compression_level=6, member_filter=None, duplicates=None, walker=None, read_ahead=None,
+                      offsets=None):
     compression_level = min(max(compression_level, 1), 9)
     
     with tarfile.open(output_path, 'w:bz2', compresslevel=compression_level) as tar:
-        for source_path in source_paths:
-            source = Path(source_path)
-            if not source.exists():
-                raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
-            tar.add(source, arcname=source.name)
+        _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead, offsets=offsets)
     
     return output_path
 
 # COMPRESSES FILES/DIRECTORIES TO TAR.XZ FORMAT
-def _compress_tar_xz(source_paths, output_path, compression_level=6):
+def _compress_tar_xz(source_paths, output_path, compression_level=6, jobs=1, block_size=None, memory_limit=None, member_filter=None,
+                     duplicates=None, walker=None, read_ahead=None, offsets=None):
     compression_level = min(max(compression_level, 0), 9)
+    jobs = _resolve_jobs(jobs)
+
+    if jobs > 1:
+        with open(output_path, 'wb') as raw, ParallelXzWriter(raw, compression_level, jobs, block_size, memory_limit) as xz:
+            with tarfile.open(fileobj=xz, mode='w') as tar:
+                _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead, offsets=offsets)
+        return output_path
 
-    import lzma
     with lzma.open(output_path, 'wb', preset=compression_level) as lzma_file:
         with tarfile.open(fileobj=lzma_file, mode='w') as tar:
-            for source_path in source_paths:
-                source = Path(source_path)
-                if not source.exists():
-                    raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
-                tar.add(source, arcname=source.name)
+            _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead, offsets=offsets)
     
     return output_path
 
+# WRAPS A WRITE-ONLY STREAM IN THE COMPRESSOR OF A TAR FORMAT (NOTHING IS SEEKED, SO PIPES WORK)
+def _open_tar_stream(archive_format, stream, compression_level=6, jobs=1, block_size=None, memory_limit=None):
+    jobs = _resolve_jobs(jobs)
+    if archive_format == 'tar.gz':
+        compression_level = min(max(compression_level, 1), 9)
+        if jobs > 1: return ParallelGzipWriter(stream, compression_level, jobs, block_size, memory_limit)
+        return gzip.GzipFile(filename='', mode='wb', compresslevel=compression_level, fileobj=stream)
+    elif archive_format == 'tar.bz2': return bz2.BZ2File(stream, 'wb', compresslevel=min(max(compression_level, 1), 9))
+    elif archive_format == 'tar.xz':
+        compression_level = min(max(compression_level, 0), 9)
+        if jobs > 1: return ParallelXzWriter(stream, compression_level, jobs, block_size, memory_limit)
+        return lzma.LZMAFile(stream, 'wb', preset=compression_level)
+    return nullcontext(stream)
+
+# WRITES A TAR ARCHIVE (ANY COMPRESSION) TO A NON-SEEKABLE STREAM SUCH AS STDOUT
+# - MEMBERS ARE COPIED THROUGH IN CHUNKS, SO MEMORY USE DOES NOT GROW WITH THE ARCHIVE SIZE
+def _stream_tar(archive_format, source_paths, stream, compression_level=6, jobs=1, block_size=None, memory_limit=None, member_filter=None,
+                duplicates=None, walker=None, read_ahead=None):
+    with _open_tar_stream(archive_format, stream, compression_level, jobs, block_size, memory_limit) as compressed:
+        with tarfile.open(fileobj=compressed, mode='w|') as tar: _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead)
+    stream.flush()
+    return STDOUT
+
 # DETERMINES OUTPUT FORMAT FROM FILE EXTENSION
 def _get_format_from_extension(output_path):
     path_str = str(output_path).lower()
@@ -79,29 +380,501 @@ def _get_format_from_extension(output_path):
         raise ValueError(f"UNSUPPORTED ARCHIVE FORMAT: {ext}\nSUPPORTED: .zip, .tar.gz, .tar.bz2, .tar.xz, .tar")
 
 # COMPRESSES FILES/DIRECTORIES TO TAR FORMAT (UNCOMPRESSED)
-def _compress_tar(source_paths, output_path):
-    with tarfile.open(output_path, 'w') as tar:
-        for source_path in source_paths:
-            source = Path(source_path)
-            if not source.exists():
-                raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
-            tar.add(source, arcname=source.name)
+# - FILE BODIES ARE COPIED IN THE KERNEL (copy_file_range/sendfile) WHEN THE PLATFORM AND FILESYSTEMS ALLOW IT
+# - checkpointer (A Checkpointer) MAKES THE RUN RESUMABLE AND offsets RECEIVES THE OFFSET OF EVERY ENTRY (SEE _add_tar_sources)
+def _compress_tar(source_paths, output_path, member_filter=None, duplicates=None, walker=None, read_ahead=None, checkpointer=None, offsets=None):
+    with checkpointer.open() if checkpointer is not None else open(output_path, 'wb') as raw, ZeroCopyTarFile.open(fileobj=raw, mode='w') as tar:
+        _add_tar_sources(tar, source_paths, member_filter, duplicates, walker, read_ahead, checkpointer, offsets)
 
     return output_path
 
+# ADDS NEW SOURCE FILES TO AN EXISTING ZIP IN APPEND MODE; ONLY THE CENTRAL DIRECTORY IS REWRITTEN
+# - replace=True ALSO REWRITES MEMBERS WHOSE SOURCE CHANGED: THE NEW COPY IS APPENDED AND THE OLD ONE DROPPED FROM THE CENTRAL DIRECTORY
+# - A FAILED APPEND (E.G. A SOURCE READ ERROR) PUTS THE ARCHIVE BACK AS IT WAS: THE ORIGINAL CENTRAL DIRECTORY IS WRITTEN BACK AT ITS
+#   ORIGINAL OFFSET AND THE APPENDED DATA IS TRUNCATED AWAY (AN ARCHIVE CREATED BY THE CALL IS REMOVED)
+# - RETURNS {'added', 'replaced', 'unchanged'}
+def _update_zip(source_paths, output_path, compression_level=6, adaptive=True, replace=False, walker=None):
+    compression_level = min(max(compression_level, 0), 9)
+    counts, stale = {'added': 0, 'replaced': 0, 'unchanged': 0}, set()
+    created = not Path(output_path).exists()
+
+    try:
+        with zipfile.ZipFile(output_path, 'a', zipfile.ZIP_DEFLATED, compresslevel=compression_level) as zipf:
+            original = list(zipf.filelist), dict(zipf.NameToInfo), zipf.start_dir
+            try:
+                for file_path, arcname in _iter_source_files(source_paths, 'zip', walker):
+                    existing = zipf.NameToInfo.get(arcname)
+                    if existing is not None and not (replace and zip_member_changed(existing, file_path)):
+                        counts['unchanged'] += 1
+                        continue
+
+                    if existing is not None:
+                        stale.add(existing)
+                        del zipf.NameToInfo[arcname]
+                    _write_zip_source(zipf, file_path, arcname, adaptive)
+                    counts['added' if existing is None else 'replaced'] += 1
+            except BaseException:
+                zipf.filelist, zipf.NameToInfo, zipf.start_dir = original
+                raise
+            zipf.filelist = [zinfo for zinfo in zipf.filelist if zinfo not in stale]
+    except BaseException:
+        if created: Path(output_path).unlink(missing_ok=True)
+        raise
+
+    return counts
+
+# ADDS NEW SOURCE ENTRIES TO AN EXISTING UNCOMPRESSED TAR, WRITING OVER ITS END-OF-ARCHIVE BLOCKS
+# - THE EXISTING MEMBERS ARE READ WITH scan_tar_members (HEADERS ONLY), THEN THE ARCHIVE IS TRUNCATED TO ITS LAST MEMBER AND WRITTEN ON
+# - replace=True ALSO APPENDS A NEW COPY OF CHANGED FILES (LIKE tar --update: THE LAST COPY OF A NAME WINS ON EXTRACTION)
+# - HARDLINK MEMBERS (E.G. FROM --dedup) ARE COMPARED THROUGH THE MEMBER THEY LINK TO
+# - A FAILED APPEND (E.G. A SOURCE READ ERROR) PUTS THE ARCHIVE BACK AS IT WAS: ITS LAST MEMBER FOLLOWED BY ITS ORIGINAL END-OF-ARCHIVE
+#   BLOCKS (AN ARCHIVE CREATED BY THE CALL IS REMOVED)
+# - RETURNS {'added', 'replaced', 'unchanged'}
+def _update_tar(source_paths, output_path, replace=False, walker=None):
+    counts = {'added': 0, 'replaced': 0, 'unchanged': 0}
+    created = not Path(output_path).exists()
+    if created: open(output_path, 'wb').close()
+    end = size = None
+
+    try:
+        with open(output_path, 'r+b') as raw:
+            existing, end = scan_tar_members(raw)
+            size = raw.seek(0, os.SEEK_END)
+            raw.truncate(end)
+            raw.seek(end)
+            with ZeroCopyTarFile.open(fileobj=raw, mode='w') as tar, open(output_path, 'rb') as archive:
+                for path, arcname in (walker or SourceWalker()).entries(source_paths, 'tar'):
+                    member = existing.get(arcname.lstrip('/'))
+                    stored = existing.get(member.linkname, member) if member is not None and member.islnk() else member
+                    if member is not None and not (replace and tar_member_changed(archive, stored, path)):
+                        counts['unchanged'] += 1
+                        continue
+
+                    written = len(tar.members)
+                    _add_tar_entry(tar, path, arcname)
+                    if len(tar.members) > written: counts['added' if member is None else 'replaced'] += 1
+    except BaseException:
+        if created: Path(output_path).unlink(missing_ok=True)
+        elif end is not None: _restore_tar_end(output_path, end, size)
+        raise
+
+    return counts
+
+# CUTS AN UNCOMPRESSED TAR BACK TO end (THE END OF ITS LAST MEMBER) AND ZERO-FILLS IT TO size, REWRITING ITS END-OF-ARCHIVE BLOCKS
+def _restore_tar_end(output_path, end, size):
+    with open(output_path, 'r+b') as raw:
+        raw.truncate(end)
+        raw.seek(end)
+        raw.write(tarfile.NUL * (size - end))
+
+# CANONICAL FORMAT NAMES BY ACCEPTED ALIAS
+_FORMAT_ALIASES = {'zip': 'zip', 'tar.gz': 'tar.gz', 'tgz': 'tar.gz', 'tar.bz2': 'tar.bz2', 'tbz2': 'tar.bz2',
+                   'tar.xz': 'tar.xz', 'txz': 'tar.xz', 'tar': 'tar'}
+
+# RETURNS THE CANONICAL FORMAT NAME OR RAISES FOR UNSUPPORTED FORMATS
+def _normalize_format(archive_format):
+    canonical = _FORMAT_ALIASES.get(archive_format.lower())
+    if canonical is None: raise ValueError(f"UNSUPPORTED FORMAT: {archive_format}\nSUPPORTED: zip, tar.gz, tar.bz2, tar.xz, tar")
+    return canonical
+
+# RETURNS THE ARCHIVE NAME LAYOUT USED BY A FORMAT ('zip' OR 'tar')
+def _format_layout(archive_format):
+    return 'zip' if archive_format == 'zip' else 'tar'
+
+# SCANS SOURCES INTO A MANIFEST, COMPARING WITH THE BASE MANIFEST FOR INCREMENTAL RUNS
+def _scan_manifest(source_paths, archive_format, incremental=None, walker=None):
+    layout = _format_layout(archive_format)
+    base = None
+    if incremental is not None:
+        base = load_manifest(incremental)
+        if base.get('layout') != layout:
+            raise ValueError(f"BASE MANIFEST LAYOUT MISMATCH: {base.get('layout')} MANIFEST CANNOT BASE A {archive_format} ARCHIVE")
+
+    return build_manifest(_iter_source_files(source_paths, layout, walker), layout, base, incremental)
+
+# DISPATCHES TO THE FORMAT-SPECIFIC COMPRESSOR
+# - offsets (OPTIONAL DICT) RECEIVES {NAME: [OFFSET, SIZE]} FOR EVERY MEMBER AS IT IS WRITTEN (SEE _compress_zip AND _add_tar_sources)
+def _compress_format(archive_format, source_paths, output_path, compression_level, jobs, block_size, memory_limit, member_filter, adaptive=True,
+                     duplicates=None, index_interval=None, walker=None, read_ahead=None, checkpointer=None, offsets=None):
+    if archive_format == 'zip':
+        return _compress_zip(source_paths, output_path, compression_level, jobs, member_filter, adaptive, duplicates, walker, read_ahead,
+                             checkpointer, offsets)
+    elif archive_format == 'tar.gz':
+        return _compress_tar_gz(source_paths, output_path, compression_level, jobs, block_size, memory_limit, member_filter, duplicates,
+                                index_interval, walker, read_ahead, offsets)
+    elif archive_format == 'tar.bz2':
+        return _compress_tar_bz2(source_paths, output_path, compression_level, member_filter, duplicates, walker, read_ahead, offsets)
+    elif archive_format == 'tar.xz':
+        return _compress_tar_xz(source_paths, output_path, compression_level, jobs, block_size, memory_limit, member_filter, duplicates,
+                                walker, read_ahead, offsets)
+    else: return _compress_tar(source_paths, output_path, member_filter, duplicates, walker, read_ahead, checkpointer, offsets)
+
+# FAN-OUT WRITER FOR A TAR FORMAT: HEADERS COME FROM THE CACHED lstat, BODIES FROM THE SHARED READ
+@contextmanager
+def _tar_writer(output_path, archive_format, compression_level=6, jobs=1, block_size=None, memory_limit=None):
+    with open(output_path, 'wb') as raw, _open_tar_stream(archive_format, raw, compression_level, jobs, block_size, memory_limit) as compressed:
+        with tarfile.open(fileobj=compressed, mode='w', copybufsize=_CHUNK_SIZE) as tar:
+            def add(entry, reader):
+                path, name, in_tar, _ = entry
+                tarinfo = _tar_info(tar, path, name) if in_tar else None
+                if tarinfo is None: return
+                if tarinfo.isreg(): tar.addfile(tarinfo, reader)
+                else: tar.addfile(tarinfo)
+
+            yield add
+
+# FAN-OUT WRITER FOR ZIP: EACH MEMBER IS COMPRESSED AS ITS CHUNKS ARRIVE (THE FIRST CHUNK IS THE STORE-VS-DEFLATE SAMPLE)
+@contextmanager
+def _zip_writer(output_path, compression_level=6, adaptive=True):
+    compression_level = min(max(compression_level, 0), 9)
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compression_level) as zipf:
+        def add(entry, reader):
+            path, _, _, arcname = entry
+            if arcname is None or reader is None: return
+            zinfo = _zip_info(path, arcname)
+            zinfo.compress_type = _zip_compress_type(arcname, reader.peek(SAMPLE_SIZE), adaptive)
+            zinfo._compresslevel = compression_level
+            with zipf.open(zinfo, 'w') as member:
+                while chunk := reader.read1(): member.write(chunk)
+
+        yield add
+
+# FAN-OUT WRITER FOR A SHA256SUMS-STYLE LIST ("<HEX DIGEST>  <NAME>" PER FILE, NAMES IN THE 'tar' LAYOUT)
+@contextmanager
+def _checksum_writer(output_path, counts):
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+        def add(entry, reader):
+            if reader is None: return
+            digest = hashlib.sha256()
+            while chunk := reader.read1(): digest.update(chunk)
+            f.write(f"{digest.hexdigest()}  {entry[1]}\n")
+            counts['checksums'] = counts.get('checksums', 0) + 1
+
+        yield add
+
+# WRITES SEVERAL ARCHIVES (AND AN OPTIONAL CHECKSUM LIST) FROM ONE READ OF THE SOURCES
+# - EVERY OUTPUT IS WRITTEN BY ITS OWN THREAD; tar.gz/tar.xz OUTPUTS ALSO USE jobs COMPRESSION THREADS EACH
+# - ON ANY ERROR (A SOURCE THAT CANNOT BE READ, A FULL DISK) EVERY OUTPUT IS REMOVED, SO NO TRUNCATED ARCHIVE IS LEFT BEHIND
+def _compress_fanout(source_paths, outputs, compression_level, jobs, block_size, memory_limit, adaptive=True, checksums=None, report=None,
+                     walker=None):
+    writers = [partial(_zip_writer, path, compression_level, adaptive) if archive_format == 'zip'
+               else partial(_tar_writer, path, archive_format, compression_level, jobs, block_size, memory_limit) for path, archive_format in outputs]
+    counts = {}
+    if checksums is not None: writers.append(partial(_checksum_writer, checksums, counts))
+
+    skip = [path for path, _ in outputs] + ([checksums] if checksums is not None else [])
+    try:
+        fan_out((walker or SourceWalker()).layouts(source_paths), writers, skip)
+    except Exception:
+        for path in skip: Path(path).unlink(missing_ok=True)
+        raise
+    if report is not None and checksums is not None: report['checksums'] = counts.get('checksums', 0)
+    return [path for path, _ in outputs]
+
+# WRITES THE SOURCES AS INDEPENDENT SHARDS OF ONE FORMAT PLUS A GLOBAL INDEX (<OUTPUT>.shards.json), AND RETURNS THE INDEX PATH
+# - SHARDS ARE WRITTEN CONCURRENTLY, ONE PER WORKER; SPARE jobs ARE SHARED OUT AS COMPRESSION THREADS INSIDE EACH SHARD
+# - MEMBER OFFSETS FOR THE INDEX ARE RECORDED AS EACH SHARD IS WRITTEN, SO NO SHARD IS READ BACK
+# - ON ANY ERROR EVERY SHARD IS REMOVED AND NO INDEX IS WRITTEN
+# - report['shards'] RECEIVES THE SHARD PATHS
+def _compress_shards(source_paths, output_path, archive_format, compression_level, jobs, block_size, memory_limit, adaptive=True, shards=None,
+                     shard_size=None, report=None, walker=None, read_ahead=None, progress=None):
+    walker = walker or SourceWalker()
+    layout = _format_layout(archive_format)
+    entries = walker.files(source_paths, layout) if layout == 'zip' else walker.entries(source_paths, layout)
+    groups = partition(entries, layout, shards, shard_size)
+    paths = [shard_path_for(output_path, number, archive_format) for number in range(len(groups))]
+
+    workers = max(1, min(_resolve_jobs(jobs), len(groups)))
+    shard_jobs = max(1, _resolve_jobs(jobs) // workers)
+    if progress is not None:
+        progress.expect(sum(len(group) for group in groups), sum(size for group in groups for _, _, size in group))
+        progress.watch(paths)
+
+    def write_shard(path, group):
+        shard_walker = ShardWalker(group) if progress is None else progress.track(ShardWalker(group))
+        offsets = {}
+        _compress_format(archive_format, [], path, compression_level, shard_jobs, block_size, memory_limit, None, adaptive,
+                         walker=shard_walker, read_ahead=read_ahead, offsets=offsets)
+        return offsets
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool: offsets = list(pool.map(write_shard, paths, groups))
+    except Exception:
+        for path in paths: Path(path).unlink(missing_ok=True)
+        raise
+    if report is not None: report['shards'] = paths
+    return write_shard_index(shard_index_path_for(output_path), archive_format, layout, paths, offsets,
+                             [sum(size for _, _, size in group) for group in groups])
+
+# EXTRACTS EVERY SHARD LISTED IN A GLOBAL INDEX, SEVERAL SHARDS AT A TIME, AND RETURNS THE COMBINED SUMMARY
+# - DIRECTORY PERMISSIONS AND TIMES ARE RESTORED ONCE, AFTER EVERY SHARD HAS FINISHED WRITING INTO THE SHARED TREE
+def _extract_shards(index_path, destination, jobs=1, safe=True):
+    index = load_shard_index(index_path)
+    paths = shard_paths(index_path, index)
+    workers = max(1, min(_resolve_jobs(jobs), len(paths)))
+    shard_jobs = max(1, _resolve_jobs(jobs) // workers)
+    archive_format, directories = _normalize_format(index['format']), []
+
+    def extract_shard(path):
+        if archive_format == 'zip': return extract_zip(path, destination, shard_jobs, safe)
+        return extract_tar(path, destination, safe, directories)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool: results = list(pool.map(extract_shard, paths))
+    restore_directories(directories, safe)
+    return {key: sum(stats[key] for stats in results) for key in ('files', 'directories', 'links', 'bytes')}
+
+# FINDS DUPLICATE FILES AMONG THE MEMBERS THAT WILL BE WRITTEN (FILLS report WITH COUNT AND BYTES SAVED)
+def _find_archive_duplicates(source_paths, archive_format, jobs, member_filter, report, walker=None):
+    members = _iter_source_files(source_paths, _format_layout(archive_format), walker)
+    if member_filter is not None: members = (m for m in members if member_filter(m[1]))
+    duplicates, bytes_saved = find_duplicates(members, _resolve_jobs(jobs))
+    if report is not None: report.update(duplicates=count_duplicates(duplicates), bytes_saved=bytes_saved)
+    return duplicates
+
 # COMPRESSES FILES AND DIRECTORIES INTO VARIOUS ARCHIVE FORMATS
-def autozip_compress(source_paths, output_path, archive_format=None, compression_level=6):
+# - manifest=True WRITES A SIDECAR MANIFEST (<ARCHIVE>.manifest.json) DESCRIBING EVERY SOURCE FILE
+# - incremental=BASE_MANIFEST ONLY STORES FILES THAT ARE NEW OR CHANGED SINCE THAT MANIFEST
+# - adaptive=False DEFLATES EVERY ZIP MEMBER, EVEN ALREADY-COMPRESSED ONES
+# - dedup=True STORES IDENTICAL FILES ONCE (TAR HARDLINKS, OR A DEDUP MANIFEST MEMBER IN ZIP)
+# - report (OPTIONAL DICT) RECEIVES 'duplicates' AND 'bytes_saved' WHEN dedup=True
+# - output_path='-' STREAMS A TAR FORMAT (DEFAULT: TAR) TO STDOUT
+# - source_paths MAY BE A ONE-SHOT ITERABLE (E.G. A --files-from LIST), READ AS THE ARCHIVE IS WRITTEN
+# - index=True WRITES A SEEKABLE INDEX (<ARCHIVE>.index.json) NEXT TO A TAR.GZ ARCHIVE FOR autozip_get
+# - compression_level='auto[:fastest|smallest|balanced]' PICKS THE LEVEL FROM A CALIBRATION RUN ON A SAMPLE OF THE SOURCES
+#   (THE MEASUREMENTS ARE STORED IN report['calibration'])
+# - excludes (GLOBS) AND gitignore=True (HONOUR .gitignore FILES) PRUNE THE SOURCE WALK; jobs ALSO LISTS DIRECTORIES IN PARALLEL
+# - output_path MAY BE A LIST OF PATHS (FORMATS FROM THEIR EXTENSIONS) AND checksums A SHA256SUMS PATH: THE SOURCES ARE THEN READ ONCE
+#   AND FED TO EVERY OUTPUT ON ITS OWN THREAD (report['checksums'] RECEIVES THE NUMBER OF FILES HASHED)
+# - shards=N OR shard_size=SIZE WRITES INDEPENDENT SHARDS (data-00000.tar.gz, ...) IN PARALLEL PLUS A GLOBAL INDEX
+#   (<OUTPUT>.shards.json, MAPPING EVERY NAME TO ITS SHARD AND OFFSET), AND RETURNS THE INDEX PATH
+# - prefetch_depth=N READS UP TO N SMALL FILES AHEAD OF THE WRITER IN READER THREADS, HOLDING AT MOST prefetch_memory BYTES (DEFAULT: 64M)
+# - checkpoint=True (.tar AND .zip ONLY) RECORDS PROGRESS IN <OUTPUT>.checkpoint EVERY checkpoint_interval BYTES (DEFAULT: 64M);
+#   resume=True TRUNCATES AN INTERRUPTED ARCHIVE TO ITS LAST CHECKPOINT AND CONTINUES WITH THE NEXT ENTRY (report['resumed'] RECEIVES
+#   THE OFFSET RESUMED FROM)
+# - append=True ADDS SOURCES MISSING FROM AN EXISTING .tar OR .zip WITHOUT REWRITING IT; update=True ALSO REPLACES MEMBERS WHOSE SOURCE
+#   CHANGED (report RECEIVES 'added', 'replaced' AND 'unchanged' COUNTS)
+# - progress=CALLBACK RECEIVES A SNAPSHOT DICT (FILES, BYTES IN/OUT, RATES, RATIO, ETA) EVERY progress_interval SECONDS WHILE THE
+#   ARCHIVE IS WRITTEN, THEN A FINAL ONE WITH 'done': True (THE SOURCES ARE WALKED ONCE BEFOREHAND FOR THE TOTALS)
+# - ON ANY ERROR WHILE WRITING (A SOURCE THAT CANNOT BE READ, A FULL DISK) THE OUTPUT ARCHIVES ARE REMOVED, SO NO TRUNCATED ARCHIVE IS LEFT
+#   BEHIND; A CHECKPOINTED RUN KEEPS ITS ARCHIVE FOR resume, AND append/update PUT AN EXISTING ARCHIVE BACK AS IT WAS
+def autozip_compress(source_paths, output_path, archive_format=None, compression_level=6, jobs=1, block_size=None, memory_limit=None,
+                     manifest=False, incremental=None, adaptive=True, dedup=False, report=None, index=False, index_interval=None, excludes=None,
+                     gitignore=False, checksums=None, shards=None, shard_size=None, prefetch_depth=0, prefetch_memory=None, checkpoint=False, checkpoint_interval=None,
+                     resume=False, append=False, update=False, progress=None, progress_interval=None):
     if not source_paths:
         raise ValueError("NO SOURCE PATHS PROVIDED")
-    
+    checkpointed, in_place = checkpoint or resume, append or update
+    if isinstance(output_path, (list, tuple)) or checksums is not None:
+        return _autozip_compress_fanout(source_paths, output_path, archive_format, compression_level, jobs, block_size, memory_limit, adaptive,
+                                        checksums, report, excludes, gitignore,
+                                        manifest or incremental is not None or dedup or index or checkpointed or in_place, progress, progress_interval)
+
+    streaming = str(output_path) == STDOUT
+    if archive_format is None: archive_format = 'tar' if streaming else _get_format_from_extension(output_path)
+    archive_format = _normalize_format(archive_format)
+    block_size, memory_limit = parse_size(block_size), parse_size(memory_limit)
+    index_interval = parse_size(index_interval or DEFAULT_INDEX_INTERVAL) if index else None
+    if streaming and archive_format == 'zip': raise ValueError("ZIP ARCHIVES CANNOT BE STREAMED TO STDOUT (USE A TAR FORMAT)")
+    if streaming and (manifest or incremental is not None): raise ValueError("MANIFESTS REQUIRE AN OUTPUT FILE, NOT STDOUT")
+    if index and archive_format != 'tar.gz': raise ValueError(f"SEEKABLE INDEX IS ONLY SUPPORTED FOR TAR.GZ ARCHIVES, NOT {archive_format}")
+    if streaming and index: raise ValueError("SEEKABLE INDEX REQUIRES AN OUTPUT FILE, NOT STDOUT")
+    sharded = shards is not None or shard_size is not None
+    if sharded: shard_size = _check_sharding(shards, shard_size, streaming or manifest or incremental is not None or dedup or index)
+    if checkpointed and (streaming or sharded or archive_format not in ('tar', 'zip')):
+        raise ValueError("CHECKPOINTS NEED A .tar OR .zip OUTPUT FILE (NOT A COMPRESSED TAR, STDOUT OR SHARDS)")
+    if append and update: raise ValueError("APPEND AND UPDATE CANNOT BE COMBINED")
+    if in_place and (streaming or sharded or archive_format not in ('tar', 'zip') or manifest or incremental is not None or dedup or index
+                     or checkpointed):
+        raise ValueError("APPEND AND UPDATE NEED A .tar OR .zip OUTPUT FILE AND DO NOT SUPPORT MANIFEST, INCREMENTAL, DEDUP, INDEX, "
+                         "CHECKPOINT OR SHARD OPTIONS")
+    read_ahead = _read_ahead(prefetch_depth, prefetch_memory)
+    target = parse_auto(compression_level)
+
+    # CALIBRATION, MANIFESTS, DEDUP, CHECKPOINTS AND PROGRESS SCAN OR RECORD THE SOURCES BEFORE WRITING, SO ONE-SHOT ITERABLES ARE KEPT AS LISTS
+    tracker = ProgressTracker(progress, progress_interval) if progress is not None else None
+    if manifest or incremental is not None or dedup or target is not None or checkpointed or tracker is not None: source_paths = list(source_paths)
+    checkpointer = None
+    if checkpointed:
+        checkpointer = Checkpointer(output_path, archive_format, [os.path.abspath(path) for path in source_paths],
+                                    parse_size(checkpoint_interval) or DEFAULT_CHECKPOINT_INTERVAL, resume)
+        if report is not None and resume: report['resumed'] = checkpointer.state['offset']
+
+    walker = SourceWalker(excludes, gitignore, _resolve_jobs(jobs))
+    if target is not None:
+        calibration = calibrate(_iter_source_files(source_paths, _format_layout(archive_format), walker), archive_format, target)
+        compression_level = calibration['level']
+        if report is not None: report['calibration'] = calibration
+
+    if in_place:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        walker = _track_progress(tracker, walker, source_paths, archive_format, [output_path])
+        with tracker or nullcontext():
+            if archive_format == 'zip': counts = _update_zip(source_paths, str(output_path), compression_level, adaptive, update, walker)
+            else: counts = _update_tar(source_paths, str(output_path), update, walker)
+        if report is not None: report.update(counts)
+        return str(output_path)
+
+    new_manifest, member_filter = None, None
+    if manifest or incremental is not None:
+        new_manifest, selected = _scan_manifest(source_paths, archive_format, incremental, walker)
+        if incremental is not None: member_filter = selected.__contains__
+
+    if sharded:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with tracker or nullcontext():
+            result = _compress_shards(source_paths, str(output_path), archive_format, compression_level, jobs, block_size, memory_limit, adaptive,
+                                      shards, shard_size, report, walker, read_ahead, tracker)
+        return result
+
+    duplicates = _find_archive_duplicates(source_paths, archive_format, jobs, member_filter, report, walker) if dedup else None
+    if streaming:
+        walker = _track_progress(tracker, walker, source_paths, archive_format)
+        stream = sys.stdout.buffer if tracker is None else tracker.count(sys.stdout.buffer)
+        with tracker or nullcontext():
+            _stream_tar(archive_format, source_paths, stream, compression_level, jobs, block_size, memory_limit, member_filter, duplicates, walker,
+                        read_ahead)
+        return STDOUT
+
     output = Path(output_path)
-    if archive_format is None: archive_format = _get_format_from_extension(output_path)
-    archive_format = archive_format.lower()
     output.parent.mkdir(parents=True, exist_ok=True)
-    
-    if archive_format == 'zip': return _compress_zip(source_paths, str(output), compression_level)
-    elif archive_format in ('tar.gz', 'tgz'): return _compress_tar_gz(source_paths, str(output), compression_level)
-    elif archive_format in ('tar.bz2', 'tbz2'): return _compress_tar_bz2(source_paths, str(output), compression_level)
-    elif archive_format in ('tar.xz', 'txz'): return _compress_tar_xz(source_paths, str(output), compression_level)
-    elif archive_format == 'tar': return _compress_tar(source_paths, str(output))
-    else: raise ValueError(f"UNSUPPORTED FORMAT: {archive_format}\nSUPPORTED: zip, tar.gz, tar.bz2, tar.xz, tar")
+    walker = _track_progress(tracker, walker, source_paths, archive_format, [output])
+    with tracker or nullcontext():
+        try:
+            result = _compress_format(archive_format, source_paths, str(output), compression_level, jobs, block_size, memory_limit, member_filter,
+                                      adaptive, duplicates, index_interval, walker, read_ahead, checkpointer)
+        except Exception:
+            if checkpointer is None and output.is_file(): output.unlink()
+            raise
+    if new_manifest is not None: write_manifest(manifest_path_for(result), new_manifest)
+    return result
+
+# RETURNS THE prefetch PARTIAL FOR A READ-AHEAD DEPTH AND MEMORY BUDGET (None WHEN DEPTH IS 0, I.E. PREFETCHING IS OFF)
+def _read_ahead(depth, memory_limit=None):
+    if depth < 0: raise ValueError(f"PREFETCH DEPTH CANNOT BE NEGATIVE: {depth}")
+    if not depth: return None
+    return partial(prefetch, depth=depth, memory_limit=parse_size(memory_limit) or DEFAULT_PREFETCH_MEMORY)
+
+# STARTS COUNTING A WRITE FOR tracker (None WHEN PROGRESS IS OFF) AND RETURNS THE WALKER TO WRITE WITH
+# - THE SOURCES ARE WALKED ONCE FIRST FOR THE TOTALS (archive_format None: THE COMBINED WALK FEEDING SEVERAL OUTPUTS)
+def _track_progress(tracker, walker, source_paths, archive_format, outputs=()):
+    if tracker is None: return walker
+    layout = _format_layout(archive_format) if archive_format is not None else None
+    if layout is None: entries = walker.layouts(source_paths)
+    elif layout == 'zip': entries = walker.files(source_paths, layout)
+    else: entries = walker.entries(source_paths, layout)
+    tracker.expect(*scan_totals(entries, layout or 'tar'))
+    tracker.watch(outputs)
+    return tracker.track(walker)
+
+# VALIDATES SHARDING OPTIONS AND RETURNS THE SHARD SIZE IN BYTES (unsupported IS SET WHEN A SINGLE-FILE OPTION WAS REQUESTED)
+def _check_sharding(shards, shard_size, unsupported):
+    if shards is not None and shard_size is not None: raise ValueError("SHARD COUNT AND SHARD SIZE CANNOT BE COMBINED")
+    if shards is not None and shards < 1: raise ValueError("SHARD COUNT MUST BE AT LEAST 1")
+    if unsupported: raise ValueError("SHARDED ARCHIVES NEED AN OUTPUT FILE AND DO NOT SUPPORT MANIFEST, INCREMENTAL, DEDUP OR INDEX OPTIONS")
+    return parse_size(shard_size)
+
+# autozip_compress WITH SEVERAL OUTPUTS AND/OR A CHECKSUM LIST (ONE READ OF THE SOURCES)
+# - unsupported IS SET WHEN A SINGLE-OUTPUT OPTION (MANIFEST, INCREMENTAL, DEDUP, INDEX, CHECKPOINT, APPEND, UPDATE) WAS REQUESTED
+def _autozip_compress_fanout(source_paths, output_paths, archive_format, compression_level, jobs, block_size, memory_limit, adaptive, checksums,
+                             report, excludes, gitignore, unsupported, progress=None, progress_interval=None):
+    single = not isinstance(output_paths, (list, tuple))
+    output_paths = [str(output_paths)] if single else [str(path) for path in output_paths]
+    if not output_paths: raise ValueError("AT LEAST ONE OUTPUT PATH IS REQUIRED")
+    targets = output_paths + ([str(checksums)] if checksums is not None else [])
+    if STDOUT in targets: raise ValueError("MULTIPLE OUTPUTS AND CHECKSUMS REQUIRE FILES, NOT STDOUT")
+    if len({os.path.abspath(path) for path in targets}) < len(targets): raise ValueError("OUTPUT PATHS MUST BE DIFFERENT")
+    if len(output_paths) > 1 and archive_format is not None:
+        raise ValueError("FORMAT CANNOT BE FORCED WITH MULTIPLE OUTPUTS (EACH FORMAT COMES FROM ITS EXTENSION)")
+    if unsupported:
+        raise ValueError("MANIFEST, INCREMENTAL, DEDUP, INDEX, CHECKPOINT, APPEND AND UPDATE OPTIONS NEED A SINGLE OUTPUT WITHOUT CHECKSUMS")
+    if parse_auto(compression_level) is not None: raise ValueError("COMPRESSION AUTO-TUNING NEEDS A SINGLE OUTPUT WITHOUT CHECKSUMS")
+
+    outputs = [(path, _normalize_format(archive_format or _get_format_from_extension(path))) for path in output_paths]
+    block_size, memory_limit = parse_size(block_size), parse_size(memory_limit)
+    for path in targets: Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    walker = SourceWalker(excludes, gitignore, _resolve_jobs(jobs))
+    tracker = None
+    if progress is not None:
+        source_paths = list(source_paths)
+        tracker = ProgressTracker(progress, progress_interval)
+        walker = _track_progress(tracker, walker, source_paths, None, targets)
+    with tracker or nullcontext():
+        results = _compress_fanout(source_paths, outputs, compression_level, jobs, block_size, memory_limit, adaptive, checksums, report, walker)
+    return results[0] if single else results
+
+# EXTRACTS AN ARCHIVE INTO A DESTINATION DIRECTORY
+# - ZIP MEMBERS ARE EXTRACTED IN PARALLEL; TAR FORMATS ARE STREAMED MEMBER BY MEMBER
+# - safe=True REJECTS ABSOLUTE PATHS, '..' TRAVERSAL AND LINKS POINTING OUTSIDE THE DESTINATION
+# - A SHARD INDEX (<OUTPUT>.shards.json) EXTRACTS ALL OF ITS SHARDS, SEVERAL AT A TIME
+def autozip_extract(archive_path, destination='.', archive_format=None, jobs=1, safe=True):
+    if is_shard_index(archive_path): return _extract_shards(str(archive_path), str(destination), jobs, safe)
+    if not Path(archive_path).is_file():
+        raise FileNotFoundError(f"ARCHIVE NOT FOUND: {archive_path}")
+
+    if archive_format is None: archive_format = _get_format_from_extension(archive_path)
+    archive_format = _normalize_format(archive_format)
+
+    if archive_format == 'zip': return extract_zip(str(archive_path), str(destination), _resolve_jobs(jobs), safe)
+    return extract_tar(str(archive_path), str(destination), safe)
+
+# LISTS ARCHIVE ENTRIES FROM METADATA ONLY (ZIP CENTRAL DIRECTORY OR TAR HEADERS)
+def autozip_list(archive_path, archive_format=None):
+    if not Path(archive_path).is_file():
+        raise FileNotFoundError(f"ARCHIVE NOT FOUND: {archive_path}")
+
+    if archive_format is None: archive_format = _get_format_from_extension(archive_path)
+    archive_format = _normalize_format(archive_format)
+
+    if archive_format == 'zip': return list_zip(str(archive_path))
+    return list_tar(str(archive_path), archive_format)
+
+# RETURNS A SUMMARY OF AN ARCHIVE (ENTRY COUNTS, SIZES, COMPRESSION RATIO AND LARGEST MEMBERS)
+def autozip_stat(archive_path, archive_format=None):
+    entries = autozip_list(archive_path, archive_format)
+    stats = archive_stat(entries, os.path.getsize(archive_path))
+    return {'archive': str(archive_path), 'format': _normalize_format(archive_format or _get_format_from_extension(archive_path)), **stats}
+
+# VERIFIES AN ARCHIVE AND YIELDS ONE RESULT PER MEMBER AS SOON AS IT IS CHECKED ({'name', 'size', 'status', 'sha256', 'error'})
+# - ZIP: EVERY MEMBER IS INFLATED AND CHECKED AGAINST ITS CRC-32, jobs MEMBERS AT A TIME FROM AN MMAP OF THE ARCHIVE
+# - TAR: HEADER CHECKSUMS AND DATA BOUNDS; COMPRESSED TARS ARE ALSO DECODED TO THE END, WHICH CHECKS THE CODEC CHECKSUMS
+# - manifest (DEFAULT: <ARCHIVE>.manifest.json WHEN PRESENT) ADDS A SHA-256 CHECK OF EVERY MEMBER AGAINST THE SOURCE HASHES; FOR A
+#   FULL (NOT INCREMENTAL) ARCHIVE, MANIFEST FILES MISSING FROM IT ARE REPORTED TOO
+# - A SHARD INDEX (<OUTPUT>.shards.json) VERIFIES ALL OF ITS SHARDS, ONE AFTER THE OTHER
+def autozip_verify(archive_path, archive_format=None, manifest=None, jobs=1):
+    if is_shard_index(archive_path):
+        if manifest is not None: raise ValueError("SHARDED ARCHIVES HAVE NO MANIFEST TO VERIFY AGAINST")
+        index = load_shard_index(archive_path)
+        return chain.from_iterable(autozip_verify(path, index['format'], jobs=jobs) for path in shard_paths(archive_path, index))
+    if not Path(archive_path).is_file():
+        raise FileNotFoundError(f"ARCHIVE NOT FOUND: {archive_path}")
+
+    if archive_format is None: archive_format = _get_format_from_extension(archive_path)
+    archive_format = _normalize_format(archive_format)
+    if manifest is None and Path(manifest_path_for(archive_path)).is_file(): manifest = manifest_path_for(archive_path)
+    loaded = load_manifest(manifest) if manifest is not None else None
+    hashes = manifest_hashes(loaded, _format_layout(archive_format)) if loaded is not None else None
+    complete = loaded is not None and loaded.get('base') is None
+
+    if archive_format == 'zip': return verify_zip(str(archive_path), hashes, _resolve_jobs(jobs), complete)
+    if archive_format == 'tar': return verify_tar(str(archive_path), hashes, _resolve_jobs(jobs), complete)
+    return verify_compressed_tar(str(archive_path), archive_format, hashes, complete)
+
+# WRITES ONE MEMBER OF AN INDEXED TAR.GZ ARCHIVE TO output_path ('-' = STDOUT) AND RETURNS ITS SIZE
+# - ONLY THE DATA BETWEEN THE NEAREST ACCESS POINT AND THE END OF THE MEMBER IS INFLATED
+def autozip_get(archive_path, member, output_path=STDOUT):
+    if not Path(archive_path).is_file():
+        raise FileNotFoundError(f"ARCHIVE NOT FOUND: {archive_path}")
+
+    if str(output_path) == STDOUT:
+        size = read_member(str(archive_path), member, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return size
+
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(output, 'wb') as out: return read_member(str(archive_path), member, out)
+    except Exception:
+        output.unlink(missing_ok=True)
+        raise
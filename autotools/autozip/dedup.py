@@ -0,0 +1,75 @@
+import json
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# BYTES HASHED FROM THE START OF EACH CANDIDATE IN THE PARTIAL HASH PASS
+PARTIAL_HASH_SIZE = 64 * 1024
+
+# ZIP MEMBER LISTING DEDUPLICATED ENTRIES (DUPLICATE NAME -> NAME OF THE STORED COPY)
+DEDUP_MANIFEST_NAME = '.autozip-dedup.json'
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# HASHES THE FIRST PARTIAL_HASH_SIZE BYTES OF A FILE
+def _partial_digest(file_path):
+    with open(file_path, 'rb') as f: return hashlib.blake2b(f.read(PARTIAL_HASH_SIZE)).digest()
+
+# HASHES A WHOLE FILE (STREAMED)
+def _full_digest(file_path):
+    digest = hashlib.blake2b()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE): digest.update(chunk)
+    return digest.digest()
+
+# SPLITS CANDIDATE GROUPS BY A DIGEST (COMPUTED IN THE POOL) AND DROPS GROUPS LEFT WITH A SINGLE FILE
+def _refine_groups(groups, digest_func, pool):
+    candidates = [(key, member) for key, group in groups.items() for member in group]
+    refined = defaultdict(list)
+    for (key, member), digest in zip(candidates, pool.map(digest_func, (member[0] for _, member in candidates))):
+        refined[(key, digest)].append(member)
+    return {key: group for key, group in refined.items() if len(group) > 1}
+
+# FINDS FILES WITH IDENTICAL CONTENT AMONG (FILE PATH, ARCHIVE NAME) PAIRS
+# - CANDIDATES ARE GROUPED BY SIZE, THEN BY A HASH OF THEIR FIRST 64 KiB, THEN BY A FULL HASH,
+#   SO ONLY FILES THAT STILL MATCH ARE READ ENTIRELY
+# - RETURNS {ARCHIVE NAME: CANONICAL NAME} FOR EVERY FILE IN A DUPLICATE GROUP (THE CANONICAL NAME IS THE
+#   FIRST FILE OF ITS GROUP AND MAPS TO ITSELF) AND THE NUMBER OF BYTES THE DUPLICATES WOULD HAVE TAKEN
+def find_duplicates(members, jobs=1):
+    by_size = defaultdict(list)
+    for file_path, arcname in members:
+        size = file_path.stat().st_size
+        if size > 0: by_size[size].append((file_path, arcname, size))
+    groups = {size: group for size, group in by_size.items() if len(group) > 1}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        groups = _refine_groups(groups, _partial_digest, pool)
+        large = {key: group for key, group in groups.items() if group[0][2] > PARTIAL_HASH_SIZE}
+        groups = {key: group for key, group in groups.items() if key not in large}
+        groups.update(_refine_groups(large, _full_digest, pool))
+
+    duplicates, bytes_saved = {}, 0
+    for group in groups.values():
+        canonical = group[0][1]
+        for _, arcname, size in group: duplicates[arcname] = canonical
+        bytes_saved += sum(size for _, _, size in group[1:])
+    return duplicates, bytes_saved
+
+# COUNTS THE FILES THAT ARE STORED AS REFERENCES TO ANOTHER COPY
+def count_duplicates(duplicates):
+    return sum(1 for arcname, canonical in duplicates.items() if arcname != canonical)
+
+# SERIALISES THE ZIP DEDUP MANIFEST FOR THE DUPLICATES THAT WERE NOT STORED
+def dedup_manifest_bytes(duplicates):
+    skipped = {arcname: canonical for arcname, canonical in duplicates.items() if arcname != canonical}
+    return json.dumps({'version': 1, 'duplicates': skipped}, separators=(',', ':')).encode('utf-8')
+
+# PARSES A ZIP DEDUP MANIFEST INTO {DUPLICATE NAME: STORED NAME}
+def load_dedup_manifest(data):
+    try:
+        manifest = json.loads(data)
+    except ValueError as e:
+        raise ValueError(f"INVALID DEDUP MANIFEST: {str(e)}")
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('duplicates'), dict):
+        raise ValueError("INVALID DEDUP MANIFEST")
+    return manifest['duplicates']
@@ -0,0 +1,212 @@
+import os
+import re
+import mmap
+import time
+import zlib
+import shutil
+import struct
+import tarfile
+import zipfile
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from .dedup import DEDUP_MANIFEST_NAME, load_dedup_manifest
+
+# CHUNK SIZE FOR STREAMING MEMBER DATA (ALSO CAPS DECOMPRESSED OUTPUT PER STEP)
+_CHUNK_SIZE = 1024 * 1024
+
+# WINDOWS DRIVE PREFIXES (C:, C:\) ARE NEVER ALLOWED IN SAFE MODE
+_DRIVE_PATTERN = re.compile(r'^[A-Za-z]:')
+
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+# RETURNS A FRESH EXTRACTION SUMMARY
+def _new_stats():
+    return {'files': 0, 'directories': 0, 'links': 0, 'bytes': 0}
+
+# CHECKS THAT A RESOLVED PATH IS THE ROOT OR INSIDE IT
+def _is_within(root, path):
+    try:
+        return os.path.commonpath([root, path]) == root
+    except ValueError:
+        return False
+
+# RESOLVES THE OUTPUT PATH OF A MEMBER, REJECTING PATH TRAVERSAL IN SAFE MODE
+def _member_target(root, name, safe):
+    target = os.path.join(root, name)
+    if safe and (os.path.isabs(name) or _DRIVE_PATTERN.match(name) or not _is_within(root, os.path.realpath(target))):
+        raise ValueError(f"UNSAFE PATH IN ARCHIVE: {name}")
+    return target
+
+# RESERVES DISK SPACE FOR AN OUTPUT FILE UP FRONT (BEST EFFORT)
+def _preallocate(f, size):
+    if size <= 0 or not hasattr(os, 'posix_fallocate'): return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except OSError:
+        pass
+
+# REMOVES AN EXISTING FILE OR LINK SO IT CAN BE REPLACED
+def _replace_target(target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target): os.unlink(target)
+
+# APPLIES PERMISSIONS AND MODIFICATION TIME (SAFE MODE DROPS SETUID/SETGID/STICKY BITS)
+def _apply_attributes(target, mode, mtime, safe):
+    if mode: os.chmod(target, mode & (0o777 if safe else 0o7777))
+    os.utime(target, (mtime, mtime))
+
+# STREAMS ONE REGULAR TAR MEMBER TO DISK WITHOUT BUFFERING IT WHOLE
+def _extract_tar_file(tar, member, target, safe):
+    _replace_target(target)
+    source = tar.extractfile(member)
+    with open(target, 'wb') as out:
+        _preallocate(out, member.size)
+        shutil.copyfileobj(source, out, _CHUNK_SIZE)
+    _apply_attributes(target, member.mode, member.mtime, safe)
+
+# CREATES A SYMLINK MEMBER (SAFE MODE ONLY ALLOWS TARGETS INSIDE THE DESTINATION)
+def _extract_tar_symlink(root, member, target, safe):
+    if safe:
+        link_target = os.path.join(os.path.dirname(target), member.linkname)
+        if os.path.isabs(member.linkname) or not _is_within(root, os.path.realpath(link_target)):
+            raise ValueError(f"UNSAFE LINK IN ARCHIVE: {member.name} -> {member.linkname}")
+
+    _replace_target(target)
+    os.symlink(member.linkname, target)
+
+# CREATES A HARDLINK MEMBER TO AN ALREADY EXTRACTED FILE (COPIES IF LINKING FAILS)
+def _extract_tar_hardlink(root, member, target, safe):
+    source = _member_target(root, member.linkname, safe)
+    _replace_target(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+# APPLIES THE PERMISSIONS AND TIMES OF EXTRACTED DIRECTORIES ((TARGET, MODE, MTIME) TUPLES), DEEPEST FIRST
+# - RUN ONCE THEIR CONTENTS ARE EXTRACTED, SO WRITING INTO A DIRECTORY DOES NOT CHANGE ITS TIME AGAIN
+def restore_directories(directories, safe=True):
+    for target, mode, mtime in sorted(directories, reverse=True): _apply_attributes(target, mode, mtime, safe)
+
+# EXTRACTS A TAR ARCHIVE (ANY COMPRESSION) AS A SINGLE SEQUENTIAL STREAM
+# - MEMBERS ARE NOT KEPT IN MEMORY, SO ARCHIVES OF ANY SIZE USE CONSTANT MEMORY
+# - DEVICES AND FIFOS ARE SKIPPED
+# - directories (OPTIONAL LIST) RECEIVES THE DIRECTORY ATTRIBUTES INSTEAD OF HAVING THEM APPLIED, FOR CALLERS EXTRACTING SEVERAL
+#   ARCHIVES INTO ONE TREE AT ONCE (THEY CALL restore_directories WHEN ALL ARE DONE)
+def extract_tar(archive_path, destination, safe=True, directories=None):
+    root = os.path.realpath(destination)
+    os.makedirs(root, exist_ok=True)
+    stats, extracted = _new_stats(), []
+
+    with tarfile.open(archive_path, 'r|*') as tar:
+        for member in tar:
+            target = _member_target(root, member.name, safe)
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+                extracted.append((target, member.mode, member.mtime))
+                stats['directories'] += 1
+            elif member.isreg():
+                _extract_tar_file(tar, member, target, safe)
+                stats['files'] += 1
+                stats['bytes'] += member.size
+            elif member.issym():
+                _extract_tar_symlink(root, member, target, safe)
+                stats['links'] += 1
+            elif member.islnk():
+                _extract_tar_hardlink(root, member, target, safe)
+                stats['links'] += 1
+            tar.members = []
+
+    if directories is not None: directories.extend(extracted)
+    else: restore_directories(extracted, safe)
+    return stats
+
+# RETURNS THE OFFSET OF A ZIP MEMBER'S DATA BY READING ITS LOCAL HEADER
+def _zip_data_offset(archive_map, info):
+    header = archive_map[info.header_offset:info.header_offset + _ZIP_LOCAL_HEADER_SIZE]
+    if header[:4] != _ZIP_LOCAL_HEADER_SIGNATURE: raise ValueError(f"BAD LOCAL HEADER FOR ZIP MEMBER: {info.filename}")
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    return info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+
+# INFLATES ONE INPUT BLOCK IN BOUNDED STEPS (KEEPS HIGHLY COMPRESSED DATA FROM EXPANDING IN MEMORY)
+def _inflate_chunks(decompressor, block):
+    yield decompressor.decompress(block, _CHUNK_SIZE)
+    while decompressor.unconsumed_tail: yield decompressor.decompress(decompressor.unconsumed_tail, _CHUNK_SIZE)
+
+# WRITES A STORED OR DEFLATED MEMBER STRAIGHT FROM THE MMAP, CHECKING ITS CRC
+# - VIEWS ARE RELEASED BY CONTEXT MANAGERS SO THE MMAP CAN ALWAYS BE CLOSED, EVEN AFTER ERRORS
+def copy_zip_member_data(archive_map, info, out):
+    start = _zip_data_offset(archive_map, info)
+    decompressor = zlib.decompressobj(-15) if info.compress_type == zipfile.ZIP_DEFLATED else None
+    crc = 0
+
+    with memoryview(archive_map) as view, view[start:start + info.compress_size] as data:
+        for offset in range(0, len(data), _CHUNK_SIZE):
+            with data[offset:offset + _CHUNK_SIZE] as block:
+                chunks = (block,) if decompressor is None else _inflate_chunks(decompressor, block)
+                for chunk in chunks:
+                    crc = zlib.crc32(chunk, crc)
+                    out.write(chunk)
+
+    if decompressor is not None:
+        chunk = decompressor.flush()
+        crc = zlib.crc32(chunk, crc)
+        out.write(chunk)
+    if crc != info.CRC: raise ValueError(f"BAD CRC FOR ZIP MEMBER: {info.filename}")
+
+# EXTRACTS ONE ZIP MEMBER (RUNS IN WORKER THREADS)
+# - STORED/DEFLATED MEMBERS ARE READ FROM THE SHARED READ-ONLY MMAP
+# - OTHER METHODS (BZIP2, LZMA) FALL BACK TO THE SHARED ZipFile, WHICH SERIALISES ITS OWN READS
+def _extract_zip_member(archive_map, zipf, info, target, safe):
+    _replace_target(target)
+    with open(target, 'wb') as out:
+        _preallocate(out, info.file_size)
+        if info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            copy_zip_member_data(archive_map, info, out)
+        else:
+            with zipf.open(info) as source: shutil.copyfileobj(source, out, _CHUNK_SIZE)
+
+    mtime = time.mktime(info.date_time + (0, 0, -1))
+    _apply_attributes(target, (info.external_attr >> 16) & 0o7777, mtime, safe)
+
+# RECREATES FILES THAT A DEDUPLICATED ZIP LISTS IN ITS DEDUP MANIFEST AS COPIES OF A STORED MEMBER
+def _restore_zip_duplicates(root, duplicates, safe, stats):
+    for name, stored_name in duplicates.items():
+        source, target = _member_target(root, stored_name, safe), _member_target(root, name, safe)
+        _replace_target(target)
+        shutil.copy2(source, target)
+        stats['files'] += 1
+        stats['bytes'] += os.path.getsize(target)
+
+# EXTRACTS A ZIP ARCHIVE WITH MEMBERS WRITTEN IN PARALLEL FROM A SHARED MMAP OF THE ARCHIVE
+# - DEDUPLICATED ARCHIVES (autozip --dedup) GET THEIR DUPLICATE FILES RESTORED FROM THE STORED COPIES
+def extract_zip(archive_path, destination, jobs=1, safe=True):
+    root = os.path.realpath(destination)
+    os.makedirs(root, exist_ok=True)
+    stats, duplicates = _new_stats(), {}
+
+    with zipfile.ZipFile(archive_path) as zipf, open(archive_path, 'rb') as raw:
+        files = []
+        for info in zipf.infolist():
+            if info.flag_bits & 0x1:
+                raise ValueError(f"ENCRYPTED ZIP MEMBERS ARE NOT SUPPORTED: {info.filename}")
+            if info.filename == DEDUP_MANIFEST_NAME:
+                duplicates = load_dedup_manifest(zipf.read(info))
+                continue
+            target = _member_target(root, info.filename, safe)
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                stats['directories'] += 1
+            else:
+                files.append((info, target))
+
+        if files:
+            with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as archive_map, ThreadPoolExecutor(max_workers=jobs) as pool:
+                infos, targets = [info for info, _ in files], [target for _, target in files]
+                for _ in pool.map(_extract_zip_member, repeat(archive_map), repeat(zipf), infos, targets, repeat(safe)): pass
+
+    stats['files'] = len(files)
+    stats['bytes'] = sum(info.file_size for info, _ in files)
+    _restore_zip_duplicates(root, duplicates, safe, stats)
+    return stats
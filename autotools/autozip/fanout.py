@@ -0,0 +1,111 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# READ CHUNK SIZE; EVERY CHUNK IS SHARED (NOT COPIED) BY ALL WRITERS
+_CHUNK_SIZE = 1024 * 1024
+
+# CHUNKS QUEUED PER WRITER BEFORE THE READER WAITS FOR IT (BOUNDS MEMORY AND KEEPS WRITERS IN STEP)
+QUEUE_DEPTH = 16
+
+# MARKS THE END OF ONE FILE'S CHUNKS
+_END = object()
+
+# MARKS A FILE WHOSE READ FAILED PART WAY: WRITERS RAISE RATHER THAN CLOSE THE MEMBER AS IF IT WERE COMPLETE
+_ABORT = object()
+
+# FILE-LIKE VIEW OF ONE FILE'S CHUNKS AS THEY ARRIVE ON A WRITER'S QUEUE
+class QueueReader:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._chunk = b''
+        self._position = 0
+        self._done = False
+
+    # MAKES SURE UNREAD BYTES ARE AVAILABLE, RETURNING False AT THE END OF THE FILE (RAISES WHEN THE SOURCE COULD NOT BE READ TO ITS END)
+    def _fill(self):
+        while self._position == len(self._chunk) and not self._done:
+            chunk = self._chunks.get()
+            if chunk is _ABORT: raise OSError("SOURCE FILE READ FAILED BEFORE ITS END")
+            if chunk is _END: self._done = True
+            else: self._chunk, self._position = chunk, 0
+        return not self._done
+
+    # RETURNS UP TO size BYTES FROM THE START OF THE UNREAD DATA WITHOUT CONSUMING THEM
+    def peek(self, size):
+        if not self._fill(): return b''
+        return self._chunk[self._position:self._position + size]
+
+    # RETURNS THE REST OF THE CURRENT CHUNK (b'' AT THE END OF THE FILE)
+    def read1(self, size=-1):
+        if not self._fill(): return b''
+        end = len(self._chunk) if size < 0 else min(len(self._chunk), self._position + size)
+        data = self._chunk[self._position:end] if self._position or end < len(self._chunk) else self._chunk
+        self._position = end
+        return data
+
+    # RETURNS EXACTLY size BYTES (FEWER ONLY AT THE END OF THE FILE), OR EVERYTHING LEFT WHEN size IS NEGATIVE
+    def read(self, size=-1):
+        parts = []
+        while size and (part := self.read1(size)):
+            parts.append(part)
+            if size > 0: size -= len(part)
+        return b''.join(parts)
+
+    # SKIPS WHATEVER THE WRITER DID NOT READ
+    def drain(self):
+        while self._fill(): self._position = len(self._chunk)
+
+# RUNS ONE WRITER ON ITS OWN THREAD UNTIL THE END-OF-SOURCES MARKER
+# - open_writer IS A CONTEXT MANAGER FACTORY YIELDING add(entry, reader); reader IS None FOR ENTRIES WITHOUT DATA
+# - A FAILED WRITER SETS failed AND KEEPS EMPTYING ITS QUEUE SO THE READER NEVER BLOCKS, THEN RE-RAISES
+def _run_writer(open_writer, chunks, failed):
+    finished = False
+    try:
+        with open_writer() as add:
+            while (entry := chunks.get()) is not None:
+                reader = QueueReader(chunks) if entry[-1] else None
+                add(entry[:-1], reader)
+                if reader is not None: reader.drain()
+            finished = True
+    except BaseException:
+        failed.set()
+        while not finished: finished = chunks.get() is None
+        raise
+
+# QUEUES ONE ENTRY (AND ITS CHUNKS) TO EVERY WRITER; STOPS EARLY WHEN A WRITER HAS FAILED
+# - A READ ERROR SENDS _ABORT INSTEAD OF _END, SO NO WRITER ENDS A TRUNCATED MEMBER NORMALLY, THEN RE-RAISES
+def _read_sources(entries, queues, failed, skip):
+    for entry in entries:
+        if failed.is_set(): return
+        path = entry[0]
+        if os.path.abspath(path) in skip: continue
+
+        has_data = path.is_file()
+        for chunks in queues: chunks.put((*entry, has_data))
+        if not has_data: continue
+        try:
+            with open(path, 'rb') as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    for chunks in queues: chunks.put(chunk)
+        except BaseException:
+            for chunks in queues: chunks.put(_ABORT)
+            raise
+        for chunks in queues: chunks.put(_END)
+
+# READS EVERY SOURCE FILE ONCE AND FEEDS ITS BYTES TO SEVERAL WRITERS, EACH RUNNING ON ITS OWN THREAD
+# - entries YIELDS TUPLES WHOSE FIRST ITEM IS THE SOURCE PATH (A DirEntry OR Path); WRITERS RECEIVE THEM UNCHANGED
+# - skip HOLDS ABSOLUTE PATHS NEVER READ (THE OUTPUTS BEING WRITTEN)
+# - EACH WRITER HAS AT MOST queue_depth CHUNKS QUEUED, SO THE FASTEST WRITER RUNS AT MOST THAT FAR AHEAD OF THE SLOWEST
+def fan_out(entries, writers, skip=(), queue_depth=QUEUE_DEPTH):
+    skip = {os.path.abspath(path) for path in skip}
+    queues = [queue.Queue(maxsize=queue_depth) for _ in writers]
+    failed = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(writers)) as pool:
+        futures = [pool.submit(_run_writer, open_writer, chunks, failed) for open_writer, chunks in zip(writers, queues)]
+        try:
+            _read_sources(entries, queues, failed, skip)
+        finally:
+            for chunks in queues: chunks.put(None)
+    for future in futures: future.result()
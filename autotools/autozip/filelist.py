@@ -0,0 +1,36 @@
+import os
+import sys
+from contextlib import contextmanager
+
+# PATH ARGUMENT MEANING STANDARD INPUT
+STDIN = '-'
+
+# BYTES READ PER STEP FROM A FILE LIST
+_READ_SIZE = 64 * 1024
+
+# DECODES RAW FILE LIST ENTRIES INTO PATHS, SKIPPING EMPTY ONES (AND CR OF CRLF LINE ENDINGS)
+def _decode_entries(entries, separator):
+    for entry in entries:
+        if separator == b'\n': entry = entry.rstrip(b'\r')
+        if entry: yield os.fsdecode(entry)
+
+# YIELDS PATHS FROM A BINARY STREAM OF NUL- OR NEWLINE-SEPARATED ENTRIES WITHOUT READING IT WHOLE
+# - THE SEPARATOR IS NUL IF THE FIRST BLOCK CONTAINS ONE (find -print0, git ls-files -z), NEWLINE OTHERWISE
+def iter_file_list(stream):
+    separator, pending = None, b''
+    while block := stream.read(_READ_SIZE):
+        if separator is None: separator = b'\0' if b'\0' in block else b'\n'
+        *entries, pending = (pending + block).split(separator)
+        yield from _decode_entries(entries, separator)
+    yield from _decode_entries([pending], separator)
+
+# OPENS A FILE LIST FOR READING ('-' IS STANDARD INPUT)
+@contextmanager
+def open_file_list(path):
+    if path == STDIN:
+        yield sys.stdin.buffer
+        return
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"FILE LIST NOT FOUND: {path}")
+    with open(path, 'rb') as f: yield f
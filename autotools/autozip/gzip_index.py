@@ -0,0 +1,103 @@
+import os
+import json
+import zlib
+import tarfile
+from bisect import bisect_right
+from pathlib import Path
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.index.json'
+
+# DEFAULT UNCOMPRESSED DISTANCE BETWEEN ACCESS POINTS
+DEFAULT_INDEX_INTERVAL = 4 * 1024 * 1024
+
+# COMPRESSED BYTES READ PER STEP (ALSO CAPS DECOMPRESSED OUTPUT PER STEP)
+_CHUNK_SIZE = 1024 * 1024
+
+# RETURNS THE SIDECAR INDEX PATH FOR AN ARCHIVE
+def index_path_for(archive_path):
+    return f"{archive_path}{INDEX_SUFFIX}"
+
+# TarFile THAT RECORDS WHERE EACH REGULAR MEMBER'S DATA STARTS IN THE UNCOMPRESSED TAR STREAM
+# - HARDLINKS (E.G. FROM --dedup) POINT AT THE DATA OF THEIR TARGET
+class IndexingTarFile(tarfile.TarFile):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.member_offsets = {}
+
+    def addfile(self, tarinfo, fileobj=None):
+        super().addfile(tarinfo, fileobj)
+        if tarinfo.isreg():
+            padded_size = -(-tarinfo.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+            self.member_offsets[tarinfo.name] = [self.offset - padded_size, tarinfo.size]
+        elif tarinfo.islnk() and tarinfo.linkname in self.member_offsets:
+            self.member_offsets[tarinfo.name] = self.member_offsets[tarinfo.linkname]
+
+# WRITES THE SIDECAR INDEX OF A TAR.GZ ARCHIVE AS COMPACT JSON
+def write_index(archive_path, access_points, member_offsets, interval):
+    index = {
+        'version': INDEX_VERSION,
+        'format': 'tar.gz',
+        'archive_size': os.path.getsize(archive_path),
+        'interval': interval,
+        'access_points': [list(point) for point in access_points],
+        'members': member_offsets,
+    }
+    index_path = index_path_for(archive_path)
+    with open(index_path, 'w', encoding='utf-8') as f: json.dump(index, f, separators=(',', ':'))
+    return index_path
+
+# LOADS AND VALIDATES A SIDECAR INDEX
+def load_index(index_path):
+    if not Path(index_path).is_file():
+        raise FileNotFoundError(f"INDEX NOT FOUND: {index_path} (CREATE THE ARCHIVE WITH --index)")
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f: index = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"INVALID INDEX: {index_path}: {str(e)}")
+
+    if not isinstance(index, dict) or index.get('version') != INDEX_VERSION or not index.get('access_points') \
+            or not isinstance(index.get('members'), dict):
+        raise ValueError(f"INVALID INDEX: {index_path}")
+    return index
+
+# INFLATES COMPRESSED CHUNKS IN BOUNDED STEPS
+def _inflate(decompressor, chunks):
+    for chunk in chunks:
+        yield decompressor.decompress(chunk, _CHUNK_SIZE)
+        while decompressor.unconsumed_tail: yield decompressor.decompress(decompressor.unconsumed_tail, _CHUNK_SIZE)
+
+# READS A FILE IN CHUNKS FROM ITS CURRENT POSITION
+def _read_chunks(f):
+    while chunk := f.read(_CHUNK_SIZE): yield chunk
+
+# COPIES ONE MEMBER OF AN INDEXED TAR.GZ TO out, INFLATING ONLY FROM THE NEAREST ACCESS POINT BEFORE IT
+def read_member(archive_path, member, out):
+    index = load_index(index_path_for(archive_path))
+    if os.path.getsize(archive_path) != index['archive_size']:
+        raise ValueError(f"INDEX DOES NOT MATCH ARCHIVE: {archive_path}")
+
+    entry = index['members'].get(member)
+    if entry is None: raise FileNotFoundError(f"MEMBER NOT FOUND IN ARCHIVE: {member}")
+    offset, remaining = entry
+    if not remaining: return 0
+
+    points = index['access_points']
+    start, compressed_offset = points[bisect_right(points, offset, key=lambda point: point[0]) - 1]
+    skip = offset - start
+
+    with open(archive_path, 'rb') as f:
+        f.seek(compressed_offset)
+        for data in _inflate(zlib.decompressobj(-15), _read_chunks(f)):
+            if skip >= len(data):
+                skip -= len(data)
+                continue
+            data = data[skip:skip + remaining]
+            skip = 0
+            out.write(data)
+            remaining -= len(data)
+            if not remaining:
+                return entry[1]
+
+    raise ValueError(f"TRUNCATED ARCHIVE: {archive_path}")
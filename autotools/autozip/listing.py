@@ -0,0 +1,93 @@
+import stat
+import tarfile
+import zipfile
+from datetime import datetime
+from .dedup import DEDUP_MANIFEST_NAME, load_dedup_manifest
+
+# NUMBER OF LARGEST MEMBERS REPORTED BY archive_stat
+LARGEST_MEMBERS = 10
+
+# ZIP COMPRESSION METHOD NAMES
+_ZIP_METHODS = {zipfile.ZIP_STORED: 'stored', zipfile.ZIP_DEFLATED: 'deflated', zipfile.ZIP_BZIP2: 'bzip2', zipfile.ZIP_LZMA: 'lzma'}
+
+# RETURNS compressed / size ROUNDED FOR DISPLAY, OR None WHEN UNKNOWN OR EMPTY
+def _ratio(compressed_size, size):
+    return round(compressed_size / size, 4) if compressed_size is not None and size else None
+
+# RETURNS THE ENTRY TYPE OF A TAR MEMBER
+def _tar_type(member):
+    if member.isreg(): return 'file'
+    elif member.isdir(): return 'dir'
+    elif member.issym(): return 'symlink'
+    elif member.islnk(): return 'hardlink'
+    return 'other'
+
+# RETURNS THE ENTRY TYPE OF A ZIP MEMBER (SYMLINKS ARE RECORDED IN THE UNIX MODE BITS)
+def _zip_type(info):
+    if info.is_dir(): return 'dir'
+    if stat.S_ISLNK(info.external_attr >> 16): return 'symlink'
+    return 'file'
+
+# LISTS A ZIP ARCHIVE FROM ITS CENTRAL DIRECTORY ONLY (NO MEMBER DATA IS READ)
+# - COPIES SKIPPED BY --dedup ARE READ FROM THE (SMALL) DEDUP MANIFEST MEMBER AND LISTED AS HARDLINKS, AS IN TAR
+def list_zip(archive_path):
+    entries, duplicates = [], {}
+    with zipfile.ZipFile(archive_path) as zipf:
+        for info in zipf.infolist():
+            if info.filename == DEDUP_MANIFEST_NAME:
+                duplicates = load_dedup_manifest(zipf.read(info))
+                continue
+            entries.append({
+                'name': info.filename,
+                'type': _zip_type(info),
+                'size': info.file_size,
+                'compressed_size': info.compress_size,
+                'ratio': _ratio(info.compress_size, info.file_size),
+                'method': _ZIP_METHODS.get(info.compress_type, str(info.compress_type)),
+                'mtime': datetime(*info.date_time).isoformat(),
+            })
+
+    mtimes = {entry['name']: entry['mtime'] for entry in entries}
+    for name, stored_name in duplicates.items():
+        entries.append({'name': name, 'type': 'hardlink', 'size': 0, 'compressed_size': 0, 'ratio': None, 'method': 'dedup',
+                        'mtime': mtimes.get(stored_name)})
+    return entries
+
+# LISTS A TAR ARCHIVE FROM ITS MEMBER HEADERS
+# - UNCOMPRESSED TARS SEEK OVER MEMBER DATA, SO ONLY HEADER BLOCKS ARE READ
+# - COMPRESSED TARS ARE STREAMED ONCE (THE DATA MUST BE INFLATED TO REACH THE NEXT HEADER) BUT NEVER KEPT
+def list_tar(archive_path, archive_format='tar'):
+    entries = []
+    with tarfile.open(archive_path, 'r:' if archive_format == 'tar' else 'r|*') as tar:
+        for member in tar:
+            entries.append({
+                'name': member.name,
+                'type': _tar_type(member),
+                'size': member.size if member.isreg() else 0,
+                'compressed_size': None,
+                'ratio': None,
+                'method': None,
+                'mtime': datetime.fromtimestamp(int(member.mtime)).isoformat(),
+            })
+            tar.members = []
+    return entries
+
+# SUMMARISES ARCHIVE ENTRIES: COUNTS, TOTAL AND COMPRESSED SIZE, OVERALL RATIO AND LARGEST MEMBERS
+# - TAR FORMATS ARE COMPRESSED AS ONE STREAM, SO THEIR COMPRESSED SIZE IS THE ARCHIVE SIZE
+def archive_stat(entries, archive_size):
+    files = [entry for entry in entries if entry['type'] == 'file']
+    total_size = sum(entry['size'] for entry in files)
+    compressed = [entry['compressed_size'] for entry in files if entry['compressed_size'] is not None]
+    compressed_size = sum(compressed) if len(compressed) == len(files) and files else archive_size
+
+    return {
+        'archive_size': archive_size,
+        'entries': len(entries),
+        'files': len(files),
+        'directories': sum(1 for entry in entries if entry['type'] == 'dir'),
+        'links': sum(1 for entry in entries if entry['type'] in ('symlink', 'hardlink')),
+        'total_size': total_size,
+        'compressed_size': compressed_size,
+        'ratio': _ratio(compressed_size, total_size),
+        'largest': sorted(files, key=lambda entry: entry['size'], reverse=True)[:LARGEST_MEMBERS],
+    }
@@ -0,0 +1,78 @@
+import json
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+
+# ORDER OF THE VALUES STORED FOR EACH FILE (KEPT AS LISTS TO KEEP MANIFESTS COMPACT)
+MANIFEST_FIELDS = ('size', 'mtime_ns', 'inode', 'sha256')
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# RETURNS THE SIDECAR MANIFEST PATH FOR AN ARCHIVE
+def manifest_path_for(archive_path):
+    return f"{archive_path}{MANIFEST_SUFFIX}"
+
+# RETURNS THE SHA-256 HEX DIGEST OF A FILE (STREAMED)
+def hash_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE): digest.update(chunk)
+    return digest.hexdigest()
+
+# LOADS AND VALIDATES A MANIFEST FILE
+def load_manifest(manifest_path):
+    if not Path(manifest_path).is_file():
+        raise FileNotFoundError(f"MANIFEST NOT FOUND: {manifest_path}")
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f: manifest = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"INVALID MANIFEST: {manifest_path}: {str(e)}")
+
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION or not isinstance(manifest.get('files'), dict):
+        raise ValueError(f"INVALID MANIFEST: {manifest_path}")
+    return manifest
+
+# WRITES A MANIFEST AS COMPACT JSON
+def write_manifest(manifest_path, manifest):
+    with open(manifest_path, 'w', encoding='utf-8') as f: json.dump(manifest, f, separators=(',', ':'))
+    return manifest_path
+
+# SCANS SOURCE FILES AGAINST AN OPTIONAL BASE MANIFEST
+# - members YIELDS (PATH, ARCHIVE NAME) WITH Path OR os.DirEntry PATHS (A DirEntry REUSES ITS CACHED STAT)
+# - FILES WHOSE SIZE, MTIME AND INODE MATCH THE BASE REUSE THE BASE HASH WITHOUT BEING READ
+# - OTHER FILES ARE HASHED AND ONLY COUNT AS CHANGED IF THEIR CONTENT DIFFERS
+# - RETURNS THE NEW MANIFEST AND THE SET OF ARCHIVE NAMES THAT MUST BE WRITTEN
+def build_manifest(members, layout, base=None, base_path=None):
+    base_files = base['files'] if base else {}
+    files, added, changed = {}, [], []
+
+    for file_path, arcname in members:
+        st = file_path.stat()
+        previous = base_files.get(arcname)
+
+        if previous and previous[:3] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+            digest = previous[3]
+        else:
+            digest = hash_file(file_path)
+            if previous is None: added.append(arcname)
+            elif previous[3] != digest: changed.append(arcname)
+
+        files[arcname] = [st.st_size, st.st_mtime_ns, st.st_ino, digest]
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'layout': layout,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'base': str(base_path) if base_path else None,
+        'fields': list(MANIFEST_FIELDS),
+        'files': files,
+        'added': added,
+        'changed': changed,
+        'deleted': sorted(set(base_files) - set(files)),
+    }
+
+    return manifest, set(added) | set(changed)
@@ -0,0 +1,78 @@
+import time
+import zlib
+import struct
+from collections import deque
+from .block_writer import ParallelBlockWriter
+
+# UNCOMPRESSED BYTES PER INDEPENDENTLY DEFLATED BLOCK
+DEFAULT_BLOCK_SIZE = 128 * 1024
+
+# DEFLATE WINDOW SIZE USED TO PRIME EACH BLOCK WITH THE PREVIOUS BLOCK'S TAIL
+_DICTIONARY_SIZE = 32 * 1024
+
+# ZLIB DEFLATE STATE FOR wbits=15, memLevel=8 (WINDOW + HASH TABLES)
+_DEFLATE_MEMORY = 256 * 1024
+
+# LENGTH OF THE HEADER WRITTEN BY _gzip_header (NO OPTIONAL FIELDS)
+_GZIP_HEADER_SIZE = 10
+
+# BUILDS A MINIMAL GZIP MEMBER HEADER (RFC 1952)
+def _gzip_header(compression_level, mtime=None):
+    if mtime is None: mtime = int(time.time())
+    xfl = 2 if compression_level >= 9 else 4 if compression_level <= 1 else 0
+    return struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, 0, mtime & 0xffffffff, xfl, 255)
+
+# DEFLATES ONE BLOCK AS A RAW DEFLATE FRAGMENT (RUNS IN WORKER THREADS)
+# - NON-FINAL BLOCKS END WITH A SYNC FLUSH SO FRAGMENTS CONCATENATE INTO ONE STREAM
+# - THE PREVIOUS 32 KIB IS SET AS DICTIONARY SO BACK-REFERENCES STAY VALID ACROSS BLOCKS
+def _deflate_block(block, dictionary, compression_level, finish):
+    kwargs = {'zdict': dictionary} if dictionary else {}
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15, **kwargs)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+# FILE-LIKE WRITER PRODUCING A SINGLE-MEMBER GZIP STREAM FROM BLOCKS DEFLATED IN PARALLEL (PIGZ-STYLE)
+# - WITH index_interval, THE DICTIONARY IS RESET AT LEAST EVERY index_interval UNCOMPRESSED BYTES AND EACH RESET IS
+#   RECORDED IN access_points AS (UNCOMPRESSED OFFSET, COMPRESSED OFFSET); INFLATING CAN START THERE WITH NO HISTORY
+class ParallelGzipWriter(ParallelBlockWriter):
+    # WRITES THE GZIP HEADER AND STARTS THE WORKER POOL
+    def __init__(self, fileobj, compression_level=6, jobs=1, block_size=None, memory_limit=None, mtime=None, index_interval=None):
+        self._level = compression_level
+        super().__init__(fileobj, jobs, block_size or DEFAULT_BLOCK_SIZE, memory_limit)
+        self._dictionary = b''
+        self._crc = 0
+        self._index_interval = index_interval
+        self._next_access_point = 0
+        self._access_blocks = deque()
+        self._offset = 0
+        self._written_blocks = 0
+        self._compressed = _GZIP_HEADER_SIZE
+        self.access_points = []
+        self._fileobj.write(_gzip_header(compression_level, mtime))
+
+    def _worker_memory(self):
+        return _DEFLATE_MEMORY + super()._worker_memory()
+
+    # UPDATES THE RUNNING CRC IN STREAM ORDER AND PRIMES THE NEXT BLOCK'S DICTIONARY (EMPTY AT ACCESS POINTS)
+    def _block_task(self, block, finish):
+        dictionary = self._dictionary
+        if self._index_interval and self._offset >= self._next_access_point:
+            dictionary = b''
+            self._access_blocks.append((self._blocks, self._offset))
+            self._next_access_point = self._offset + self._index_interval
+
+        self._offset += len(block)
+        self._crc = zlib.crc32(block, self._crc)
+        self._dictionary = (dictionary + block)[-_DICTIONARY_SIZE:]
+        return _deflate_block, block, dictionary, self._level, finish
+
+    # TRACKS THE COMPRESSED OFFSET OF EVERY BLOCK TO RESOLVE ACCESS POINTS
+    def _write_block(self, data):
+        if self._access_blocks and self._access_blocks[0][0] == self._written_blocks:
+            self.access_points.append((self._access_blocks.popleft()[1], self._compressed))
+        self._written_blocks += 1
+        self._compressed += len(data)
+        super()._write_block(data)
+
+    # WRITES THE CRC-32 AND ISIZE TRAILER
+    def _write_trailer(self):
+        self._fileobj.write(struct.pack('<II', self._crc & 0xffffffff, self._size & 0xffffffff))
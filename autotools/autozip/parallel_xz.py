@@ -0,0 +1,34 @@
+import lzma
+from .block_writer import ParallelBlockWriter
+
+_MIB = 1024 * 1024
+
+# LZMA2 DICTIONARY SIZE PER PRESET (xz(1) PRESET TABLE)
+_PRESET_DICT_SIZE = (256 * 1024, 1 * _MIB, 2 * _MIB, 4 * _MIB, 4 * _MIB, 8 * _MIB, 8 * _MIB, 16 * _MIB, 32 * _MIB, 64 * _MIB)
+
+# APPROXIMATE COMPRESSOR MEMORY PER PRESET (xz(1) PRESET TABLE)
+_PRESET_MEMORY = (3 * _MIB, 9 * _MIB, 17 * _MIB, 32 * _MIB, 48 * _MIB, 94 * _MIB, 94 * _MIB, 186 * _MIB, 370 * _MIB, 674 * _MIB)
+
+# DEFAULT BLOCK SIZE FOR A PRESET (3x DICTIONARY LIKE xz -T, AT LEAST 1 MIB)
+def default_block_size(compression_level):
+    return max(3 * _PRESET_DICT_SIZE[compression_level], _MIB)
+
+# COMPRESSES ONE BLOCK INTO A SELF-CONTAINED XZ STREAM (RUNS IN WORKER THREADS)
+def _compress_xz_block(block, compression_level):
+    return lzma.compress(block, format=lzma.FORMAT_XZ, check=lzma.CHECK_CRC64, preset=compression_level)
+
+# FILE-LIKE WRITER PRODUCING CONCATENATED XZ STREAMS FROM BLOCKS COMPRESSED IN PARALLEL
+# - EACH BLOCK IS AN INDEPENDENT STREAM, SO BLOCKS CAN ALSO BE DECOMPRESSED IN PARALLEL
+# - CONCATENATED STREAMS ARE PART OF THE XZ FORMAT AND ARE READ BY xz, tar AND lzma.open
+class ParallelXzWriter(ParallelBlockWriter):
+    _always_finish = False
+
+    def __init__(self, fileobj, compression_level=6, jobs=1, block_size=None, memory_limit=None):
+        self._level = compression_level
+        super().__init__(fileobj, jobs, block_size or default_block_size(compression_level), memory_limit)
+
+    def _worker_memory(self):
+        return _PRESET_MEMORY[self._level] + super()._worker_memory()
+
+    def _block_task(self, block, finish):
+        return _compress_xz_block, block, self._level
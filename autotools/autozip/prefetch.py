@@ -0,0 +1,53 @@
+import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# DEFAULT NUMBER OF FILES READ AHEAD OF THE WRITER, AND MEMORY THEY MAY HOLD
+DEFAULT_PREFETCH_DEPTH = 64
+DEFAULT_PREFETCH_MEMORY = 64 * 1024 * 1024
+
+# READER THREADS (OPENING AND READING SMALL FILES IS LATENCY-BOUND, SO MORE THREADS THAN CORES HELP)
+PREFETCH_READERS = 8
+
+# FILES LARGER THAN THIS ARE NOT BUFFERED: THE WRITER STREAMS THEM ITSELF (OR COPIES THEM IN THE KERNEL)
+PREFETCH_MAX_FILE_SIZE = 1024 * 1024
+
+# READS A WHOLE FILE (RUNS IN READER THREADS)
+def _read_file(path):
+    with open(path, 'rb') as f: return f.read()
+
+# RETURNS THE SIZE TO PREFETCH FOR AN ENTRY, OR None WHEN THE WRITER SHOULD READ IT ITSELF
+# - TAR STORES SYMLINKS AS LINKS, SO ONLY REGULAR FILES ARE READ; ZIP FOLLOWS THEM
+def _prefetch_size(path, follow_symlinks, max_size):
+    st = path.stat(follow_symlinks=follow_symlinks)
+    if not stat.S_ISREG(st.st_mode) or st.st_size > max_size: return None
+    return st.st_size
+
+# YIELDS (PATH, ARCHIVE NAME, DATA) FOR EVERY ENTRY, IN ORDER, WHILE A THREAD POOL READS UPCOMING SMALL FILES AHEAD
+# - DATA IS THE FILE CONTENT, OR None FOR ENTRIES NOT PREFETCHED (DIRECTORIES, LINKS, LARGE FILES, ENTRIES wanted REJECTS)
+# - AT MOST depth ENTRIES AND ABOUT memory_limit BYTES OF FILE CONTENT ARE HELD AHEAD OF THE WRITER
+# - READ ERRORS ARE RAISED WHEN THE WRITER REACHES THE FILE, AS IF IT HAD OPENED IT ITSELF
+def prefetch(entries, depth=DEFAULT_PREFETCH_DEPTH, memory_limit=DEFAULT_PREFETCH_MEMORY, wanted=None, follow_symlinks=False):
+    max_size = min(PREFETCH_MAX_FILE_SIZE, memory_limit)
+    pending, buffered = deque(), 0
+    entries = iter(entries)
+    upcoming = next(entries, None)
+
+    with ThreadPoolExecutor(max_workers=min(depth, PREFETCH_READERS)) as pool:
+        try:
+            while pending or upcoming is not None:
+                while upcoming is not None and len(pending) < depth:
+                    path, arcname = upcoming
+                    size = _prefetch_size(path, follow_symlinks, max_size) if wanted is None or wanted(arcname) else None
+                    if size is not None and pending and buffered + size > memory_limit: break
+                    future = pool.submit(_read_file, path) if size is not None else None
+                    pending.append((path, arcname, future, size or 0))
+                    buffered += size or 0
+                    upcoming = next(entries, None)
+
+                path, arcname, future, size = pending.popleft()
+                buffered -= size
+                yield path, arcname, None if future is None else future.result()
+        finally:
+            for _, _, future, _ in pending:
+                if future is not None: future.cancel()
@@ -0,0 +1,153 @@
+import os
+import stat
+import time
+import threading
+
+# SECONDS BETWEEN TWO PROGRESS SNAPSHOTS
+PROGRESS_INTERVAL = 0.5
+
+_MB = 1024 * 1024
+
+# RETURNS THE NUMBER OF SOURCE BYTES AN ENTRY CONTRIBUTES (REGULAR FILES ONLY; ZIP FOLLOWS SYMLINKS, TAR STORES THEM AS LINKS)
+def _data_size(path, layout):
+    st = path.stat(follow_symlinks=layout == 'zip')
+    return st.st_size if stat.S_ISREG(st.st_mode) else 0
+
+# RETURNS (FILES, BYTES) FOR WALKED ENTRIES ((PATH, NAME, ...) TUPLES), THE TOTALS THE ETA IS BASED ON
+def scan_totals(entries, layout):
+    files, size = 0, 0
+    for entry in entries:
+        files += 1
+        size += _data_size(entry[0], layout)
+    return files, size
+
+# RETURNS A RATE PER SECOND, OR None WHEN NO TIME HAS PASSED
+def _rate(amount, seconds, unit=1):
+    return round(amount / unit / seconds, 2) if seconds > 0 else None
+
+# STANDS IN FOR A SourceWalker (OR ShardWalker), COUNTING EVERY ENTRY ONCE THE WRITER ASKS FOR THE NEXT ONE (I.E. IS DONE WITH IT)
+class ProgressWalker:
+    def __init__(self, walker, tracker):
+        self._walker = walker
+        self._tracker = tracker
+
+    def _track(self, entries, layout):
+        for entry in entries:
+            self._tracker.begin(entry[1])
+            yield entry
+            self._tracker.advance(_data_size(entry[0], layout))
+
+    def entries(self, source_paths=(), layout='tar'):
+        return self._track(self._walker.entries(source_paths, layout), layout)
+
+    def files(self, source_paths=(), layout='zip'):
+        return self._track(self._walker.files(source_paths, layout), layout)
+
+    def layouts(self, source_paths):
+        return self._track(self._walker.layouts(source_paths), 'tar')
+
+# WRITE-ONLY STREAM WRAPPER COUNTING THE BYTES WRITTEN (FOR OUTPUTS THAT CANNOT BE STAT'ED, SUCH AS STDOUT)
+class _CountingStream:
+    def __init__(self, stream, tracker):
+        self._stream = stream
+        self._tracker = tracker
+
+    def write(self, data):
+        written = self._stream.write(data)
+        self._tracker.wrote(len(data))
+        return written
+
+    def flush(self):
+        self._stream.flush()
+
+# COLLECTS PROGRESS COUNTERS WHILE AN ARCHIVE IS WRITTEN AND HANDS A SNAPSHOT (DICT) TO callback EVERY interval SECONDS
+# - USED AS A CONTEXT MANAGER: A REPORTER THREAD RUNS INSIDE THE BLOCK, AND A FINAL SNAPSHOT ('done': True) FOLLOWS A SUCCESSFUL WRITE
+# - INPUT IS COUNTED PER ENTRY THROUGH track(); OUTPUT IS THE SIZE OF THE watch()'ED FILES PLUS THE BYTES WRITTEN THROUGH count()
+# - RATES IN A SNAPSHOT COVER THE LAST INTERVAL (THE WHOLE RUN IN THE FINAL ONE); THE ETA USES THE AVERAGE RATE SO FAR
+class ProgressTracker:
+    def __init__(self, callback, interval=None):
+        self._callback = callback
+        self._interval = PROGRESS_INTERVAL if interval is None else interval
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._outputs = []
+        self.total_files, self.total_bytes = None, None
+        self.files, self.bytes_in, self.streamed, self.current = 0, 0, 0, None
+        self._restart_clock()
+
+    # STARTS TIMING (RATES AND THE ETA EXCLUDE THE PRE-SCAN)
+    def _restart_clock(self):
+        self._start = self._last_advance = time.monotonic()
+        self._start_cpu = time.process_time()
+        self._window = (self._start, self._start_cpu, 0, 0, 0)
+
+    # SETS THE TOTALS FROM A PRE-SCAN OF THE SOURCES
+    def expect(self, files, size):
+        self.total_files, self.total_bytes = files, size
+
+    # ADDS OUTPUT FILES WHOSE SIZE COUNTS AS WRITTEN BYTES
+    def watch(self, paths):
+        self._outputs.extend(str(path) for path in paths)
+
+    def track(self, walker):
+        return ProgressWalker(walker, self)
+
+    def count(self, stream):
+        return _CountingStream(stream, self)
+
+    def begin(self, name):
+        self.current = name
+
+    def advance(self, size):
+        with self._lock:
+            self.files += 1
+            self.bytes_in += size
+            self._last_advance = time.monotonic()
+
+    def wrote(self, size):
+        with self._lock: self.streamed += size
+
+    def _bytes_out(self):
+        size = self.streamed
+        for path in self._outputs:
+            try: size += os.path.getsize(path)
+            except OSError: pass
+        return size
+
+    # RETURNS THE CURRENT COUNTERS, RATES (MB/S, FILES/S), COMPRESSION RATIO (OUTPUT / INPUT), PERCENT DONE AND ETA (SECONDS)
+    # - read_mb_s: SOURCE BYTES CONSUMED; write_mb_s: ARCHIVE BYTES PRODUCED; compress_mb_s: SOURCE BYTES PER CPU-SECOND OF THE PROCESS
+    # - idle: SECONDS SINCE THE LAST ENTRY WAS DONE (A GROWING VALUE POINTS AT A STALLED OR VERY LARGE FILE)
+    def snapshot(self, done=False):
+        with self._lock: files, bytes_in, last_advance = self.files, self.bytes_in, self._last_advance
+        now, cpu, bytes_out = time.monotonic(), time.process_time(), self._bytes_out()
+        since, since_cpu, since_files, since_in, since_out = (self._start, self._start_cpu, 0, 0, 0) if done else self._window
+        self._window = (now, cpu, files, bytes_in, bytes_out)
+        elapsed, total = now - self._start, self.total_bytes or self.total_files
+        done_amount = bytes_in if self.total_bytes else files
+        average = done_amount / elapsed if elapsed > 0 else 0
+        return {
+            'elapsed': round(elapsed, 2), 'files': files, 'total_files': self.total_files, 'bytes_in': bytes_in, 'total_bytes': self.total_bytes,
+            'bytes_out': bytes_out, 'ratio': round(bytes_out / bytes_in, 4) if bytes_in else None,
+            'files_per_s': _rate(files - since_files, now - since),
+            'read_mb_s': _rate(bytes_in - since_in, now - since, _MB),
+            'compress_mb_s': _rate(bytes_in - since_in, cpu - since_cpu, _MB),
+            'write_mb_s': _rate(bytes_out - since_out, now - since, _MB),
+            'percent': round(min(100.0, 100 * done_amount / total), 1) if total else (100.0 if done else None),
+            'eta': 0 if done else round((total - done_amount) / average, 1) if total and average else None,
+            'idle': round(now - last_advance, 2), 'current': None if done else self.current, 'done': done,
+        }
+
+    def _report(self):
+        while not self._stopped.wait(self._interval): self._callback(self.snapshot())
+
+    def __enter__(self):
+        self._restart_clock()
+        self._thread = threading.Thread(target=self._report, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stopped.set()
+        self._thread.join()
+        if exc_type is None: self._callback(self.snapshot(done=True))
@@ -0,0 +1,106 @@
+import os
+import json
+import stat
+from pathlib import Path
+
+SHARD_INDEX_VERSION = 1
+SHARD_INDEX_SUFFIX = '.shards.json'
+
+# ARCHIVE EXTENSIONS KEPT AT THE END OF SHARD NAMES (LONGEST FIRST)
+_EXTENSIONS = ('.tar.gz', '.tar.bz2', '.tar.xz', '.tgz', '.tbz2', '.txz', '.tar', '.zip')
+
+# RETURNS THE GLOBAL INDEX PATH FOR A SHARDED ARCHIVE
+def shard_index_path_for(output_path):
+    return f"{output_path}{SHARD_INDEX_SUFFIX}"
+
+# RETURNS WHETHER A PATH NAMES A SHARD INDEX
+def is_shard_index(path):
+    return str(path).endswith(SHARD_INDEX_SUFFIX)
+
+# RETURNS THE PATH OF SHARD number: data.tar.gz -> data-00000.tar.gz (THE FORMAT IS APPENDED WHEN THE OUTPUT HAS NO EXTENSION)
+def shard_path_for(output_path, number, archive_format):
+    output_path = str(output_path)
+    extension = next((ext for ext in _EXTENSIONS if output_path.lower().endswith(ext)), None)
+    if extension is None: return f"{output_path}-{number:05d}.{archive_format}"
+    return f"{output_path[:-len(extension)]}-{number:05d}{output_path[-len(extension):]}"
+
+# RETURNS THE NUMBER OF BYTES AN ENTRY ADDS TO A SHARD (ZIP FOLLOWS SYMLINKS TO FILES, TAR STORES THEM AS LINKS)
+def _entry_size(path, layout):
+    if layout == 'zip': return path.stat().st_size
+    st = path.stat(follow_symlinks=False)
+    return st.st_size if stat.S_ISREG(st.st_mode) else 0
+
+# SPLITS WALKED (PATH, ARCHIVE NAME) ENTRIES INTO CONSECUTIVE SHARDS, KEEPING THE WALK ORDER
+# - shards=N: N SHARDS OF ABOUT EQUAL UNCOMPRESSED SIZE (FILES ARE NEVER SPLIT, SO A HUGE FILE MAKES ITS SHARD LARGER); EACH ENTRY GOES
+#   TO THE SHARD ITS STARTING POSITION FALLS IN, SO AN ENTRY WITHOUT DATA (A DIRECTORY, A LINK) CAN OPEN THE NEXT SHARD
+# - shard_size=BYTES: A NEW SHARD STARTS WHEN THE NEXT FILE WOULD TAKE THE CURRENT ONE PAST shard_size (ENTRIES WITHOUT DATA NEVER
+#   START ONE)
+# - EMPTY SHARDS ARE DROPPED
+# - RETURNS [[(PATH, ARCHIVE NAME, SIZE), ...], ...]
+def partition(entries, layout, shards=None, shard_size=None):
+    sized = [(path, arcname, _entry_size(path, layout)) for path, arcname in entries]
+    total = sum(size for _, _, size in sized)
+    groups, position, current = [[]], 0, 0
+
+    for path, arcname, size in sized:
+        if shards is not None:
+            number = min(shards - 1, position * shards // total) if total else 0
+            while len(groups) <= number: groups.append([])
+        elif size and current and current + size > shard_size:
+            groups.append([])
+            current = 0
+        groups[-1].append((path, arcname, size))
+        position += size
+        current += size
+
+    return [group for group in groups if group]
+
+# STANDS IN FOR A SourceWalker SO A SHARD'S PRE-WALKED ENTRIES GO THROUGH THE REGULAR FORMAT WRITERS
+class ShardWalker:
+    def __init__(self, entries):
+        self._entries = [(path, arcname) for path, arcname, _ in entries]
+
+    def entries(self, source_paths=(), layout='tar'):
+        return iter(self._entries)
+
+    def files(self, source_paths=(), layout='zip'):
+        return ((path, arcname) for path, arcname in self._entries if not path.is_dir())
+
+# WRITES THE GLOBAL INDEX: SHARD FILES (RELATIVE TO THE INDEX) AND {NAME: [SHARD NUMBER, OFFSET, SIZE]}
+def write_shard_index(index_path, archive_format, layout, shard_paths, shard_offsets, shard_sizes):
+    members = {}
+    for number, offsets in enumerate(shard_offsets):
+        for name, (offset, size) in offsets.items(): members[name] = [number, offset, size]
+
+    index = {
+        'version': SHARD_INDEX_VERSION,
+        'format': archive_format,
+        'layout': layout,
+        'shards': [{'path': os.path.basename(path), 'members': len(offsets), 'bytes': size, 'archive_size': os.path.getsize(path)}
+                   for path, offsets, size in zip(shard_paths, shard_offsets, shard_sizes)],
+        'members': members,
+    }
+    with open(index_path, 'w', encoding='utf-8') as f: json.dump(index, f, separators=(',', ':'))
+    return index_path
+
+# LOADS AND VALIDATES A GLOBAL INDEX
+def load_shard_index(index_path):
+    if not Path(index_path).is_file():
+        raise FileNotFoundError(f"SHARD INDEX NOT FOUND: {index_path}")
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f: index = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"INVALID SHARD INDEX: {index_path}: {str(e)}")
+
+    if not isinstance(index, dict) or index.get('version') != SHARD_INDEX_VERSION or not isinstance(index.get('shards'), list) \
+            or not isinstance(index.get('members'), dict):
+        raise ValueError(f"INVALID SHARD INDEX: {index_path}")
+    return index
+
+# RETURNS THE SHARD FILE PATHS OF AN INDEX (STORED RELATIVE TO THE INDEX), CHECKING THAT THEY ALL EXIST
+def shard_paths(index_path, index):
+    paths = [os.path.join(os.path.dirname(os.path.abspath(index_path)), shard['path']) for shard in index['shards']]
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing: raise FileNotFoundError(f"SHARD NOT FOUND: {missing[0]}")
+    return paths
@@ -0,0 +1,104 @@
+import os
+import stat
+import tarfile
+import time
+import zlib
+
+_CHUNK_SIZE = 1024 * 1024
+
+# PAX / GNU HEADER RECORDS THAT DESCRIBE THE NEXT MEMBER (GLOBAL PAX HEADERS ARE SKIPPED)
+_PAX_FIELDS = {'path': 'name', 'linkpath': 'linkname', 'size': 'size', 'mtime': 'mtime'}
+_GNU_FIELDS = {tarfile.GNUTYPE_LONGNAME: 'name', tarfile.GNUTYPE_LONGLINK: 'linkname'}
+_HEADER_TYPES = (tarfile.XHDTYPE, tarfile.SOLARIS_XHDTYPE, tarfile.XGLTYPE, *_GNU_FIELDS)
+
+# RETURNS A MODIFICATION TIME AS A ZIP DATE_TIME (LOCAL TIME, EVEN SECONDS: THE RESOLUTION ZIP STORES)
+def _zip_date_time(mtime):
+    date_time = time.localtime(mtime)[:6]
+    return date_time[:5] + (date_time[5] // 2 * 2,)
+
+# RETURNS THE CRC-32 OF A FILE (STREAMED)
+def _file_crc32(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(_CHUNK_SIZE): crc = zlib.crc32(chunk, crc)
+    return crc
+
+# RETURNS WHETHER size BYTES OF archive AT offset EQUAL THE CONTENT OF A FILE
+def _same_content(archive, offset, path, size):
+    archive.seek(offset)
+    with open(path, 'rb') as f:
+        while size > 0:
+            chunk = f.read(min(_CHUNK_SIZE, size))
+            if not chunk or archive.read(len(chunk)) != chunk:
+                return False
+            size -= len(chunk)
+    return True
+
+# DECODES A NUL-TERMINATED TAR HEADER STRING
+def _text(data):
+    return tarfile.nts(data, 'utf-8', 'surrogateescape')
+
+# PARSES THE RECORDS OF A PAX EXTENDED HEADER ("<length> <key>=<value>\n"), KEEPING ONLY THE FIELDS AN UPDATE COMPARES
+def _pax_fields(data):
+    fields, pos = {}, 0
+    while pos < len(data):
+        length, _, rest = data[pos:].partition(b' ')
+        key, _, value = rest[:int(length) - len(length) - 2].partition(b'=')
+        name = _PAX_FIELDS.get(key.decode('utf-8', 'surrogateescape'))
+        if name in ('size', 'mtime'): fields[name] = float(value) if name == 'mtime' else int(value)
+        elif name is not None: fields[name] = _text(value)
+        pos += int(length)
+    return fields
+
+# READS THE MEMBER HEADERS OF AN UNCOMPRESSED TAR WITHOUT tarfile'S FULL HEADER PROCESSING (archive IS OPEN FOR READING)
+# - ONLY THE NAME, TYPE, SIZE, MTIME, LINK TARGET AND DATA OFFSET ARE DECODED, AND MEMBER DATA IS SEEKED OVER
+# - YIELDS (TarInfo, OFFSET AFTER ITS DATA) IN ARCHIVE ORDER; A HEADER WITH A BAD CHECKSUM RAISES
+def iter_tar_headers(archive):
+    pending, offset = {}, 0
+    archive.seek(0)
+    while (header := archive.read(tarfile.BLOCKSIZE)).strip(tarfile.NUL):
+        if len(header) < tarfile.BLOCKSIZE or tarfile.nti(header[148:156]) not in tarfile.calc_chksums(header):
+            raise ValueError(f"INVALID TAR HEADER AT OFFSET {offset}")
+        member_type, size = header[156:157], tarfile.nti(header[124:136])
+        if member_type not in _HEADER_TYPES: size = pending.get('size', size)
+        data_offset = offset + tarfile.BLOCKSIZE
+        offset = data_offset + -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+        if member_type in (tarfile.XHDTYPE, tarfile.SOLARIS_XHDTYPE): pending.update(_pax_fields(archive.read(size)))
+        elif member_type in _GNU_FIELDS: pending[_GNU_FIELDS[member_type]] = _text(archive.read(size))
+        elif member_type != tarfile.XGLTYPE:
+            name, prefix = _text(header[0:100]), _text(header[345:500]) if header[257:265] == tarfile.POSIX_MAGIC else ''
+            member = tarfile.TarInfo(f"{prefix}/{name}" if prefix else name)
+            member.type = tarfile.REGTYPE if member_type in (tarfile.AREGTYPE, tarfile.CONTTYPE) else member_type
+            member.mtime, member.linkname, member.offset_data = tarfile.nti(header[136:148]), _text(header[157:257]), data_offset
+            for field, value in pending.items(): setattr(member, field, value)
+            member.size = size
+            if member.isdir(): member.name = member.name.rstrip('/')
+            pending = {}
+            yield member, offset
+        archive.seek(offset)
+
+# RETURNS ({name: TarInfo} WITH THE LAST COPY OF EVERY NAME, OFFSET OF THE END-OF-ARCHIVE BLOCKS) FOR AN UNCOMPRESSED TAR
+def scan_tar_members(archive):
+    members, end = {}, 0
+    for member, end in iter_tar_headers(archive): members[member.name] = member
+    return members, end
+
+# RETURNS WHETHER A SOURCE FILE SHOULD REPLACE ITS ZIP MEMBER
+# - A MATCHING SIZE AND MTIME MEANS UNCHANGED WITHOUT READING THE FILE; OTHERWISE THE CRC DECIDES (A TOUCHED BUT IDENTICAL FILE IS KEPT)
+def zip_member_changed(zinfo, path):
+    st = path.stat()
+    if st.st_size != zinfo.file_size: return True
+    if _zip_date_time(st.st_mtime) == tuple(zinfo.date_time): return False
+    return _file_crc32(path) != zinfo.CRC
+
+# RETURNS WHETHER A SOURCE ENTRY SHOULD REPLACE ITS TAR MEMBER (archive IS THE UNCOMPRESSED TAR, OPEN FOR READING)
+# - REGULAR FILES: A MATCHING SIZE AND MTIME MEANS UNCHANGED; OTHERWISE THE ARCHIVED DATA IS COMPARED WITH THE FILE
+# - SYMLINKS ARE REPLACED WHEN THEIR TARGET CHANGED; DIRECTORIES AND SPECIAL FILES ARE ONLY EVER ADDED ONCE
+def tar_member_changed(archive, member, path):
+    st = path.stat(follow_symlinks=False)
+    if stat.S_ISLNK(st.st_mode): return not member.issym() or member.linkname != os.readlink(path)
+    if not stat.S_ISREG(st.st_mode): return False
+    if not member.isreg() or st.st_size != member.size: return True
+    if int(member.mtime) == int(st.st_mtime): return False
+    return not _same_content(archive, member.offset_data, path, member.size)
@@ -0,0 +1,188 @@
+import os
+import lzma
+import mmap
+import zlib
+import hashlib
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from .dedup import DEDUP_MANIFEST_NAME, load_dedup_manifest
+from .extract import copy_zip_member_data
+from .manifest import MANIFEST_FIELDS
+from .update import iter_tar_headers
+
+# MEMBERS CHECKED AHEAD OF THE ONE BEING REPORTED (BOUNDS THE RESULTS HELD IN MEMORY)
+VERIFY_WINDOW = 256
+
+_CHUNK_SIZE = 1024 * 1024
+
+# ERRORS RAISED BY DAMAGED MEMBER DATA (BAD CRC OR LOCAL HEADER, BROKEN COMPRESSED STREAM, TRUNCATED ARCHIVE)
+_DATA_ERRORS = (ValueError, EOFError, OSError, zlib.error, lzma.LZMAError, zipfile.BadZipFile, tarfile.TarError, NotImplementedError)
+
+# FILE-LIKE SINK THAT COUNTS (AND OPTIONALLY HASHES) THE MEMBER DATA WRITTEN TO IT
+class _DigestSink:
+    def __init__(self, hashed):
+        self.digest = hashlib.sha256() if hashed else None
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.digest is not None: self.digest.update(data)
+
+    def hexdigest(self):
+        return self.digest.hexdigest() if self.digest is not None else None
+
+# RETURNS THE RESULT OF ONE MEMBER: 'corrupt' ON A READ ERROR, 'mismatch' WHEN ITS SHA-256 DIFFERS FROM THE MANIFEST, 'ok' OTHERWISE
+def _result(name, size, digest=None, expected=None, error=None):
+    if error is not None: status = 'corrupt'
+    elif expected is not None and digest != expected: status, error = 'mismatch', "CONTENT DIFFERS FROM THE MANIFEST"
+    else: status = 'ok'
+    return {'name': name, 'size': size, 'status': status, 'sha256': digest, 'error': error}
+
+# RUNS CHECKS (ZERO-ARGUMENT CALLABLES RETURNING A RESULT) IN A THREAD POOL, YIELDING THE RESULTS IN ORDER AS THEY COMPLETE
+# - AT MOST window CHECKS ARE PENDING; THE ONES NOT STARTED ARE CANCELLED IF THE CONSUMER STOPS EARLY
+def _run_ordered(checks, jobs=1, window=VERIFY_WINDOW):
+    if jobs <= 1:
+        for check in checks: yield check()
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        try:
+            for check in checks:
+                pending.append(pool.submit(check))
+                if len(pending) >= window: yield pending.popleft().result()
+            while pending: yield pending.popleft().result()
+        finally:
+            for future in pending: future.cancel()
+
+# FILLS IN LINKED ENTRIES (TAR HARDLINKS, ZIP DEDUP COPIES) FROM THE MEMBER THEY POINT TO, WHICH IS ALWAYS REPORTED FIRST,
+# THEN REPORTS THE MANIFEST FILES THE ARCHIVE DOES NOT CONTAIN (ONLY FOR FULL ARCHIVES: AN INCREMENTAL ONE HOLDS CHANGES ONLY)
+def _finish(results, hashes=None, complete=False):
+    seen = {}
+    for result in results:
+        link = result.pop('link', None)
+        if link is not None:
+            status, digest = seen.get(link, (None, None))
+            error = None if status == 'ok' else f"LINKED MEMBER IS {'CORRUPT' if status else 'MISSING'}: {link}"
+            result = _result(result['name'], 0, digest, result['expected'], error)
+        seen[result['name']] = (result['status'], result['sha256'])
+        yield result
+
+    for name in sorted(set(hashes or ()) - set(seen) if complete else ()):
+        yield {'name': name, 'size': None, 'status': 'missing', 'sha256': None, 'error': "MISSING FROM THE ARCHIVE"}
+
+# RETURNS {NAME: SHA-256} FROM A LOADED MANIFEST, CHECKING THAT ITS NAMES USE THE ARCHIVE'S LAYOUT
+def manifest_hashes(manifest, layout):
+    if manifest.get('layout') != layout:
+        raise ValueError(f"MANIFEST LAYOUT MISMATCH: {manifest.get('layout')} MANIFEST CANNOT VERIFY A {layout} ARCHIVE")
+    position = MANIFEST_FIELDS.index('sha256')
+    return {name: values[position] for name, values in manifest['files'].items()}
+
+# CHECKS ONE ZIP MEMBER (RUNS IN WORKER THREADS)
+# - STORED/DEFLATED MEMBERS ARE INFLATED STRAIGHT FROM THE SHARED MMAP; OTHER METHODS GO THROUGH THE SHARED ZipFile, WHICH CHECKS THE CRC
+def _check_zip_member(archive_map, zipf, info, hashed, expected):
+    sink = _DigestSink(hashed)
+    try:
+        if info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            copy_zip_member_data(archive_map, info, sink)
+        else:
+            with zipf.open(info) as source:
+                while chunk := source.read(_CHUNK_SIZE): sink.write(chunk)
+    except _DATA_ERRORS as e:
+        return _result(info.filename, info.file_size, error=str(e))
+    if sink.size != info.file_size: return _result(info.filename, info.file_size, error=f"SIZE IS {sink.size}, EXPECTED {info.file_size}")
+    return _result(info.filename, info.file_size, sink.hexdigest(), expected)
+
+# PLACEHOLDER CHECK FOR AN ENTRY THAT LINKS TO A STORED MEMBER (RESOLVED BY _finish)
+def _link(name, target, expected):
+    return {'name': name, 'link': target, 'expected': expected}
+
+# VERIFIES EVERY ZIP MEMBER AGAINST ITS CRC-32 AND SIZE, SEVERAL MEMBERS AT A TIME FROM A SHARED MMAP OF THE ARCHIVE
+# - WITH hashes ({NAME: SHA-256} FROM A MANIFEST), MEMBER DATA IS ALSO HASHED AND COMPARED; DEDUP COPIES USE THEIR STORED MEMBER
+def verify_zip(archive_path, hashes=None, jobs=1, complete=False):
+    try:
+        zipf = zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"INVALID ZIP ARCHIVE: {archive_path}: {str(e)}")
+
+    with zipf, open(archive_path, 'rb') as raw, mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as archive_map:
+        infos = [info for info in zipf.infolist() if not info.is_dir()]
+        encrypted = next((info.filename for info in infos if info.flag_bits & 0x1), None)
+        if encrypted is not None:
+            raise ValueError(f"ENCRYPTED ZIP MEMBERS ARE NOT SUPPORTED: {encrypted}")
+
+        # A DAMAGED DEDUP MANIFEST IS REPORTED BY ITS OWN MEMBER CHECK
+        try: duplicates = load_dedup_manifest(zipf.read(DEDUP_MANIFEST_NAME)) if DEDUP_MANIFEST_NAME in zipf.NameToInfo else {}
+        except _DATA_ERRORS: duplicates = {}
+
+        expected = (hashes or {}).get
+        checks = [partial(_check_zip_member, archive_map, zipf, info, hashes is not None, expected(info.filename)) for info in infos]
+        checks += [partial(_link, name, stored_name, expected(name)) for name, stored_name in duplicates.items()]
+        yield from _finish(_run_ordered(checks, jobs), hashes, complete)
+
+# CHECKS ONE MEMBER OF AN UNCOMPRESSED TAR FROM THE SHARED VIEW OF THE ARCHIVE (RUNS IN WORKER THREADS)
+# - TAR STORES NO CHECKSUM OF MEMBER DATA: WITHOUT A MANIFEST, ONLY THE HEADERS AND THE DATA BOUNDS CAN BE CHECKED
+def _check_tar_member(view, member, hashed, expected):
+    end = member.offset_data + member.size
+    if end > len(view): return _result(member.name, member.size, error=f"TRUNCATED: DATA ENDS AT {end}, ARCHIVE SIZE IS {len(view)}")
+    if not hashed: return _result(member.name, member.size)
+    with view[member.offset_data:end] as data: return _result(member.name, member.size, hashlib.sha256(data).hexdigest(), expected)
+
+# YIELDS ONE CHECK PER NON-DIRECTORY MEMBER OF AN UNCOMPRESSED TAR, READING ONLY THE HEADERS (AND CHECKING THEIR CHECKSUMS)
+# - A ZEROED HEADER WOULD END THE ARCHIVE EARLY, SO ANYTHING BUT ZEROS IN THE TWO BLOCKS AFTER THE LAST MEMBER IS REPORTED
+def _tar_checks(archive_map, view, hashes):
+    expected, end = (hashes or {}).get, 0
+    try:
+        for member, end in iter_tar_headers(archive_map):
+            if member.isreg(): yield partial(_check_tar_member, view, member, hashes is not None, expected(member.name))
+            elif member.islnk(): yield partial(_link, member.name, member.linkname, expected(member.name))
+            elif not member.isdir(): yield partial(_result, member.name, 0)
+    except ValueError as e:
+        yield partial(_result, None, None, error=str(e))
+        return
+    if archive_map[end:end + 2 * tarfile.BLOCKSIZE].strip(tarfile.NUL):
+        yield partial(_result, None, None, error=f"UNEXPECTED DATA AFTER THE LAST MEMBER AT OFFSET {end}")
+
+# VERIFIES AN UNCOMPRESSED TAR: HEADER CHECKSUMS AND DATA BOUNDS, PLUS SHA-256 AGAINST hashes (HASHED IN PARALLEL FROM AN MMAP)
+def verify_tar(archive_path, hashes=None, jobs=1, complete=False):
+    with open(archive_path, 'rb') as raw:
+        if not os.fstat(raw.fileno()).st_size:
+            raise ValueError(f"INVALID TAR ARCHIVE: {archive_path}: EMPTY FILE")
+        with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as archive_map, memoryview(archive_map) as view:
+            yield from _finish(_run_ordered(_tar_checks(archive_map, view, hashes), jobs), hashes, complete)
+
+# READS ONE MEMBER OF A COMPRESSED TAR THROUGH ITS DECOMPRESSOR
+def _read_tar_member(tar, member, hashed, expected):
+    sink = _DigestSink(hashed)
+    try:
+        source = tar.extractfile(member)
+        while chunk := source.read(_CHUNK_SIZE): sink.write(chunk)
+    except _DATA_ERRORS as e:
+        return _result(member.name, member.size, error=str(e))
+    return _result(member.name, member.size, sink.hexdigest(), expected)
+
+# YIELDS THE RESULTS OF A COMPRESSED TAR, READ AS ONE STREAM (THE CODEC CHECKSUMS: GZIP CRC-32, BZIP2 BLOCK CRCS, XZ CRC-64)
+# - THE STREAM IS READ TO ITS END SO THE FINAL CHECKSUMS ARE VERIFIED TOO; AFTER A DECODING ERROR NOTHING FURTHER CAN BE READ
+def _compressed_tar_results(archive_path, archive_format, hashes):
+    expected = (hashes or {}).get
+    try:
+        with tarfile.open(archive_path, f"r:{archive_format[4:]}") as tar:
+            for member in tar:
+                if member.isreg(): result = _read_tar_member(tar, member, hashes is not None, expected(member.name))
+                elif member.islnk(): result = _link(member.name, member.linkname, expected(member.name))
+                elif member.isdir(): continue
+                else: result = _result(member.name, 0)
+                yield result
+                if result.get('status') == 'corrupt':
+                    return
+                tar.members = []
+            while tar.fileobj.read(_CHUNK_SIZE): pass
+    except _DATA_ERRORS as e:
+        yield _result(None, None, error=str(e))
+
+# VERIFIES A COMPRESSED TAR (DECOMPRESSION IS SEQUENTIAL, SO jobs DOES NOT APPLY)
+def verify_compressed_tar(archive_path, archive_format, hashes=None, complete=False):
+    yield from _finish(_compressed_tar_results(archive_path, archive_format, hashes), hashes, complete)
@@ -0,0 +1,188 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+GITIGNORE_NAME = '.gitignore'
+
+# ALWAYS PRUNED WHEN .gitignore RULES ARE HONOURED (GIT NEVER TRACKS ITS OWN DIRECTORY)
+_GIT_DIR_PATTERN = '.git/'
+
+# ONE COMPILED IGNORE PATTERN; base IS THE DIRECTORY (RELATIVE TO THE WALK ROOT, ENDING IN '/') IT APPLIES UNDER
+class _Rule:
+    __slots__ = ('regex', 'negate', 'dir_only', 'base')
+
+    def __init__(self, regex, negate, dir_only, base):
+        self.regex, self.negate, self.dir_only, self.base = regex, negate, dir_only, base
+
+# TRANSLATES A GITIGNORE GLOB INTO A REGEX ('*' AND '?' STOP AT '/', '**' CROSSES DIRECTORIES)
+def _glob_to_regex(pattern):
+    parts, i, n = [], 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and (end := pattern.find(']', i + 2)) != -1:
+            body = pattern[i + 1:end].replace('\\', '\\\\')
+            parts.append('[' + ('^' + body[1:] if body[0] == '!' else body) + ']')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+# COMPILES ONE .gitignore LINE (OR --exclude GLOB) INTO A RULE, OR None FOR BLANK LINES AND COMMENTS
+# - A LEADING '!' RE-INCLUDES, A TRAILING '/' ONLY MATCHES DIRECTORIES
+# - PATTERNS WITHOUT A '/' MATCH AT ANY DEPTH, OTHERS ARE ANCHORED TO base
+def compile_rule(line, base=''):
+    pattern = line.rstrip('\r\n').rstrip(' ')
+    if not pattern or pattern.startswith('#'): return None
+
+    negate = pattern.startswith('!')
+    if negate: pattern = pattern[1:]
+    elif pattern.startswith(('\\#', '\\!')): pattern = pattern[1:]
+
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    if not pattern: return None
+
+    regex = _glob_to_regex(pattern)
+    if not anchored: regex = '(?:.*/)?' + regex
+    return _Rule(re.compile(regex, re.DOTALL), negate, dir_only, base)
+
+# ORDERED IGNORE RULES; THE LAST MATCHING RULE DECIDES (LIKE GIT)
+class IgnoreRules:
+    def __init__(self, rules=()):
+        self.rules = tuple(rules)
+
+    # BUILDS RULES FROM PATTERN LINES THAT APPLY UNDER base
+    @classmethod
+    def from_lines(cls, lines, base=''):
+        return cls(rule for rule in (compile_rule(line, base) for line in lines) if rule is not None)
+
+    # RETURNS NEW RULES WITH lines (E.G. A NESTED .gitignore) ADDED AFTER THE CURRENT ONES
+    def extend(self, lines, base=''):
+        return IgnoreRules(self.rules + IgnoreRules.from_lines(lines, base).rules)
+
+    # TRUE WHEN relpath (POSIX, RELATIVE TO THE WALK ROOT) IS IGNORED
+    def ignores(self, relpath, is_dir):
+        ignored = False
+        for rule in self.rules:
+            if rule.dir_only and not is_dir: continue
+            if not relpath.startswith(rule.base): continue
+            if rule.regex.fullmatch(relpath, len(rule.base)): ignored = not rule.negate
+        return ignored
+
+# READS A .gitignore FILE AS LINES (UNDECODABLE BYTES ARE KEPT LIKE os.fsdecode)
+def _read_ignore_file(path):
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f: return f.read().splitlines()
+
+# LISTS ONE DIRECTORY (RUNS IN WORKER THREADS)
+# - ENTRIES ARE SORTED BY NAME; IGNORED ENTRIES ARE DROPPED BEFORE THEY ARE EVER STAT'ED
+# - KEPT ENTRIES ARE lstat'ED HERE SO THE DirEntry CACHE IS WARM WHEN THE ARCHIVE WRITER READS IT
+# - RETURNS [(DirEntry, RELATIVE PATH, IS DIRECTORY)] AND THE RULES THAT APPLY TO SUBDIRECTORIES
+def _scan_dir(path, prefix, excludes, rules, gitignore):
+    with os.scandir(path) as it: entries = sorted(it, key=lambda entry: entry.name)
+
+    if gitignore:
+        for entry in entries:
+            if entry.name == GITIGNORE_NAME and entry.is_file(follow_symlinks=False):
+                rules = rules.extend(_read_ignore_file(entry.path), prefix)
+
+    kept = []
+    for entry in entries:
+        relpath, is_dir = prefix + entry.name, entry.is_dir(follow_symlinks=False)
+        if excludes.ignores(relpath, is_dir) or rules.ignores(relpath, is_dir): continue
+        entry.stat(follow_symlinks=False)
+        kept.append((entry, relpath, is_dir))
+    return kept, rules
+
+# CALLS A FUNCTION ON DEMAND; STANDS IN FOR A FUTURE WHEN WALKING SERIALLY
+class _Deferred:
+    def __init__(self, func, *args):
+        self.func, self.args = func, args
+
+    def result(self):
+        return self.func(*self.args)
+
+# WALKS DIRECTORY TREES WITH os.scandir, APPLYING --exclude GLOBS AND OPTIONAL .gitignore RULES
+# - WITH jobs > 1, SUBDIRECTORIES ARE LISTED AHEAD IN A THREAD POOL WHILE EARLIER ENTRIES ARE CONSUMED
+# - OUTPUT ORDER IS DETERMINISTIC (DEPTH-FIRST, SORTED BY NAME, LIKE tarfile.add) WHATEVER THE WORKER COUNT
+# - SYMLINKED DIRECTORIES ARE NOT FOLLOWED
+class SourceWalker:
+    def __init__(self, excludes=(), gitignore=False, jobs=1):
+        self.excludes = IgnoreRules.from_lines(excludes or ())
+        self.gitignore = gitignore
+        self.jobs = max(jobs, 1)
+
+    # YIELDS (DirEntry, RELATIVE PATH) FOR EVERY KEPT ENTRY UNDER root; DIRECTORIES COME BEFORE THEIR CONTENTS
+    def walk(self, root):
+        rules = IgnoreRules.from_lines([_GIT_DIR_PATTERN]) if self.gitignore else IgnoreRules()
+        pool = ThreadPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        submit = pool.submit if pool is not None else _Deferred
+        try:
+            yield from self._walk(submit(_scan_dir, os.fspath(root), '', self.excludes, rules, self.gitignore), submit)
+        finally:
+            if pool is not None: pool.shutdown(cancel_futures=True)
+
+    def _walk(self, listing, submit):
+        entries, rules = listing.result()
+        children = {relpath: submit(_scan_dir, entry.path, relpath + '/', self.excludes, rules, self.gitignore)
+                    for entry, relpath, is_dir in entries if is_dir}
+        for entry, relpath, is_dir in entries:
+            yield entry, relpath
+            if is_dir: yield from self._walk(children[relpath], submit)
+
+    # YIELDS (SOURCE PATH, ARCHIVE NAME) FOR THE SOURCES AND EVERY KEPT ENTRY UNDER DIRECTORY SOURCES
+    # - THE SOURCE PATH IS A DirEntry (CACHED STAT) OR, FOR A TOP-LEVEL SOURCE, A Path
+    # - 'zip' LAYOUT: DIRECTORY CONTENTS ARE NAMED RELATIVE TO THE DIRECTORY, WHICH IS NOT YIELDED ITSELF (A SYMLINKED ONE IS FOLLOWED)
+    # - 'tar' LAYOUT: DIRECTORY CONTENTS ARE NAMED UNDER THE DIRECTORY NAME (LIKE tarfile.add)
+    def entries(self, source_paths, layout='tar'):
+        for source_path in source_paths:
+            source = Path(source_path)
+            if not source.exists():
+                raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
+
+            is_dir = source.is_dir() and (layout == 'zip' or not source.is_symlink())
+            if self.excludes.ignores(source.name, is_dir): continue
+            if not is_dir or layout == 'tar': yield source, source.name
+            if not is_dir: continue
+
+            prefix = f"{source.name}/" if layout == 'tar' else ''
+            for entry, relpath in self.walk(source): yield entry, prefix + relpath
+
+    # YIELDS (SOURCE PATH, ARCHIVE NAME) FOR EVERY FILE (ANYTHING BUT A DIRECTORY OR A SYMLINK TO ONE, LIKE os.walk)
+    def files(self, source_paths, layout='zip'):
+        return ((path, arcname) for path, arcname in self.entries(source_paths, layout) if not path.is_dir())
+
+    # YIELDS (SOURCE PATH, NAME, IN TAR, ZIP NAME) FROM ONE WALK THAT SERVES BOTH LAYOUTS
+    # - NAME IS THE 'tar' LAYOUT NAME; IN TAR IS False UNDER A SYMLINKED SOURCE DIRECTORY (TAR STORES THE LINK ITSELF)
+    # - ZIP NAME IS THE 'zip' LAYOUT NAME, OR None FOR ENTRIES THE 'zip' LAYOUT SKIPS (DIRECTORIES)
+    def layouts(self, source_paths):
+        for source_path in source_paths:
+            source = Path(source_path)
+            if not source.exists():
+                raise FileNotFoundError(f"SOURCE PATH NOT FOUND: {source_path}")
+
+            is_dir = source.is_dir()
+            in_tar = not (is_dir and source.is_symlink())
+            if self.excludes.ignores(source.name, is_dir and in_tar): continue
+            yield source, source.name, True, None if is_dir else source.name
+            if not is_dir: continue
+
+            for entry, relpath in self.walk(source):
+                yield entry, f"{source.name}/{relpath}", in_tar, None if entry.is_dir() else relpath
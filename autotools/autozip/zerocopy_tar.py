@@ -0,0 +1,89 @@
+import io
+import os
+import copy
+import errno
+import tarfile
+
+# FILES SMALLER THAN THIS GO THROUGH tarfile'S OWN COPY (THE EXTRA SYSCALLS WOULD COST MORE THAN THEY SAVE)
+ZERO_COPY_MIN_SIZE = 64 * 1024
+
+# MAXIMUM BYTES MOVED PER SYSCALL, AND THE SIZE OF THE readinto FALLBACK BUFFER
+_COPY_CHUNK = 64 * 1024 * 1024
+_BUFFER_SIZE = 1024 * 1024
+
+# ERRORS MEANING "THIS COPY METHOD DOES NOT WORK FOR THESE FILES" (E.G. CROSS-DEVICE, UNSUPPORTED FILESYSTEM)
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.ETXTBSY}
+
+# COPIES UP TO count BYTES IN THE KERNEL BETWEEN FILE OFFSETS (REFLINK/SERVER-SIDE COPY ON SUPPORTING FILESYSTEMS)
+def _copy_file_range(src_fd, dst_fd, count, buffer):
+    return os.copy_file_range(src_fd, dst_fd, min(count, _COPY_CHUNK))
+
+# COPIES UP TO count BYTES IN THE KERNEL FROM THE SOURCE FILE OFFSET
+def _sendfile(src_fd, dst_fd, count, buffer):
+    return os.sendfile(dst_fd, src_fd, None, min(count, _COPY_CHUNK))
+
+# READS UP TO count BYTES INTO A REUSED BUFFER AND WRITES THEM OUT (PORTABLE FALLBACK)
+def _readinto(src_fd, dst_fd, count, buffer):
+    view = memoryview(buffer)[:min(count, len(buffer))]
+    with io.FileIO(src_fd, 'rb', closefd=False) as src: copied = src.readinto(view)
+    written = 0
+    while written < copied: written += os.write(dst_fd, view[written:copied])
+    return copied
+
+# COPY METHODS IN ORDER OF PREFERENCE (THE ONES THE PLATFORM LACKS ARE LEFT OUT)
+def _available_methods():
+    methods = []
+    if hasattr(os, 'copy_file_range'): methods.append(_copy_file_range)
+    if hasattr(os, 'sendfile'): methods.append(_sendfile)
+    return methods + [_readinto]
+
+# TarFile FOR UNCOMPRESSED ARCHIVES THAT MOVES FILE BODIES WITH copy_file_range/sendfile INSTEAD OF PYTHON BUFFERS
+# - HEADERS ARE STILL ENCODED BY TarInfo.tobuf, SO THE ARCHIVE IS BYTE-FOR-BYTE WHAT tarfile WOULD WRITE
+# - A METHOD THAT FAILS AS UNSUPPORTED IS DROPPED FOR THE REST OF THE ARCHIVE AND THE NEXT ONE CONTINUES THE COPY
+# - SMALL FILES, AND FILE OBJECTS WITHOUT A FILE DESCRIPTOR, USE THE REGULAR tarfile PATH
+class ZeroCopyTarFile(tarfile.TarFile):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.copy_methods = _available_methods()
+        self._buffer = None
+
+    def addfile(self, tarinfo, fileobj=None):
+        fds = self._file_descriptors(tarinfo, fileobj)
+        if fds is None: return super().addfile(tarinfo, fileobj)
+
+        self._check("awx")
+        tarinfo = copy.copy(tarinfo)
+        header = tarinfo.tobuf(self.format, self.encoding, self.errors)
+        self.fileobj.write(header)
+        self.fileobj.flush()
+
+        self._copy_body(*fds, tarinfo.size)
+        self.fileobj.seek(os.lseek(fds[1], 0, os.SEEK_CUR))
+        padding = -tarinfo.size % tarfile.BLOCKSIZE
+        if padding: self.fileobj.write(tarfile.NUL * padding)
+
+        self.offset += len(header) + tarinfo.size + padding
+        self.members.append(tarinfo)
+
+    # RETURNS (SOURCE FD, ARCHIVE FD) WHEN THE BODY CAN BE COPIED BETWEEN FILE DESCRIPTORS, OTHERWISE None
+    def _file_descriptors(self, tarinfo, fileobj):
+        if fileobj is None or tarinfo.size < ZERO_COPY_MIN_SIZE: return None
+        try:
+            return fileobj.fileno(), self.fileobj.fileno()
+        except (AttributeError, OSError):
+            return None
+
+    # COPIES size BYTES FROM THE SOURCE FILE OFFSET TO THE ARCHIVE FILE OFFSET
+    def _copy_body(self, src_fd, dst_fd, size):
+        remaining = size
+        while remaining:
+            method = self.copy_methods[0]
+            if method is _readinto and self._buffer is None: self._buffer = bytearray(_BUFFER_SIZE)
+            try:
+                copied = method(src_fd, dst_fd, remaining, self._buffer)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS or method is _readinto: raise
+                self.copy_methods.pop(0)
+                continue
+            if not copied: raise OSError("unexpected end of data")
+            remaining -= copied
@@ -130,6 +130,12 @@ def should_run_tool(tool_name: str, public_name: str, include: Set[str], exclude
     return True
 
 
+# RETURNS THE ROW COUNT EACH SMOKE TEST DECLARES ('rows' KEY OF A DICT ITEM), OR None, IN SMOKE_TESTS ORDER
+def smoke_test_rows(value: Any) -> List[int | None]:
+    if not isinstance(value, list): return []
+    return [item.get("rows") if isinstance(item, dict) else None for item in value]
+
+
 # DISCOVERS BENCHMARK CASES FROM TOOL SMOKE DEFINITIONS
 def discover_benchmark_cases(config: BenchmarkConfig) -> List[Dict[str, Any]]:
     entries = discover_tool_command_entries()
@@ -150,9 +156,10 @@ def discover_benchmark_cases(config: BenchmarkConfig) -> List[Dict[str, Any]]:
         tool_dir.mkdir(parents=True, exist_ok=True)
 
         smoke_tests = _normalize_smoke_tests(getattr(mod, "SMOKE_TESTS", None))
+        rows = smoke_test_rows(getattr(mod, "SMOKE_TESTS", None))
         if not smoke_tests: smoke_tests = [_build_default_case(tool_name, cmd, tool_dir)]
 
-        for case_name, args in smoke_tests:
+        for index, (case_name, args) in enumerate(smoke_tests):
             cases.append(
                 {
                     "category": get_tool_category(mod),
@@ -160,6 +167,7 @@ def discover_benchmark_cases(config: BenchmarkConfig) -> List[Dict[str, Any]]:
                     "tool_package": tool_name,
                     "case": case_name,
                     "args": list(args),
+                    "rows": rows[index] if index < len(rows) else None,
                 }
             )
 
@@ -287,6 +295,14 @@ def summarize_durations(durations_s: Sequence[float]) -> Dict[str, Any]:
     }
 
 
+# ADDS ROWS PER SECOND (AT THE MEDIAN DURATION) TO THE STATISTICS OF A CASE THAT DECLARES HOW MANY ROWS IT PROCESSES
+def add_row_throughput(stats: Dict[str, Any], rows: int | None) -> Dict[str, Any]:
+    if rows and stats["count"] and stats["median_ms"] > 0:
+        stats["rows"] = rows
+        stats["rows_per_s"] = round(rows / (stats["median_ms"] / 1000), 1)
+    return stats
+
+
 # RUNS ONE BENCHMARK CASE WITH WARMUP AND MEASURED ITERATIONS
 def run_case(case: Dict[str, Any], config: BenchmarkConfig, run_root: Path) -> Dict[str, Any]:
     runs: List[Dict[str, Any]] = []
@@ -327,7 +343,7 @@ def run_case(case: Dict[str, Any], config: BenchmarkConfig, run_root: Path) -> D
         "case": case["case"],
         "args": case["args"],
         "status": "OK" if not failed_runs else "FAIL",
-        "stats": summarize_durations(successful_durations),
+        "stats": add_row_throughput(summarize_durations(successful_durations), case.get("rows")),
         "warmups": warmups,
         "runs": runs,
         "failures": failed_runs,
@@ -418,6 +434,21 @@ def render_markdown_report(report: Dict[str, Any]) -> str:
 
     lines.append("")
 
+    throughput = [result for result in report["results"] if "rows_per_s" in result["stats"]]
+    if throughput:
+        lines.extend(
+            [
+                "## Row Throughput",
+                "",
+                "| Tool | Case | Rows | Median ms | Rows/s |",
+                "| --- | --- | ---: | ---: | ---: |",
+            ]
+        )
+        for result in throughput:
+            stats = result["stats"]
+            lines.append(f"| {result['tool']} | {result['case']} | {stats['rows']} | {stats['median_ms']:.3f} | {stats['rows_per_s']:.1f} |")
+        lines.append("")
+
     failed = [result for result in report["results"] if result["status"] != "OK"]
     if failed:
         lines.extend(["## Failed Cases", ""])
@@ -4,6 +4,13 @@ import os
 import sys
 from unittest.mock import MagicMock
 
+# KEEPS THE CONVERSION CACHE OF EVERY TEST IN ITS OWN TEMPORARY DIRECTORY (NEVER THE USER CACHE DIRECTORY)
+@pytest.fixture(autouse=True)
+def isolated_convert_cache(monkeypatch, tmp_path):
+    cache_dir = tmp_path / 'convert-cache'
+    monkeypatch.setenv('AUTOTOOLS_CONVERT_CACHE', str(cache_dir))
+    return cache_dir
+
 # FIXTURE FOR CREATING A TEMPORARY DIRECTORY WITH FILES
 @pytest.fixture
 def temp_dir():
@@ -2,6 +2,7 @@ import pytest
 import os
 import json
 from unittest.mock import patch
+from pathlib import Path
 from click.testing import CliRunner
 from autotools.cli import autoconvert
 
@@ -185,3 +186,107 @@ def test_autoconvert_cli_conversion_failure_success_false(mock_convert_file, cli
     result = cli_runner.invoke(autoconvert, [input_file, output_file])
     assert result.exit_code != 0
     assert "CONVERSION FAILED" in result.output.upper()
+
+# TEST COMMANDS DIRECTORY MODE (PROCESS POOL, GLOB FILTERS, UP-TO-DATE SKIPS, AGGREGATE REPORT)
+def test_autoconvert_cli_directory(cli_runner, temp_dir):
+    from PIL import Image
+    src, dst = os.path.join(temp_dir, "src"), os.path.join(temp_dir, "dst")
+    os.makedirs(os.path.join(src, "sub"))
+    for name in ("a.png", os.path.join("sub", "b.png")): Image.new("RGB", (8, 8)).save(os.path.join(src, name))
+    with open(os.path.join(src, "notes.txt"), "w", encoding="utf-8") as f: f.write("hello")
+
+    result = cli_runner.invoke(autoconvert, [src, dst, "--to", "webp", "--jobs", "2", "--include", "*.png"])
+    assert result.exit_code == 0
+    assert "CONVERTED: 2, SKIPPED (UP TO DATE): 0, FAILED: 0" in result.output and os.path.exists(os.path.join(dst, "sub", "b.webp"))
+    result = cli_runner.invoke(autoconvert, [src, dst, "--to", "webp", "--exclude", "*.txt"])
+    assert result.exit_code == 0 and "CONVERTED: 0, SKIPPED (UP TO DATE): 2, FAILED: 0" in result.output
+
+    result = cli_runner.invoke(autoconvert, [src, dst, "--to", "webp"])
+    assert result.exit_code == 0 and "FAILED: 0, SKIPPED (NOT CONVERTIBLE TO WEBP): 1" in result.output
+
+    with open(os.path.join(src, "broken.png"), "w", encoding="utf-8") as f: f.write("not an image")
+    result = cli_runner.invoke(autoconvert, [src, dst, "--to", "webp"])
+    assert result.exit_code != 0
+    assert "broken.png: CONVERSION FAILED" in result.output and "1 OF 1 CONVERSIONS FAILED" in result.output
+
+# TEST COMMANDS DIRECTORY MODE WITHOUT A TARGET FORMAT OR WITH NEGATIVE JOBS
+@pytest.mark.parametrize("options, message", [([], "--to FORMAT IS REQUIRED"), (["--to", "webp", "-j", "-1"], "JOBS MUST BE 0")])
+def test_autoconvert_cli_directory_invalid(cli_runner, temp_dir, options, message):
+    result = cli_runner.invoke(autoconvert, [temp_dir, os.path.join(temp_dir, "out")] + options)
+    assert result.exit_code != 0
+    assert message in result.output
+
+# TEST COMMANDS DIRECTORY MODE WITH UPDATE MESSAGE
+@patch('autotools.autoconvert.commands.check_for_updates')
+def test_autoconvert_cli_directory_update_message(mock_updates, cli_runner, temp_dir):
+    mock_updates.return_value = "Update available: v2.0.0"
+    result = cli_runner.invoke(autoconvert, [temp_dir, os.path.join(temp_dir, "out"), "--to", "webp"])
+    assert result.exit_code == 0
+    assert "Update available" in result.output
+
+# TEST COMMANDS CSV TO JSON LINES (ROW COUNT IN THE MESSAGE)
+def test_autoconvert_cli_csv_to_jsonl(cli_runner, temp_dir, create_test_file):
+    input_file = create_test_file("rows.csv", "id,name\n1,Alice\n2,Bob\n", mode="w")
+    output_file = os.path.join(temp_dir, "rows.jsonl")
+
+    result = cli_runner.invoke(autoconvert, [input_file, output_file])
+    assert result.exit_code == 0 and "(2 ROWS)" in result.output
+    with open(output_file, "r", encoding="utf-8") as f: assert [json.loads(line) for line in f] == [{"id": "1", "name": "Alice"}, {"id": "2", "name": "Bob"}]
+
+# TEST COMMANDS CONVERSION CACHE (--cache-dir HITS, --no-cache ENCODES AGAIN, DIRECTORY MODE SHARES THE CACHE)
+def test_autoconvert_cli_cache(cli_runner, temp_dir, isolated_convert_cache):
+    from PIL import Image
+    input_file, cache_dir = os.path.join(temp_dir, "photo.png"), os.path.join(temp_dir, "cache")
+    Image.new("RGB", (8, 8), (0, 128, 0)).save(input_file)
+
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "a.webp"), "--cache-dir", cache_dir])
+    assert result.exit_code == 0 and "IMAGE CONVERTED SUCCESSFULLY" in result.output
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "b.webp"), "--cache-dir", cache_dir])
+    assert result.exit_code == 0 and "IMAGE RESTORED FROM CACHE" in result.output
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "c.webp"), "--cache-dir", cache_dir, "--no-cache"])
+    assert result.exit_code == 0 and "IMAGE CONVERTED SUCCESSFULLY" in result.output
+
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "d"), "--to", "webp"])
+    assert result.exit_code == 0 and os.path.isdir(isolated_convert_cache)
+    os.makedirs(os.path.join(temp_dir, "src"))
+    os.replace(input_file, os.path.join(temp_dir, "src", "photo.png"))
+    result = cli_runner.invoke(autoconvert, [os.path.join(temp_dir, "src"), os.path.join(temp_dir, "dst"), "--to", "webp"])
+    assert result.exit_code == 0 and "CONVERTED: 1" in result.output
+
+# TEST COMMANDS REJECT A NON-POSITIVE CACHE SIZE
+def test_autoconvert_cli_cache_size_invalid(cli_runner, temp_dir, create_test_file):
+    input_file = create_test_file("input.txt", "test", mode="w")
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "out.json"), "--cache-size", "0"])
+    assert result.exit_code != 0
+    assert "Invalid value for '--cache-size'" in result.output
+
+# TEST COMMANDS ONLY OPEN THE CACHE FOR MEDIA OUTPUTS (TEXT CONVERSIONS, --no-cache AND A DIRECTORY WITHOUT --to NEVER BUILD ONE)
+@patch('autotools.autoconvert.commands.ConversionCache')
+def test_autoconvert_cli_cache_media_only(mock_cache_class, cli_runner, temp_dir, create_test_file):
+    input_file = create_test_file("input.txt", "test", mode="w")
+    assert cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "out.json")]).exit_code == 0
+    assert cli_runner.invoke(autoconvert, [temp_dir, os.path.join(temp_dir, "json"), "--to", "json"]).exit_code == 0
+    assert cli_runner.invoke(autoconvert, [temp_dir, os.path.join(temp_dir, "none")]).exit_code != 0
+    assert cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "out.png"), "--no-cache"]).exit_code != 0
+    mock_cache_class.assert_not_called()
+
+    cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "out"), "--to", "png", "--cache-size", "2"])
+    mock_cache_class.assert_called_once_with(None, 2 * 1024 * 1024)
+
+# TEST COMMANDS PASS --bitrate AND --sample-rate TO THE AUDIO CONVERTER (SINGLE FILE AND DIRECTORY MODE)
+@patch('autotools.autoconvert.conversion.convert_audio.find_ffmpeg', return_value=None)
+def test_autoconvert_cli_audio_options(mock_find_ffmpeg, cli_runner, temp_dir, create_test_file, mock_pydub):
+    segment = mock_pydub.from_file.return_value
+    segment.export.side_effect = lambda path, **kwargs: Path(path).write_bytes(b"ID3")
+    input_file = create_test_file("talk.wav", b"RIFF")
+
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "talk.mp3"), "--bitrate", "64k", "--sample-rate", "22050", "--no-cache"])
+    assert result.exit_code == 0 and "AUDIO CONVERTED SUCCESSFULLY" in result.output
+    segment.export.assert_called_once_with(os.path.join(temp_dir, "talk.mp3"), format="mp3", bitrate="64k", parameters=["-ar", "22050"])
+
+    result = cli_runner.invoke(autoconvert, [temp_dir, os.path.join(temp_dir, "out"), "--to", "ogg", "--include", "*.wav", "--bitrate", "96k"])
+    assert result.exit_code == 0 and "CONVERTED: 1" in result.output
+    assert segment.export.call_args[1]["bitrate"] == "96k"
+
+    result = cli_runner.invoke(autoconvert, [input_file, os.path.join(temp_dir, "talk.mp3"), "--sample-rate", "0"])
+    assert result.exit_code != 0
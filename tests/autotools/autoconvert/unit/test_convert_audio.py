@@ -1,10 +1,27 @@
 import pytest
 import os
-from unittest.mock import MagicMock
+import shutil
+import subprocess
+from unittest.mock import MagicMock, patch
 
-from autotools.autoconvert.conversion.convert_audio import convert_audio
+from autotools.autoconvert.conversion.convert_audio import audio_engine, convert_audio, ffmpeg_audio_command, find_ffmpeg
 from ..conftest import mock_import_error
 
+# RUNS EVERY TEST WITHOUT AN FFMPEG EXECUTABLE (PYDUB FALLBACK) UNLESS THE TEST PROVIDES ONE
+@pytest.fixture(autouse=True)
+def no_ffmpeg(monkeypatch):
+    monkeypatch.setattr("autotools.autoconvert.conversion.convert_audio.find_ffmpeg", lambda: None)
+
+# HELPER TO WRITE A SHORT SILENT WAV FILE
+def create_wav(path, rate=8000, seconds=1):
+    import wave
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00" * rate * seconds)
+    return path
+
 # TEST CONVERT AUDIO WITH OUTPUT FORMAT
 def test_convert_audio_with_output_format(monkeypatch, mock_pydub, temp_dir, create_test_file):
     mock_segment = MagicMock()
@@ -56,3 +73,77 @@ def test_convert_audio_import_error(monkeypatch, temp_dir, create_test_file):
     
     with pytest.raises(ImportError) as exc_info: convert_audio(input_file, output_file)
     assert "PYDUB" in str(exc_info.value).upper()
+
+# TEST PYDUB FALLBACK PASSES THE BITRATE AND SAMPLE RATE TO THE EXPORT
+def test_convert_audio_pydub_options(mock_pydub, temp_dir, create_test_file):
+    mock_segment = MagicMock()
+    mock_pydub.from_file.return_value = mock_segment
+    output_file = os.path.join(temp_dir, "output.mp3")
+
+    assert convert_audio(create_test_file("input.wav"), output_file, bitrate="96k", sample_rate=22050)
+    mock_segment.export.assert_called_once_with(output_file, format="mp3", bitrate="96k", parameters=["-ar", "22050"])
+
+# TEST INVALID BITRATES AND SAMPLE RATES ARE REJECTED BEFORE ANY ENGINE RUNS
+@pytest.mark.parametrize("options, message", [({"bitrate": "fast"}, "INVALID BITRATE"), ({"sample_rate": 0}, "SAMPLE RATE MUST BE GREATER THAN 0")])
+def test_convert_audio_invalid_options(temp_dir, create_test_file, options, message):
+    with pytest.raises(RuntimeError, match=message): convert_audio(create_test_file("input.wav"), os.path.join(temp_dir, "out.mp3"), **options)
+
+# TEST FFMPEG COMMAND: ONE STREAMING PASS, AUDIO ONLY, MUXER NAMES AND PROTECTED PATHS
+def test_ffmpeg_audio_command():
+    command = ffmpeg_audio_command("ffmpeg", "-in.wav", "out:1.m4a", "m4a", "128k", 44100)
+    assert command[:2] == ["ffmpeg", "-hide_banner"]
+    assert command[command.index("-i") + 1] == "file:-in.wav" and "-vn" in command
+    assert command[command.index("-b:a") + 1] == "128k" and command[command.index("-ar") + 1] == "44100"
+    assert command[-3:] == ["-f", "ipod", "file:out:1.m4a"]
+
+    command = ffmpeg_audio_command("ffmpeg", "in.wav", "out.flac", "flac")
+    assert "-b:a" not in command and "-ar" not in command and command[-2] == "flac"
+
+# TEST FFMPEG IS LOOKED UP ON THE PATH
+def test_find_ffmpeg():
+    with patch("autotools.autoconvert.conversion.convert_audio.shutil.which", return_value="/opt/bin/ffmpeg") as which:
+        assert find_ffmpeg() == "/opt/bin/ffmpeg"
+    which.assert_called_once_with("ffmpeg")
+
+# TEST THE ENGINE IS FFMPEG WHEN IT IS ON THE PATH, OTHERWISE PYDUB WITH THE avconv IT SHELLS OUT TO
+def test_audio_engine(monkeypatch):
+    with patch("autotools.autoconvert.conversion.convert_audio.shutil.which", return_value="/opt/bin/avconv") as which:
+        assert audio_engine() == ("pydub", "/opt/bin/avconv")
+    which.assert_called_once_with("avconv")
+    monkeypatch.setattr("autotools.autoconvert.conversion.convert_audio.find_ffmpeg", lambda: "/opt/bin/ffmpeg")
+    assert audio_engine() == ("ffmpeg", "/opt/bin/ffmpeg")
+
+# TEST FFMPEG ENGINE IS PREFERRED OVER PYDUB WHEN AVAILABLE
+def test_convert_audio_ffmpeg_engine(monkeypatch, mock_pydub, temp_dir, create_test_file):
+    monkeypatch.setattr("autotools.autoconvert.conversion.convert_audio.find_ffmpeg", lambda: "/usr/bin/ffmpeg")
+    input_file, output_file = create_test_file("input.wav"), os.path.join(temp_dir, "output.mp3")
+
+    with patch("autotools.autoconvert.conversion.convert_audio.subprocess.run", return_value=MagicMock(returncode=0)) as run:
+        assert convert_audio(input_file, output_file, bitrate="192k") is True
+    command = run.call_args[0][0]
+    assert command[0] == "/usr/bin/ffmpeg" and command[-1] == f"file:{output_file}" and "192k" in command
+    assert run.call_args[1]["stdin"] == subprocess.DEVNULL
+    mock_pydub.from_file.assert_not_called()
+
+# TEST FFMPEG FAILURE REMOVES THE PARTIAL OUTPUT AND REPORTS THE LAST ERROR LINE
+def test_convert_audio_ffmpeg_failure(monkeypatch, temp_dir, create_test_file):
+    monkeypatch.setattr("autotools.autoconvert.conversion.convert_audio.find_ffmpeg", lambda: "ffmpeg")
+    input_file, output_file = create_test_file("input.wav"), create_test_file("output.mp3", b"partial")
+
+    failure = MagicMock(returncode=1, stderr=b"first line\nfile:input.wav: Invalid data found when processing input\n")
+    with patch("autotools.autoconvert.conversion.convert_audio.subprocess.run", return_value=failure):
+        with pytest.raises(RuntimeError, match="FFMPEG EXITED WITH CODE 1: file:input.wav: Invalid data found"): convert_audio(input_file, output_file)
+    assert not os.path.exists(output_file)
+
+    with patch("autotools.autoconvert.conversion.convert_audio.subprocess.run", return_value=MagicMock(returncode=-9, stderr=b"")):
+        with pytest.raises(RuntimeError, match="CODE -9: NO ERROR OUTPUT"): convert_audio(input_file, output_file)
+
+# TEST REAL FFMPEG CONVERSION WITH A NEW SAMPLE RATE (ONLY WHERE FFMPEG IS INSTALLED)
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFMPEG IS NOT INSTALLED")
+def test_convert_audio_ffmpeg_real(monkeypatch, temp_dir):
+    import wave
+    monkeypatch.setattr("autotools.autoconvert.conversion.convert_audio.find_ffmpeg", lambda: shutil.which("ffmpeg"))
+    input_file, output_file = create_wav(os.path.join(temp_dir, "input.wav")), os.path.join(temp_dir, "output.wav")
+
+    assert convert_audio(input_file, output_file, sample_rate=16000)
+    with wave.open(output_file, "rb") as f: assert f.getframerate() == 16000
@@ -0,0 +1,89 @@
+import os
+import pytest
+from unittest.mock import patch
+
+from autotools.autoconvert.batch import convert_directory, is_up_to_date, plan_batch
+
+# HELPER TO CREATE A SOURCE TREE OF PNG IMAGES AND TEXT FILES
+def create_tree(root):
+    from PIL import Image
+    os.makedirs(os.path.join(root, "src", "icons", "small"))
+    for name in ("a.png", os.path.join("icons", "b.png"), os.path.join("icons", "small", "c.png")):
+        Image.new("RGB", (16, 16), (255, 0, 0)).save(os.path.join(root, "src", name))
+    with open(os.path.join(root, "src", "notes.txt"), "w", encoding="utf-8") as f: f.write("hello")
+    return os.path.join(root, "src")
+
+# BATCH PLANNING TESTS
+
+# TEST PLAN MIRRORS THE LAYOUT, APPLIES INCLUDE/EXCLUDE GLOBS AND LEAVES OUT FILES OF ANOTHER TYPE (UNLESS input_type IS FORCED)
+def test_plan_batch_filters(temp_dir):
+    src, dst = create_tree(temp_dir), os.path.join(temp_dir, "dst")
+    pairs = plan_batch(src, dst, "webp", includes=["*.png"], excludes=["icons/small/*"])
+    assert pairs == [(os.path.join(src, "a.png"), os.path.join(dst, "a.webp")),
+                     (os.path.join(src, "icons", "b.png"), os.path.join(dst, "icons", "b.webp"))]
+    assert len(plan_batch(src, dst, "webp")) == 3
+    assert len(plan_batch(src, dst, "webp", input_type="image")) == 4
+    assert plan_batch(src, dst, "json") == [(os.path.join(src, "notes.txt"), os.path.join(dst, "notes.json"))]
+
+# TEST PLAN SKIPS AN OUTPUT DIRECTORY INSIDE THE SOURCE AND FILES THAT WOULD BE THEIR OWN OUTPUT
+def test_plan_batch_nested_output(temp_dir):
+    src = create_tree(temp_dir)
+    os.makedirs(os.path.join(src, "out"))
+    open(os.path.join(src, "out", "old.png"), "w").close()
+    inputs = [os.path.relpath(i, src) for i, _ in plan_batch(src, os.path.join(src, "out"), "png")]
+    assert inputs == ["a.png", os.path.join("icons", "b.png"), os.path.join("icons", "small", "c.png")]
+    assert os.path.join(src, "a.png") not in [i for i, _ in plan_batch(src, src, "png")]
+
+# TEST PLAN REJECTS TWO INPUTS WITH THE SAME OUTPUT, AN UNKNOWN OUTPUT FORMAT AND A MISSING SOURCE DIRECTORY
+# - A FILE OF ANOTHER TYPE NEVER CONFLICTS (a.md IS NOT CONVERTED TO a.webp)
+def test_plan_batch_errors(temp_dir):
+    src = create_tree(temp_dir)
+    open(os.path.join(src, "a.md"), "w").close()
+    assert len(plan_batch(src, temp_dir, "webp")) == 3
+    open(os.path.join(src, "a.jpg"), "w").close()
+    with pytest.raises(ValueError, match="SEVERAL INPUTS MAP TO THE SAME OUTPUT"): plan_batch(src, temp_dir, "webp")
+    with pytest.raises(ValueError, match="UNSUPPORTED OUTPUT FORMAT: xyz"): plan_batch(src, temp_dir, "xyz")
+    with pytest.raises(FileNotFoundError, match="INPUT DIRECTORY NOT FOUND"): plan_batch(os.path.join(temp_dir, "none"), temp_dir, "webp")
+
+# TEST UP-TO-DATE CHECK BY MODIFICATION TIME
+def test_is_up_to_date(temp_dir, create_test_file):
+    source, output = create_test_file("in.txt", "x", mode="w"), os.path.join(temp_dir, "out.json")
+    assert not is_up_to_date(source, output)
+    create_test_file("out.json", "{}", mode="w")
+    os.utime(source, (1000, 1000))
+    assert is_up_to_date(source, output)
+    os.utime(source, (os.stat(output).st_mtime + 10,) * 2)
+    assert not is_up_to_date(source, output)
+
+# BATCH CONVERSION TESTS
+
+# TEST CONVERTING A TREE IN A PROCESS POOL, THEN SKIPPING UP-TO-DATE OUTPUTS (force CONVERTS AGAIN)
+def test_convert_directory(temp_dir):
+    from PIL import Image
+    src, dst = create_tree(temp_dir), os.path.join(temp_dir, "dst")
+    results = []
+    report = convert_directory(src, dst, ".WEBP", includes=["*.png"], jobs=2, on_result=lambda *result: results.append(result))
+    assert report == {'converted': 3, 'skipped': 0, 'unsupported': 0, 'failed': []} and len(results) == 3
+    with Image.open(os.path.join(dst, "icons", "small", "c.webp")) as img: assert img.format == "WEBP"
+
+    assert convert_directory(src, dst, "webp", includes=["*.png"], jobs=0)['skipped'] == 3
+    assert convert_directory(src, dst, "webp", includes=["*.png"], force=True)['converted'] == 3
+
+# TEST FILES OF ANOTHER TYPE ARE COUNTED, NOT FAILED
+def test_convert_directory_unsupported(temp_dir):
+    src, dst = create_tree(temp_dir), os.path.join(temp_dir, "dst")
+    open(os.path.join(src, ".DS_Store"), "wb").close()
+    assert convert_directory(src, dst, "webp") == {'converted': 3, 'skipped': 0, 'unsupported': 2, 'failed': []}
+    assert not os.path.exists(os.path.join(dst, "notes.webp"))
+
+# TEST FAILURES ARE COLLECTED WITHOUT STOPPING THE BATCH (A CORRUPT IMAGE AND AN UNEXPECTED ERROR)
+def test_convert_directory_failures(temp_dir):
+    src, dst = create_tree(temp_dir), os.path.join(temp_dir, "dst")
+    with open(os.path.join(src, "broken.png"), "w", encoding="utf-8") as f: f.write("not an image")
+    report = convert_directory(src, dst, "webp")
+    assert report['converted'] == 3 and [path for path, _ in report['failed']] == [os.path.join(src, "broken.png")]
+    assert report['failed'][0][1].startswith("CONVERSION FAILED:")
+
+    with patch('autotools.autoconvert.batch.convert_file', side_effect=FileNotFoundError("GONE")):
+        report = convert_directory(src, dst, "webp", includes=["a.png"], force=True)
+    assert report['failed'] == [(os.path.join(src, "a.png"), "CONVERSION FAILED: GONE")]
@@ -0,0 +1,289 @@
+import os
+import sys
+import hashlib
+import pytest
+import subprocess
+from pathlib import Path, PurePosixPath
+from unittest.mock import MagicMock, patch
+
+from autotools.autoconvert import cache as cache_module
+from autotools.autoconvert.cache import ConversionCache, converter_version, default_cache_dir, encoder_version, hash_file, materialise, reflink
+from autotools.autoconvert.core import convert_file
+from autotools.autoconvert.batch import convert_directory
+from ..conftest import mock_import_error
+
+# HELPER TO SAVE A SMALL PNG IMAGE
+def create_png(path, color=(255, 0, 0)):
+    from PIL import Image
+    Image.new("RGB", (8, 8), color).save(path)
+    return path
+
+# CACHE LOCATION AND KEY TESTS
+
+# TEST DEFAULT CACHE DIRECTORY: ENVIRONMENT OVERRIDE, THEN THE USER CACHE DIRECTORY OF EACH PLATFORM
+def test_default_cache_dir(monkeypatch, tmp_path):
+    assert default_cache_dir() == tmp_path / "convert-cache"
+
+    monkeypatch.delenv("AUTOTOOLS_CONVERT_CACHE")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert default_cache_dir() == tmp_path / "xdg" / "Open-AutoTools" / "autoconvert"
+
+    monkeypatch.setattr(sys, "platform", "darwin")
+    assert default_cache_dir() == Path.home() / "Library" / "Caches" / "Open-AutoTools" / "autoconvert"
+
+    monkeypatch.setattr(cache_module, "Path", PurePosixPath)
+    monkeypatch.setattr(cache_module.os, "name", "nt")
+    monkeypatch.setenv("LOCALAPPDATA", "LOCAL")
+    assert str(default_cache_dir()) == "LOCAL/Open-AutoTools/autoconvert"
+
+# TEST KEYS CHANGE WITH THE INPUT CONTENT, THE OUTPUT FORMAT AND THE CONVERTER VERSION, BUT NOT WITH THE FILE NAMES
+def test_cache_key(temp_dir, create_test_file):
+    cache = ConversionCache()
+    first, same = create_test_file("a.png", b"pixels"), create_test_file("b.png", b"pixels")
+    key = cache.key(first, os.path.join(temp_dir, "out.webp"), "image", "image")
+
+    assert cache.key(same, os.path.join(temp_dir, "other.webp"), "image", "image") == key
+    assert cache.key(first, os.path.join(temp_dir, "out.jpg"), "image", "image") != key
+    assert cache.key(create_test_file("c.png", b"other pixels"), os.path.join(temp_dir, "out.webp"), "image", "image") != key
+    with patch("autotools.autoconvert.cache.converter_version", return_value="Open-AutoTools==9.9"):
+        assert cache.key(first, os.path.join(temp_dir, "out.webp"), "image", "image") != key
+
+    assert hash_file(first) == hashlib.sha256(b"pixels").hexdigest()
+    assert cache.entry_path(key) == os.path.join(cache.directory, key[:2], key)
+    assert converter_version("text") == f"Open-AutoTools=={cache_module._distribution_version('Open-AutoTools')}"
+    assert converter_version("image").endswith(f";Pillow=={cache_module._distribution_version('Pillow')}")
+    assert cache_module._distribution_version("no-such-distribution-for-autoconvert") == "unknown"
+
+# TEST AUDIO KEYS NAME THE ENGINE THAT RUNS AND ITS EXECUTABLE'S VERSION, VIDEO KEYS THE VERSION OF MOVIEPY'S FFMPEG
+def test_cache_key_encoders(monkeypatch, temp_dir, create_test_file):
+    cache, source, output = ConversionCache(), create_test_file("a.wav", b"RIFF"), os.path.join(temp_dir, "a.mp3")
+    monkeypatch.setattr(cache_module, "encoder_version", lambda executable: f"{executable} version 7.0")
+
+    monkeypatch.setattr(cache_module, "audio_engine", lambda: ("ffmpeg", "/usr/bin/ffmpeg"))
+    assert converter_version("audio").endswith(";engine=ffmpeg;encoder=/usr/bin/ffmpeg version 7.0")
+    ffmpeg_key = cache.key(source, output, "audio", "audio")
+    monkeypatch.setattr(cache_module, "audio_engine", lambda: ("ffmpeg", "/opt/bin/ffmpeg"))
+    assert cache.key(source, output, "audio", "audio") != ffmpeg_key
+    monkeypatch.setattr(cache_module, "audio_engine", lambda: ("pydub", None))
+    assert converter_version("audio").endswith(f";pydub=={cache_module._distribution_version('pydub')};engine=pydub;encoder=None version 7.0")
+    assert cache.key(source, output, "audio", "audio") != ffmpeg_key
+
+    monkeypatch.setattr(cache_module, "find_moviepy_ffmpeg", lambda: "/bundled/ffmpeg")
+    assert converter_version("video").endswith(f";moviepy=={cache_module._distribution_version('moviepy')};encoder=/bundled/ffmpeg version 7.0")
+
+# TEST ENCODER VERSIONS ARE THE FIRST LINE OF '-version', 'unknown' WHEN THE EXECUTABLE IS MISSING, FAILS OR HANGS
+def test_encoder_version(temp_dir, create_test_file):
+    def script(name, body):
+        path = create_test_file(name, f"#!/bin/sh\n{body}\n", mode="w")
+        os.chmod(path, 0o755)
+        return path
+
+    assert encoder_version(script("ffmpeg", "echo 'ffmpeg version 7.0.2'; echo 'built with gcc'")) == "ffmpeg version 7.0.2"
+    assert encoder_version(script("broken", "exit 1")) == "unknown"
+    assert encoder_version(script("silent", "true")) == "unknown"
+    assert encoder_version(create_test_file("not-executable", "data", mode="w")) == "unknown"
+    assert encoder_version(os.path.join(temp_dir, "missing")) == "unknown"
+    assert encoder_version(None) == "unknown"
+    with patch("autotools.autoconvert.cache.subprocess.run", side_effect=subprocess.TimeoutExpired("ffmpeg", 10)):
+        assert encoder_version(script("hanging", "sleep 60")) == "unknown"
+
+# TEST ONLY SAME-TYPE MEDIA CONVERSIONS GO THROUGH THE CACHE, AND THE SIZE CAP MUST BE POSITIVE
+def test_cache_handles():
+    cache = ConversionCache("unused")
+    assert cache.handles("image", "image") and cache.handles("video", "video")
+    assert not cache.handles("text", "text") and not cache.handles("image", "video")
+    with pytest.raises(ValueError, match="CACHE SIZE MUST BE GREATER THAN 0"): ConversionCache("unused", 0)
+
+# MATERIALISATION TESTS
+
+# TEST MATERIALISATION FALLS BACK FROM REFLINK TO COPY, AND NEVER HARD-LINKS
+def test_materialise_fallbacks(temp_dir, create_test_file):
+    source = create_test_file("source.bin", b"payload")
+
+    with patch("autotools.autoconvert.cache.reflink"):
+        assert materialise(source, os.path.join(temp_dir, "clone.bin")) == "reflink"
+    with patch("autotools.autoconvert.cache.reflink", side_effect=OSError("NO REFLINK")):
+        copied = os.path.join(temp_dir, "copied.bin")
+        assert materialise(source, copied) == "copy"
+    assert Path(copied).read_bytes() == b"payload" and not os.path.samefile(source, copied)
+
+# TEST LINUX REFLINK: FICLONE SUCCESS, FAILURE (NO PARTIAL FILE LEFT) AND A MISSING SOURCE
+def test_reflink_linux(monkeypatch, temp_dir, create_test_file):
+    import fcntl
+    monkeypatch.setattr(sys, "platform", "linux")
+    source, target = create_test_file("source.bin", b"payload"), os.path.join(temp_dir, "target.bin")
+
+    with patch.object(fcntl, "ioctl") as ioctl:
+        reflink(source, target)
+    assert ioctl.call_args[0][1] == cache_module._FICLONE and os.path.exists(target)
+    os.unlink(target)
+
+    with patch.object(fcntl, "ioctl", side_effect=OSError("EOPNOTSUPP")):
+        with pytest.raises(OSError, match="EOPNOTSUPP"): reflink(source, target)
+    assert not os.path.exists(target)
+    with pytest.raises(FileNotFoundError): reflink(os.path.join(temp_dir, "missing.bin"), target)
+    assert not os.path.exists(target)
+
+# TEST REFLINK IS REPORTED AS UNSUPPORTED WITHOUT fcntl (WINDOWS)
+def test_reflink_unsupported(monkeypatch, temp_dir):
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.delitem(sys.modules, "fcntl", raising=False)
+    mock_import_error(monkeypatch, "fcntl")
+    with pytest.raises(OSError, match="REFLINKS ARE NOT SUPPORTED"): reflink("a", os.path.join(temp_dir, "b"))
+
+# TEST MACOS REFLINK THROUGH clonefile(2)
+def test_reflink_macos(monkeypatch):
+    import ctypes
+    monkeypatch.setattr(sys, "platform", "darwin")
+    libc = MagicMock()
+    monkeypatch.setattr(ctypes, "CDLL", MagicMock(return_value=libc))
+
+    libc.clonefile.return_value = 0
+    reflink("a.png", "b.png")
+    libc.clonefile.assert_called_once_with(b"a.png", b"b.png", 0)
+
+    libc.clonefile.return_value = -1
+    with pytest.raises(OSError, match="clonefile FAILED"): reflink("a.png", "b.png")
+
+# STORE, RESTORE AND EVICTION TESTS
+
+# TEST A STORED OUTPUT IS RESTORED OVER AN EXISTING FILE AND A MISSING ENTRY IS A MISS
+def test_cache_store_and_restore(temp_dir, create_test_file):
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+    output = create_test_file("out.webp", b"encoded")
+    assert cache.restore("ab" * 32, output) is None
+
+    assert cache.store("ab" * 32, output)
+    assert Path(cache.entry_path("ab" * 32)).read_bytes() == b"encoded"
+
+    restored = create_test_file("restored.webp", b"stale")
+    assert cache.restore("ab" * 32, restored) in ("reflink", "copy")
+    assert Path(restored).read_bytes() == b"encoded"
+    assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+
+# TEST STORE IS BEST EFFORT: OVERSIZED OUTPUTS, AN UNUSABLE CACHE DIRECTORY AND LEFTOVER TEMPORARY FILES
+def test_cache_store_failures(temp_dir, create_test_file):
+    output = create_test_file("out.webp", b"encoded")
+    assert not ConversionCache(os.path.join(temp_dir, "cache"), 4).store("cd" * 32, output)
+    assert not ConversionCache(output).store("cd" * 32, output)
+
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+    os.makedirs(os.path.join(cache.directory, "cd"))
+    create_test_file(os.path.join("cache", "cd", f".{'cd' * 32}.{os.getpid()}.tmp"), b"torn")
+    with patch("autotools.autoconvert.cache.materialise", side_effect=OSError("DISK FULL")):
+        assert not cache.store("cd" * 32, output)
+    assert os.listdir(os.path.join(cache.directory, "cd")) == []
+    with patch("autotools.autoconvert.cache.os.replace", side_effect=OSError("READ-ONLY")):
+        assert not cache.store("cd" * 32, output)
+    assert os.listdir(os.path.join(cache.directory, "cd")) == []
+
+    create_test_file(os.path.join("cache", "cd", f".{'cd' * 32}.{os.getpid()}.tmp"), b"torn")
+    assert cache.store("cd" * 32, output)
+    assert os.listdir(os.path.join(cache.directory, "cd")) == ["cd" * 32]
+
+# TEST LEAST RECENTLY USED ENTRIES ARE EVICTED ONCE THE CACHE GROWS PAST ITS CAP (A RESTORE COUNTS AS A USE)
+def test_cache_eviction(temp_dir, create_test_file):
+    cache = ConversionCache(os.path.join(temp_dir, "cache"), 25)
+    output = create_test_file("out.bin", b"x" * 10)
+    os.makedirs(os.path.join(cache.directory, "stray"))
+    create_test_file(os.path.join("cache", "notes.txt"), b"not an entry")
+    os.makedirs(os.path.join(cache.directory, "aa"))
+    create_test_file(os.path.join("cache", "aa", ".write-in-progress.tmp"), b"z" * 100)
+
+    for index, key in enumerate(("aa" * 32, "bb" * 32)):
+        assert cache.store(key, output)
+        os.utime(cache.entry_path(key), (1000 + index, 1000 + index))
+    assert cache.restore("aa" * 32, os.path.join(temp_dir, "copy.bin"))
+
+    assert cache.store("cc" * 32, create_test_file("out2.bin", b"y" * 10))
+    assert not os.path.exists(cache.entry_path("bb" * 32))
+    assert os.path.exists(cache.entry_path("aa" * 32)) and os.path.exists(cache.entry_path("cc" * 32))
+    assert cache.evict(0) == 0 and not os.path.exists(cache.entry_path("aa" * 32))
+
+# TEST EVICTION TOLERATES ENTRIES REMOVED BY ANOTHER PROCESS AND A FAILING SCAN
+def test_cache_eviction_races(temp_dir, create_test_file):
+    cache = ConversionCache(os.path.join(temp_dir, "cache"), 100)
+    assert cache.store("aa" * 32, create_test_file("out.bin", b"x" * 10))
+    with patch.object(ConversionCache, "_entries", return_value=[(cache.entry_path("zz" * 32), 10, 0.0)]):
+        assert cache.evict(0) == 0
+
+    cache_module._known_sizes.pop(cache.directory, None)
+    with patch.object(ConversionCache, "_entries", side_effect=OSError("GONE")):
+        assert cache.store("bb" * 32, create_test_file("out2.bin", b"y" * 10))
+    assert cache.directory not in cache_module._known_sizes
+
+# CONVERSION THROUGH THE CACHE TESTS
+
+# TEST A MEDIA CONVERSION IS ENCODED ONCE, THEN RESTORED FROM THE CACHE FOR THE SAME CONTENT
+def test_convert_file_uses_cache(temp_dir):
+    from PIL import Image
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+    source, output = create_png(os.path.join(temp_dir, "a.png")), os.path.join(temp_dir, "a.webp")
+
+    assert convert_file(source, output, cache=cache) == (True, "IMAGE CONVERTED SUCCESSFULLY")
+    copy_source, copy_output = create_png(os.path.join(temp_dir, "b.png")), os.path.join(temp_dir, "b.webp")
+    with patch("autotools.autoconvert.core.convert_image") as convert_image:
+        success, message = convert_file(copy_source, copy_output, cache=cache)
+    assert success and message.startswith("IMAGE RESTORED FROM CACHE (") and not convert_image.called
+    with Image.open(copy_output) as img: assert img.format == "WEBP"
+
+# TEST FAILED AND NON-MEDIA CONVERSIONS ARE NEVER STORED
+def test_convert_file_cache_skips(temp_dir, create_test_file):
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+    assert convert_file(create_test_file("in.txt", "hello", mode="w"), os.path.join(temp_dir, "out.json"), cache=cache)[0]
+    with patch("autotools.autoconvert.core._convert", return_value=(False, "BROKEN")):
+        assert convert_file(create_png(os.path.join(temp_dir, "a.png")), os.path.join(temp_dir, "a.webp"), cache=cache) == (False, "BROKEN")
+    assert not os.path.exists(cache.directory)
+
+# TEST OUTPUTS NEVER SHARE AN INODE WITH THEIR ENTRY: EDITING AN OUTPUT LEAVES THE ENTRY INTACT, A HIT LEAVES OLD OUTPUTS' MTIMES ALONE
+def test_cache_entries_are_independent(temp_dir):
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+    red, output = create_png(os.path.join(temp_dir, "a.png")), os.path.join(temp_dir, "a.webp")
+    with patch("autotools.autoconvert.cache.reflink", side_effect=OSError("NO REFLINK")):
+        convert_file(red, output, cache=cache)
+        key = cache.key(red, output, "image", "image")
+        entry = Path(cache.entry_path(key)).read_bytes()
+        assert os.stat(output).st_nlink == 1
+
+        os.utime(output, (1000, 1000))
+        assert convert_file(red, os.path.join(temp_dir, "b.webp"), cache=cache)[1] == "IMAGE RESTORED FROM CACHE (COPY)"
+    assert os.stat(output).st_mtime == 1000
+
+    with open(output, "r+b") as f: f.write(b"edited")
+    assert Path(cache.entry_path(key)).read_bytes() == entry
+
+# TEST A CACHED CONVERSION WRITES THROUGH A TEMPORARY FILE: USER HARD LINKS TO THE OLD OUTPUT ARE LEFT UNTOUCHED, NO TEMPORARY FILE IS LEFT
+def test_convert_file_cache_temporary_output(temp_dir, create_test_file):
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+    source, output = create_png(os.path.join(temp_dir, "a.png")), create_test_file("a.webp", b"old")
+    os.link(output, os.path.join(temp_dir, "backup.webp"))
+
+    assert convert_file(source, output, cache=cache)[0]
+    assert Path(temp_dir, "backup.webp").read_bytes() == b"old" and Path(output).read_bytes() != b"old"
+
+    def broken(input_path, output_path, *args):
+        Path(output_path).write_bytes(b"half")
+        raise RuntimeError("ENCODER CRASHED")
+    with patch("autotools.autoconvert.core._convert", side_effect=broken):
+        assert convert_file(create_png(os.path.join(temp_dir, "b.png"), (0, 0, 255)), output, cache=cache) == (False, "CONVERSION FAILED: ENCODER CRASHED")
+    assert sorted(os.listdir(temp_dir)) == ["a.png", "a.webp", "b.png", "backup.webp", "cache"]
+
+# TEST NON-CACHED CONVERSIONS WRITE THE OUTPUT IN PLACE (HARD LINKS THE USER MADE TO IT ARE KEPT)
+def test_convert_file_without_cache_keeps_hardlinks(temp_dir, create_test_file):
+    output = create_test_file("out.json", "{}", mode="w")
+    os.link(output, os.path.join(temp_dir, "mirror.json"))
+    assert convert_file(create_test_file("in.txt", "hello", mode="w"), output)[0]
+    assert os.path.samefile(output, os.path.join(temp_dir, "mirror.json"))
+
+# TEST A BATCH SHARES ONE CACHE ACROSS WORKER PROCESSES
+def test_convert_directory_uses_cache(temp_dir):
+    src = os.path.join(temp_dir, "src")
+    os.makedirs(src)
+    for name in ("a.png", "b.png", "c.png"): create_png(os.path.join(src, name))
+    cache = ConversionCache(os.path.join(temp_dir, "cache"))
+
+    results = []
+    report = convert_directory(src, os.path.join(temp_dir, "dst"), "webp", jobs=2, cache=cache, on_result=lambda *result: results.append(result[3]))
+    assert report['converted'] == 3 and len(os.listdir(cache.directory)) >= 1
+    report = convert_directory(src, os.path.join(temp_dir, "dst2"), "webp", cache=cache, on_result=lambda *result: results.append(result[3]))
+    assert report['converted'] == 3 and all("RESTORED FROM CACHE" in message for message in results[3:])
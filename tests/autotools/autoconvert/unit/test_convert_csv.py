@@ -0,0 +1,125 @@
+import io
+import os
+import csv
+import json
+import pytest
+
+from autotools.autoconvert.core import convert_file
+from autotools.autoconvert.conversion.convert_csv import csv_to_json, is_table_conversion, json_to_csv, sniff_csv
+
+# HELPER TO READ AN OUTPUT FILE BACK
+def read(path):
+    with open(path, "r", encoding="utf-8", newline="") as f: return f.read()
+
+# CSV DETECTION TESTS
+
+# TEST DIALECT SNIFFING AND HEADER INFERENCE
+@pytest.mark.parametrize("content, delimiter, header", [
+    ("name;city\nAlice;Paris\nBob;Lyon\n", ";", True),
+    ("a\tb\n1\t2\n", "\t", True),
+    ("1,2,3\n4,5,6\n", ",", False),
+    ("id,\n1,10\n2,12\n", ",", True),
+    ("a\nb\n", ",", True),
+    ("", ",", False),
+])
+def test_sniff_csv(content, delimiter, header):
+    source = io.StringIO(content)
+    dialect, has_header = sniff_csv(source)
+    assert (dialect.delimiter, has_header, source.tell()) == (delimiter, header, 0)
+
+# TEST ONLY CSV TO JSON/JSONL AND JSON/JSONL TO CSV ARE TABLE CONVERSIONS
+def test_is_table_conversion():
+    assert is_table_conversion("csv", "jsonl") and is_table_conversion("ndjson", "csv") and is_table_conversion("json", "csv")
+    assert not is_table_conversion("csv", "txt") and not is_table_conversion("json", "xml") and not is_table_conversion("csv", "csv")
+
+# CSV TO JSON TESTS
+
+# TEST CSV TO A JSON ARRAY AND TO JSON LINES (BOM, QUOTED DELIMITERS, SHORT AND LONG ROWS, BLANK LINES, SMALL BATCHES)
+def test_csv_to_json(temp_dir, create_test_file):
+    input_file = create_test_file("in.csv", '﻿name;city;\r\nAlice;"Paris; FR";1\nBob;Lyon\n\nEve;Nice;2;extra\n', mode="w")
+    expected = [{"name": "Alice", "city": "Paris; FR", "column_3": "1"}, {"name": "Bob", "city": "Lyon", "column_3": None},
+                {"name": "Eve", "city": "Nice", "column_3": "2", "column_4": "extra"}]
+
+    assert csv_to_json(input_file, os.path.join(temp_dir, "out.json"), batch_size=2) == 3
+    assert json.loads(read(os.path.join(temp_dir, "out.json"))) == expected
+    assert csv_to_json(input_file, os.path.join(temp_dir, "out.jsonl"), lines=True) == 3
+    assert [json.loads(line) for line in read(os.path.join(temp_dir, "out.jsonl")).splitlines()] == expected
+
+# TEST HEADERLESS FILES, A FORCED HEADER, REPEATED NAMES AND AN EMPTY FILE
+def test_csv_to_json_headers(temp_dir, create_test_file):
+    output_file = os.path.join(temp_dir, "out.json")
+    input_file = create_test_file("in.csv", "1,2,3\n4,5,6\n", mode="w")
+    csv_to_json(input_file, output_file)
+    assert json.loads(read(output_file))[0] == {"column_1": "1", "column_2": "2", "column_3": "3"}
+    csv_to_json(input_file, output_file, header=True)
+    assert json.loads(read(output_file)) == [{"1": "4", "2": "5", "3": "6"}]
+
+    input_file = create_test_file("dup.csv", "a,a,column_3\n1,2,3,4\n", mode="w")
+    csv_to_json(input_file, output_file, header=True)
+    assert json.loads(read(output_file)) == [{"a": "1", "a_2": "2", "column_3": "3", "column_4": "4"}]
+    input_file = create_test_file("named.csv", "x,column_2\n1,2,3\n", mode="w")
+    csv_to_json(input_file, output_file, header=True)
+    assert json.loads(read(output_file)) == [{"x": "1", "column_2": "2", "column_3": "3"}]
+    input_file = create_test_file("clash.csv", "column_3,b\n1,2,3\n", mode="w")
+    csv_to_json(input_file, output_file, header=True)
+    assert json.loads(read(output_file)) == [{"column_3": "1", "b": "2", "column_3_2": "3"}]
+
+    assert csv_to_json(create_test_file("empty.csv", "", mode="w"), output_file) == 0 and read(output_file) == "[]"
+
+# JSON TO CSV TESTS
+
+# TEST A JSON ARRAY AND JSON LINES TO CSV (NESTED VALUES AS JSON, null AS AN EMPTY CELL)
+def test_json_to_csv(temp_dir, create_test_file):
+    records = [{"a": 1, "b": {"n": [1, True]}, "c": "x,y"}, {"a": None, "c": "é"}]
+    output_file = os.path.join(temp_dir, "out.csv")
+    assert json_to_csv(create_test_file("in.json", json.dumps(records), mode="w"), output_file) == 2
+    assert list(csv.reader(io.StringIO(read(output_file)))) == [["a", "b", "c"], ["1", '{"n": [1, true]}', "x,y"], ["", "", "é"]]
+
+    lines = "\n".join(json.dumps(record) for record in records) + "\n\n"
+    assert json_to_csv(create_test_file("in.jsonl", lines, mode="w"), output_file, lines=True) == 2
+    assert read(output_file).splitlines()[0] == "a,b,c"
+
+# TEST A KEY FIRST SEEN AFTER THE HEADER WAS WRITTEN TRIGGERS A SECOND PASS WITH THE FULL HEADER; A SINGLE OBJECT IS ONE ROW
+def test_json_to_csv_late_keys(temp_dir, create_test_file):
+    output_file = os.path.join(temp_dir, "out.csv")
+    input_file = create_test_file("in.json", json.dumps([{"a": 1}, {"a": 2}, {"b": 3}]), mode="w")
+    assert json_to_csv(input_file, output_file, batch_size=2) == 3
+    assert read(output_file) == "a,b\r\n1,\r\n2,\r\n,3\r\n"
+
+    assert json_to_csv(create_test_file("one.json", '{"k": "v"}', mode="w"), output_file) == 1
+    assert read(output_file) == "k\r\nv\r\n"
+    assert json_to_csv(create_test_file("none.json", '[]', mode="w"), output_file) == 0 and read(output_file) == ""
+
+# TEST INVALID INPUT FAILS THE CONVERSION
+@pytest.mark.parametrize("filename, content, message", [
+    ("in.json", "[1, 2]", "RECORD 1 IS NOT AN OBJECT"),
+    ("in.jsonl", '{"a": 1}\n{oops\n', "INVALID JSON ON LINE 2"),
+    ("in.json", '[{"a": 1} {"a": 2}]', "INVALID JSON"),
+])
+def test_json_to_csv_invalid(temp_dir, create_test_file, filename, content, message):
+    success, result = convert_file(create_test_file(filename, content, mode="w"), os.path.join(temp_dir, "out.csv"))
+    assert success is False and message in result
+
+# TEST A FAILED CONVERSION LEAVES NO EMPTY OR PARTIAL OUTPUT
+def test_json_to_csv_invalid_no_output(temp_dir, create_test_file):
+    input_file = create_test_file("in.jsonl", '{"a": 1}\n' * 3 + '{"b": 2}\n[{"a":1},{"b":2}\n', mode="w")
+    assert not convert_file(input_file, os.path.join(temp_dir, "out.csv"))[0]
+    assert sorted(os.listdir(temp_dir)) == ["in.jsonl"]
+
+    create_test_file("out.csv", "a\r\n1\r\n", mode="w")
+    assert not convert_file(create_test_file("in.json", '[{"a":1},{"b":2}', mode="w"), os.path.join(temp_dir, "out.csv"))[0]
+    assert sorted(os.listdir(temp_dir)) == ["in.json", "in.jsonl"]
+
+# TEST CONVERSIONS THROUGH convert_file REPORT THE ROW COUNT, AND WRITE ERRORS ARE REPORTED
+def test_convert_file_table(temp_dir, create_test_file):
+    input_file = create_test_file("in.csv", "a,b\n1,2\n3,4\n", mode="w")
+    assert convert_file(input_file, os.path.join(temp_dir, "out", "rows.ndjson")) == (True, "TEXT CONVERTED FROM CSV TO NDJSON (2 ROWS)")
+    assert convert_file(os.path.join(temp_dir, "out", "rows.ndjson"), os.path.join(temp_dir, "back.csv"))[0]
+    assert read(os.path.join(temp_dir, "back.csv")) == "a,b\r\n1,2\r\n3,4\r\n"
+
+    os.makedirs(os.path.join(temp_dir, "taken.json"))
+    success, message = convert_file(input_file, os.path.join(temp_dir, "taken.json"))
+    assert success is False and "Cannot write output file" in message
+    os.makedirs(os.path.join(temp_dir, "folder.csv"))
+    success, message = convert_file(os.path.join(temp_dir, "folder.csv"), os.path.join(temp_dir, "folder.json"))
+    assert success is False and not os.path.exists(os.path.join(temp_dir, "folder.json"))
@@ -0,0 +1,56 @@
+import io
+import json
+import pytest
+from autotools.autoconvert.conversion.json_stream import iter_json_events, iter_json_items, iter_json_text, load_json_value, skip_json_value
+
+# JSON EVENT STREAM TESTS
+
+# TEST EVENTS FOR A DOCUMENT READ ONE CHARACTER AT A TIME (STRING PIECES JOINED; A SURROGATE PAIR ESCAPE IS NEVER SPLIT)
+def test_iter_json_events():
+    events = []
+    for event, value in iter_json_events(io.StringIO('{"k\\u00e9": [1, -2.5e3, "ab\\ud83d\\ude00", null, true, false]}'), chunk_size=1):
+        events.append((event, ''.join(value) if event == 'string' else value))
+    assert events == [('start_object', None), ('key', 'ké'), ('start_array', None), ('scalar', 1), ('scalar', -2500.0),
+                      ('string', 'ab\U0001F600'), ('scalar', None), ('scalar', True), ('scalar', False),
+                      ('end_array', None), ('end_object', None)]
+
+# TEST NUMBERS SPLIT BETWEEN CHUNKS, NON-FINITE LITERALS AND SKIPPED STRINGS
+@pytest.mark.parametrize("chunk_size", [1, 2, 1024])
+def test_iter_json_events_scalars(chunk_size):
+    events = list(iter_json_events(io.StringIO(' [123456.75e-2, NaN, -Infinity, "skipped", 0]\n'), chunk_size))
+    values = [value for event, value in events if event == 'scalar']
+    assert values[0] == 1234.5675 and values[1] != values[1] and values[2] == float('-inf') and values[3] == 0
+
+# TEST INVALID DOCUMENTS RAISE ValueError
+@pytest.mark.parametrize("content", ['', '{', '[1,]', '{"a" 1}', '{"a": 1,}', '{1: 2}', '"\\x"', '"abc', '"a\x01"', '01', '[1] 2', 'tru', '[-]'])
+def test_iter_json_events_invalid(content):
+    with pytest.raises(ValueError, match="INVALID JSON"): list(iter_json_events(io.StringIO(content), chunk_size=3))
+
+# TEST BUILDING AND SKIPPING VALUES FROM THE EVENTS
+def test_load_and_skip_json_value():
+    events = iter_json_events(io.StringIO('[{"a": [1, {"b": "c"}]}, {"skip": [[]]}, "x"]'))
+    next(events)
+    assert load_json_value(*next(events), events) == {"a": [1, {"b": "c"}]}
+    skip_json_value(*next(events), events)
+    skip_json_value(*next(events), events)
+    assert next(events) == ('end_array', None)
+
+# TEST THE STREAMED TEXT MATCHES json.dumps WITH AN INDENT
+@pytest.mark.parametrize("data", [{"a": {}, "b": [], "c": [1, {"d": "é\n"}], "e": None}, [], "plain", [[[]], {}]])
+def test_iter_json_text(data):
+    text = ''.join(iter_json_text(iter_json_events(io.StringIO(json.dumps(data)), chunk_size=2), indent=4))
+    assert text == json.dumps(data, indent=4, ensure_ascii=False)
+
+# TEST ARRAY ITEMS ARE DECODED ONE AT A TIME ACROSS CHUNKS (ANY OTHER DOCUMENT IS ONE ITEM)
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+def test_iter_json_items(chunk_size):
+    data = [{"a": [1, 2]}, "x" * 10, 12345678, None, []]
+    assert list(iter_json_items(io.StringIO(json.dumps(data)), chunk_size)) == data
+    assert list(iter_json_items(io.StringIO(' [ ] '), chunk_size)) == []
+    assert list(iter_json_items(io.StringIO('{"k": 1}'), chunk_size)) == [{"k": 1}]
+    assert list(iter_json_items(io.StringIO('7'), chunk_size)) == [7]
+
+# TEST INVALID ARRAYS RAISE ValueError
+@pytest.mark.parametrize("content", ['[1 2]', '[1,', '[{"a": }]', '[1] x', ''])
+def test_iter_json_items_invalid(content):
+    with pytest.raises(ValueError, match="INVALID JSON"): list(iter_json_items(io.StringIO(content), chunk_size=2))
@@ -1,5 +1,8 @@
+import os
 import json
-from autotools.autoconvert.conversion.convert_text import (text_to_json, text_to_xml, text_to_html, text_to_markdown, json_to_text, xml_to_text)
+import pytest
+from autotools.autoconvert.conversion.convert_text import (text_to_json, text_to_xml, text_to_html, text_to_markdown, json_to_text, xml_to_text,
+                                                           convert_text_file)
 
 # TEXT CONVERSION TESTS
 
@@ -91,3 +94,61 @@ def test_xml_to_text_with_tail():
     assert "text1" in result
     assert "text2" in result
     assert "tail" in result
+
+# STREAMING FILE CONVERSION TESTS
+
+# HELPER TO CONVERT A FILE WITH A SMALL CHUNK SIZE AND READ THE OUTPUT BACK
+def convert_chunked(temp_dir, input_file, output_name, chunk_size=3):
+    output_file = os.path.join(temp_dir, output_name)
+    success, _ = convert_text_file(input_file, output_file, chunk_size=chunk_size)
+    assert success is True
+    with open(output_file, "r", encoding="utf-8") as f: return f.read()
+
+# TEST STREAMED OUTPUT MATCHES THE WHOLE-TEXT FORMATTERS, WHATEVER THE CHUNK SIZE
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_convert_text_file_streamed_output(temp_dir, create_test_file, chunk_size):
+    text = 'line "one" <b> & \\ é \U0001F600\nline two'
+    input_file = create_test_file("input.txt", text, mode="w")
+    assert convert_chunked(temp_dir, input_file, "out.json", chunk_size) == text_to_json(text)
+    assert convert_chunked(temp_dir, input_file, "out.xml", chunk_size) == text_to_xml(text)
+    assert convert_chunked(temp_dir, input_file, "out.html", chunk_size) == text_to_html(text)
+    assert convert_chunked(temp_dir, input_file, "out.md", chunk_size) == text
+
+# TEST AN EMPTY TEXT BECOMES AN EMPTY XML ELEMENT
+def test_convert_text_file_empty_xml(temp_dir, create_test_file):
+    input_file = create_test_file("input.txt", "", mode="w")
+    assert convert_chunked(temp_dir, input_file, "out.xml") == text_to_xml("") == "<text />"
+
+# TEST JSON INPUT MATCHES json_to_text (TEXT KEY AFTER OTHER KEYS, NON-STRING TEXT, NO TEXT KEY, ESCAPES SPLIT BETWEEN CHUNKS)
+@pytest.mark.parametrize("data", [
+    {"meta": {"tags": ["a", {"text": "nested"}]}, "n": 1, "text": "café \U0001F600 \"quoted\"\n"},
+    {"text": {"a": [1, 2.5, None]}},
+    [{"text": "not top-level"}, True, False, None, {}, [], -1e-07, "\\"],
+])
+def test_convert_text_file_json_input(temp_dir, create_test_file, data):
+    content = json.dumps(data)
+    input_file = create_test_file("input.json", content, mode="w")
+    assert convert_chunked(temp_dir, input_file, "out.txt", chunk_size=1) == json_to_text(content)
+    assert convert_chunked(temp_dir, input_file, "out.json", chunk_size=2) == text_to_json(json_to_text(content))
+
+# TEST XML INPUT IS EXTRACTED IN DOCUMENT ORDER (TEXT, CHILDREN, THEN TAIL)
+def test_convert_text_file_xml_input(temp_dir, create_test_file):
+    input_file = create_test_file("input.xml", "<root> a <b>b1<c>c</c> b2 </b> tail <d/>\n<e>e &amp; f</e></root>", mode="w")
+    assert convert_chunked(temp_dir, input_file, "out.txt") == "a b1 c b2 tail e & f"
+    assert xml_to_text("<root>text1<child>text2</child>tail</root>") == "text1 text2 tail"
+
+# TEST HTML INPUT JOINS TEXT RUNS WITH SPACES, KEEPING TEXT SPLIT BETWEEN CHUNKS TOGETHER
+def test_convert_text_file_html_input(temp_dir, create_test_file):
+    input_file = create_test_file("input.html", "<!DOCTYPE html><p>Hello World</p><!-- note --><br/>end &amp; more", mode="w")
+    assert convert_chunked(temp_dir, input_file, "out.txt", chunk_size=2) == "Hello World end & more"
+
+# TEST INVALID JSON AND XML ARE CONVERTED AS PLAIN TEXT (EVEN AFTER PART OF THE XML WAS WRITTEN)
+@pytest.mark.parametrize("filename, content", [("input.json", '{"text": "unterminated'), ("input.xml", "<root>partial text<open></root>")])
+def test_convert_text_file_invalid_input(temp_dir, create_test_file, filename, content):
+    input_file = create_test_file(filename, content, mode="w")
+    assert convert_chunked(temp_dir, input_file, "out.json") == text_to_json(content)
+
+# TEST INVALID UTF-8 STILL FAILS THE CONVERSION
+def test_convert_text_file_invalid_utf8(temp_dir, create_test_file):
+    input_file = create_test_file("input.txt", b"\xff\xfe bad")
+    with pytest.raises(UnicodeDecodeError): convert_text_file(input_file, os.path.join(temp_dir, "out.json"))
@@ -1,9 +1,9 @@
 import pytest
 import os
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from autotools.autoconvert.conversion.convert_video import convert_video
+from autotools.autoconvert.conversion.convert_video import convert_video, find_moviepy_ffmpeg
 from ..conftest import mock_import_error, cleanup_sys_modules
 
 # TEST CONVERT VIDEO WITH OUTPUT FORMAT
@@ -58,3 +58,23 @@ def test_convert_video_import_error(monkeypatch, temp_dir, create_test_file):
     
     with pytest.raises(ImportError) as exc_info: convert_video(input_file, output_file)
     assert "MOVIEPY" in str(exc_info.value).upper()
+
+# TEST THE FFMPEG OF MOVIEPY IS RESOLVED LIKE MOVIEPY DOES ($FFMPEG_BINARY, DEFAULT: THE ONE BUNDLED WITH imageio-ffmpeg)
+def test_find_moviepy_ffmpeg(monkeypatch):
+    monkeypatch.delenv("FFMPEG_BINARY", raising=False)
+    bundled = MagicMock()
+    bundled.get_ffmpeg_exe.return_value = "/site-packages/imageio_ffmpeg/binaries/ffmpeg"
+    with patch("autotools.autoconvert.conversion.convert_video.importlib.import_module", return_value=bundled) as import_module:
+        assert find_moviepy_ffmpeg() == "/site-packages/imageio_ffmpeg/binaries/ffmpeg"
+    import_module.assert_called_once_with("imageio_ffmpeg")
+    bundled.get_ffmpeg_exe.side_effect = RuntimeError("NO FFMPEG EXECUTABLE")
+    with patch("autotools.autoconvert.conversion.convert_video.importlib.import_module", return_value=bundled):
+        assert find_moviepy_ffmpeg() is None
+    with patch("autotools.autoconvert.conversion.convert_video.importlib.import_module", side_effect=ImportError):
+        assert find_moviepy_ffmpeg() is None
+
+    with patch("autotools.autoconvert.conversion.convert_video.shutil.which", side_effect=lambda name: f"/usr/bin/{name}"):
+        monkeypatch.setenv("FFMPEG_BINARY", "auto-detect")
+        assert find_moviepy_ffmpeg() == "/usr/bin/ffmpeg"
+        monkeypatch.setenv("FFMPEG_BINARY", "ffmpeg6")
+        assert find_moviepy_ffmpeg() == "/usr/bin/ffmpeg6"
@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+import pytest
+from contextlib import contextmanager
+from unittest.mock import patch
+from autotools.autozip import core as core_module
+
+# FIXTURE FOR A TEMPORARY DIRECTORY, REMOVED AFTER THE TEST
+@pytest.fixture
+def temp_dir():
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path, ignore_errors=True)
+
+# FIXTURE RETURNING fail_reads(name): A PATCH OF open() IN autozip.core WHOSE FILES NAMED name FAIL AFTER THEIR FIRST READ
+# (AN I/O ERROR PART WAY THROUGH A SOURCE)
+@pytest.fixture
+def fail_reads():
+    real_open = open
+
+    @contextmanager
+    def failing(path):
+        with real_open(path, 'rb') as f:
+            def read(size=-1):
+                if f.tell(): raise OSError(5, "Input/output error")
+                return f.read(size)
+            yield type("FailingFile", (), {"read": staticmethod(read)})()
+
+    def fail_reads(name):
+        return patch.object(core_module, 'open', create=True,
+                            side_effect=lambda path, *args, **kwargs: failing(path) if os.path.basename(path) == name else real_open(path, *args, **kwargs))
+
+    return fail_reads
@@ -0,0 +1,90 @@
+import os
+import pytest
+from pathlib import Path
+from autotools.autozip.core import autozip_compress
+from autotools.autozip.calibrate import DEFAULT_LEVEL, _pick_members, calibrate, collect_sample, parse_auto, select_level
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    root.mkdir()
+    for i in range(5): (root / f"log{i}.txt").write_text(f"LINE {i} OF A VERY REPETITIVE LOG FILE\n" * 4000)
+    (root / "noise.bin").write_bytes(os.urandom(50000))
+    return root
+
+# HELPER FUNCTIONS
+
+def row(level, compressed_size, mb_per_s, saved_per_cpu_s):
+    return {'level': level, 'compressed_size': compressed_size, 'mb_per_s': mb_per_s, 'saved_per_cpu_s': saved_per_cpu_s}
+
+# TESTS FOR PARSING
+
+# TEST FOR auto SETTINGS AND NUMERIC LEVELS
+@pytest.mark.parametrize("value, expected", [("auto", "balanced"), ("AUTO:Smallest", "smallest"), ("auto:fastest", "fastest"),
+                                             (6, None), ("6", None)])
+def test_parse_auto(value, expected):
+    assert parse_auto(value) == expected
+
+# TEST FOR INVALID auto SETTINGS
+@pytest.mark.parametrize("value", ["auto:tiny", "automatic"])
+def test_parse_auto_invalid(value):
+    with pytest.raises(ValueError, match="INVALID COMPRESSION"): parse_auto(value)
+
+# TESTS FOR SAMPLING
+
+# TEST FOR UNIFORM ONE-PASS PICKING (ORIGINAL ORDER KEPT, DETERMINISTIC)
+def test_pick_members():
+    picked = _pick_members(iter(range(10000)), 64)
+    assert len(picked) == 64 and picked == sorted(picked)
+    assert picked == _pick_members(range(10000), 64)
+    assert picked[0] < 2000 and picked[-1] > 8000
+    assert _pick_members(range(3), 64) == [0, 1, 2]
+
+# TEST FOR THE PER-FILE SAMPLE CAP
+def test_collect_sample(source_dir):
+    members = [(source_dir / name, name) for name in sorted(os.listdir(source_dir))]
+    data, files = collect_sample(members, sample_size=4096 * 6, file_count=6)
+    assert files == 6 and len(data) == 4096 * 6
+    assert collect_sample([], 1024, 4) == (b"", 0)
+
+# TESTS FOR LEVEL SELECTION
+
+# TEST FOR EACH TARGET (TIES GO TO THE FASTER LEVEL)
+def test_select_level():
+    results = [row(1, 500, 90.0, 1000), row(6, 400, 30.0, 1200), row(9, 400, 10.0, 300)]
+    assert select_level(results, "fastest") == 1
+    assert select_level(results, "smallest") == 6
+    assert select_level(results, "balanced") == 6
+
+# TESTS FOR CALIBRATION
+
+# TEST FOR A MEASURED TABLE FOR EVERY COMPRESSED FORMAT
+@pytest.mark.parametrize("archive_format, codec, levels", [
+    ("zip", "deflate", [1, 3, 6, 9]), ("tar.gz", "deflate", [1, 3, 6, 9]), ("tar.bz2", "bzip2", [1, 5, 9]), ("tar.xz", "xz", [0, 3, 6, 9]),
+])
+def test_calibrate(source_dir, archive_format, codec, levels):
+    members = [(source_dir / name, name) for name in sorted(os.listdir(source_dir))]
+    calibration = calibrate(members, archive_format, "smallest")
+    assert calibration['codec'] == codec and calibration['files'] == 6 and calibration['sample_size'] > 0
+    assert [r['level'] for r in calibration['results']] == levels
+    assert calibration['level'] == select_level(calibration['results'], "smallest")
+    assert all(0 < r['ratio'] < 1 and r['mb_per_s'] > 0 for r in calibration['results'])
+
+# TEST FOR UNCOMPRESSED TAR AND EMPTY SAMPLES
+def test_calibrate_edge_cases(temp_dir):
+    with pytest.raises(ValueError, match="NEEDS A COMPRESSED FORMAT"): calibrate([], "tar")
+    empty = Path(temp_dir) / "empty.txt"
+    empty.write_bytes(b"")
+    calibration = calibrate([(empty, "empty.txt")], "tar.gz")
+    assert calibration['level'] == DEFAULT_LEVEL and calibration['results'] == []
+
+# TEST FOR autozip_compress RESOLVING auto AND REPORTING THE MEASUREMENTS
+def test_autozip_compress_auto(temp_dir, source_dir):
+    report = {}
+    archive = autozip_compress(iter([str(source_dir)]), str(Path(temp_dir) / "a.tar.gz"), compression_level="auto:fastest", report=report)
+    assert Path(archive).is_file()
+    assert report['calibration']['target'] == "fastest" and report['calibration']['format'] == "tar.gz"
+    with pytest.raises(ValueError, match="NEEDS A COMPRESSED FORMAT"):
+        autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"), compression_level="auto")
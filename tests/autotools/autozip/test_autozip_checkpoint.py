@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip.checkpoint import Checkpointer, checkpoint_path_for, load_checkpoint
+from autotools.autozip.core import autozip_compress
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    for d in range(3):
+        (root / f"d{d}").mkdir(parents=True)
+        for f in range(8): (root / f"d{d}" / f"f{f}.txt").write_text(f"DIR {d} FILE {f}\n" * (50 * (f + 1)))
+    (root / "d0" / "script.sh").write_text("#!/bin/sh\n")
+    (root / "d0" / "script.sh").chmod(0o755)
+    (root / "link").symlink_to("d1/f1.txt")
+    return root
+
+# HELPER FUNCTIONS
+
+def interrupt_after(count):
+    real_written = Checkpointer.written
+    calls = []
+
+    def written(self, fp, arcname, zinfo=None):
+        real_written(self, fp, arcname, zinfo)
+        calls.append(arcname)
+        if len(calls) == count: raise KeyboardInterrupt
+
+    return patch.object(Checkpointer, 'written', written)
+
+def archive_contents(path):
+    if str(path).endswith(".zip"):
+        with zipfile.ZipFile(path) as zipf:
+            assert zipf.testzip() is None
+            return [(i.filename, i.external_attr, zipf.read(i)) for i in zipf.infolist()]
+    with tarfile.open(path) as tar:
+        return [(m.name, m.type, m.mode, m.linkname, tar.extractfile(m).read() if m.isreg() else None) for m in tar]
+
+# TESTS FOR RESUMABLE ARCHIVES
+
+# TEST FOR AN INTERRUPTED RUN RESUMING TO THE SAME ARCHIVE AS AN UNINTERRUPTED ONE
+@pytest.mark.parametrize("name, options", [
+    ("a.tar", {}),
+    ("a.tar", {"prefetch_depth": 4}),
+    ("a.zip", {}),
+    ("a.zip", {"prefetch_depth": 4}),
+    ("a.zip", {"jobs": 2}),
+])
+def test_resume_after_interrupt(temp_dir, source_dir, name, options):
+    expected = autozip_compress([str(source_dir)], str(Path(temp_dir) / "expected" / name), **options)
+    output = Path(temp_dir) / name
+    with interrupt_after(12), pytest.raises(KeyboardInterrupt):
+        autozip_compress([str(source_dir)], str(output), checkpoint=True, checkpoint_interval="100", **options)
+
+    journal = Path(checkpoint_path_for(output))
+    state = load_checkpoint(journal, name[2:], [str(source_dir)])
+    assert len(journal.read_text().splitlines()) > 2 and 0 < state['offset'] <= output.stat().st_size
+
+    report = {}
+    result = autozip_compress([str(source_dir)], str(output), resume=True, checkpoint_interval="100", report=report, **options)
+    assert report['resumed'] == state['offset'] and not journal.exists()
+    assert archive_contents(result) == archive_contents(expected)
+
+# TEST FOR ENTRIES THE FILTERS DROP BETWEEN WRITTEN MEMBERS (DEDUP COPIES, FILES AN INCREMENTAL RUN SKIPS)
+def test_resume_with_filters(temp_dir, source_dir):
+    (source_dir / "d2" / "copy.txt").write_text("DIR 0 FILE 0\n" * 50)
+    output = Path(temp_dir) / "a.zip"
+    with interrupt_after(20), pytest.raises(KeyboardInterrupt):
+        autozip_compress([str(source_dir)], str(output), dedup=True, checkpoint=True, checkpoint_interval="1")
+    autozip_compress([str(source_dir)], str(output), dedup=True, resume=True)
+    assert archive_contents(output) == archive_contents(autozip_compress([str(source_dir)], str(Path(temp_dir) / "x.zip"), dedup=True))
+
+# TEST FOR A TORN JOURNAL LINE AND A PARTIAL MEMBER AFTER THE LAST CHECKPOINT (A HARD CRASH)
+@pytest.mark.parametrize("name", ["a.tar", "a.zip"])
+def test_resume_after_crash(temp_dir, source_dir, name):
+    output = Path(temp_dir) / name
+    with interrupt_after(5), pytest.raises(KeyboardInterrupt):
+        autozip_compress([str(source_dir)], str(output), checkpoint=True)
+    with open(output, 'ab') as f: f.write(os.urandom(3000))
+    with open(checkpoint_path_for(output), 'a') as f: f.write('{"offset": 99999999, "posi')
+
+    autozip_compress([str(source_dir)], str(output), resume=True)
+    assert archive_contents(output) == archive_contents(autozip_compress([str(source_dir)], str(Path(temp_dir) / "x" / name)))
+
+# TEST FOR A RUN INTERRUPTED BEFORE ITS FIRST CHECKPOINT STARTING OVER
+def test_resume_without_checkpoint(temp_dir, source_dir):
+    output = Path(temp_dir) / "a.tar"
+    with patch.object(tarfile.TarFile, 'addfile', side_effect=OSError("DISK FULL")), pytest.raises(OSError):
+        autozip_compress([str(source_dir)], str(output), checkpoint=True)
+    assert load_checkpoint(checkpoint_path_for(output), "tar", [str(source_dir)])['offset'] == 0
+
+    report = {}
+    autozip_compress([str(source_dir)], str(output), resume=True, report=report)
+    assert report['resumed'] == 0 and len(archive_contents(output)) == 30
+
+# TEST FOR A CHECKPOINTED RUN THAT COMPLETES LEAVING NO JOURNAL
+def test_checkpoint_success(temp_dir, source_dir):
+    output = Path(temp_dir) / "a.zip"
+    autozip_compress([str(source_dir)], str(output), checkpoint=True, checkpoint_interval="1")
+    assert not Path(checkpoint_path_for(output)).exists()
+    assert len(archive_contents(output)) == 26
+
+# TESTS FOR RESUME ERRORS
+
+# TEST FOR MISSING, CORRUPT AND MISMATCHED JOURNALS
+def test_resume_journal_errors(temp_dir, source_dir):
+    output = Path(temp_dir) / "a.tar"
+    journal = Path(checkpoint_path_for(output))
+    with pytest.raises(FileNotFoundError, match="CHECKPOINT NOT FOUND"): autozip_compress([str(source_dir)], str(output), resume=True)
+
+    for content in ["", "{", json.dumps({"version": 9})]:
+        journal.write_text(content)
+        with pytest.raises(ValueError, match="INVALID CHECKPOINT"): autozip_compress([str(source_dir)], str(output), resume=True)
+
+    journal.write_text(json.dumps({"version": 1, "format": "zip", "sources": [str(source_dir)]}))
+    with pytest.raises(ValueError, match="DOES NOT MATCH"): autozip_compress([str(source_dir)], str(output), resume=True)
+    with pytest.raises(ValueError, match="DOES NOT MATCH"): autozip_compress([str(source_dir / "d0")], str(output), resume=True, archive_format="zip")
+
+# TEST FOR A MISSING OR TRUNCATED ARCHIVE AND SOURCES THAT CHANGED SINCE THE CHECKPOINT
+def test_resume_archive_errors(temp_dir, source_dir):
+    output = Path(temp_dir) / "a.tar"
+    with interrupt_after(10), pytest.raises(KeyboardInterrupt):
+        autozip_compress([str(source_dir)], str(output), checkpoint=True)
+
+    os.rename(output, f"{output}.bak")
+    with pytest.raises(FileNotFoundError, match="ARCHIVE NOT FOUND"): autozip_compress([str(source_dir)], str(output), resume=True)
+    with open(output, 'wb') as f: f.write(b"X")
+    with pytest.raises(ValueError, match="SHORTER THAN ITS CHECKPOINT"): autozip_compress([str(source_dir)], str(output), resume=True)
+
+    os.replace(f"{output}.bak", output)
+    shutil.rmtree(source_dir / "d0")
+    with pytest.raises(ValueError, match="SOURCES CHANGED SINCE THE CHECKPOINT"): autozip_compress([str(source_dir)], str(output), resume=True)
+
+# TEST FOR OUTPUTS THAT CANNOT BE CHECKPOINTED
+@pytest.mark.parametrize("output, options, message", [
+    ("a.tar.gz", {"checkpoint": True}, "NEED A .tar OR .zip OUTPUT FILE"),
+    ("-", {"resume": True}, "NEED A .tar OR .zip OUTPUT FILE"),
+    ("a.zip", {"checkpoint": True, "shards": 2}, "NEED A .tar OR .zip OUTPUT FILE"),
+    ("a.zip", {"checkpoint": True, "checksums": "SUMS"}, "NEED A SINGLE OUTPUT"),
+])
+def test_checkpoint_invalid(temp_dir, source_dir, output, options, message):
+    output = output if output == "-" else str(Path(temp_dir) / output)
+    with pytest.raises(ValueError, match=message): autozip_compress([str(source_dir)], output, **options)
@@ -0,0 +1,113 @@
+import os
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip import core as core_module
+from autotools.autozip.core import autozip_compress, _compress_zip
+from autotools.autozip.content import (
+    has_compressed_signature,
+    is_incompressible,
+    sample_entropy,
+    SAMPLE_SIZE
+)
+
+# FIXTURES
+
+@pytest.fixture
+def mixed_tree(temp_dir):
+    root = Path(temp_dir) / "media"
+    root.mkdir()
+    (root / "notes.txt").write_text("PLAIN TEXT COMPRESSES WELL\n" * 4000)
+    (root / "photo.JPG").write_bytes(b"\xff\xd8\xff\xe0" + b"\0" * 5000)
+    (root / "noext").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\0" * 5000)
+    (root / "random.dat").write_bytes(os.urandom(3 * SAMPLE_SIZE))
+    (root / "tiny.bin").write_bytes(os.urandom(100))
+    return root
+
+# HELPER FUNCTIONS
+
+def compress_types(path):
+    with zipfile.ZipFile(path) as zipf:
+        assert zipf.testzip() is None
+        return {info.filename: info.compress_type for info in zipf.infolist()}
+
+# TESTS FOR CONTENT DETECTION
+
+# TEST FOR ENTROPY ESTIMATE
+def test_sample_entropy():
+    assert sample_entropy(b"") == 0.0
+    assert sample_entropy(b"A" * 1000) == 0.0
+    assert sample_entropy(bytes(range(256)) * 4) == pytest.approx(8.0)
+    assert 3.0 < sample_entropy(b"HELLO WORLD, HELLO AUTOZIP" * 100) < 4.5
+
+# TEST FOR MAGIC BYTES
+@pytest.mark.parametrize("sample, expected", [
+    (b"\x1f\x8b\x08\x00rest", True),
+    (b"\0\0\0\x20ftypisom", True),
+    (b"RIFF\0\0\0\0WEBPVP8 ", True),
+    (b"PK\x03\x04\x14\0", True),
+    (b"RIFF\0\0\0\0WAVEfmt ", False),
+    (b"#!/bin/sh\n", False),
+    (b"", False),
+])
+def test_has_compressed_signature(sample, expected):
+    assert has_compressed_signature(sample) is expected
+
+# TEST FOR STORE DECISION (EXTENSION, SIGNATURE, ENTROPY, SHORT SAMPLES)
+@pytest.mark.parametrize("name, sample, expected", [
+    ("dir/movie.MP4", b"anything", True),
+    ("archive.tar.gz", b"", True),
+    ("blob", b"\xfd7zXZ\x00" + b"\0" * 100, True),
+    ("blob", os.urandom(8192), True),
+    ("blob", os.urandom(1024), False),
+    ("readme.md", b"# TITLE\n" * 2000, False),
+])
+def test_is_incompressible(name, sample, expected):
+    assert is_incompressible(name, sample) is expected
+
+# TESTS FOR ADAPTIVE ZIP COMPRESSION
+
+# TEST FOR STORED AND DEFLATED MEMBERS (SERIAL AND PARALLEL WRITERS AGREE)
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_compress_zip_adaptive(temp_dir, mixed_tree, jobs):
+    output = Path(temp_dir) / f"out{jobs}.zip"
+    _compress_zip([str(mixed_tree)], str(output), jobs=jobs)
+    assert compress_types(output) == {
+        "notes.txt": zipfile.ZIP_DEFLATED,
+        "photo.JPG": zipfile.ZIP_STORED,
+        "noext": zipfile.ZIP_STORED,
+        "random.dat": zipfile.ZIP_STORED,
+        "tiny.bin": zipfile.ZIP_DEFLATED,
+    }
+    with zipfile.ZipFile(output) as zipf:
+        assert zipf.read("random.dat") == (mixed_tree / "random.dat").read_bytes()
+        assert zipf.getinfo("random.dat").compress_size == 3 * SAMPLE_SIZE
+
+# TEST FOR THE SERIAL WRITER OPENING EACH SOURCE ONCE (THE SAMPLED HEAD IS WRITTEN, NOT READ AGAIN)
+def test_compress_zip_serial_single_read(temp_dir, mixed_tree):
+    opened = []
+    def recording_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return open(path, *args, **kwargs)
+
+    output = Path(temp_dir) / "once.zip"
+    with patch.object(core_module, 'open', side_effect=recording_open, create=True):
+        _compress_zip([str(mixed_tree)], str(output), jobs=1)
+    assert sorted(opened) == sorted(path.name for path in mixed_tree.iterdir())
+    with zipfile.ZipFile(output) as zipf:
+        assert all(zipf.read(path.name) == path.read_bytes() for path in mixed_tree.iterdir())
+
+# TEST FOR DISABLING THE ADAPTIVE POLICY
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_autozip_compress_deflate_all(temp_dir, mixed_tree, jobs):
+    output = autozip_compress([str(mixed_tree)], str(Path(temp_dir) / "all.zip"), jobs=jobs, adaptive=False)
+    assert set(compress_types(output).values()) == {zipfile.ZIP_DEFLATED}
+
+# TEST FOR EMPTY FILES IN THE PARALLEL WRITER
+def test_compress_zip_parallel_empty_file(temp_dir):
+    source = Path(temp_dir) / "empty.txt"
+    source.write_bytes(b"")
+    output = Path(temp_dir) / "out.zip"
+    _compress_zip([str(source)], str(output), jobs=2)
+    with zipfile.ZipFile(output) as zipf: assert zipf.read("empty.txt") == b""
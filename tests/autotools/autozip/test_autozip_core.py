@@ -2,8 +2,6 @@ import pytest
 import os
 import zipfile
 import tarfile
-import tempfile
-import shutil
 from pathlib import Path
 from autotools.autozip.core import (
     autozip_compress,
@@ -12,17 +10,12 @@ from autotools.autozip.core import (
     _compress_tar_bz2,
     _compress_tar_xz,
     _compress_tar,
-    _get_format_from_extension
+    _get_format_from_extension,
+    _resolve_jobs
 )
 
 # FIXTURES
 
-@pytest.fixture
-def temp_dir():
-    temp_path = tempfile.mkdtemp()
-    yield temp_path
-    shutil.rmtree(temp_path, ignore_errors=True)
-
 @pytest.fixture
 def test_file(temp_dir):
     file_path = Path(temp_dir) / "test.txt"
@@ -137,6 +130,48 @@ def test_compress_zip_nonexistent_file(temp_dir):
     with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"):
         _compress_zip([str(Path(temp_dir) / "nonexistent.txt")], str(output))
 
+# TESTS FOR PARALLEL ZIP COMPRESSION
+
+# TEST FOR JOBS RESOLUTION
+def test_resolve_jobs():
+    from unittest.mock import patch
+    assert _resolve_jobs(3) == 3
+    with patch('autotools.autozip.core.os.cpu_count', return_value=8): assert _resolve_jobs(0) == 8
+    with patch('autotools.autozip.core.os.cpu_count', return_value=None): assert _resolve_jobs(-1) == 1
+
+# TEST FOR PARALLEL ZIP MATCHING SERIAL OUTPUT
+@pytest.mark.parametrize("level", [0, 6, 9])
+def test_compress_zip_parallel_matches_serial(temp_dir, test_file, test_dir, level):
+    for i in range(12): (Path(test_dir) / f"extra{i}.txt").write_text(f"EXTRA {i} " * (i * 500 + 1))
+
+    serial = Path(temp_dir) / "serial.zip"
+    parallel = Path(temp_dir) / "parallel.zip"
+    _compress_zip([test_file, test_dir], str(serial), compression_level=level)
+    result = _compress_zip([test_file, test_dir], str(parallel), compression_level=level, jobs=4)
+    assert result == str(parallel)
+
+    with zipfile.ZipFile(serial) as serial_zip, zipfile.ZipFile(parallel) as parallel_zip:
+        assert parallel_zip.testzip() is None
+        assert parallel_zip.namelist() == serial_zip.namelist()
+        for serial_info, parallel_info in zip(serial_zip.infolist(), parallel_zip.infolist()):
+            assert parallel_info.CRC == serial_info.CRC
+            assert parallel_info.date_time == serial_info.date_time
+            assert parallel_info.external_attr == serial_info.external_attr
+            assert parallel_zip.read(parallel_info) == serial_zip.read(serial_info)
+
+# TEST FOR PARALLEL ZIP WITH NONEXISTENT FILE
+def test_compress_zip_parallel_nonexistent_file(temp_dir, test_file):
+    output = Path(temp_dir) / "archive.zip"
+    with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"):
+        _compress_zip([test_file, str(Path(temp_dir) / "nonexistent.txt")], str(output), jobs=2)
+
+# TEST FOR PARALLEL ZIP THROUGH autozip_compress
+def test_autozip_compress_zip_jobs(temp_dir, test_dir):
+    output = Path(temp_dir) / "archive.zip"
+    result = autozip_compress([test_dir], str(output), jobs=2)
+    assert result == str(output)
+    with zipfile.ZipFile(output) as zipf: assert zipf.read("subdir/file3.txt") == b"FILE 3 CONTENT"
+
 # TESTS FOR _compress_tar_gz
 
 # TEST FOR TAR.GZ WITH SINGLE FILE
@@ -460,6 +495,30 @@ def test_autozip_compress_tar_nonexistent_file(temp_dir):
     with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"):
         autozip_compress([str(Path(temp_dir) / "nonexistent.txt")], str(output))
 
+# TEST FOR A SOURCE READ ERROR REMOVING THE OUTPUT, SO NO VALID-LOOKING ARCHIVE WITH A TRUNCATED MEMBER IS LEFT BEHIND
+@pytest.mark.parametrize("name, options", [
+    ("archive.zip", {}), ("archive.zip", {"jobs": 2}), ("archive.tar", {}), ("archive.tar.gz", {}), ("archive.tar.gz", {"jobs": 2}),
+    ("archive.tar.bz2", {}), ("archive.tar.xz", {}), ("archive.tar", {"shards": 2}),
+])
+def test_autozip_compress_read_error(temp_dir, test_dir, fail_reads, name, options):
+    (Path(test_dir) / "subdir" / "big.txt").write_text("BIG\n" * 10000)
+    output = Path(temp_dir) / "out" / name
+    with fail_reads("big.txt"):
+        with pytest.raises(OSError, match="Input/output error"): autozip_compress([test_dir], str(output), **options)
+    assert list(output.parent.iterdir()) == []
+
+# TEST FOR A FAILED WRITE KEEPING A CHECKPOINTED ARCHIVE (FOR resume) AND AN OUTPUT PATH THAT IS A DIRECTORY
+def test_autozip_compress_error_keeps(temp_dir, test_dir, fail_reads):
+    (Path(test_dir) / "subdir" / "big.txt").write_text("BIG\n" * 10000)
+    output = Path(temp_dir) / "archive.tar"
+    with fail_reads("big.txt"):
+        with pytest.raises(OSError, match="Input/output error"): autozip_compress([test_dir], str(output), checkpoint=True)
+    assert output.is_file()
+
+    (Path(temp_dir) / "taken.zip").mkdir()
+    with pytest.raises(IsADirectoryError): autozip_compress([test_dir], str(Path(temp_dir) / "taken.zip"))
+    assert (Path(temp_dir) / "taken.zip").is_dir()
+
 # TEST FOR BRANCH COVERAGE (18->11, 39->32, 56->49, 73->66, 140->133)
 def test_compress_zip_path_not_file_not_dir(temp_dir):
     from unittest.mock import patch, MagicMock
@@ -0,0 +1,130 @@
+import os
+import json
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip.core import autozip_compress, autozip_extract, _iter_source_files
+from autotools.autozip import dedup as dedup_module
+from autotools.autozip.dedup import (
+    find_duplicates,
+    count_duplicates,
+    dedup_manifest_bytes,
+    load_dedup_manifest,
+    DEDUP_MANIFEST_NAME,
+    PARTIAL_HASH_SIZE
+)
+
+# FIXTURES
+
+@pytest.fixture
+def dup_tree(temp_dir):
+    root = Path(temp_dir) / "tree"
+    (root / "vendor" / "copy").mkdir(parents=True)
+    big = os.urandom(PARTIAL_HASH_SIZE * 2)
+    (root / "lib.js").write_bytes(big)
+    (root / "vendor" / "lib.js").write_bytes(big)
+    (root / "vendor" / "copy" / "lib.js").write_bytes(big)
+    (root / "lib-patched.js").write_bytes(big[:-1] + bytes([big[-1] ^ 0xFF]))
+    (root / "a.txt").write_text("SMALL DUPLICATE")
+    (root / "vendor" / "a.txt").write_text("SMALL DUPLICATE")
+    (root / "b.txt").write_text("SMALL DIFFERENT")
+    (root / "empty1").write_bytes(b"")
+    (root / "empty2").write_bytes(b"")
+    return root
+
+# HELPER FUNCTIONS
+
+def tree_contents(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(Path(root).rglob("*")) if p.is_file()}
+
+# TESTS FOR DUPLICATE DETECTION
+
+# TEST FOR SIZE, PARTIAL HASH AND FULL HASH PASSES
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_find_duplicates(dup_tree, jobs):
+    duplicates, bytes_saved = find_duplicates(_iter_source_files([str(dup_tree)]), jobs)
+    big = {"lib.js", "vendor/lib.js", "vendor/copy/lib.js"}
+    small = {"a.txt", "vendor/a.txt"}
+
+    assert set(duplicates) == big | small
+    assert len({duplicates[name] for name in big}) == 1 and len({duplicates[name] for name in small}) == 1
+    assert all(duplicates[duplicates[name]] == duplicates[name] for name in duplicates)
+    assert count_duplicates(duplicates) == 3
+    assert bytes_saved == 2 * PARTIAL_HASH_SIZE * 2 + len("SMALL DUPLICATE")
+
+# TEST FOR FULL HASH ONLY RUNNING ON LARGE FILES THAT SURVIVE THE PARTIAL HASH
+def test_find_duplicates_full_hash_calls(dup_tree):
+    with patch.object(dedup_module, '_full_digest', wraps=dedup_module._full_digest) as full:
+        find_duplicates(_iter_source_files([str(dup_tree)]))
+    assert sorted(Path(call.args[0]).name for call in full.call_args_list) == ["lib-patched.js"] + ["lib.js"] * 3
+
+# TEST FOR NO DUPLICATES
+def test_find_duplicates_none(temp_dir):
+    (Path(temp_dir) / "x").write_text("X")
+    (Path(temp_dir) / "y").write_text("Y")
+    assert find_duplicates(_iter_source_files([temp_dir])) == ({}, 0)
+
+# TEST FOR DEDUP MANIFEST ROUND TRIP
+def test_dedup_manifest_round_trip():
+    data = dedup_manifest_bytes({"a": "a", "b": "a", "c": "a"})
+    assert load_dedup_manifest(data) == {"b": "a", "c": "a"}
+
+# TEST FOR INVALID DEDUP MANIFESTS
+@pytest.mark.parametrize("data", [b"{oops", b"[]", json.dumps({"duplicates": []}).encode()])
+def test_load_dedup_manifest_invalid(data):
+    with pytest.raises(ValueError, match="INVALID DEDUP MANIFEST"): load_dedup_manifest(data)
+
+# TESTS FOR DEDUPLICATED ARCHIVES
+
+# TEST FOR TAR FORMATS (DUPLICATES BECOME HARDLINKS)
+@pytest.mark.parametrize("ext, jobs", [("tar", 1), ("tar.gz", 2), ("tar.bz2", 1), ("tar.xz", 2)])
+def test_autozip_compress_dedup_tar(temp_dir, dup_tree, ext, jobs):
+    report = {}
+    archive = autozip_compress([str(dup_tree)], str(Path(temp_dir) / f"d.{ext}"), jobs=jobs, dedup=True, report=report)
+    assert report == {'duplicates': 3, 'bytes_saved': 4 * PARTIAL_HASH_SIZE + 15}
+
+    with tarfile.open(archive) as tar:
+        members = tar.getmembers()
+        links = [m for m in members if m.islnk()]
+        assert len(links) == 3
+        names = [m.name for m in members]
+        assert all(names.index(link.linkname) < names.index(link.name) for link in links)
+
+    autozip_extract(archive, str(Path(temp_dir) / "out"))
+    assert tree_contents(Path(temp_dir) / "out" / "tree") == tree_contents(dup_tree)
+
+# TEST FOR ZIP (ONE STORED COPY PLUS DEDUP MANIFEST, RESTORED ON EXTRACTION)
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_autozip_compress_dedup_zip(temp_dir, dup_tree, jobs):
+    archive = autozip_compress([str(dup_tree)], str(Path(temp_dir) / "d.zip"), jobs=jobs, dedup=True)
+    with zipfile.ZipFile(archive) as zipf:
+        names = zipf.namelist()
+        skipped = load_dedup_manifest(zipf.read(DEDUP_MANIFEST_NAME))
+    assert len(skipped) == 3 and not set(skipped) & set(names)
+    assert set(skipped.values()) <= set(names)
+
+    stats = autozip_extract(archive, str(Path(temp_dir) / "out"), jobs=jobs)
+    assert tree_contents(Path(temp_dir) / "out") == tree_contents(dup_tree)
+    assert stats['files'] == len(tree_contents(dup_tree))
+
+# TEST FOR DEDUP WITHOUT DUPLICATES (NO MANIFEST MEMBER, EMPTY REPORT)
+def test_autozip_compress_dedup_nothing_found(temp_dir):
+    source = Path(temp_dir) / "only.txt"
+    source.write_text("ONLY")
+    report = {}
+    archive = autozip_compress([str(source)], str(Path(temp_dir) / "d.zip"), dedup=True, report=report)
+    assert report == {'duplicates': 0, 'bytes_saved': 0}
+    with zipfile.ZipFile(archive) as zipf: assert zipf.namelist() == ["only.txt"]
+
+# TEST FOR DEDUP COMBINED WITH INCREMENTAL ARCHIVES (ONLY SELECTED FILES ARE CONSIDERED)
+def test_autozip_compress_dedup_incremental(temp_dir, dup_tree):
+    full = autozip_compress([str(dup_tree)], str(Path(temp_dir) / "full.tar"), manifest=True)
+    (dup_tree / "new1.txt").write_text("NEW TWIN")
+    (dup_tree / "new2.txt").write_text("NEW TWIN")
+    archive = autozip_compress([str(dup_tree)], str(Path(temp_dir) / "inc.tar"), incremental=f"{full}.manifest.json", dedup=True)
+    with tarfile.open(archive) as tar:
+        files = {m.name: m for m in tar.getmembers() if m.isreg() or m.islnk()}
+    assert set(files) == {"tree/new1.txt", "tree/new2.txt"}
+    assert sum(m.islnk() for m in files.values()) == 1
@@ -0,0 +1,267 @@
+import io
+import os
+import stat
+import random
+import tarfile
+import zipfile
+import tempfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip.core import autozip_compress, autozip_extract
+from autotools.autozip import extract as extract_module
+from autotools.autozip.extract import _is_within, _preallocate, extract_tar, extract_zip
+
+# FIXTURES
+
+@pytest.fixture
+def source_tree(temp_dir):
+    root = Path(temp_dir) / "src"
+    (root / "nested" / "deep").mkdir(parents=True)
+    (root / "a.txt").write_text("ALPHA")
+    (root / "nested" / "b.bin").write_bytes(bytes(random.Random(3).getrandbits(8) for _ in range(70000)))
+    (root / "nested" / "deep" / "c.txt").write_text("GAMMA " * 5000)
+    (root / "run.sh").write_text("#!/bin/sh\n")
+    os.chmod(root / "run.sh", 0o755)
+    os.utime(root / "a.txt", (1_600_000_000, 1_600_000_000))
+    return root
+
+# HELPER FUNCTIONS
+
+def tree_contents(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(Path(root).rglob("*")) if p.is_file()}
+
+def write_tar(path, entries):
+    with tarfile.open(path, 'w') as tar:
+        for info, data in entries:
+            tar.addfile(info, io.BytesIO(data) if data is not None else None)
+
+def tar_entry(name, data=b"", **attrs):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    for key, value in attrs.items(): setattr(info, key, value)
+    return info, data if info.isreg() else None
+
+def write_zip(path, entries, compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(path, 'w', compression) as zipf:
+        for name, data in entries: zipf.writestr(name, data)
+
+# TESTS FOR HELPERS
+
+# TEST FOR PATH CONTAINMENT
+def test_is_within():
+    root = os.path.realpath(tempfile.gettempdir())
+    assert _is_within(root, root)
+    assert _is_within(root, os.path.join(root, "a", "b"))
+    assert not _is_within(root, os.path.dirname(root))
+    assert not _is_within(root, "relative/path")
+
+# TEST FOR PREALLOCATION BRANCHES
+def test_preallocate(temp_dir):
+    path = Path(temp_dir) / "f.bin"
+    with open(path, 'wb') as f:
+        _preallocate(f, 0)
+        _preallocate(f, 4096)
+        with patch.object(extract_module.os, 'posix_fallocate', side_effect=OSError("UNSUPPORTED"), create=True): _preallocate(f, 8192)
+        with patch.object(extract_module, 'hasattr', return_value=False, create=True): _preallocate(f, 16384)
+    assert path.stat().st_size in (0, 4096)
+
+# TESTS FOR ZIP EXTRACTION
+
+# TEST FOR ZIP ROUND TRIP (SERIAL AND PARALLEL)
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_extract_zip_round_trip(temp_dir, source_tree, jobs):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.zip"))
+    destination = Path(temp_dir) / "out"
+    stats = autozip_extract(archive, str(destination), jobs=jobs)
+
+    assert tree_contents(destination) == tree_contents(source_tree)
+    assert stats == {'files': 4, 'directories': 0, 'links': 0, 'bytes': sum(len(v) for v in tree_contents(source_tree).values())}
+    assert stat.S_IMODE((destination / "run.sh").stat().st_mode) == 0o755
+    assert abs((destination / "a.txt").stat().st_mtime - 1_600_000_000) <= 2
+
+# TEST FOR ZIP WITH SMALL CHUNKS (MULTIPLE BLOCKS AND BOUNDED INFLATE STEPS)
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_extract_zip_chunked(temp_dir, compression, monkeypatch):
+    monkeypatch.setattr(extract_module, '_CHUNK_SIZE', 1024)
+    data = {"zeros.bin": b"\0" * 300000, "noise.bin": bytes(random.Random(5).getrandbits(8) for _ in range(20000))}
+    archive = Path(temp_dir) / "a.zip"
+    write_zip(archive, data.items(), compression)
+    extract_zip(str(archive), str(Path(temp_dir) / "out"), jobs=2)
+    assert tree_contents(Path(temp_dir) / "out") == {k: v for k, v in data.items()}
+
+# TEST FOR DIRECTORY ENTRIES, ZERO MODES AND NON-DEFLATE FALLBACK
+def test_extract_zip_directories_and_fallback(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    with zipfile.ZipFile(archive, 'w') as zipf:
+        zipf.writestr("empty/", b"")
+        zipf.writestr(zipfile.ZipInfo("plain.txt"), b"PLAIN")
+        zipf.writestr("packed.txt", b"PACKED " * 100, compress_type=zipfile.ZIP_BZIP2)
+        zipf.writestr("lz.txt", b"LZ " * 100, compress_type=zipfile.ZIP_LZMA)
+    stats = extract_zip(str(archive), str(Path(temp_dir) / "out"), jobs=3)
+    out = Path(temp_dir) / "out"
+    assert (out / "empty").is_dir()
+    assert (out / "plain.txt").read_bytes() == b"PLAIN"
+    assert (out / "packed.txt").read_bytes() == b"PACKED " * 100
+    assert (out / "lz.txt").read_bytes() == b"LZ " * 100
+    assert stats['directories'] == 1 and stats['files'] == 3
+
+# TEST FOR EMPTY ZIP
+def test_extract_zip_empty(temp_dir):
+    archive = Path(temp_dir) / "empty.zip"
+    zipfile.ZipFile(archive, 'w').close()
+    assert extract_zip(str(archive), str(Path(temp_dir) / "out")) == {'files': 0, 'directories': 0, 'links': 0, 'bytes': 0}
+
+# TEST FOR OVERWRITING EXISTING FILES
+def test_extract_zip_overwrites(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    write_zip(archive, [("a.txt", b"NEW")])
+    out = Path(temp_dir) / "out"
+    out.mkdir()
+    (out / "a.txt").write_text("OLD CONTENT")
+    extract_zip(str(archive), str(out))
+    assert (out / "a.txt").read_bytes() == b"NEW"
+
+# TEST FOR CORRUPTED MEMBER DATA
+def test_extract_zip_bad_crc(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    write_zip(archive, [("a.txt", b"ABCDEFGH" * 10)], zipfile.ZIP_STORED)
+    raw = bytearray(archive.read_bytes())
+    raw[raw.index(b"ABCDEFGH")] ^= 0xFF
+    archive.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match="BAD CRC"): extract_zip(str(archive), str(Path(temp_dir) / "out"), jobs=2)
+
+# TEST FOR CORRUPTED LOCAL HEADER
+def test_extract_zip_bad_local_header(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    write_zip(archive, [("a.txt", b"DATA")])
+    raw = bytearray(archive.read_bytes())
+    raw[0:4] = b"XXXX"
+    archive.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match="BAD LOCAL HEADER"): extract_zip(str(archive), str(Path(temp_dir) / "out"))
+
+# TEST FOR ENCRYPTED MEMBERS
+def test_extract_zip_encrypted(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    write_zip(archive, [("a.txt", b"DATA")])
+    raw = bytearray(archive.read_bytes())
+    central = raw.index(b"PK\x01\x02")
+    raw[central + 8] |= 0x01
+    archive.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match="ENCRYPTED"): extract_zip(str(archive), str(Path(temp_dir) / "out"))
+
+# TEST FOR PATH TRAVERSAL IN ZIP NAMES
+@pytest.mark.parametrize("name", ["../evil.txt", "a/../../evil.txt", "/abs.txt", "C:/win.txt"])
+def test_extract_zip_unsafe_paths(temp_dir, name):
+    archive = Path(temp_dir) / "a.zip"
+    with zipfile.ZipFile(archive, 'w') as zipf: zipf.writestr(zipfile.ZipInfo(name), b"EVIL")
+    zip_name = zipfile.ZipFile(archive).namelist()[0]
+    if zip_name != name: pytest.skip("zipfile normalised the name")
+    with pytest.raises(ValueError, match="UNSAFE PATH"): extract_zip(str(archive), str(Path(temp_dir) / "out"))
+    assert not (Path(temp_dir) / "evil.txt").exists()
+
+# TEST FOR DISABLED PATH CHECKS
+def test_extract_zip_unsafe_allowed(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    with zipfile.ZipFile(archive, 'w') as zipf: zipf.writestr(zipfile.ZipInfo("../outside.txt"), b"OUT")
+    extract_zip(str(archive), str(Path(temp_dir) / "out"), safe=False)
+    assert (Path(temp_dir) / "outside.txt").read_bytes() == b"OUT"
+
+# TESTS FOR TAR EXTRACTION
+
+# TEST FOR TAR ROUND TRIP FOR EVERY COMPRESSION
+@pytest.mark.parametrize("ext", ["tar", "tar.gz", "tar.bz2", "tar.xz"])
+def test_extract_tar_round_trip(temp_dir, source_tree, ext):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / f"a.{ext}"))
+    destination = Path(temp_dir) / "out"
+    stats = autozip_extract(archive, str(destination))
+
+    assert tree_contents(destination / "src") == tree_contents(source_tree)
+    assert stats['files'] == 4 and stats['directories'] == 3
+    assert stat.S_IMODE((destination / "src" / "run.sh").stat().st_mode) == 0o755
+    assert (destination / "src" / "a.txt").stat().st_mtime == 1_600_000_000
+
+# TEST FOR LINKS, SKIPPED SPECIAL FILES AND SETUID STRIPPING
+def test_extract_tar_links_and_special(temp_dir):
+    archive = Path(temp_dir) / "a.tar"
+    write_tar(archive, [
+        tar_entry("d", type=tarfile.DIRTYPE, mode=0o755, mtime=1_500_000_000),
+        tar_entry("d/file.txt", b"FILE", mode=0o4755),
+        tar_entry("d/link", type=tarfile.SYMTYPE, linkname="file.txt"),
+        tar_entry("d/hard", type=tarfile.LNKTYPE, linkname="d/file.txt"),
+        tar_entry("d/pipe", type=tarfile.FIFOTYPE),
+    ])
+    out = Path(temp_dir) / "out"
+    stats = extract_tar(str(archive), str(out))
+
+    assert (out / "d" / "link").is_symlink() and (out / "d" / "link").read_bytes() == b"FILE"
+    assert (out / "d" / "hard").read_bytes() == b"FILE"
+    assert not (out / "d" / "pipe").exists()
+    assert stat.S_IMODE((out / "d" / "file.txt").stat().st_mode) == 0o755
+    assert (out / "d").stat().st_mtime == 1_500_000_000
+    assert stats == {'files': 1, 'directories': 1, 'links': 2, 'bytes': 4}
+
+# TEST FOR HARDLINK COPY FALLBACK AND REPLACING EXISTING ENTRIES
+def test_extract_tar_hardlink_fallback(temp_dir):
+    archive = Path(temp_dir) / "a.tar"
+    write_tar(archive, [tar_entry("file.txt", b"DATA", mode=0o644), tar_entry("copy.txt", type=tarfile.LNKTYPE, linkname="file.txt")])
+    out = Path(temp_dir) / "out"
+    out.mkdir()
+    (out / "copy.txt").write_text("STALE")
+    with patch.object(extract_module.os, 'link', side_effect=OSError("CROSS-DEVICE")):
+        extract_tar(str(archive), str(out))
+    assert (out / "copy.txt").read_bytes() == b"DATA"
+    assert not (out / "copy.txt").is_symlink()
+
+# TEST FOR UNSAFE TAR MEMBERS
+@pytest.mark.parametrize("entry, message", [
+    (("../evil.txt", b"EVIL"), "UNSAFE PATH"),
+    (("/abs.txt", b"EVIL"), "UNSAFE PATH"),
+])
+def test_extract_tar_unsafe_paths(temp_dir, entry, message):
+    archive = Path(temp_dir) / "a.tar"
+    write_tar(archive, [tar_entry(entry[0], entry[1], mode=0o644)])
+    with pytest.raises(ValueError, match=message): extract_tar(str(archive), str(Path(temp_dir) / "out"))
+
+# TEST FOR UNSAFE SYMLINK AND HARDLINK TARGETS
+@pytest.mark.parametrize("entry, message", [
+    (dict(type=tarfile.SYMTYPE, linkname="../../etc/passwd"), "UNSAFE LINK"),
+    (dict(type=tarfile.SYMTYPE, linkname="/etc/passwd"), "UNSAFE LINK"),
+    (dict(type=tarfile.LNKTYPE, linkname="../outside.txt"), "UNSAFE PATH"),
+])
+def test_extract_tar_unsafe_links(temp_dir, entry, message):
+    archive = Path(temp_dir) / "a.tar"
+    write_tar(archive, [tar_entry("link", **entry)])
+    with pytest.raises(ValueError, match=message): extract_tar(str(archive), str(Path(temp_dir) / "out"))
+
+# TEST FOR WRITES THROUGH A SYMLINKED DIRECTORY BEING REJECTED
+def test_extract_tar_symlink_escape(temp_dir):
+    archive = Path(temp_dir) / "a.tar"
+    write_tar(archive, [tar_entry("up", type=tarfile.SYMTYPE, linkname="."), tar_entry("up/../../escape.txt", b"X", mode=0o644)])
+    with pytest.raises(ValueError, match="UNSAFE PATH"): extract_tar(str(archive), str(Path(temp_dir) / "out"))
+
+# TEST FOR DISABLED PATH CHECKS ON TAR
+def test_extract_tar_unsafe_allowed(temp_dir):
+    archive = Path(temp_dir) / "a.tar"
+    write_tar(archive, [tar_entry("../outside.txt", b"OUT", mode=0o644), tar_entry("abs-link", type=tarfile.SYMTYPE, linkname="/tmp")])
+    extract_tar(str(archive), str(Path(temp_dir) / "out"), safe=False)
+    assert (Path(temp_dir) / "outside.txt").read_bytes() == b"OUT"
+    assert os.readlink(Path(temp_dir) / "out" / "abs-link") == "/tmp"
+
+# TESTS FOR autozip_extract
+
+# TEST FOR MISSING ARCHIVE
+def test_autozip_extract_missing(temp_dir):
+    with pytest.raises(FileNotFoundError, match="ARCHIVE NOT FOUND"): autozip_extract(str(Path(temp_dir) / "none.zip"), temp_dir)
+
+# TEST FOR UNSUPPORTED EXTENSION
+def test_autozip_extract_unsupported(temp_dir):
+    archive = Path(temp_dir) / "a.rar"
+    archive.write_bytes(b"RAR")
+    with pytest.raises(ValueError, match="UNSUPPORTED ARCHIVE FORMAT"): autozip_extract(str(archive), temp_dir)
+
+# TEST FOR EXPLICIT FORMAT OVERRIDING THE EXTENSION
+def test_autozip_extract_explicit_format(temp_dir, source_tree):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.bin"), archive_format="tgz")
+    stats = autozip_extract(archive, str(Path(temp_dir) / "out"), archive_format="TAR.GZ")
+    assert stats['files'] == 4
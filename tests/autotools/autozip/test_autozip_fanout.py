@@ -0,0 +1,210 @@
+import os
+import queue
+import threading
+import socket
+import tarfile
+import zipfile
+import hashlib
+import pytest
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip import fanout as fanout_module
+from autotools.autozip.core import autozip_compress
+from autotools.autozip.fanout import _ABORT, _END, QueueReader, _read_sources, fan_out
+from autotools.autozip.walker import SourceWalker
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("ALPHA\n" * 1000)
+    (root / "sub" / "b.bin").write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    (root / "empty").write_bytes(b"")
+    (root / "link").symlink_to("a.txt")
+    return root
+
+# HELPER FUNCTIONS
+
+def reader_for(*chunks):
+    chunks_queue = queue.Queue()
+    for chunk in chunks + (_END,): chunks_queue.put(chunk)
+    return QueueReader(chunks_queue)
+
+def recording_writer(records, fail_on=None):
+    @contextmanager
+    def open_writer():
+        def add(entry, reader):
+            if entry[1] == fail_on: raise OSError("DISK FULL")
+            records.append((entry[1], None if reader is None else reader.read()))
+
+        yield add
+
+    return open_writer
+
+def sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+# TESTS FOR THE QUEUE READER
+
+# TEST FOR EXACT-SIZE READS ACROSS CHUNK BOUNDARIES
+def test_queue_reader_read():
+    reader = reader_for(b"abc", b"defg", b"h")
+    assert reader.peek(2) == b"ab"
+    assert reader.read(5) == b"abcde"
+    assert reader.read1() == b"fg"
+    assert reader.read() == b"h"
+    assert reader.read(3) == b"" and reader.peek(1) == b"" and reader.read1() == b""
+
+# TEST FOR WHOLE CHUNKS BEING PASSED THROUGH WITHOUT A COPY, AND DRAINING
+def test_queue_reader_passthrough_and_drain():
+    chunk = bytes(range(256)) * 8
+    reader = reader_for(chunk, b"tail", b"more")
+    assert reader.read1() is chunk
+    assert reader.read1(2) == b"ta"
+    reader.drain()
+    assert reader.read() == b""
+
+# TEST FOR AN ABORTED FILE RAISING INSTEAD OF ENDING
+def test_queue_reader_abort():
+    chunks_queue = queue.Queue()
+    for chunk in (b"head", _ABORT): chunks_queue.put(chunk)
+    reader = QueueReader(chunks_queue)
+    assert reader.read(4) == b"head"
+    with pytest.raises(OSError, match="READ FAILED BEFORE ITS END"): reader.read()
+
+# TESTS FOR FAN-OUT
+
+# TEST FOR EVERY WRITER SEEING EVERY ENTRY AND THE SAME BYTES
+def test_fan_out_writers(source_dir):
+    first, second = [], []
+    entries = SourceWalker().layouts([str(source_dir)])
+    fan_out(entries, [recording_writer(first), recording_writer(second)], skip=[source_dir / "empty"], queue_depth=2)
+    assert first == second
+    names = dict(first)
+    assert names["data"] is None and names["data/sub"] is None and "data/empty" not in names
+    assert names["data/sub/b.bin"] == (source_dir / "sub" / "b.bin").read_bytes()
+    assert names["data/link"] == names["data/a.txt"]
+
+# TEST FOR A FAILING WRITER STOPPING THE READ WITHOUT BLOCKING THE OTHERS
+def test_fan_out_writer_error(source_dir):
+    healthy = []
+    entries = SourceWalker().layouts([str(source_dir)])
+    with pytest.raises(OSError, match="DISK FULL"):
+        fan_out(entries, [recording_writer([], fail_on="data/a.txt"), recording_writer(healthy)], queue_depth=1)
+    assert healthy[0] == ("data", None)
+
+# TEST FOR NOTHING MORE BEING READ ONCE A WRITER HAS FAILED
+def test_read_sources_stops_after_failure(source_dir):
+    failed, chunks = threading.Event(), queue.Queue()
+    failed.set()
+    _read_sources(SourceWalker().layouts([str(source_dir)]), [chunks], failed, set())
+    assert chunks.empty()
+
+# TEST FOR A WRITER THAT CANNOT BE OPENED
+def test_fan_out_open_error(source_dir):
+    @contextmanager
+    def broken():
+        raise PermissionError("READ-ONLY")
+        yield
+
+    with pytest.raises(PermissionError): fan_out(SourceWalker().layouts([str(source_dir)]), [broken, recording_writer([])], queue_depth=1)
+
+# TEST FOR A READ ERROR FAILING THE CURRENT FILE IN EVERY WRITER (NONE RECORDS IT AS COMPLETE) AND REACHING THE CALLER
+def test_fan_out_read_error(source_dir):
+    first, second = [], []
+    with patch.object(fanout_module, 'open', side_effect=OSError("I/O ERROR"), create=True):
+        with pytest.raises(OSError, match="I/O ERROR"):
+            fan_out(SourceWalker().layouts([str(source_dir / "a.txt")]), [recording_writer(first), recording_writer(second)])
+    assert first == second == []
+
+# TESTS FOR THE DUAL-LAYOUT WALK
+
+# TEST FOR TAR AND ZIP NAMES FROM ONE WALK (FILE SOURCES, SYMLINKED DIRECTORIES, EXCLUDED AND MISSING SOURCES)
+def test_walker_layouts(temp_dir, source_dir):
+    linked = Path(temp_dir) / "linked"
+    linked.symlink_to(source_dir, target_is_directory=True)
+    walker = SourceWalker(excludes=["skipped.txt"])
+    (Path(temp_dir) / "skipped.txt").write_text("X")
+
+    layouts = [(name, in_tar, zip_name) for _, name, in_tar, zip_name in
+               walker.layouts([str(source_dir / "a.txt"), str(linked), str(Path(temp_dir) / "skipped.txt")])]
+    assert layouts[:3] == [("a.txt", True, "a.txt"), ("linked", True, None), ("linked/a.txt", False, "a.txt")]
+    assert ("linked/sub", False, None) in layouts and ("linked/sub/b.bin", False, "sub/b.bin") in layouts
+    assert [name for _, name in walker.entries([str(linked)], 'tar')] == ["linked"]
+    with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"): list(walker.layouts([str(source_dir / "none")]))
+
+# TESTS FOR autozip_compress WITH SEVERAL OUTPUTS
+
+# TEST FOR EVERY FORMAT AND THE CHECKSUM LIST FROM ONE READ
+def test_autozip_compress_many(temp_dir, source_dir):
+    out = Path(temp_dir) / "out"
+    paths = [str(out / name) for name in ["a.zip", "a.tar.gz", "a.tar.xz", "a.tar.bz2", "a.tar"]]
+    report = {}
+    result = autozip_compress([str(source_dir)], paths, checksums=str(out / "SHA256SUMS"), report=report, jobs=2)
+    assert result == paths and report == {'checksums': 4}
+
+    with zipfile.ZipFile(paths[0]) as zipf:
+        assert sorted(zipf.namelist()) == ["a.txt", "empty", "link", "sub/b.bin"]
+        assert zipf.read("sub/b.bin") == (source_dir / "sub" / "b.bin").read_bytes()
+        assert zipf.getinfo("a.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.getinfo("sub/b.bin").compress_type == zipfile.ZIP_STORED
+
+    expected = autozip_compress([str(source_dir)], str(Path(temp_dir) / "single.tar"))
+    for path in paths[1:]:
+        with tarfile.open(path) as tar, tarfile.open(expected) as single:
+            assert [(m.name, m.type, m.size, m.linkname) for m in tar] == [(m.name, m.type, m.size, m.linkname) for m in single]
+            assert tar.extractfile("data/sub/b.bin").read() == (source_dir / "sub" / "b.bin").read_bytes()
+
+    lines = (out / "SHA256SUMS").read_text().splitlines()
+    assert lines[0] == f"{sha256(source_dir / 'a.txt')}  data/a.txt"
+    assert [line.split("  ")[1] for line in lines] == ["data/a.txt", "data/empty", "data/link", "data/sub/b.bin"]
+
+# TEST FOR A SINGLE OUTPUT WITH CHECKSUMS, SKIPPING THE OUTPUTS AND SPECIAL FILES
+def test_autozip_compress_single_with_checksums(source_dir):
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(source_dir / "s.sock"))
+        (source_dir / "broken").symlink_to("missing")
+        result = autozip_compress([str(source_dir)], str(source_dir / "self.tar"), archive_format="tar",
+                                  checksums=str(source_dir / "SUMS"))
+    assert result == str(source_dir / "self.tar")
+    with tarfile.open(result) as tar: names = tar.getnames()
+    assert "data/broken" in names and "data/s.sock" not in names and "data/self.tar" not in names and "data/SUMS" not in names
+    assert "broken" not in (source_dir / "SUMS").read_text()
+
+# TEST FOR A SOURCE FAILING PART WAY THROUGH ITS READ: NO OUTPUT IS LEFT, NOT EVEN A VALID-LOOKING ARCHIVE WITH A TRUNCATED MEMBER
+def test_autozip_compress_many_read_error(temp_dir, source_dir):
+    real_open = open
+
+    @contextmanager
+    def failing_open(path, mode):
+        with real_open(path, mode) as f:
+            def read(size):
+                if f.tell(): raise OSError(5, "Input/output error")
+                return f.read(size)
+            yield type("FailingFile", (), {"read": staticmethod(read)})()
+
+    out = Path(temp_dir) / "out"
+    paths = [str(out / "a.zip"), str(out / "a.tar.gz")]
+    with patch.object(fanout_module, 'open', side_effect=failing_open, create=True):
+        with pytest.raises(OSError, match="Input/output error"):
+            autozip_compress([str(source_dir / "sub")], paths, checksums=str(out / "SHA256SUMS"))
+    assert list(out.iterdir()) == []
+
+# TEST FOR OPTIONS THAT NEED A SINGLE OUTPUT
+@pytest.mark.parametrize("outputs, options, message", [
+    ([], {}, "AT LEAST ONE OUTPUT PATH"),
+    (["a.zip", "-"], {}, "REQUIRE FILES, NOT STDOUT"),
+    (["a.zip"], {"checksums": "-"}, "REQUIRE FILES, NOT STDOUT"),
+    (["a.zip", "./a.zip"], {}, "OUTPUT PATHS MUST BE DIFFERENT"),
+    (["a.zip", "a.tar"], {"archive_format": "tar"}, "FORMAT CANNOT BE FORCED"),
+    (["a.zip", "a.tar"], {"dedup": True}, "NEED A SINGLE OUTPUT"),
+    (["a.tar.gz"], {"index": True, "checksums": "SUMS"}, "NEED A SINGLE OUTPUT"),
+    (["a.zip", "a.tar"], {"compression_level": "auto"}, "AUTO-TUNING NEEDS A SINGLE OUTPUT"),
+    (["a.zip", "a.rar"], {}, "UNSUPPORTED ARCHIVE FORMAT"),
+])
+def test_autozip_compress_many_invalid(temp_dir, source_dir, outputs, options, message):
+    outputs = [path if path == "-" else str(Path(temp_dir) / path) for path in outputs]
+    with pytest.raises(ValueError, match=message): autozip_compress([str(source_dir)], outputs, **options)
@@ -0,0 +1,164 @@
+import io
+import os
+import gzip
+import json
+import zlib
+import random
+import shutil
+import tarfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip import gzip_index as gzip_index_module
+from autotools.autozip.core import autozip_compress, autozip_get
+from autotools.autozip.parallel_gzip import ParallelGzipWriter
+from autotools.autozip.gzip_index import index_path_for, load_index, read_member
+
+# FIXTURES
+
+@pytest.fixture
+def source_tree(temp_dir):
+    rng = random.Random(9)
+    root = Path(temp_dir) / "data"
+    (root / "sub").mkdir(parents=True)
+    for i in range(8):
+        words = " ".join(rng.choice(["alpha", "beta", "gamma", "delta", str(i)]) for _ in range(40000))
+        (root / f"text{i}.txt").write_text(words)
+    (root / "sub" / "noise.bin").write_bytes(bytes(rng.getrandbits(8) for _ in range(200000)))
+    (root / "sub" / "empty.txt").write_bytes(b"")
+    return root
+
+# HELPER FUNCTIONS
+
+def get_bytes(archive, member):
+    out = io.BytesIO()
+    read_member(archive, member, out)
+    return out.getvalue()
+
+# TESTS FOR ACCESS POINTS IN THE GZIP WRITER
+
+# TEST FOR ACCESS POINTS BEING INDEPENDENT INFLATE ENTRY POINTS
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_parallel_gzip_access_points(jobs):
+    data = b"".join(b"LINE %d OF A REPETITIVE PAYLOAD\n" % i for i in range(60000))
+    raw = io.BytesIO()
+    with ParallelGzipWriter(raw, 6, jobs, block_size=16 * 1024, index_interval=100 * 1024) as gz: gz.write(data)
+    compressed = raw.getvalue()
+
+    assert gzip.decompress(compressed) == data
+    assert gz.access_points[0] == (0, 10)
+    assert [u for u, _ in gz.access_points] == list(range(0, len(data), 112 * 1024))
+    for uncompressed_offset, compressed_offset in gz.access_points:
+        inflated = zlib.decompressobj(-15).decompress(compressed[compressed_offset:], 4096)
+        assert inflated == data[uncompressed_offset:uncompressed_offset + len(inflated)]
+
+# TEST FOR NO ACCESS POINTS WITHOUT AN INTERVAL
+def test_parallel_gzip_no_index():
+    raw = io.BytesIO()
+    with ParallelGzipWriter(raw, 6, 2, block_size=1024) as gz: gz.write(b"X" * 10000)
+    assert gz.access_points == []
+
+# TESTS FOR INDEXED ARCHIVES
+
+# TEST FOR READING EVERY MEMBER THROUGH THE INDEX
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_autozip_compress_index(temp_dir, source_tree, jobs):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), jobs=jobs, index=True, index_interval="64K",
+                               block_size="16K")
+    index = load_index(index_path_for(archive))
+    assert index['format'] == 'tar.gz' and index['interval'] == 65536
+    assert len(index['access_points']) > 5
+
+    with tarfile.open(archive) as tar:
+        regular = [m.name for m in tar.getmembers() if m.isreg()]
+    assert sorted(index['members']) == sorted(regular)
+    for name in regular:
+        assert get_bytes(archive, name) == (source_tree.parent / name).read_bytes()
+
+# TEST FOR SEEKING TO THE NEAREST ACCESS POINT INSTEAD OF THE START
+def test_read_member_seeks(temp_dir, source_tree):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), index=True, index_interval="32K", block_size="32K")
+    index = load_index(index_path_for(archive))
+    name = max(index['members'], key=lambda member: index['members'][member][0])
+    positions = []
+    original = gzip_index_module._read_chunks
+
+    def spy(f):
+        positions.append(f.tell())
+        return original(f)
+
+    with patch.object(gzip_index_module, '_read_chunks', side_effect=spy):
+        assert get_bytes(archive, name) == (source_tree.parent / name).read_bytes()
+    assert positions[0] > os.path.getsize(archive) // 2
+
+# TEST FOR HARDLINKED (DEDUPLICATED) MEMBERS
+def test_autozip_compress_index_dedup(temp_dir, source_tree):
+    shutil.copy(source_tree / "text1.txt", source_tree / "sub" / "copy.txt")
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), index=True, dedup=True)
+    assert get_bytes(archive, "data/sub/copy.txt") == (source_tree / "text1.txt").read_bytes()
+
+# TEST FOR INDEX ONLY ON TAR.GZ FILE OUTPUTS
+@pytest.mark.parametrize("name, message", [("a.zip", "ONLY SUPPORTED FOR TAR.GZ"), ("-", "REQUIRES AN OUTPUT FILE")])
+def test_autozip_compress_index_errors(temp_dir, source_tree, name, message):
+    output = name if name == "-" else str(Path(temp_dir) / name)
+    with pytest.raises(ValueError, match=message):
+        autozip_compress([str(source_tree)], output, archive_format="tar.gz" if name == "-" else None, index=True)
+
+# TESTS FOR READ ERRORS
+
+# TEST FOR MISSING MEMBER, MISSING INDEX AND STALE INDEX
+def test_read_member_errors(temp_dir, source_tree):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), index=True)
+    with pytest.raises(FileNotFoundError, match="MEMBER NOT FOUND"): get_bytes(archive, "data/none.txt")
+
+    plain = autozip_compress([str(source_tree)], str(Path(temp_dir) / "plain.tar.gz"))
+    with pytest.raises(FileNotFoundError, match="INDEX NOT FOUND"): get_bytes(plain, "data/text0.txt")
+
+    with open(archive, 'ab') as f: f.write(b"\0")
+    with pytest.raises(ValueError, match="INDEX DOES NOT MATCH"): get_bytes(archive, "data/text0.txt")
+
+# TEST FOR TRUNCATED ARCHIVE DATA
+def test_read_member_truncated(temp_dir, source_tree):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), index=True)
+    index_path = index_path_for(archive)
+    index = load_index(index_path)
+    name = max(index['members'], key=lambda member: index['members'][member][0])
+
+    size = os.path.getsize(archive) - 2000
+    with open(archive, 'r+b') as f: f.truncate(size)
+    index['archive_size'] = size
+    Path(index_path).write_text(json.dumps(index))
+    with pytest.raises(ValueError, match="TRUNCATED ARCHIVE"): get_bytes(archive, name)
+
+# TEST FOR INVALID INDEX FILES
+@pytest.mark.parametrize("content", ["{broken", "[]", json.dumps({"version": 1, "access_points": [], "members": {}}),
+                                     json.dumps({"version": 1, "access_points": [[0, 10]], "members": []})])
+def test_load_index_invalid(temp_dir, content):
+    path = Path(temp_dir) / "bad.index.json"
+    path.write_text(content)
+    with pytest.raises(ValueError, match="INVALID INDEX"): load_index(str(path))
+
+# TESTS FOR autozip_get
+
+# TEST FOR WRITING A MEMBER TO A FILE, TO STDOUT, AND AN EMPTY MEMBER
+def test_autozip_get(temp_dir, source_tree):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), index=True)
+    output = Path(temp_dir) / "out" / "text3.txt"
+    assert autozip_get(archive, "data/text3.txt", str(output)) == (source_tree / "text3.txt").stat().st_size
+    assert output.read_bytes() == (source_tree / "text3.txt").read_bytes()
+    assert autozip_get(archive, "data/sub/empty.txt", str(Path(temp_dir) / "empty.txt")) == 0
+
+    class FakeStdout:
+        buffer = io.BytesIO()
+
+    with patch('autotools.autozip.core.sys.stdout', FakeStdout):
+        autozip_get(archive, "data/sub/noise.bin")
+    assert FakeStdout.buffer.getvalue() == (source_tree / "sub" / "noise.bin").read_bytes()
+
+# TEST FOR FAILED GET NOT LEAVING A PARTIAL FILE
+def test_autozip_get_errors(temp_dir, source_tree):
+    archive = autozip_compress([str(source_tree)], str(Path(temp_dir) / "a.tar.gz"), index=True)
+    output = Path(temp_dir) / "missing.txt"
+    with pytest.raises(FileNotFoundError, match="MEMBER NOT FOUND"): autozip_get(archive, "data/none", str(output))
+    assert not output.exists()
+    with pytest.raises(FileNotFoundError, match="ARCHIVE NOT FOUND"): autozip_get(str(Path(temp_dir) / "none.tar.gz"), "x")
@@ -1,7 +1,9 @@
 import pytest
+import io
+import json
 import os
-import tempfile
-import shutil
+import tarfile
+import zipfile
 import click
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -14,12 +16,6 @@ from autotools.cli import autozip
 def runner():
     return CliRunner()
 
-@pytest.fixture
-def temp_dir():
-    temp_path = tempfile.mkdtemp()
-    yield temp_path
-    shutil.rmtree(temp_path, ignore_errors=True)
-
 @pytest.fixture
 def test_file(temp_dir):
     file_path = Path(temp_dir) / "test.txt"
@@ -140,6 +136,352 @@ def test_autozip_cli_compression_level_short(runner, temp_dir, test_file):
     assert_success(result, "SUCCESS")
     assert Path(output).exists()
 
+# TEST FOR PARALLEL JOBS OPTION
+@pytest.mark.parametrize("jobs_args", [["--jobs", "4"], ["-j", "0"]])
+def test_autozip_cli_jobs(runner, temp_dir, test_dir, jobs_args):
+    output = str(Path(temp_dir) / "archive.zip")
+    result = runner.invoke(autozip, [test_dir, "--output", output] + jobs_args)
+    assert_success(result, "SUCCESS")
+    assert Path(output).exists()
+
+# TEST FOR ERROR - NEGATIVE JOBS
+def test_autozip_cli_invalid_jobs(runner, temp_dir, test_file):
+    output = str(Path(temp_dir) / "archive.zip")
+    result = runner.invoke(autozip, [test_file, "--output", output, "--jobs", "-1"])
+    assert_error(result, "JOBS MUST BE 0")
+
+# TEST FOR PARALLEL BLOCK OPTIONS
+@pytest.mark.parametrize("name", ["archive.tar.xz", "archive.tar.gz"])
+def test_autozip_cli_block_options(runner, temp_dir, test_dir, name):
+    output = str(Path(temp_dir) / name)
+    result = runner.invoke(autozip, [test_dir, "-o", output, "-j", "2", "--block-size", "64K", "--memory-limit", "1G"])
+    assert_success(result, "SUCCESS")
+    assert Path(output).exists()
+
+# TEST FOR ERROR - INVALID BLOCK SIZE
+def test_autozip_cli_invalid_block_size(runner, temp_dir, test_file):
+    output = str(Path(temp_dir) / "archive.tar.xz")
+    result = runner.invoke(autozip, [test_file, "-o", output, "--block-size", "huge"])
+    assert_error(result, "INVALID SIZE")
+
+# TEST FOR FULL THEN INCREMENTAL ARCHIVE WITH MANIFESTS
+def test_autozip_cli_manifest_and_incremental(runner, temp_dir, test_dir):
+    full = str(Path(temp_dir) / "full.tar.gz")
+    result = runner.invoke(autozip, [test_dir, "-o", full, "--manifest"])
+    assert_success(result, f"MANIFEST: {full}.manifest.json")
+    assert "FILES: 2 (ADDED: 2, CHANGED: 0, DELETED: 0)" in result.output
+
+    (Path(test_dir) / "file1.txt").write_text("FILE 1 CHANGED")
+    (Path(test_dir) / "file2.txt").unlink()
+    incremental = str(Path(temp_dir) / "inc.tar.gz")
+    result = runner.invoke(autozip, [test_dir, "-o", incremental, "--incremental", f"{full}.manifest.json"])
+    assert_success(result, "SUCCESS")
+    assert "FILES: 1 (ADDED: 0, CHANGED: 1, DELETED: 1)" in result.output
+
+# TEST FOR ERROR - MISSING BASE MANIFEST
+def test_autozip_cli_incremental_missing_base(runner, temp_dir, test_dir):
+    output = str(Path(temp_dir) / "inc.zip")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--incremental", str(Path(temp_dir) / "missing.json")])
+    assert_error(result, "MANIFEST NOT FOUND")
+
+# TEST FOR STORING ALREADY-COMPRESSED FILES UNLESS --deflate-all
+@pytest.mark.parametrize("args, expected", [([], zipfile.ZIP_STORED), (["--deflate-all"], zipfile.ZIP_DEFLATED)])
+def test_autozip_cli_deflate_all(runner, temp_dir, args, expected):
+    source = Path(temp_dir) / "photo.jpg"
+    source.write_bytes(b"\xff\xd8\xff\xe0" + b"\0" * 1000)
+    output = str(Path(temp_dir) / "photos.zip")
+    assert_success(runner.invoke(autozip, [str(source), "-o", output] + args), "SUCCESS")
+    with zipfile.ZipFile(output) as zipf: assert zipf.getinfo("photo.jpg").compress_type == expected
+
+# TEST FOR DEDUPLICATION REPORT
+def test_autozip_cli_dedup(runner, temp_dir, test_dir):
+    (Path(test_dir) / "copy.txt").write_text("FILE 1 CONTENT")
+    output = str(Path(temp_dir) / "archive.tar.gz")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--dedup"])
+    assert_success(result, "DEDUPLICATED: 1 FILES (SAVED: 0.01 KB)")
+
+# TEST FOR STREAMING AN ARCHIVE TO STDOUT (SUMMARY ON STDERR)
+@pytest.mark.parametrize("args, mode", [([], "r:"), (["-f", "tar.gz", "-j", "2"], "r:gz"), (["-f", "tar.xz"], "r:xz")])
+def test_autozip_cli_stdout(runner, test_dir, args, mode):
+    result = runner.invoke(autozip, [test_dir, "-o", "-"] + args)
+    assert result.exit_code == 0
+    assert "STREAMED ARCHIVE TO STDOUT" in result.stderr
+    with tarfile.open(fileobj=io.BytesIO(result.stdout_bytes), mode=mode) as tar:
+        assert sorted(tar.getnames()) == ["test_dir", "test_dir/file1.txt", "test_dir/file2.txt"]
+
+# TEST FOR STREAMING WITH DEDUP AND UPDATE MESSAGE ROUTED TO STDERR
+@patch('autotools.autozip.commands.check_for_updates', return_value="UPDATE AVAILABLE")
+def test_autozip_cli_stdout_messages(mock_updates, runner, test_dir):
+    result = runner.invoke(autozip, [test_dir, "-o", "-", "--dedup"])
+    assert result.exit_code == 0
+    assert "UPDATE AVAILABLE" in result.stderr and "DEDUPLICATED: 0 FILES" in result.stderr
+    assert b"UPDATE" not in result.stdout_bytes
+
+# TEST FOR ERROR - ZIP TO STDOUT
+def test_autozip_cli_stdout_zip(runner, test_file):
+    assert_error(runner.invoke(autozip, [test_file, "-o", "-", "-f", "zip"]), "CANNOT BE STREAMED")
+
+# TEST FOR SOURCES READ FROM A FILE LIST AND FROM STDIN
+def test_autozip_cli_files_from(runner, temp_dir, test_file, test_dir):
+    file_list = Path(temp_dir) / "list.txt"
+    file_list.write_text(f"{test_dir}\n")
+    output = str(Path(temp_dir) / "archive.tar")
+    assert_success(runner.invoke(autozip, [test_file, "-o", output, "--files-from", str(file_list)]), "SUCCESS")
+    with tarfile.open(output) as tar: assert "test.txt" in tar.getnames() and "test_dir/file1.txt" in tar.getnames()
+
+    output = str(Path(temp_dir) / "stdin.tar")
+    result = runner.invoke(autozip, ["-T", "-", "-o", output], input=f"{test_file}\0{test_dir}\0".encode())
+    assert_success(result, "SUCCESS")
+    with tarfile.open(output) as tar: assert "test.txt" in tar.getnames() and "test_dir/file2.txt" in tar.getnames()
+
+# TEST FOR ERROR - MISSING FILE LIST
+def test_autozip_cli_files_from_missing(runner, temp_dir):
+    result = runner.invoke(autozip, ["--files-from", str(Path(temp_dir) / "none.txt"), "-o", str(Path(temp_dir) / "a.tar")])
+    assert_error(result, "FILE LIST NOT FOUND")
+
+# TEST FOR --exclude AND --gitignore PRUNING THE SOURCE WALK
+def test_autozip_cli_exclude_and_gitignore(runner, temp_dir, test_dir):
+    (Path(test_dir) / ".gitignore").write_text("file2.txt\n")
+    (Path(test_dir) / "cache").mkdir()
+    (Path(test_dir) / "cache" / "blob.bin").write_bytes(b"X")
+    archive = str(Path(temp_dir) / "archive.zip")
+
+    result = runner.invoke(autozip, [test_dir, "-o", archive, "--gitignore", "--exclude", "cache/", "--exclude", ".gitignore", "-j", "2"])
+    assert_success(result, "SUCCESS: CREATED ARCHIVE")
+    with zipfile.ZipFile(archive) as zipf: assert zipf.namelist() == ["file1.txt"]
+
+# TEST FOR --compression auto PRINTING THE CALIBRATION TABLE (TO STDERR WHEN STREAMING)
+def test_autozip_cli_compression_auto(runner, temp_dir, test_dir):
+    result = runner.invoke(autozip, [test_dir, "-o", str(Path(temp_dir) / "archive.zip"), "-c", "auto:smallest"])
+    assert_success(result, "CALIBRATION: DEFLATE ON 0.03 KB SAMPLED FROM 2 FILES (TARGET: SMALLEST)")
+    assert "LEVEL  RATIO" in result.output and "<- SELECTED" in result.output and "SELECTED COMPRESSION LEVEL:" in result.output
+
+    result = runner.invoke(autozip, [test_dir, "-o", "-", "-f", "tar.xz", "-c", "auto"])
+    assert result.exit_code == 0
+    assert "TARGET: BALANCED" in result.stderr and b"CALIBRATION" not in result.stdout_bytes
+
+# TEST FOR CALIBRATION WITHOUT SAMPLE DATA, AND AN INVALID TARGET
+def test_autozip_cli_compression_auto_edge_cases(runner, temp_dir):
+    empty = Path(temp_dir) / "empty.txt"
+    empty.write_bytes(b"")
+    result = runner.invoke(autozip, [str(empty), "-o", str(Path(temp_dir) / "a.tar.gz"), "-c", "auto"])
+    assert_success(result, "SELECTED COMPRESSION LEVEL: 6")
+    assert "LEVEL  RATIO" not in result.output
+    assert_error(runner.invoke(autozip, [str(empty), "-o", str(Path(temp_dir) / "a.zip"), "-c", "auto:tiny"]), "INVALID COMPRESSION")
+
+# TEST FOR SEVERAL OUTPUTS AND A CHECKSUM LIST FROM ONE READ
+def test_autozip_cli_multiple_outputs(runner, temp_dir, test_dir):
+    outputs = [str(Path(temp_dir) / name) for name in ["release.zip", "release.tar.gz", "release.tar.xz"]]
+    checksums = str(Path(temp_dir) / "SHA256SUMS")
+    result = runner.invoke(autozip, [test_dir, "-o", outputs[0], "-o", outputs[1], "-o", outputs[2], "--checksums", checksums])
+    assert_success(result, f"SUCCESS: CREATED ARCHIVE: {outputs[2]}")
+    assert result.output.count("ARCHIVE SIZE:") == 3 and f"CHECKSUMS: {checksums} (2 FILES)" in result.output
+    with zipfile.ZipFile(outputs[0]) as zipf: assert sorted(zipf.namelist()) == ["file1.txt", "file2.txt"]
+    with tarfile.open(outputs[2]) as tar: assert tar.extractfile("test_dir/file2.txt").read() == b"FILE 2 CONTENT"
+    assert Path(checksums).read_text().splitlines()[0].endswith("  test_dir/file1.txt")
+
+# TEST FOR ERROR - SEVERAL OUTPUTS OR CHECKSUMS OUTSIDE ARCHIVE CREATION
+def test_autozip_cli_multiple_outputs_errors(runner, temp_dir, test_dir):
+    archive = str(Path(temp_dir) / "archive.zip")
+    assert_error(runner.invoke(autozip, [archive, "--list", "--checksums", "SUMS"]), "--list ACCEPTS ONE --output AND NO --checksums")
+    assert_error(runner.invoke(autozip, [archive, "-x", "-o", "a", "-o", "b"]), "--extract ACCEPTS ONE --output")
+    assert_error(runner.invoke(autozip, [test_dir, "-o", archive, "-o", str(Path(temp_dir) / "a.tar"), "--dedup"]), "NEED A SINGLE OUTPUT")
+
+# TEST FOR SHARDED ARCHIVES AND EXTRACTING THEM FROM THE GLOBAL INDEX
+def test_autozip_cli_shards(runner, temp_dir, test_dir):
+    output = str(Path(temp_dir) / "set.tar.gz")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--shards", "2", "-j", "2"])
+    assert_success(result, f"SUCCESS: CREATED 2 SHARDS: {output}.shards.json")
+    assert "ARCHIVE SIZE:" in result.output and Path(temp_dir, "set-00001.tar.gz").is_file()
+
+    result = runner.invoke(autozip, [f"{output}.shards.json", "-x", "-o", str(Path(temp_dir) / "restore"), "-j", "2"])
+    assert_success(result, "FILES: 2, DIRECTORIES: 1")
+    assert (Path(temp_dir) / "restore" / "test_dir" / "file2.txt").read_text() == "FILE 2 CONTENT"
+    assert_error(runner.invoke(autozip, [test_dir, "-o", output, "--shards", "2", "--shard-size", "1M"]), "CANNOT BE COMBINED")
+
+# TEST FOR READ-AHEAD OPTIONS
+def test_autozip_cli_prefetch(runner, temp_dir, test_dir):
+    output = str(Path(temp_dir) / "archive.tar")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--prefetch", "8", "--prefetch-memory", "1M"])
+    assert_success(result, f"SUCCESS: CREATED ARCHIVE: {output}")
+    with tarfile.open(output) as tar: assert tar.extractfile("test_dir/file1.txt").read() == b"FILE 1 CONTENT"
+    assert_error(runner.invoke(autozip, [test_dir, "-o", output, "--prefetch", "-1"]), "PREFETCH DEPTH CANNOT BE NEGATIVE")
+
+# TEST FOR CHECKPOINTED AND RESUMED RUNS
+def test_autozip_cli_checkpoint_and_resume(runner, temp_dir, test_dir):
+    output = str(Path(temp_dir) / "archive.zip")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--checkpoint", "--checkpoint-interval", "1K"])
+    assert_success(result, f"SUCCESS: CREATED ARCHIVE: {output}")
+    assert not Path(f"{output}.checkpoint").exists()
+
+    assert_error(runner.invoke(autozip, [test_dir, "-o", output, "--resume"]), "CHECKPOINT NOT FOUND")
+    Path(f"{output}.checkpoint").write_text(json.dumps({"version": 1, "format": "zip", "sources": [os.path.abspath(test_dir)]}))
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--resume"])
+    assert_success(result, "RESUMED FROM: 0")
+    with zipfile.ZipFile(output) as zipf: assert zipf.read("file2.txt") == b"FILE 2 CONTENT"
+
+# TEST FOR APPENDING TO AND UPDATING AN EXISTING ARCHIVE
+def test_autozip_cli_append_and_update(runner, temp_dir, test_dir):
+    output = str(Path(temp_dir) / "archive.tar")
+    assert_success(runner.invoke(autozip, [test_dir, "-o", output]), "SUCCESS: CREATED ARCHIVE")
+    Path(test_dir, "file3.txt").write_text("FILE 3 CONTENT")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--append"])
+    assert_success(result, f"SUCCESS: UPDATED ARCHIVE: {output}")
+    assert "ADDED: 1, REPLACED: 0, UNCHANGED: 3" in result.output
+
+    Path(test_dir, "file1.txt").write_text("FILE 1 CHANGED CONTENT")
+    assert "ADDED: 0, REPLACED: 1, UNCHANGED: 3" in runner.invoke(autozip, [test_dir, "-o", output, "--update"]).output
+    assert_error(runner.invoke(autozip, [test_dir, "-o", output, "--append", "--update"]), "CANNOT BE COMBINED")
+
+# TEST FOR VERIFYING AN ARCHIVE (TEXT AND JSON LINES), A DAMAGED MEMBER AND A MANIFEST MISMATCH
+def test_autozip_cli_verify(runner, temp_dir, test_dir):
+    output = str(Path(temp_dir) / "archive.zip")
+    assert_success(runner.invoke(autozip, [test_dir, "-o", output, "--manifest"]), "SUCCESS: CREATED ARCHIVE")
+    assert_success(runner.invoke(autozip, [output, "--verify", "-j", "2"]), f"SUCCESS: VERIFIED 2 MEMBERS (0.03 KB): {output}")
+    result = runner.invoke(autozip, [output, "--verify", "--json"])
+    lines = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+    assert [(line['name'], line['status']) for line in lines] == [("file1.txt", "ok"), ("file2.txt", "ok")] and lines[0]['sha256']
+
+    manifest = json.loads(Path(f"{output}.manifest.json").read_text())
+    manifest['files']['file2.txt'][3] = "0" * 64
+    Path(f"{output}.manifest.json").write_text(json.dumps(manifest))
+    result = runner.invoke(autozip, [output, "--verify"])
+    assert_error(result, "MISMATCH: file2.txt: CONTENT DIFFERS FROM THE MANIFEST")
+    assert "VERIFICATION FAILED: 1 OF 2 MEMBERS" in result.output
+    assert_error(runner.invoke(autozip, [output, "--verify", "--json"]), '"status": "mismatch"')
+
+    tar_output = str(Path(temp_dir) / "archive.tar")
+    assert_success(runner.invoke(autozip, [test_dir, "-o", tar_output]), "SUCCESS: CREATED ARCHIVE")
+    with open(tar_output, 'r+b') as f: f.write(b"X")
+    assert_error(runner.invoke(autozip, [tar_output, "--verify"]), "CORRUPT: INVALID TAR HEADER AT OFFSET 0")
+    assert_error(runner.invoke(autozip, [output, "--verify", "--verify-manifest", "none.json"]), "MANIFEST NOT FOUND")
+    assert_error(runner.invoke(autozip, [output, "--verify", "--list"]), "--list AND --verify CANNOT BE COMBINED")
+
+# TEST FOR LIVE PROGRESS: JSON LINES AND THE STATUS LINE ON STDERR, NOTHING BY DEFAULT OFF A TERMINAL
+def test_autozip_cli_progress(runner, temp_dir, test_dir, monkeypatch):
+    output = str(Path(temp_dir) / "archive.tar.gz")
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--progress", "json"])
+    assert_success(result, "SUCCESS: CREATED ARCHIVE")
+    lines = [json.loads(line) for line in result.stderr.splitlines() if line.startswith("{")]
+    assert lines[-1]['done'] and lines[-1]['files'] == lines[-1]['total_files'] == 3 and lines[-1]['bytes_in'] == 28
+
+    result = runner.invoke(autozip, [test_dir, "-o", output, "--progress", "text"])
+    assert_success(result, "SUCCESS: CREATED ARCHIVE")
+    assert "100.0% 3/3 FILES, IN: 0.03 KB" in result.stderr and "MB/S, ETA: 0:00" in result.stderr
+
+    assert "FILES/S" not in runner.invoke(autozip, [test_dir, "-o", output]).stderr
+    monkeypatch.setattr("autotools.autozip.commands._should_show_spinner", lambda: True)
+    assert "FILES/S" in runner.invoke(autozip, [test_dir, "-o", output]).stderr
+    assert_error(runner.invoke(autozip, [test_dir, "-o", output, "--progress", "fast"]), "Invalid value for '--progress'")
+
+# TEST FOR INDEXED ARCHIVE AND SINGLE-MEMBER GET (FILE AND STDOUT)
+def test_autozip_cli_index_and_get(runner, temp_dir, test_dir):
+    archive = str(Path(temp_dir) / "archive.tar.gz")
+    result = runner.invoke(autozip, [test_dir, "-o", archive, "--index", "--index-interval", "1M"])
+    assert_success(result, f"INDEX: {archive}.index.json")
+
+    output = Path(temp_dir) / "file1.txt"
+    result = runner.invoke(autozip, [archive, "--get", "test_dir/file1.txt", "-o", str(output)])
+    assert_success(result, f"SUCCESS: EXTRACTED MEMBER: test_dir/file1.txt -> {output}")
+    assert output.read_text() == "FILE 1 CONTENT"
+
+    result = runner.invoke(autozip, [archive, "--get", "test_dir/file2.txt"])
+    assert result.exit_code == 0
+    assert result.stdout_bytes == b"FILE 2 CONTENT"
+    assert "MEMBER SIZE: 0.01 KB" in result.stderr
+
+# TEST FOR ERRORS - GET WITHOUT INDEX, GET WITH EXTRACT
+def test_autozip_cli_get_errors(runner, temp_dir, test_dir):
+    archive = str(Path(temp_dir) / "archive.tar.gz")
+    assert_success(runner.invoke(autozip, [test_dir, "-o", archive]))
+    assert_error(runner.invoke(autozip, [archive, "--get", "test_dir/file1.txt"]), "INDEX NOT FOUND")
+    assert_error(runner.invoke(autozip, [archive, "--get", "x", "--extract"]), "CANNOT BE COMBINED")
+    assert_error(runner.invoke(autozip, [archive, archive, "--get", "x"]), "--get EXPECTS EXACTLY ONE ARCHIVE")
+
+# TEST FOR LISTING AND STAT TABLES
+@pytest.mark.parametrize("name", ["archive.zip", "archive.tar"])
+def test_autozip_cli_list_and_stat(runner, temp_dir, test_dir, name):
+    archive = str(Path(temp_dir) / name)
+    assert_success(runner.invoke(autozip, [test_dir, "-o", archive]))
+
+    result = runner.invoke(autozip, [archive, "--list"])
+    assert_success(result, "MODIFIED  NAME")
+    assert "file1.txt" in result.output
+
+    result = runner.invoke(autozip, [archive, "--stat"])
+    assert_success(result, f"ARCHIVE: {archive}")
+    assert "FILES: 2" in result.output and "LARGEST MEMBERS:" in result.output
+
+# TEST FOR JSON OUTPUT (STDOUT HOLDS ONLY THE JSON DOCUMENT)
+def test_autozip_cli_list_and_stat_json(runner, temp_dir, test_dir):
+    archive = str(Path(temp_dir) / "archive.tar.gz")
+    assert_success(runner.invoke(autozip, [test_dir, "-o", archive]))
+
+    result = runner.invoke(autozip, [archive, "--list", "--json"])
+    assert result.exit_code == 0
+    assert {entry['name'] for entry in json.loads(result.stdout)} >= {"test_dir/file1.txt", "test_dir/file2.txt"}
+
+    result = runner.invoke(autozip, [archive, "--stat", "--json"])
+    assert result.exit_code == 0
+    stats = json.loads(result.stdout)
+    assert stats['format'] == "tar.gz" and stats['files'] == 2 and stats['compressed_size'] == os.path.getsize(archive)
+
+# TEST FOR STAT OF AN ARCHIVE WITHOUT FILES
+def test_autozip_cli_stat_empty(runner, temp_dir):
+    archive = Path(temp_dir) / "empty.zip"
+    zipfile.ZipFile(archive, 'w').close()
+    result = runner.invoke(autozip, [str(archive), "--stat"])
+    assert_success(result, "RATIO: -")
+    assert "LARGEST MEMBERS:" not in result.output
+
+# TEST FOR ERRORS - COMBINED MODES, SEVERAL ARCHIVES, MISSING ARCHIVE
+def test_autozip_cli_list_errors(runner, temp_dir):
+    archive = str(Path(temp_dir) / "archive.zip")
+    assert_error(runner.invoke(autozip, [archive, "--list", "--stat"]), "--list AND --stat CANNOT BE COMBINED")
+    assert_error(runner.invoke(autozip, [archive, archive, "--stat"]), "--stat EXPECTS EXACTLY ONE ARCHIVE")
+    assert_error(runner.invoke(autozip, [archive, "--list"]), "ARCHIVE NOT FOUND")
+
+# TEST FOR EXTRACTING ZIP AND TAR.GZ ARCHIVES
+@pytest.mark.parametrize("name", ["archive.zip", "archive.tar.gz"])
+def test_autozip_cli_extract(runner, temp_dir, test_dir, name):
+    archive = str(Path(temp_dir) / name)
+    assert_success(runner.invoke(autozip, [test_dir, "-o", archive]))
+    destination = Path(temp_dir) / "restore"
+    result = runner.invoke(autozip, [archive, "--extract", "-o", str(destination), "-j", "2"])
+    assert_success(result, f"SUCCESS: EXTRACTED ARCHIVE: {archive}")
+    assert "FILES: 2" in result.output
+    assert "EXTRACTED SIZE: 0.03 KB" in result.output
+    assert sorted(p.read_text() for p in destination.rglob("*.txt")) == ["FILE 1 CONTENT", "FILE 2 CONTENT"]
+
+# TEST FOR EXTRACTING INTO THE CURRENT DIRECTORY BY DEFAULT
+def test_autozip_cli_extract_default_destination(runner, temp_dir, test_file, monkeypatch):
+    archive = str(Path(temp_dir) / "archive.tar")
+    assert_success(runner.invoke(autozip, [test_file, "-o", archive]))
+    destination = Path(temp_dir) / "cwd"
+    destination.mkdir()
+    monkeypatch.chdir(destination)
+    result = runner.invoke(autozip, [archive, "-x"])
+    assert_success(result, "-> .")
+    assert (destination / "test.txt").read_text() == "TEST CONTENT FOR COMPRESSION"
+
+# TEST FOR ERROR - EXTRACT WITH SEVERAL SOURCES
+def test_autozip_cli_extract_multiple_sources(runner, test_file, test_dir):
+    assert_error(runner.invoke(autozip, [test_file, test_dir, "--extract"]), "EXPECTS EXACTLY ONE ARCHIVE")
+    assert_error(runner.invoke(autozip, [test_file, "--extract", "--files-from", "-"]), "EXPECTS EXACTLY ONE ARCHIVE")
+
+# TEST FOR ERROR - COMPRESS WITHOUT OUTPUT
+def test_autozip_cli_missing_output(runner, test_file):
+    assert_error(runner.invoke(autozip, [test_file]), "--output IS REQUIRED")
+
+# TEST FOR UNSAFE ARCHIVE PATHS (REJECTED UNLESS --unsafe-paths)
+def test_autozip_cli_extract_unsafe_paths(runner, temp_dir):
+    archive = Path(temp_dir) / "evil.zip"
+    with zipfile.ZipFile(archive, 'w') as zipf: zipf.writestr(zipfile.ZipInfo("../escaped.txt"), b"ESCAPED")
+    destination = str(Path(temp_dir) / "restore")
+    assert_error(runner.invoke(autozip, [str(archive), "-x", "-o", destination]), "UNSAFE PATH IN ARCHIVE")
+    assert_success(runner.invoke(autozip, [str(archive), "-x", "-o", destination, "--unsafe-paths"]))
+    assert (Path(temp_dir) / "escaped.txt").read_text() == "ESCAPED"
+
 # TEST FOR MULTIPLE SOURCES
 def test_autozip_cli_multiple_sources(runner, temp_dir, test_file, test_dir):
     output = str(Path(temp_dir) / "archive.zip")
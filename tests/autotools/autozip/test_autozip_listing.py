@@ -0,0 +1,153 @@
+import os
+import shutil
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip.core import autozip_compress, autozip_list, autozip_stat
+from autotools.autozip.listing import LARGEST_MEMBERS, archive_stat, list_tar
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    (root / "sub").mkdir(parents=True)
+    (root / "text.txt").write_text("REPEATED LINE\n" * 5000)
+    (root / "sub" / "noise.bin").write_bytes(os.urandom(40000))
+    (root / "sub" / "empty.txt").write_bytes(b"")
+    return root
+
+# HELPER FUNCTIONS
+
+def by_name(entries):
+    return {entry['name']: entry for entry in entries}
+
+# TESTS FOR autozip_list
+
+# TEST FOR ZIP ENTRIES FROM THE CENTRAL DIRECTORY
+def test_autozip_list_zip(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"))
+    entries = by_name(autozip_list(archive))
+
+    text = entries["text.txt"]
+    assert text['type'] == "file" and text['size'] == 70000 and text['method'] == "deflated"
+    assert text['compressed_size'] < text['size'] and text['ratio'] == round(text['compressed_size'] / 70000, 4)
+    assert entries["sub/noise.bin"]['method'] == "stored"
+    assert entries["sub/empty.txt"]['ratio'] is None
+
+# TEST FOR ZIP MEMBER DATA NEVER BEING READ
+def test_autozip_list_zip_metadata_only(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"))
+    with patch.object(zipfile.ZipFile, 'open', side_effect=AssertionError("MEMBER DATA READ")):
+        assert len(autozip_list(archive)) == 3
+
+# TEST FOR ZIP DIRECTORY AND SYMLINK ENTRIES
+def test_autozip_list_zip_types(temp_dir):
+    archive = Path(temp_dir) / "types.zip"
+    with zipfile.ZipFile(archive, 'w') as zipf:
+        zipf.writestr("dir/", b"")
+        link = zipfile.ZipInfo("link")
+        link.external_attr = 0o120777 << 16
+        zipf.writestr(link, "target")
+    assert [(e['name'], e['type']) for e in autozip_list(str(archive))] == [("dir/", "dir"), ("link", "symlink")]
+
+# TEST FOR ZIP DUPLICATES LISTED AS HARDLINKS (DEDUP MANIFEST HIDDEN)
+def test_autozip_list_zip_dedup(temp_dir, source_dir):
+    shutil.copy(source_dir / "text.txt", source_dir / "sub" / "copy.txt")
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"), dedup=True)
+    entries = by_name(autozip_list(archive))
+
+    assert ".autozip-dedup.json" not in entries
+    duplicate = entries["sub/copy.txt"] if entries["sub/copy.txt"]['type'] == "hardlink" else entries["text.txt"]
+    assert duplicate['method'] == "dedup" and duplicate['size'] == 0 and duplicate['mtime']
+
+# TEST FOR TAR ENTRIES IN EVERY TAR FORMAT
+@pytest.mark.parametrize("name", ["a.tar", "a.tar.gz", "a.tar.bz2", "a.tar.xz"])
+def test_autozip_list_tar(temp_dir, source_dir, name):
+    (source_dir / "link").symlink_to("text.txt")
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / name))
+    entries = by_name(autozip_list(archive))
+
+    assert entries["data"]['type'] == "dir" and entries["data/link"]['type'] == "symlink"
+    assert entries["data/text.txt"]['size'] == 70000 and entries["data/text.txt"]['compressed_size'] is None
+    assert "T" in entries["data/text.txt"]['mtime']
+
+# TEST FOR UNCOMPRESSED TAR SEEKING OVER MEMBER DATA
+def test_list_tar_skips_data(temp_dir):
+    archive = Path(temp_dir) / "big.tar"
+    with tarfile.open(archive, 'w') as tar:
+        for i in range(3):
+            path = Path(temp_dir) / f"f{i}.bin"
+            path.write_bytes(b"\0" * 1024 * 1024)
+            tar.add(path, f"f{i}.bin")
+
+    read_sizes = []
+    real_tar_open = tarfile.open
+
+    class CountingFile:
+        def __init__(self, f): self.f = f
+        def read(self, size=-1):
+            data = self.f.read(size)
+            read_sizes.append(len(data))
+            return data
+        def __getattr__(self, name): return getattr(self.f, name)
+
+    with patch('autotools.autozip.listing.tarfile.open',
+               side_effect=lambda path, mode: real_tar_open(fileobj=CountingFile(open(path, 'rb')), mode=mode)):
+        entries = list_tar(str(archive))
+
+    assert [e['size'] for e in entries] == [1024 * 1024] * 3
+    assert sum(read_sizes) < 64 * 1024
+
+# TEST FOR HARDLINK AND OTHER TAR ENTRY TYPES
+def test_list_tar_types(temp_dir):
+    archive = Path(temp_dir) / "types.tar"
+    with tarfile.open(archive, 'w') as tar:
+        for name, kind in [("hard", tarfile.LNKTYPE), ("fifo", tarfile.FIFOTYPE)]:
+            info = tarfile.TarInfo(name)
+            info.type = kind
+            info.linkname = "target" if kind == tarfile.LNKTYPE else ""
+            tar.addfile(info)
+    assert [e['type'] for e in list_tar(str(archive))] == ["hardlink", "other"]
+
+# TEST FOR FORMAT OVERRIDE, UNKNOWN EXTENSION AND MISSING ARCHIVE
+def test_autozip_list_format_errors(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar.gz"))
+    renamed = Path(temp_dir) / "a.bin"
+    os.rename(archive, renamed)
+    assert len(autozip_list(str(renamed), archive_format="tgz")) == 5
+    with pytest.raises(ValueError, match="UNSUPPORTED ARCHIVE FORMAT"): autozip_list(str(renamed))
+    with pytest.raises(FileNotFoundError, match="ARCHIVE NOT FOUND"): autozip_list(str(Path(temp_dir) / "none.zip"))
+
+# TESTS FOR autozip_stat
+
+# TEST FOR ZIP STATISTICS (COMPRESSED SIZE FROM THE ENTRIES)
+def test_autozip_stat_zip(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"))
+    stats = autozip_stat(archive)
+    entries = autozip_list(archive)
+
+    assert stats['archive'] == archive and stats['format'] == "zip" and stats['archive_size'] == os.path.getsize(archive)
+    assert (stats['entries'], stats['files'], stats['directories'], stats['links']) == (3, 3, 0, 0)
+    assert stats['total_size'] == 110000
+    assert stats['compressed_size'] == sum(e['compressed_size'] for e in entries)
+    assert [e['name'] for e in stats['largest']] == ["text.txt", "sub/noise.bin", "sub/empty.txt"]
+
+# TEST FOR TAR STATISTICS (COMPRESSED SIZE IS THE ARCHIVE SIZE)
+def test_autozip_stat_tar(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar.xz"))
+    stats = autozip_stat(archive, archive_format="tar.xz")
+    assert stats['format'] == "tar.xz" and stats['directories'] == 2
+    assert stats['compressed_size'] == os.path.getsize(archive)
+    assert stats['ratio'] == round(os.path.getsize(archive) / 110000, 4)
+
+# TEST FOR LARGEST MEMBERS CAP AND EMPTY ARCHIVES
+def test_archive_stat():
+    entries = [{'name': f"f{i}", 'type': "file", 'size': i, 'compressed_size': i, 'ratio': None} for i in range(LARGEST_MEMBERS + 5)]
+    stats = archive_stat(entries, 1000)
+    assert [e['size'] for e in stats['largest']] == list(range(LARGEST_MEMBERS + 4, 4, -1))
+
+    empty = archive_stat([], 22)
+    assert (empty['entries'], empty['total_size'], empty['compressed_size'], empty['ratio'], empty['largest']) == (0, 0, 22, None, [])
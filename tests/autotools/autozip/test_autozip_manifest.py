@@ -0,0 +1,133 @@
+import os
+import json
+import hashlib
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from autotools.autozip.core import autozip_compress, _iter_source_files
+from autotools.autozip.manifest import (
+    build_manifest,
+    hash_file,
+    load_manifest,
+    manifest_path_for,
+    write_manifest,
+    MANIFEST_FIELDS
+)
+
+# FIXTURES
+
+@pytest.fixture
+def source_tree(temp_dir):
+    root = Path(temp_dir) / "data"
+    (root / "sub").mkdir(parents=True)
+    (root / "keep.txt").write_text("KEEP")
+    (root / "edit.txt").write_text("BEFORE")
+    (root / "touch.txt").write_text("SAME CONTENT")
+    (root / "sub" / "gone.txt").write_text("GONE")
+    return root
+
+# HELPER FUNCTIONS
+
+def archive_names(path):
+    if str(path).endswith('.zip'):
+        with zipfile.ZipFile(path) as zipf: return set(zipf.namelist())
+    with tarfile.open(path) as tar: return {m.name for m in tar.getmembers() if m.isreg()}
+
+def make_changes(root):
+    (root / "edit.txt").write_text("AFTER EDIT")
+    (root / "new.txt").write_text("NEW")
+    (root / "sub" / "gone.txt").unlink()
+    st = (root / "touch.txt").stat()
+    os.utime(root / "touch.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+# TESTS FOR MANIFEST HELPERS
+
+# TEST FOR SIDECAR PATH
+def test_manifest_path_for():
+    assert manifest_path_for("backup.tar.gz") == "backup.tar.gz.manifest.json"
+
+# TEST FOR FILE HASHING
+def test_hash_file(temp_dir):
+    path = Path(temp_dir) / "a.bin"
+    path.write_bytes(b"ABC" * 1000)
+    assert hash_file(path) == hashlib.sha256(b"ABC" * 1000).hexdigest()
+
+# TEST FOR WRITE AND LOAD ROUND TRIP
+def test_write_and_load_manifest(temp_dir, source_tree):
+    manifest, selected = build_manifest(_iter_source_files([str(source_tree)], 'tar'), 'tar')
+    path = write_manifest(str(Path(temp_dir) / "m.json"), manifest)
+    loaded = load_manifest(path)
+    assert loaded == manifest
+    assert loaded['fields'] == list(MANIFEST_FIELDS)
+    assert selected == set(manifest['files']) == set(manifest['added'])
+    assert "data/sub/gone.txt" in selected
+    assert ',"' in Path(path).read_text() and ', "' not in Path(path).read_text()
+
+# TEST FOR MISSING MANIFEST
+def test_load_manifest_missing(temp_dir):
+    with pytest.raises(FileNotFoundError, match="MANIFEST NOT FOUND"): load_manifest(str(Path(temp_dir) / "none.json"))
+
+# TEST FOR INVALID MANIFESTS
+@pytest.mark.parametrize("content", ["{not json", "[]", json.dumps({"version": 99, "files": {}}), json.dumps({"version": 1, "files": []})])
+def test_load_manifest_invalid(temp_dir, content):
+    path = Path(temp_dir) / "bad.json"
+    path.write_text(content)
+    with pytest.raises(ValueError, match="INVALID MANIFEST"): load_manifest(str(path))
+
+# TESTS FOR FULL AND INCREMENTAL ARCHIVES
+
+# TEST FOR FULL ARCHIVE WITH MANIFEST
+@pytest.mark.parametrize("name, prefix", [("full.zip", ""), ("full.tar.gz", "data/")])
+def test_autozip_compress_with_manifest(temp_dir, source_tree, name, prefix):
+    output = Path(temp_dir) / name
+    result = autozip_compress([str(source_tree)], str(output), manifest=True)
+    manifest = load_manifest(manifest_path_for(result))
+    expected = {f"{prefix}{n}" for n in ("keep.txt", "edit.txt", "touch.txt", "sub/gone.txt")}
+    assert set(manifest['files']) == expected == archive_names(output)
+    assert manifest['base'] is None and manifest['deleted'] == []
+    size, mtime_ns, inode, digest = manifest['files'][f"{prefix}keep.txt"]
+    assert (size, digest) == (4, hashlib.sha256(b"KEEP").hexdigest())
+
+# TEST FOR INCREMENTAL ARCHIVE ONLY STORING NEW AND CHANGED FILES
+@pytest.mark.parametrize("ext, prefix", [("zip", ""), ("tar", "data/"), ("tar.gz", "data/"), ("tar.bz2", "data/"), ("tar.xz", "data/")])
+def test_autozip_compress_incremental(temp_dir, source_tree, ext, prefix):
+    full = autozip_compress([str(source_tree)], str(Path(temp_dir) / f"full.{ext}"), manifest=True)
+    make_changes(source_tree)
+
+    base_manifest = manifest_path_for(full)
+    incremental = autozip_compress([str(source_tree)], str(Path(temp_dir) / f"inc.{ext}"), incremental=base_manifest)
+    manifest = load_manifest(manifest_path_for(incremental))
+
+    assert archive_names(incremental) == {f"{prefix}edit.txt", f"{prefix}new.txt"}
+    assert manifest['added'] == [f"{prefix}new.txt"]
+    assert manifest['changed'] == [f"{prefix}edit.txt"]
+    assert manifest['deleted'] == [f"{prefix}sub/gone.txt"]
+    assert manifest['base'] == base_manifest
+    assert f"{prefix}keep.txt" in manifest['files'] and f"{prefix}touch.txt" in manifest['files']
+
+# TEST FOR CHAINED INCREMENTAL WITH NO CHANGES
+def test_autozip_compress_incremental_no_changes(temp_dir, source_tree):
+    full = autozip_compress([str(source_tree)], str(Path(temp_dir) / "full.tar"), manifest=True)
+    incremental = autozip_compress([str(source_tree)], str(Path(temp_dir) / "inc.tar"), incremental=manifest_path_for(full), jobs=2)
+    assert archive_names(incremental) == set()
+    manifest = load_manifest(manifest_path_for(incremental))
+    assert manifest['added'] == manifest['changed'] == manifest['deleted'] == []
+
+# TEST FOR PARALLEL ZIP INCREMENTAL
+def test_autozip_compress_incremental_zip_jobs(temp_dir, source_tree):
+    full = autozip_compress([str(source_tree)], str(Path(temp_dir) / "full.zip"), manifest=True)
+    make_changes(source_tree)
+    incremental = autozip_compress([str(source_tree)], str(Path(temp_dir) / "inc.zip"), incremental=manifest_path_for(full), jobs=3)
+    assert archive_names(incremental) == {"edit.txt", "new.txt"}
+
+# TEST FOR BASE MANIFEST FROM A DIFFERENT LAYOUT
+def test_autozip_compress_incremental_layout_mismatch(temp_dir, source_tree):
+    full = autozip_compress([str(source_tree)], str(Path(temp_dir) / "full.zip"), manifest=True)
+    with pytest.raises(ValueError, match="LAYOUT MISMATCH"):
+        autozip_compress([str(source_tree)], str(Path(temp_dir) / "inc.tar.gz"), incremental=manifest_path_for(full))
+
+# TEST FOR MISSING BASE MANIFEST
+def test_autozip_compress_incremental_missing_base(temp_dir, source_tree):
+    with pytest.raises(FileNotFoundError, match="MANIFEST NOT FOUND"):
+        autozip_compress([str(source_tree)], str(Path(temp_dir) / "inc.zip"), incremental=str(Path(temp_dir) / "none.json"))
@@ -0,0 +1,139 @@
+import io
+import gzip
+import zlib
+import shutil
+import random
+import tarfile
+import subprocess
+import pytest
+from pathlib import Path
+from autotools.autozip.core import _compress_tar_gz, autozip_compress
+from autotools.autozip.parallel_gzip import ParallelGzipWriter, _gzip_header, _deflate_block, DEFAULT_BLOCK_SIZE
+
+# FIXTURES
+
+@pytest.fixture
+def mixed_data():
+    rng = random.Random(7)
+    words = [b"alpha", b"beta", b"gamma", b"delta", b"epsilon"]
+    text = b" ".join(rng.choice(words) for _ in range(60000))
+    noise = bytes(rng.getrandbits(8) for _ in range(50000))
+    return text + noise + text[:70000]
+
+# HELPER FUNCTIONS
+
+def gzip_bytes(data, **kwargs):
+    buffer = io.BytesIO()
+    with ParallelGzipWriter(buffer, **kwargs) as writer:
+        for offset in range(0, len(data), 10000): writer.write(data[offset:offset + 10000])
+    return buffer.getvalue()
+
+# TESTS FOR _gzip_header
+
+# TEST FOR HEADER FIELDS AND EXTRA FLAGS
+@pytest.mark.parametrize("level, xfl", [(1, 4), (6, 0), (9, 2)])
+def test_gzip_header(level, xfl):
+    header = _gzip_header(level, mtime=1234)
+    assert header[:4] == b"\x1f\x8b\x08\x00"
+    assert int.from_bytes(header[4:8], 'little') == 1234
+    assert header[8] == xfl
+    assert len(header) == 10
+
+# TEST FOR HEADER WITH CURRENT TIME
+def test_gzip_header_default_mtime():
+    assert int.from_bytes(_gzip_header(6)[4:8], 'little') > 0
+
+# TESTS FOR _deflate_block
+
+# TEST FOR PRIMED BLOCKS DECOMPRESSING AS ONE STREAM
+def test_deflate_block_concatenation():
+    first, second = b"HELLO WORLD " * 100, b"HELLO WORLD " * 100 + b"END"
+    stream = _deflate_block(first, b'', 6, finish=False) + _deflate_block(second, first, 6, finish=True)
+    assert zlib.decompress(stream, -15) == first + second
+
+# TESTS FOR ParallelGzipWriter
+
+# TEST FOR ROUND TRIP ACROSS MANY BLOCKS
+@pytest.mark.parametrize("block_size", [4096, 32 * 1024, DEFAULT_BLOCK_SIZE])
+def test_parallel_gzip_round_trip(mixed_data, block_size):
+    compressed = gzip_bytes(mixed_data, compression_level=6, jobs=4, block_size=block_size)
+    assert gzip.decompress(compressed) == mixed_data
+
+# TEST FOR DATA ENDING EXACTLY ON A BLOCK BOUNDARY
+def test_parallel_gzip_exact_block_boundary():
+    data = b"X" * (4096 * 8)
+    assert gzip.decompress(gzip_bytes(data, jobs=2, block_size=4096)) == data
+
+# TEST FOR EMPTY STREAM
+def test_parallel_gzip_empty():
+    assert gzip.decompress(gzip_bytes(b"", jobs=2)) == b""
+
+# TEST FOR SINGLE MEMBER WITH COMBINED CRC AND SIZE TRAILER
+def test_parallel_gzip_trailer(mixed_data):
+    compressed = gzip_bytes(mixed_data, jobs=3, block_size=8192)
+    assert int.from_bytes(compressed[-8:-4], 'little') == zlib.crc32(mixed_data)
+    assert int.from_bytes(compressed[-4:], 'little') == len(mixed_data)
+    decompressor = zlib.decompressobj(31)
+    assert decompressor.decompress(compressed) == mixed_data
+    assert decompressor.eof and decompressor.unused_data == b""
+
+# TEST FOR RATIO CLOSE TO SERIAL GZIP
+def test_parallel_gzip_ratio(mixed_data):
+    parallel = gzip_bytes(mixed_data, compression_level=6, jobs=4)
+    serial = gzip.compress(mixed_data, compresslevel=6)
+    assert len(parallel) < len(serial) * 1.05
+
+# TEST FOR TELL, FLUSH, WRITABLE AND DOUBLE CLOSE
+def test_parallel_gzip_file_protocol():
+    writer = ParallelGzipWriter(io.BytesIO(), jobs=2)
+    assert writer.writable()
+    assert writer.write(b"ABC") == 3
+    writer.flush()
+    assert writer.tell() == 3
+    writer.close()
+    writer.close()
+    assert writer.closed
+    with pytest.raises(ValueError, match="CLOSED"): writer.write(b"D")
+
+# TEST FOR INVALID BLOCK SIZE
+def test_parallel_gzip_invalid_block_size():
+    with pytest.raises(ValueError, match="BLOCK SIZE"): ParallelGzipWriter(io.BytesIO(), block_size=-1)
+
+# TEST FOR STANDARD GUNZIP COMPATIBILITY
+@pytest.mark.skipif(shutil.which("gzip") is None, reason="gzip binary not available")
+def test_parallel_gzip_gunzip_compatible(temp_dir, mixed_data):
+    output = Path(temp_dir) / "data.gz"
+    output.write_bytes(gzip_bytes(mixed_data, jobs=4, block_size=16384))
+    result = subprocess.run(["gzip", "-t", str(output)], capture_output=True)
+    assert result.returncode == 0
+
+# TESTS FOR PARALLEL TAR.GZ
+
+# TEST FOR PARALLEL TAR.GZ CONTENT
+def test_compress_tar_gz_parallel(temp_dir, mixed_data):
+    source = Path(temp_dir) / "src"
+    (source / "nested").mkdir(parents=True)
+    (source / "data.bin").write_bytes(mixed_data)
+    (source / "nested" / "note.txt").write_text("NOTE")
+
+    output = Path(temp_dir) / "archive.tar.gz"
+    result = _compress_tar_gz([str(source)], str(output), compression_level=6, jobs=4)
+    assert result == str(output)
+
+    with tarfile.open(output, 'r:gz') as tar:
+        assert tar.extractfile("src/data.bin").read() == mixed_data
+        assert tar.extractfile("src/nested/note.txt").read() == b"NOTE"
+
+# TEST FOR PARALLEL TAR.GZ WITH NONEXISTENT FILE
+def test_compress_tar_gz_parallel_nonexistent(temp_dir):
+    output = Path(temp_dir) / "archive.tar.gz"
+    with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"):
+        _compress_tar_gz([str(Path(temp_dir) / "missing.txt")], str(output), jobs=2)
+
+# TEST FOR PARALLEL TAR.GZ THROUGH autozip_compress
+def test_autozip_compress_tar_gz_jobs(temp_dir):
+    source = Path(temp_dir) / "test.txt"
+    source.write_text("TEST CONTENT")
+    output = Path(temp_dir) / "archive.tgz"
+    assert autozip_compress([str(source)], str(output), jobs=2) == str(output)
+    with tarfile.open(output, 'r:gz') as tar: assert tar.getnames() == ["test.txt"]
@@ -0,0 +1,143 @@
+import io
+import lzma
+import shutil
+import random
+import tarfile
+import subprocess
+import pytest
+from pathlib import Path
+from autotools.autozip.core import _compress_tar_xz, autozip_compress, parse_size
+from autotools.autozip.block_writer import ParallelBlockWriter
+from autotools.autozip.parallel_xz import ParallelXzWriter, default_block_size, _PRESET_MEMORY
+
+# FIXTURES
+
+@pytest.fixture
+def mixed_data():
+    rng = random.Random(11)
+    text = b"".join(rng.choice([b"north ", b"south ", b"east ", b"west "]) for _ in range(40000))
+    return text + bytes(rng.getrandbits(8) for _ in range(30000))
+
+# HELPER FUNCTIONS
+
+def xz_bytes(data, **kwargs):
+    buffer = io.BytesIO()
+    with ParallelXzWriter(buffer, **kwargs) as writer:
+        for offset in range(0, len(data), 7000): writer.write(data[offset:offset + 7000])
+    return buffer.getvalue()
+
+def count_streams(compressed):
+    streams, remaining = 0, compressed
+    while remaining:
+        decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+        decompressor.decompress(remaining)
+        remaining = decompressor.unused_data
+        streams += 1
+    return streams
+
+# TESTS FOR parse_size
+
+# TEST FOR VALID SIZES
+@pytest.mark.parametrize("value, expected", [
+    (None, None), (4096, 4096), ("65536", 65536), ("512K", 512 * 1024), ("16m", 16 * 1024 ** 2),
+    ("1.5G", int(1.5 * 1024 ** 3)), ("8MiB", 8 * 1024 ** 2), ("2 GB", 2 * 1024 ** 3), ("1T", 1024 ** 4),
+])
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+# TEST FOR INVALID SIZES
+@pytest.mark.parametrize("value, message", [("abc", "INVALID SIZE"), ("12X", "INVALID SIZE"), ("0", "GREATER THAN 0")])
+def test_parse_size_invalid(value, message):
+    with pytest.raises(ValueError, match=message): parse_size(value)
+
+# TESTS FOR ParallelXzWriter
+
+# TEST FOR DEFAULT BLOCK SIZE PER PRESET
+def test_default_block_size():
+    assert default_block_size(0) == 1024 * 1024
+    assert default_block_size(6) == 24 * 1024 * 1024
+    assert default_block_size(9) == 192 * 1024 * 1024
+
+# TEST FOR ROUND TRIP AS CONCATENATED STREAMS
+def test_parallel_xz_round_trip(mixed_data):
+    compressed = xz_bytes(mixed_data, compression_level=6, jobs=4, block_size=16384)
+    assert lzma.decompress(compressed) == mixed_data
+    assert count_streams(compressed) == -(-len(mixed_data) // 16384)
+
+# TEST FOR DATA ENDING EXACTLY ON A BLOCK BOUNDARY (NO EMPTY TRAILING STREAM)
+def test_parallel_xz_exact_block_boundary():
+    data = b"Y" * (8192 * 4)
+    compressed = xz_bytes(data, jobs=2, block_size=8192)
+    assert lzma.decompress(compressed) == data
+    assert count_streams(compressed) == 4
+
+# TEST FOR EMPTY INPUT STILL PRODUCING A VALID XZ FILE
+def test_parallel_xz_empty():
+    compressed = xz_bytes(b"", jobs=2)
+    assert lzma.decompress(compressed) == b""
+    assert count_streams(compressed) == 1
+
+# TEST FOR MEMORY CAP LIMITING WORKERS
+def test_parallel_xz_memory_limit():
+    block_size = 1024 * 1024
+    per_worker = _PRESET_MEMORY[9] + 3 * block_size
+    assert ParallelXzWriter(io.BytesIO(), 9, jobs=8, block_size=block_size, memory_limit=per_worker * 3).jobs == 3
+    assert ParallelXzWriter(io.BytesIO(), 9, jobs=8, block_size=block_size, memory_limit=1).jobs == 1
+    assert ParallelXzWriter(io.BytesIO(), 9, jobs=8, block_size=block_size).jobs == 8
+
+# TEST FOR STANDARD XZ COMPATIBILITY
+@pytest.mark.skipif(shutil.which("xz") is None, reason="xz binary not available")
+def test_parallel_xz_cli_compatible(temp_dir, mixed_data):
+    output = Path(temp_dir) / "data.xz"
+    output.write_bytes(xz_bytes(mixed_data, jobs=3, block_size=20000))
+    result = subprocess.run(["xz", "-dc", str(output)], capture_output=True)
+    assert result.returncode == 0
+    assert result.stdout == mixed_data
+
+# TEST FOR BASE WRITER REQUIRING A BLOCK TASK BEFORE ANY WRITER IS CREATED
+def test_block_writer_base_not_implemented():
+    with pytest.raises(TypeError, match="_block_task"): ParallelBlockWriter(io.BytesIO(), jobs=1, block_size=4)
+
+    class IncompleteWriter(ParallelBlockWriter):
+        pass
+
+    with pytest.raises(TypeError, match="_block_task"): IncompleteWriter(io.BytesIO(), jobs=1, block_size=4)
+
+# TESTS FOR PARALLEL TAR.XZ
+
+# TEST FOR PARALLEL TAR.XZ CONTENT
+def test_compress_tar_xz_parallel(temp_dir, mixed_data):
+    source = Path(temp_dir) / "src"
+    source.mkdir()
+    (source / "data.bin").write_bytes(mixed_data)
+    (source / "small.txt").write_text("SMALL")
+
+    output = Path(temp_dir) / "archive.tar.xz"
+    result = _compress_tar_xz([str(source)], str(output), 1, jobs=4, block_size=32768, memory_limit=1024 ** 3)
+    assert result == str(output)
+
+    with tarfile.open(output, 'r:xz') as tar:
+        assert tar.extractfile("src/data.bin").read() == mixed_data
+        assert tar.extractfile("src/small.txt").read() == b"SMALL"
+
+# TEST FOR PARALLEL TAR.XZ WITH NONEXISTENT FILE
+def test_compress_tar_xz_parallel_nonexistent(temp_dir):
+    output = Path(temp_dir) / "archive.tar.xz"
+    with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"):
+        _compress_tar_xz([str(Path(temp_dir) / "missing.txt")], str(output), jobs=2)
+
+# TEST FOR PARALLEL TAR.XZ AND TAR.GZ THROUGH autozip_compress WITH SIZE STRINGS
+@pytest.mark.parametrize("name", ["archive.tar.xz", "archive.tar.gz"])
+def test_autozip_compress_block_options(temp_dir, mixed_data, name):
+    source = Path(temp_dir) / "data.bin"
+    source.write_bytes(mixed_data)
+    output = Path(temp_dir) / name
+    assert autozip_compress([str(source)], str(output), jobs=2, block_size="16K", memory_limit="1G") == str(output)
+    with tarfile.open(output) as tar: assert tar.extractfile("data.bin").read() == mixed_data
+
+# TEST FOR INVALID SIZE THROUGH autozip_compress
+def test_autozip_compress_invalid_block_size(temp_dir, mixed_data):
+    source = Path(temp_dir) / "data.bin"
+    source.write_bytes(mixed_data)
+    with pytest.raises(ValueError, match="INVALID SIZE"):
+        autozip_compress([str(source)], str(Path(temp_dir) / "a.tar.xz"), block_size="big")
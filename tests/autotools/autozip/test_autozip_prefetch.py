@@ -0,0 +1,130 @@
+import io
+import os
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip import prefetch as prefetch_module
+from autotools.autozip.core import autozip_compress
+from autotools.autozip.prefetch import prefetch
+from autotools.autozip.walker import SourceWalker
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    (root / "sub").mkdir(parents=True)
+    for i in range(10): (root / f"f{i}.txt").write_text(f"FILE {i}\n" * 100)
+    (root / "sub" / "big.bin").write_bytes(os.urandom(prefetch_module.PREFETCH_MAX_FILE_SIZE + 1))
+    (root / "sub" / "copy.txt").write_text("FILE 0\n" * 100)
+    (root / "link").symlink_to("f0.txt")
+    return root
+
+# HELPER FUNCTIONS
+
+class FakeStdout:
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+def counted(entries, consumed):
+    for entry in entries:
+        consumed.append(entry[1])
+        yield entry
+
+def tar_members(path):
+    with tarfile.open(path) as tar:
+        return [(m.name, m.type, m.linkname, tar.extractfile(m).read() if m.isreg() else None) for m in tar]
+
+# TESTS FOR THE PREFETCH PIPELINE
+
+# TEST FOR ENTRIES COMING BACK IN ORDER, WITH CONTENT ONLY FOR SMALL REGULAR FILES
+def test_prefetch_order_and_data(source_dir):
+    entries = list(SourceWalker().entries([str(source_dir)], 'tar'))
+    results = list(prefetch(entries, depth=4))
+    assert [(path, name) for path, name, _ in results] == entries
+
+    data = {name: content for _, name, content in results}
+    assert data["data"] is None and data["data/sub"] is None
+    assert data["data/link"] is None and data["data/sub/big.bin"] is None
+    assert data["data/f3.txt"] == (source_dir / "f3.txt").read_bytes()
+
+# TEST FOR ZIP-STYLE SYMLINK FOLLOWING AND THE wanted PREDICATE
+def test_prefetch_follow_symlinks_and_wanted(source_dir):
+    entries = list(SourceWalker().files([str(source_dir)], 'zip'))
+    data = {name: content for _, name, content in prefetch(entries, follow_symlinks=True, wanted=lambda name: name != "f1.txt")}
+    assert data["link"] == data["f0.txt"] == (source_dir / "f0.txt").read_bytes()
+    assert data["f1.txt"] is None
+
+# TEST FOR THE DEPTH AND MEMORY BOUNDS ON WHAT IS READ AHEAD OF THE WRITER
+@pytest.mark.parametrize("depth, memory_limit, ahead", [(3, 1024 * 1024, 3), (64, 2000, 2)])
+def test_prefetch_bounds(source_dir, depth, memory_limit, ahead):
+    consumed = []
+    entries = [(source_dir / f"f{i}.txt", f"f{i}.txt") for i in range(10)]
+    results = prefetch(counted(entries, consumed), depth=depth, memory_limit=memory_limit)
+    next(results)
+    assert len(consumed) == ahead + 1
+    results.close()
+
+# TEST FOR A FILE LARGER THAN THE MEMORY BUDGET BEING LEFT TO THE WRITER
+def test_prefetch_small_budget(source_dir):
+    results = list(prefetch([(source_dir / "f0.txt", "f0.txt")], memory_limit=100))
+    assert results == [(source_dir / "f0.txt", "f0.txt", None)]
+
+# TEST FOR A READ ERROR SURFACING WHEN THE WRITER REACHES THE FILE
+def test_prefetch_read_error(source_dir):
+    entries = [(source_dir / "sub", "sub"), (source_dir / "f0.txt", "f0.txt")]
+    results = prefetch(entries)
+    with patch.object(prefetch_module, 'open', side_effect=PermissionError("DENIED"), create=True):
+        assert next(results)[2] is None
+        with pytest.raises(PermissionError, match="DENIED"): next(results)
+
+# TEST FOR PENDING READS BEING CANCELLED WHEN THE WRITER STOPS EARLY
+def test_prefetch_early_close(source_dir):
+    entries = [(source_dir / "f0.txt", "f0.txt"), (source_dir / "sub", "sub")] + [(source_dir / f"f{i}.txt", f"f{i}.txt") for i in range(10)]
+    results = prefetch(entries, depth=8)
+    assert next(results)[2] == (source_dir / "f0.txt").read_bytes()
+    results.close()
+
+# TESTS FOR autozip_compress WITH PREFETCHING
+
+# TEST FOR PREFETCHED ARCHIVES MATCHING THE UNPREFETCHED ONES IN EVERY FORMAT
+@pytest.mark.parametrize("name", ["a.tar", "a.tar.gz", "a.tar.bz2", "a.tar.xz"])
+def test_autozip_compress_prefetch_tar(temp_dir, source_dir, name):
+    plain = autozip_compress([str(source_dir)], str(Path(temp_dir) / "plain" / name))
+    prefetched = autozip_compress([str(source_dir)], str(Path(temp_dir) / name), prefetch_depth=4, prefetch_memory="1M")
+    assert tar_members(prefetched) == tar_members(plain)
+
+def test_autozip_compress_prefetch_zip(temp_dir, source_dir):
+    result = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"), prefetch_depth=4)
+    with zipfile.ZipFile(result) as zipf:
+        assert zipf.read("link") == zipf.read("f0.txt") == (source_dir / "f0.txt").read_bytes()
+        assert zipf.read("sub/big.bin") == (source_dir / "sub" / "big.bin").read_bytes()
+        assert zipf.getinfo("f1.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.getinfo("sub/big.bin").compress_type == zipfile.ZIP_STORED
+
+# TEST FOR DEDUP AND INCREMENTAL RUNS ONLY PREFETCHING THE FILES THEY STORE
+def test_autozip_compress_prefetch_filters(temp_dir, source_dir):
+    read = []
+    real_read = prefetch_module._read_file
+    with patch.object(prefetch_module, '_read_file', side_effect=lambda path: read.append(Path(path).name) or real_read(path)):
+        full = autozip_compress([str(source_dir)], str(Path(temp_dir) / "full.tar"), manifest=True, dedup=True, prefetch_depth=4)
+        assert "copy.txt" not in read and "f0.txt" in read
+        (source_dir / "f5.txt").write_text("CHANGED")
+        read.clear()
+        autozip_compress([str(source_dir)], str(Path(temp_dir) / "incr.tar.gz"), incremental=f"{full}.manifest.json", prefetch_depth=4)
+    assert read == ["f5.txt"]
+
+    members = {name: (member_type, linkname) for name, member_type, linkname, _ in tar_members(full)}
+    assert members["data/sub/copy.txt"] == (tarfile.LNKTYPE, "data/f0.txt")
+
+# TEST FOR SHARDED AND STREAMED ARCHIVES WITH PREFETCHING, AND AN INVALID DEPTH
+def test_autozip_compress_prefetch_other_paths(temp_dir, source_dir):
+    index_path = autozip_compress([str(source_dir)], str(Path(temp_dir) / "s.tar"), shards=2, prefetch_depth=2)
+    assert Path(index_path).is_file()
+    stdout = FakeStdout()
+    with patch('autotools.autozip.core.sys.stdout', stdout): autozip_compress([str(source_dir / "f0.txt")], "-", prefetch_depth=2)
+    assert b"FILE 0" in stdout.buffer.getvalue()
+    with pytest.raises(ValueError, match="PREFETCH DEPTH CANNOT BE NEGATIVE"):
+        autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"), prefetch_depth=-1)
@@ -0,0 +1,124 @@
+import io
+import os
+import sys
+import pytest
+from pathlib import Path
+from autotools.autozip.core import autozip_compress
+from autotools.autozip.progress import ProgressTracker, scan_totals
+from autotools.autozip.walker import SourceWalker
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    (root / "logs").mkdir(parents=True)
+    for i in range(20): (root / "logs" / f"app{i}.log").write_text(f"LINE {i}\n" * 500)
+    (root / "blob.bin").write_bytes(os.urandom(50000))
+    (root / "latest").symlink_to("blob.bin")
+    return root
+
+# HELPER FUNCTIONS
+
+def compress(source_dir, output, **options):
+    snapshots = []
+    output = output if isinstance(output, list) else str(output)
+    result = autozip_compress([str(source_dir)], output, progress=snapshots.append, progress_interval=0.001, **options)
+    return result, snapshots
+
+def data_bytes(source_dir):
+    return sum(path.stat().st_size for path in Path(source_dir).rglob("*") if path.is_file() and not path.is_symlink())
+
+# TESTS FOR SNAPSHOTS
+
+# TEST FOR THE FINAL SNAPSHOT OF EVERY FORMAT: ALL ENTRIES DONE, OUTPUT SIZE AND RATIO (ZIP FOLLOWS THE SYMLINK, TAR STORES IT)
+@pytest.mark.parametrize("archive_format, files, followed", [("zip", 22, True), ("tar", 24, False), ("tar.gz", 24, False),
+                                                              ("tar.bz2", 24, False), ("tar.xz", 24, False)])
+def test_progress_final_snapshot(temp_dir, source_dir, archive_format, files, followed):
+    result, snapshots = compress(source_dir, Path(temp_dir) / f"out.{archive_format}")
+    final = snapshots[-1]
+    expected_in = data_bytes(source_dir) + (50000 if followed else 0)
+    assert final['done'] and all(not snapshot['done'] for snapshot in snapshots[:-1])
+    assert (final['files'], final['total_files'], final['bytes_in'], final['total_bytes']) == (files, files, expected_in, expected_in)
+    assert final['bytes_out'] == Path(result).stat().st_size and final['ratio'] == round(final['bytes_out'] / expected_in, 4)
+    assert (final['percent'], final['eta'], final['current']) == (100.0, 0, None)
+
+# TEST FOR SNAPSHOTS TAKEN WHILE WRITING (COUNTERS NEVER GO BACKWARDS)
+def test_progress_intermediate_snapshots(temp_dir, source_dir):
+    for i in range(300): (source_dir / "logs" / f"more{i}.log").write_text(f"MORE {i}\n" * 200)
+    _, snapshots = compress(source_dir, Path(temp_dir) / "out.tar.xz", compression_level=9)
+    assert len(snapshots) > 1
+    counts = [snapshot['files'] for snapshot in snapshots]
+    assert counts == sorted(counts) and snapshots[0]['total_files'] == counts[-1]
+
+# TEST FOR A STREAMED ARCHIVE (OUTPUT COUNTED AS IT IS WRITTEN TO STDOUT)
+def test_progress_stdout(source_dir, monkeypatch):
+    buffer = io.BytesIO()
+    monkeypatch.setattr(sys, 'stdout', io.TextIOWrapper(buffer))
+    _, snapshots = compress(source_dir, "-", archive_format="tar.gz")
+    assert snapshots[-1]['bytes_out'] == len(buffer.getvalue()) > 0
+
+# TEST FOR SHARDS (TOTALS FROM THE PARTITION, OUTPUT SUMMED OVER THE SHARD FILES)
+def test_progress_shards(temp_dir, source_dir):
+    report = {}
+    _, snapshots = compress(source_dir, Path(temp_dir) / "out.tar.gz", shards=3, report=report)
+    final = snapshots[-1]
+    assert final['files'] == final['total_files'] == 24
+    assert final['bytes_out'] == sum(Path(shard).stat().st_size for shard in report['shards'])
+
+# TEST FOR SEVERAL OUTPUTS AND A CHECKSUM LIST WRITTEN FROM ONE WALK
+def test_progress_fanout(temp_dir, source_dir):
+    outputs = [str(Path(temp_dir) / "out.zip"), str(Path(temp_dir) / "out.tar")]
+    _, snapshots = compress(source_dir, outputs, checksums=str(Path(temp_dir) / "SUMS"))
+    final = snapshots[-1]
+    assert final['files'] == final['total_files'] == 24
+    assert final['bytes_out'] == sum(Path(path).stat().st_size for path in outputs + [str(Path(temp_dir) / "SUMS")])
+
+# TEST FOR APPEND AND UPDATE (EVERY SOURCE ENTRY IS COUNTED, ADDED OR NOT)
+@pytest.mark.parametrize("archive_format", ["zip", "tar"])
+def test_progress_update(temp_dir, source_dir, archive_format):
+    output = Path(temp_dir) / f"out.{archive_format}"
+    autozip_compress([str(source_dir)], str(output))
+    (source_dir / "new.log").write_text("NEW")
+    _, snapshots = compress(source_dir, output, update=True)
+    assert snapshots[-1]['files'] == snapshots[-1]['total_files'] and snapshots[-1]['bytes_out'] == output.stat().st_size
+
+# TEST FOR ONE-SHOT SOURCE ITERABLES (THE PRE-SCAN MUST NOT CONSUME THEM)
+def test_progress_one_shot_sources(temp_dir, source_dir):
+    snapshots = []
+    output = autozip_compress(iter([str(source_dir)]), str(Path(temp_dir) / "out.tar"), progress=snapshots.append)
+    assert snapshots[-1]['files'] == 24 and Path(output).stat().st_size > 0
+
+# TESTS FOR THE TRACKER
+
+# TEST FOR PERCENT, ETA, IDLE AND THE CURRENT ENTRY COMPUTED FROM THE COUNTERS
+def test_tracker_snapshot(temp_dir, source_dir):
+    tracker = ProgressTracker(None)
+    tracker.expect(*scan_totals(SourceWalker().entries([str(source_dir)], 'tar'), 'tar'))
+    tracker.watch([Path(temp_dir) / "missing.tar"])
+    assert tracker.snapshot()['percent'] == 0.0 and tracker.snapshot()['ratio'] is None and tracker.snapshot()['bytes_out'] == 0
+
+    walker = tracker.track(SourceWalker())
+    entries = walker.entries([str(source_dir)], 'tar')
+    for _ in range(3): next(entries)
+    snapshot = tracker.snapshot()
+    assert snapshot['files'] == 2 and snapshot['current'] == "data/latest" and snapshot['idle'] >= 0
+    assert snapshot['eta'] is None or snapshot['eta'] >= 0
+    assert [entry[1] for entry in tracker.track(SourceWalker()).layouts([str(source_dir / "blob.bin")])] == ["blob.bin"]
+
+# TEST FOR A RUN WITHOUT FILE DATA (PERCENT FROM THE FILE COUNT) AND FOR A FAILED WRITE (NO FINAL SNAPSHOT)
+def test_tracker_empty_and_failed(temp_dir):
+    snapshots = []
+    tracker = ProgressTracker(snapshots.append, 0.001)
+    tracker.expect(2, 0)
+    tracker.advance(0)
+    assert tracker.snapshot()['percent'] == 50.0
+
+    with pytest.raises(RuntimeError):
+        with tracker: raise RuntimeError("FAILED")
+    assert not any(snapshot['done'] for snapshot in snapshots)
+
+    snapshots.clear()
+    with ProgressTracker(snapshots.append):
+        pass
+    assert snapshots[-1]['done'] and snapshots[-1]['percent'] == 100.0 and snapshots[-1]['total_files'] is None
@@ -0,0 +1,154 @@
+import os
+import gzip
+import json
+import pytest
+from pathlib import Path
+from autotools.autozip.core import autozip_compress, autozip_extract
+from autotools.autozip.shards import ShardWalker, load_shard_index, partition, shard_path_for, shard_paths
+from autotools.autozip.walker import SourceWalker
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    for i in range(4):
+        (root / f"part{i}").mkdir(parents=True)
+        for j in range(3): (root / f"part{i}" / f"f{j}.txt").write_text(f"PART {i} FILE {j}\n" * (1000 * (j + 1)))
+    (root / "part0" / "link").symlink_to("f0.txt")
+    return root
+
+# HELPER FUNCTIONS
+
+def tar_sizes(groups):
+    return [sum(size for _, _, size in group) for group in groups]
+
+# TESTS FOR PARTITIONING
+
+# TEST FOR N SHARDS OF ABOUT EQUAL SIZE, IN WALK ORDER, WITH DIRECTORIES KEPT NEXT TO THEIR FILES
+def test_partition_count(source_dir):
+    entries = list(SourceWalker().entries([str(source_dir)], 'tar'))
+    groups = partition(entries, 'tar', shards=4)
+    assert len(groups) == 4
+    assert [name for group in groups for _, name, _ in group] == [name for _, name in entries]
+    sizes = tar_sizes(groups)
+    assert max(sizes) - min(sizes) <= 30000
+    assert groups[1][0][1] == "data/part1" or groups[1][0][1].startswith("data/part0/")
+
+# TEST FOR A SIZE CAP (A FILE LARGER THAN THE CAP GETS A SHARD OF ITS OWN)
+def test_partition_size(source_dir):
+    (source_dir / "big.bin").write_bytes(os.urandom(200000))
+    entries = list(SourceWalker().files([str(source_dir)], 'zip'))
+    groups = partition(entries, 'zip', shard_size=60000)
+    assert all(size <= 60000 for size in tar_sizes(groups) if size != 200000)
+    assert 200000 in tar_sizes(groups)
+    assert any(name == "part0/link" for group in groups for _, name, size in group if size == 14000)
+
+# TEST FOR EMPTY SOURCES, ZERO-BYTE FILES AND MORE SHARDS THAN FILES
+def test_partition_edge_cases(temp_dir):
+    empty = Path(temp_dir) / "empty.txt"
+    empty.write_bytes(b"")
+    assert partition([], 'tar', shards=3) == []
+    assert len(partition([(empty, "a"), (empty, "b")], 'tar', shards=3)) == 1
+    one = Path(temp_dir) / "one.txt"
+    one.write_text("X")
+    assert len(partition([(one, "a"), (one, "b")], 'zip', shards=8)) == 2
+
+# TEST FOR SHARD NAMES
+@pytest.mark.parametrize("output, archive_format, expected", [
+    ("out/data.tar.gz", "tar.gz", "out/data-00003.tar.gz"),
+    ("data.TGZ", "tar.gz", "data-00003.TGZ"),
+    ("data.zip", "zip", "data-00003.zip"),
+    ("backup", "tar.xz", "backup-00003.tar.xz"),
+])
+def test_shard_path_for(output, archive_format, expected):
+    assert shard_path_for(output, 3, archive_format) == expected
+
+# TEST FOR PRE-WALKED ENTRIES STANDING IN FOR THE SOURCE WALK
+def test_shard_walker(source_dir):
+    walker = ShardWalker([(source_dir, "data", 0), (source_dir / "part0" / "f0.txt", "data/part0/f0.txt", 5)])
+    assert [name for _, name in walker.entries()] == ["data", "data/part0/f0.txt"]
+    assert [name for _, name in walker.files()] == ["data/part0/f0.txt"]
+
+# TESTS FOR SHARDED ARCHIVES
+
+# TEST FOR SHARDS, THE GLOBAL INDEX AND PARALLEL EXTRACTION IN EVERY FORMAT
+@pytest.mark.parametrize("name", ["set.zip", "set.tar", "set.tar.gz", "set.tar.bz2", "set.tar.xz"])
+def test_sharded_round_trip(temp_dir, source_dir, name):
+    report = {}
+    output = Path(temp_dir) / "out" / name
+    index_path = autozip_compress([str(source_dir)], str(output), shards=3, jobs=4, report=report)
+    assert index_path == f"{output}.shards.json" and len(report['shards']) == 3
+
+    index = load_shard_index(index_path)
+    assert [shard['path'] for shard in index['shards']] == [Path(path).name for path in report['shards']]
+    prefix, link_size = ("", 14000) if name.endswith(".zip") else ("data/", 0)
+    assert sum(shard['bytes'] for shard in index['shards']) == sum(f.stat().st_size for f in source_dir.rglob("*.txt")) + link_size
+    assert f"{prefix}part3/f2.txt" in index['members']
+
+    stats = autozip_extract(index_path, Path(temp_dir) / "restore", jobs=3)
+    assert stats['files'] == 12 + (1 if name.endswith(".zip") else 0)
+    restored = Path(temp_dir) / "restore" / ("" if name.endswith(".zip") else "data")
+    assert (restored / "part2" / "f1.txt").read_text() == (source_dir / "part2" / "f1.txt").read_text()
+
+# TEST FOR DIRECTORY TIMES RESTORED AFTER EVERY SHARD (LATER SHARDS WRITING INTO A DIRECTORY DO NOT CHANGE ITS TIME AGAIN)
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_sharded_directory_times(temp_dir, source_dir, jobs):
+    for directory in [source_dir, *source_dir.iterdir()]:
+        if directory.is_dir() and not directory.is_symlink(): os.utime(directory, (1_000_000_000, 1_000_000_000))
+    index_path = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar.gz"), shards=4)
+
+    restored = Path(temp_dir) / "restore" / "data"
+    autozip_extract(index_path, restored.parent, jobs=jobs)
+    assert {path.name: path.stat().st_mtime for path in [restored, *restored.iterdir()] if path.is_dir()} == \
+        {name: 1_000_000_000 for name in ["data", "part0", "part1", "part2", "part3"]}
+
+# TEST FOR INDEX OFFSETS POINTING AT THE MEMBER DATA
+def test_member_offsets(temp_dir, source_dir):
+    report = {}
+    autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar.gz"), shard_size="20K", report=report)
+    index = load_shard_index(f"{Path(temp_dir) / 'a.tar.gz'}.shards.json")
+    number, offset, size = index['members']["data/part1/f1.txt"]
+    with gzip.open(report['shards'][number]) as tar_stream: data = tar_stream.read()
+    assert data[offset:offset + size] == (source_dir / "part1" / "f1.txt").read_bytes()
+
+    report = {}
+    autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"), shards=3, report=report)
+    index = load_shard_index(f"{Path(temp_dir) / 'a.tar'}.shards.json")
+    for path in source_dir.rglob("*.txt"):
+        number, offset, size = index['members'][f"data/{path.relative_to(source_dir).as_posix()}"]
+        with open(report['shards'][number], 'rb') as f:
+            f.seek(offset)
+            assert f.read(size) == path.read_bytes()
+
+    autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"), shards=2)
+    index = load_shard_index(f"{Path(temp_dir) / 'a.zip'}.shards.json")
+    number, offset, _ = index['members']["part3/f2.txt"]
+    with open(Path(temp_dir) / f"a-{number:05d}.zip", 'rb') as f:
+        f.seek(offset)
+        assert f.read(4) == b"PK\x03\x04"
+
+# TEST FOR INVALID SHARDING OPTIONS
+@pytest.mark.parametrize("output, options, message", [
+    ("a.tar", {"shards": 2, "shard_size": "1G"}, "CANNOT BE COMBINED"),
+    ("a.tar", {"shards": 0}, "AT LEAST 1"),
+    ("a.tar", {"shard_size": "0"}, "SIZE MUST BE GREATER THAN 0"),
+    ("a.tar.gz", {"shards": 2, "index": True}, "SHARDED ARCHIVES NEED AN OUTPUT FILE"),
+    ("-", {"shards": 2}, "SHARDED ARCHIVES NEED AN OUTPUT FILE"),
+])
+def test_sharding_invalid(temp_dir, source_dir, output, options, message):
+    output = output if output == "-" else str(Path(temp_dir) / output)
+    with pytest.raises(ValueError, match=message): autozip_compress([str(source_dir)], output, **options)
+
+# TEST FOR MISSING, CORRUPT AND INCOMPLETE INDEXES
+def test_shard_index_errors(temp_dir, source_dir):
+    index_path = Path(temp_dir) / "a.tar.shards.json"
+    with pytest.raises(FileNotFoundError, match="SHARD INDEX NOT FOUND"): autozip_extract(index_path, temp_dir)
+    index_path.write_text("{")
+    with pytest.raises(ValueError, match="INVALID SHARD INDEX"): load_shard_index(index_path)
+    index_path.write_text(json.dumps({"version": 1, "shards": {}}))
+    with pytest.raises(ValueError, match="INVALID SHARD INDEX"): load_shard_index(index_path)
+
+    autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"), shards=2)
+    os.remove(Path(temp_dir) / "a-00001.tar")
+    with pytest.raises(FileNotFoundError, match="SHARD NOT FOUND"): shard_paths(index_path, load_shard_index(index_path))
@@ -0,0 +1,118 @@
+import io
+import os
+import shutil
+import tarfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from autotools.autozip import filelist as filelist_module
+from autotools.autozip.core import autozip_compress, _stream_tar, STDOUT
+from autotools.autozip.filelist import iter_file_list, open_file_list
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    root.mkdir()
+    (root / "a.txt").write_text("ALPHA " * 1000)
+    (root / "b.bin").write_bytes(os.urandom(300000))
+    return root
+
+# HELPER FUNCTIONS
+
+class FakeStdout:
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+def read_tar_names(data, mode):
+    with tarfile.open(fileobj=io.BytesIO(data), mode=mode) as tar: return sorted(tar.getnames())
+
+# TESTS FOR FILE LISTS
+
+# TEST FOR NEWLINE, CRLF AND NUL SEPARATED LISTS
+@pytest.mark.parametrize("data, expected", [
+    (b"a.txt\nsub dir/b.txt\n\nc.txt", ["a.txt", "sub dir/b.txt", "c.txt"]),
+    (b"a.txt\r\nb.txt\r\n", ["a.txt", "b.txt"]),
+    (b"a\nb.txt\0c.txt\0", ["a\nb.txt", "c.txt"]),
+    (b"", []),
+])
+def test_iter_file_list(data, expected):
+    assert list(iter_file_list(io.BytesIO(data))) == expected
+
+# TEST FOR ENTRIES SPANNING READ BLOCKS (LIST IS READ INCREMENTALLY)
+def test_iter_file_list_small_blocks(monkeypatch):
+    monkeypatch.setattr(filelist_module, '_READ_SIZE', 3)
+    names = [f"dir/file{i}.txt" for i in range(50)]
+    stream = io.BytesIO("\n".join(names).encode())
+    iterator = iter_file_list(stream)
+    assert next(iterator) == names[0]
+    assert stream.tell() < len(stream.getvalue())
+    assert [names[0]] + list(iterator) == names
+
+# TEST FOR UNDECODABLE BYTES (KEPT VIA SURROGATE ESCAPES LIKE os.fsdecode)
+def test_iter_file_list_raw_bytes():
+    assert list(iter_file_list(io.BytesIO(b"caf\xe9.txt\n"))) == [os.fsdecode(b"caf\xe9.txt")]
+
+# TEST FOR OPENING FILE LISTS
+def test_open_file_list(temp_dir):
+    path = Path(temp_dir) / "list.txt"
+    path.write_bytes(b"x\n")
+    with open_file_list(str(path)) as f: assert f.read() == b"x\n"
+
+    stdin = io.TextIOWrapper(io.BytesIO(b"y\n"))
+    with patch.object(filelist_module.sys, 'stdin', stdin):
+        with open_file_list("-") as f: assert f.read() == b"y\n"
+
+    with pytest.raises(FileNotFoundError, match="FILE LIST NOT FOUND"):
+        with open_file_list(str(Path(temp_dir) / "none.txt")): pass
+
+# TESTS FOR STREAMED TAR OUTPUT
+
+# TEST FOR EVERY TAR FORMAT ON A WRITE-ONLY STREAM
+@pytest.mark.parametrize("archive_format, mode, jobs", [
+    ("tar", "r:", 1), ("tar.gz", "r:gz", 1), ("tar.gz", "r:gz", 3), ("tar.bz2", "r:bz2", 1), ("tar.xz", "r:xz", 1), ("tar.xz", "r:xz", 2),
+])
+def test_stream_tar(source_dir, archive_format, mode, jobs):
+    stream = io.BytesIO()
+    assert _stream_tar(archive_format, [str(source_dir)], stream, jobs=jobs, block_size=65536) == STDOUT
+    assert read_tar_names(stream.getvalue(), mode) == ["data", "data/a.txt", "data/b.bin"]
+
+# TEST FOR GZIP STREAM HEADER (NO FILE NAME STORED)
+def test_stream_tar_gzip_header(source_dir):
+    stream = io.BytesIO()
+    _stream_tar("tar.gz", [str(source_dir)], stream)
+    assert stream.getvalue()[3] & 0x08 == 0
+
+# TEST FOR autozip_compress WRITING TO STDOUT (DEFAULT FORMAT IS TAR)
+@pytest.mark.parametrize("archive_format, mode", [(None, "r:"), ("tgz", "r:gz")])
+def test_autozip_compress_stdout(source_dir, archive_format, mode):
+    stdout = FakeStdout()
+    with patch('autotools.autozip.core.sys.stdout', stdout):
+        assert autozip_compress([str(source_dir)], "-", archive_format=archive_format) == "-"
+    assert read_tar_names(stdout.buffer.getvalue(), mode) == ["data", "data/a.txt", "data/b.bin"]
+
+# TEST FOR STDOUT WITH DEDUP (ONE-SHOT ITERABLE IS KEPT FOR THE SCAN)
+def test_autozip_compress_stdout_dedup(source_dir):
+    shutil.copy(source_dir / "b.bin", source_dir / "c.bin")
+    stdout = FakeStdout()
+    report = {}
+    with patch('autotools.autozip.core.sys.stdout', stdout):
+        autozip_compress(iter([str(source_dir)]), "-", dedup=True, report=report)
+    assert report['duplicates'] == 1
+    with tarfile.open(fileobj=io.BytesIO(stdout.buffer.getvalue())) as tar:
+        assert sum(m.islnk() for m in tar.getmembers()) == 1
+
+# TEST FOR UNSUPPORTED STDOUT COMBINATIONS
+@pytest.mark.parametrize("kwargs, message", [
+    ({'archive_format': 'zip'}, "CANNOT BE STREAMED"),
+    ({'manifest': True}, "MANIFESTS REQUIRE AN OUTPUT FILE"),
+    ({'incremental': 'base.json'}, "MANIFESTS REQUIRE AN OUTPUT FILE"),
+])
+def test_autozip_compress_stdout_errors(source_dir, kwargs, message):
+    with pytest.raises(ValueError, match=message): autozip_compress([str(source_dir)], "-", **kwargs)
+
+# TEST FOR ONE-SHOT ITERABLE SOURCES WITH A MANIFEST
+def test_autozip_compress_iterable_sources_manifest(temp_dir, source_dir):
+    output = autozip_compress((p for p in [str(source_dir)]), str(Path(temp_dir) / "a.tar"), manifest=True)
+    with tarfile.open(output) as tar: assert "data/b.bin" in tar.getnames()
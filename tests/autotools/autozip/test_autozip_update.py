@@ -0,0 +1,212 @@
+import io
+import os
+import tarfile
+import zipfile
+import pytest
+import subprocess
+from pathlib import Path
+from autotools.autozip.core import autozip_compress, autozip_extract
+from autotools.autozip.update import scan_tar_members
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "logs"
+    (root / "old").mkdir(parents=True)
+    for i in range(5): (root / "old" / f"app{i}.log").write_text(f"LOG {i}\n" * 2000)
+    (root / "current.log").write_text("CURRENT\n" * 100)
+    (root / "latest").symlink_to("current.log")
+    for path in root.rglob("*"): os.utime(path, (1700000000, 1700000000), follow_symlinks=False)
+    return root
+
+# HELPER FUNCTIONS
+
+def with_pipe(source_dir):
+    os.mkfifo(source_dir / "pipe")
+    return source_dir
+
+def touch(path, mtime=1800000000):
+    os.utime(path, (mtime, mtime))
+
+def extracted(archive, destination):
+    autozip_extract(archive, destination)
+    return {str(path.relative_to(destination)): path.read_bytes() for path in Path(destination).rglob("*") if path.is_file() and not path.is_symlink()}
+
+# TESTS FOR ZIP
+
+# TEST FOR APPEND ADDING ONLY NEW FILES, WITHOUT TOUCHING THE EXISTING BYTES
+def test_zip_append(temp_dir, source_dir):
+    output = Path(temp_dir) / "logs.zip"
+    autozip_compress([str(source_dir)], str(output))
+    with zipfile.ZipFile(output) as zipf: start_dir = zipf.start_dir
+    before = output.read_bytes()[:start_dir]
+
+    (source_dir / "new.log").write_text("NEW\n")
+    (source_dir / "current.log").write_text("REWRITTEN\n")
+    report = {}
+    assert autozip_compress([str(source_dir)], str(output), append=True, report=report) == str(output)
+    assert report == {'added': 1, 'replaced': 0, 'unchanged': 7}
+    assert output.read_bytes()[:start_dir] == before
+    with zipfile.ZipFile(output) as zipf:
+        assert zipf.read("new.log") == b"NEW\n" and zipf.read("current.log") == b"CURRENT\n" * 100
+
+# TEST FOR UPDATE REPLACING CHANGED FILES ONLY (SIZE, OR MTIME CONFIRMED BY THE CRC; THE SYMLINK FOLLOWS ITS CHANGED TARGET)
+def test_zip_update(temp_dir, source_dir):
+    output = Path(temp_dir) / "logs.zip"
+    autozip_compress([str(source_dir)], str(output))
+    size = output.stat().st_size
+
+    (source_dir / "current.log").write_text("CURRENT\n" * 101)
+    touch(source_dir / "old" / "app0.log")
+    (source_dir / "old" / "app1.log").write_text("LOG 9\n" * 2000)
+    report = {}
+    autozip_compress([str(source_dir)], str(output), update=True, report=report)
+    assert report == {'added': 0, 'replaced': 3, 'unchanged': 4}
+
+    with zipfile.ZipFile(output) as zipf:
+        assert zipf.testzip() is None
+        assert sorted(zipf.namelist()) == sorted(set(zipf.namelist()))
+        assert zipf.read("current.log") == b"CURRENT\n" * 101 and zipf.read("old/app1.log") == b"LOG 9\n" * 2000
+    assert output.stat().st_size < size + 400
+
+# TEST FOR APPENDING TO A ZIP THAT DOES NOT EXIST YET
+def test_zip_append_new_archive(temp_dir, source_dir):
+    report = {}
+    output = autozip_compress([str(source_dir / "current.log")], str(Path(temp_dir) / "new" / "a.zip"), append=True, report=report)
+    assert report['added'] == 1
+    with zipfile.ZipFile(output) as zipf: assert zipf.namelist() == ["current.log"]
+
+# TEST FOR A SOURCE READ ERROR LEAVING THE ARCHIVE AS IT WAS (NO TRUNCATED MEMBER, NO DROPPED ONE), AND A NEW ARCHIVE REMOVED
+def test_zip_update_read_error(temp_dir, source_dir, fail_reads):
+    output = Path(temp_dir) / "logs.zip"
+    autozip_compress([str(source_dir)], str(output))
+    before = output.read_bytes()
+
+    (source_dir / "current.log").write_text("CURRENT\n" * 101)
+    (source_dir / "new.log").write_text("NEW\n" * 10000)
+    with fail_reads("new.log"):
+        with pytest.raises(OSError, match="Input/output error"): autozip_compress([str(source_dir)], str(output), update=True)
+        created = Path(temp_dir) / "new.zip"
+        with pytest.raises(OSError, match="Input/output error"): autozip_compress([str(source_dir)], str(created), append=True)
+
+    assert output.read_bytes() == before and not created.exists()
+    with zipfile.ZipFile(output) as zipf: assert zipf.testzip() is None and zipf.read("current.log") == b"CURRENT\n" * 100
+
+# TESTS FOR TAR
+
+# TEST FOR APPEND WRITING OVER THE END-OF-ARCHIVE BLOCKS ONLY
+def test_tar_append(temp_dir, source_dir):
+    output = Path(temp_dir) / "logs.tar"
+    autozip_compress([str(with_pipe(source_dir))], str(output))
+    with tarfile.open(output) as tar:
+        tar.getmembers()
+        end = tar.offset
+    before = output.read_bytes()[:end]
+
+    (source_dir / "old" / "new.log").write_text("NEW\n")
+    (source_dir / "current.log").write_text("REWRITTEN\n")
+    report = {}
+    autozip_compress([str(source_dir)], str(output), append=True, report=report)
+    assert report == {'added': 1, 'replaced': 0, 'unchanged': 10}
+    assert output.read_bytes()[:end] == before
+    with tarfile.open(output) as tar: assert tar.getnames()[-1] == "logs/old/new.log"
+
+# TEST FOR A SOURCE READ ERROR LEAVING THE ARCHIVE AS IT WAS (GNU tar STILL LISTS IT), AND A NEW ARCHIVE REMOVED
+def test_tar_append_read_error(temp_dir, source_dir, fail_reads):
+    output = Path(temp_dir) / "logs.tar"
+    autozip_compress([str(source_dir)], str(output))
+    before = output.read_bytes()
+
+    (source_dir / "old" / "new.log").write_text("NEW\n" * 10000)
+    with fail_reads("new.log"):
+        with pytest.raises(OSError, match="Input/output error"): autozip_compress([str(source_dir)], str(output), append=True)
+        created = Path(temp_dir) / "new.tar"
+        with pytest.raises(OSError, match="Input/output error"): autozip_compress([str(source_dir)], str(created), append=True)
+
+    assert output.read_bytes() == before and not created.exists()
+    listing = subprocess.run(["tar", "-tf", str(output)], capture_output=True, text=True)
+    assert listing.returncode == 0 and "logs/old/new.log" not in listing.stdout.splitlines()
+
+# TEST FOR UPDATE APPENDING NEW COPIES OF CHANGED FILES AND LINKS (THE LAST COPY WINS ON EXTRACTION)
+def test_tar_update(temp_dir, source_dir):
+    output = Path(temp_dir) / "logs.tar"
+    autozip_compress([str(with_pipe(source_dir))], str(output))
+
+    (source_dir / "current.log").write_text("CURRENT\n" * 101)
+    touch(source_dir / "old" / "app0.log")
+    (source_dir / "old" / "app1.log").write_text("LOG 9\n" * 2000)
+    (source_dir / "latest").unlink()
+    (source_dir / "latest").symlink_to("old/app2.log")
+    touch(source_dir / "old")
+    report = {}
+    autozip_compress([str(source_dir)], str(output), update=True, report=report)
+    assert report == {'added': 0, 'replaced': 3, 'unchanged': 7}
+
+    with tarfile.open(output) as tar: names = tar.getnames()
+    assert names[-3:] == ["logs/current.log", "logs/latest", "logs/old/app1.log"]
+    files = extracted(output, Path(temp_dir) / "out")
+    assert files["logs/current.log"] == b"CURRENT\n" * 101 and files["logs/old/app1.log"] == b"LOG 9\n" * 2000
+    assert os.readlink(Path(temp_dir) / "out" / "logs" / "latest") == "old/app2.log"
+
+# TEST FOR DEDUP HARDLINKS AND FILES TURNED INTO OTHER TYPES
+def test_tar_update_links(temp_dir, source_dir):
+    (source_dir / "copy.log").write_text("LOG 0\n" * 2000)
+    os.utime(source_dir / "copy.log", (1700000000, 1700000000))
+    output = Path(temp_dir) / "logs.tar"
+    autozip_compress([str(source_dir)], str(output), dedup=True)
+
+    report = {}
+    autozip_compress([str(source_dir)], str(output), update=True, report=report)
+    assert report['replaced'] == 0
+
+    (source_dir / "current.log").unlink()
+    (source_dir / "current.log").symlink_to("copy.log")
+    (source_dir / "latest").unlink()
+    (source_dir / "latest").write_text("NOW A FILE")
+    autozip_compress([str(source_dir)], str(output), update=True, report=report)
+    assert report['replaced'] == 2
+
+# TEST FOR THE HEADER SCAN MATCHING tarfile ON GNU, USTAR AND PAX ARCHIVES (LONG NAMES, LONG LINKS, GLOBAL HEADERS, DUPLICATES)
+@pytest.mark.parametrize("tar_format", [tarfile.GNU_FORMAT, tarfile.USTAR_FORMAT, tarfile.PAX_FORMAT])
+def test_scan_tar_members(temp_dir, tar_format):
+    output = Path(temp_dir) / "a.tar"
+    long_dir = "d" * 120 if tar_format == tarfile.USTAR_FORMAT else "d" * 200
+    target = "a.txt" if tar_format == tarfile.USTAR_FORMAT else f"{long_dir}/b.txt"
+    with tarfile.open(output, 'w', format=tar_format, pax_headers={'comment': 'GLOBAL'} if tar_format == tarfile.PAX_FORMAT else None) as tar:
+        for name, data in [("a.txt", b"A" * 700), (f"{long_dir}/b.txt", b"B"), ("a.txt", b"AGAIN")]:
+            info = tarfile.TarInfo(name)
+            info.size, info.mtime = len(data), 1700000000
+            tar.addfile(info, io.BytesIO(data))
+        for name, member_type in [(long_dir, tarfile.DIRTYPE), ("link", tarfile.SYMTYPE)]:
+            info = tarfile.TarInfo(name)
+            info.type, info.linkname = member_type, target
+            tar.addfile(info)
+
+    with open(output, 'rb') as archive: members, end = scan_tar_members(archive)
+    with tarfile.open(output) as tar:
+        expected = {member.name: member for member in tar.getmembers()}
+        tar_end = tar.offset
+    assert end == tar_end and members.keys() == expected.keys()
+    for name, member in members.items():
+        assert (member.type, member.size, member.mtime, member.linkname, member.offset_data) == \
+            (expected[name].type, expected[name].size, expected[name].mtime, expected[name].linkname, expected[name].offset_data)
+
+# TEST FOR A CORRUPT HEADER
+def test_scan_tar_members_invalid(temp_dir, source_dir):
+    output = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"))
+    with open(output, 'r+b') as f: f.write(b"X")
+    with pytest.raises(ValueError, match="INVALID TAR HEADER AT OFFSET 0"): autozip_compress([str(source_dir)], output, update=True)
+
+# TESTS FOR INVALID OPTIONS
+
+@pytest.mark.parametrize("output, options, message", [
+    ("a.tar", {"append": True, "update": True}, "CANNOT BE COMBINED"),
+    ("a.tar.gz", {"append": True}, "NEED A .tar OR .zip OUTPUT FILE"),
+    ("a.zip", {"update": True, "manifest": True}, "NEED A .tar OR .zip OUTPUT FILE"),
+    ("-", {"append": True}, "NEED A .tar OR .zip OUTPUT FILE"),
+    ("a.zip", {"update": True, "checksums": "SUMS"}, "NEED A SINGLE OUTPUT"),
+])
+def test_append_update_invalid(temp_dir, source_dir, output, options, message):
+    output = output if output == "-" else str(Path(temp_dir) / output)
+    with pytest.raises(ValueError, match=message): autozip_compress([str(source_dir)], output, **options)
@@ -0,0 +1,222 @@
+import io
+import os
+import json
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from autotools.autozip.core import autozip_compress, autozip_verify
+from autotools.autozip.manifest import manifest_path_for
+from autotools.autozip.verify import _run_ordered
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    (root / "sub").mkdir(parents=True)
+    for i in range(6): (root / f"f{i}.txt").write_text(f"FILE {i}\n" * 2000)
+    (root / "sub" / "photo.jpg").write_bytes(b"\xff\xd8\xff" + bytes(range(256)) * 40)
+    (root / "sub" / "copy.txt").write_text("FILE 0\n" * 2000)
+    (root / "link").symlink_to("f1.txt")
+    return root
+
+# HELPER FUNCTIONS
+
+def statuses(archive, **options):
+    return {result['name']: result['status'] for result in autozip_verify(archive, **options)}
+
+def flip_byte(path, offset):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xff]))
+
+def tar_data_offset(path, name):
+    with tarfile.open(path) as tar: return tar.getmember(name).offset_data
+
+def add_tar_member(tar, name, data=b"", **fields):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    for field, value in fields.items(): setattr(info, field, value)
+    tar.addfile(info, io.BytesIO(data))
+
+# TESTS FOR INTACT ARCHIVES
+
+# TEST FOR EVERY FORMAT VERIFYING CLEAN, SEQUENTIALLY AND IN PARALLEL
+@pytest.mark.parametrize("name", ["a.zip", "a.tar", "a.tar.gz", "a.tar.bz2", "a.tar.xz"])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_verify_clean(temp_dir, source_dir, name, jobs):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / name))
+    results = list(autozip_verify(archive, jobs=jobs))
+    assert {result['status'] for result in results} == {'ok'}
+    assert all(result['sha256'] is None for result in results)
+    prefix = "" if name == "a.zip" else "data/"
+    assert {result['name'] for result in results} >= {f"{prefix}f0.txt", f"{prefix}sub/photo.jpg", f"{prefix}link"}
+    assert next(result for result in results if result['name'] == f"{prefix}f2.txt")['size'] == len("FILE 2\n") * 2000
+
+# TEST FOR THE SIDECAR MANIFEST BEING USED BY DEFAULT, AND DEDUP COPIES CHECKED THROUGH THEIR STORED MEMBER
+@pytest.mark.parametrize("name", ["a.zip", "a.tar", "a.tar.gz"])
+def test_verify_manifest(temp_dir, source_dir, name):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / name), manifest=True, dedup=True)
+    results = {result['name']: result for result in autozip_verify(archive, jobs=2)}
+    prefix = "" if name == "a.zip" else "data/"
+    assert {result['status'] for result in results.values()} == {'ok'}
+    assert results[f"{prefix}sub/copy.txt"]['sha256'] == results[f"{prefix}f0.txt"]['sha256'] is not None
+
+    manifest = json.loads(Path(manifest_path_for(archive)).read_text())
+    manifest['files'][f"{prefix}f3.txt"][3] = "0" * 64
+    manifest['files'][f"{prefix}sub/copy.txt"][3] = "0" * 64
+    manifest['files'][f"{prefix}gone.txt"] = [1, 1, 1, "0" * 64]
+    Path(manifest_path_for(archive)).write_text(json.dumps(manifest))
+    results = list(autozip_verify(archive))
+    failed = {result['name']: (result['status'], result['error']) for result in results if result['status'] != 'ok'}
+    assert failed == {f"{prefix}f3.txt": ('mismatch', "CONTENT DIFFERS FROM THE MANIFEST"),
+                      f"{prefix}sub/copy.txt": ('mismatch', "CONTENT DIFFERS FROM THE MANIFEST"),
+                      f"{prefix}gone.txt": ('missing', "MISSING FROM THE ARCHIVE")}
+    assert results[-1]['name'] == f"{prefix}gone.txt"
+
+# TEST FOR AN INCREMENTAL ARCHIVE NOT REPORTING THE UNCHANGED FILES OF ITS OWN MANIFEST AS MISSING (A FULL MANIFEST DOES)
+def test_verify_incremental_manifest(temp_dir, source_dir):
+    full = autozip_compress([str(source_dir)], str(Path(temp_dir) / "full.zip"), manifest=True)
+    (source_dir / "f4.txt").write_text("CHANGED")
+    incremental = autozip_compress([str(source_dir)], str(Path(temp_dir) / "incr.zip"), incremental=manifest_path_for(full))
+    assert statuses(incremental) == {"f4.txt": 'ok'}
+    against_full = statuses(incremental, manifest=manifest_path_for(full))
+    assert against_full.pop("f4.txt") == 'mismatch' and set(against_full.values()) == {'missing'}
+
+# TEST FOR EVERY SHARD OF A SHARD INDEX BEING VERIFIED
+def test_verify_shards(temp_dir, source_dir):
+    index = autozip_compress([str(source_dir)], str(Path(temp_dir) / "s.zip"), shards=3)
+    assert set(statuses(index).values()) == {'ok'} and len(statuses(index)) == 9
+    with pytest.raises(ValueError, match="SHARDED ARCHIVES HAVE NO MANIFEST"): autozip_verify(index, manifest="x.json")
+
+# TESTS FOR DAMAGED ARCHIVES
+
+# TEST FOR DAMAGED DEFLATED AND STORED ZIP MEMBERS, REPORTED WITHOUT STOPPING THE OTHER CHECKS
+def test_verify_zip_corruption(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.zip"), dedup=True)
+    with zipfile.ZipFile(archive) as zipf: infos = {info.filename: info for info in zipf.infolist()}
+    assert infos["sub/photo.jpg"].compress_type == zipfile.ZIP_STORED
+    flip_byte(archive, infos["sub/photo.jpg"].header_offset + 100)
+    flip_byte(archive, infos["f0.txt"].header_offset + 60)
+    flip_byte(archive, infos["f2.txt"].header_offset + 1)
+
+    results = {result['name']: result for result in autozip_verify(archive, jobs=2)}
+    assert results["sub/photo.jpg"]['error'] == "BAD CRC FOR ZIP MEMBER: sub/photo.jpg"
+    assert results["f0.txt"]['status'] == 'corrupt'
+    assert results["sub/copy.txt"]['error'] == "LINKED MEMBER IS CORRUPT: f0.txt"
+    assert results["f2.txt"]['error'] == "BAD LOCAL HEADER FOR ZIP MEMBER: f2.txt"
+    assert results["f1.txt"]['status'] == results["f5.txt"]['status'] == 'ok'
+
+# TEST FOR ZIP METHODS READ THROUGH zipfile (BZIP2), A SIZE MISMATCH AND A DAMAGED DEDUP MANIFEST
+def test_verify_zip_other_methods(temp_dir):
+    archive = Path(temp_dir) / "a.zip"
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_BZIP2) as zipf:
+        zipf.writestr("a.txt", "A" * 5000)
+        zipf.writestr("b.txt", "B" * 5000)
+        zipf.writestr(".autozip-dedup.json", "{")
+    with zipfile.ZipFile(archive) as zipf: infos = zipf.infolist()
+    flip_byte(archive, infos[1].header_offset + 50)
+    assert statuses(archive) == {"a.txt": 'ok', "b.txt": 'corrupt', ".autozip-dedup.json": 'ok'}
+
+    with zipfile.ZipFile(archive, 'w') as zipf: zipf.writestr("a.txt", "A" * 10)
+    data = bytearray(archive.read_bytes())
+    data[data.rindex(b"PK\x01\x02") + 24] = 11
+    archive.write_bytes(bytes(data))
+    assert [result['error'] for result in autozip_verify(archive)] == ["SIZE IS 10, EXPECTED 11"]
+
+# TEST FOR A DAMAGED TAR HEADER, DATA CUT SHORT AND A HARDLINK TO A MISSING MEMBER
+def test_verify_tar_corruption(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"))
+    offset = tar_data_offset(archive, "data/f3.txt") - tarfile.BLOCKSIZE
+    flip_byte(archive, offset + 10)
+    results = list(autozip_verify(archive))
+    assert results[-1] == {'name': None, 'size': None, 'status': 'corrupt', 'sha256': None, 'error': f"INVALID TAR HEADER AT OFFSET {offset}"}
+
+    flip_byte(archive, offset + 10)
+    with open(archive, 'r+b') as f: f.truncate(tar_data_offset(archive, "data/f3.txt") + 100)
+    assert statuses(archive)["data/f3.txt"] == 'corrupt'
+
+    archive = Path(temp_dir) / "links.tar"
+    with tarfile.open(archive, 'w') as tar:
+        add_tar_member(tar, "a.txt", b"A")
+        add_tar_member(tar, "b.txt", type=tarfile.LNKTYPE, linkname="missing.txt")
+        add_tar_member(tar, "fifo", type=tarfile.FIFOTYPE)
+    results = {result['name']: result for result in autozip_verify(archive)}
+    assert results["b.txt"]['error'] == "LINKED MEMBER IS MISSING: missing.txt" and results["fifo"]['status'] == 'ok'
+
+# TEST FOR A ZEROED HEADER ENDING THE TAR EARLY
+def test_verify_tar_zeroed_header(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"))
+    offset = tar_data_offset(archive, "data/f3.txt") - tarfile.BLOCKSIZE
+    with tarfile.open(archive) as tar: pax = [m for m in tar.getmembers() if m.offset_data == offset + tarfile.BLOCKSIZE][0].offset
+    with open(archive, 'r+b') as f:
+        f.seek(pax)
+        f.write(bytes(tarfile.BLOCKSIZE))
+    results = list(autozip_verify(archive))
+    assert results[-1]['error'] == f"UNEXPECTED DATA AFTER THE LAST MEMBER AT OFFSET {pax}"
+
+# TEST FOR A DAMAGED OR TRUNCATED COMPRESSED TAR: THE DAMAGED MEMBER IS REPORTED AND THE STREAM STOPS THERE
+@pytest.mark.parametrize("name", ["a.tar.gz", "a.tar.bz2", "a.tar.xz"])
+def test_verify_compressed_tar_corruption(temp_dir, source_dir, name):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / name))
+    size = Path(archive).stat().st_size
+    flip_byte(archive, size // 2)
+    results = list(autozip_verify(archive))
+    assert results[-1]['status'] == 'corrupt' and all(result['status'] == 'ok' for result in results[:-1])
+
+    flip_byte(archive, size // 2)
+    with open(archive, 'r+b') as f: f.truncate(size - 8)
+    results = list(autozip_verify(archive))
+    assert results[-1]['name'] is None and results[-1]['status'] == 'corrupt'
+
+# TEST FOR A COMPRESSED TAR CUT SHORT INSIDE A LARGE MEMBER BEING REPORTED AGAINST THAT MEMBER
+def test_verify_compressed_tar_member_data(temp_dir):
+    (Path(temp_dir) / "big").mkdir()
+    (Path(temp_dir) / "big" / "random.bin").write_bytes(os.urandom(4 * 1024 * 1024))
+    archive = autozip_compress([str(Path(temp_dir) / "big")], str(Path(temp_dir) / "a.tar.gz"), compression_level=1)
+    with open(archive, 'r+b') as f: f.truncate(Path(archive).stat().st_size // 2)
+    results = list(autozip_verify(archive))
+    assert results[-1]['name'] == "big/random.bin" and results[-1]['status'] == 'corrupt'
+
+# TEST FOR A VERIFICATION STOPPED EARLY BY ITS CONSUMER
+@pytest.mark.parametrize("name", ["a.zip", "a.tar", "a.tar.gz"])
+def test_verify_early_close(temp_dir, source_dir, name):
+    results = autozip_verify(autozip_compress([str(source_dir)], str(Path(temp_dir) / name)), jobs=2)
+    assert next(results)['status'] == 'ok'
+    results.close()
+
+# TESTS FOR INVALID INPUT
+
+# TEST FOR MISSING AND UNREADABLE ARCHIVES AND MANIFESTS
+def test_verify_invalid(temp_dir, source_dir):
+    with pytest.raises(FileNotFoundError, match="ARCHIVE NOT FOUND"): autozip_verify(str(Path(temp_dir) / "none.zip"))
+    (Path(temp_dir) / "empty.tar").touch()
+    with pytest.raises(ValueError, match="EMPTY FILE"): list(autozip_verify(str(Path(temp_dir) / "empty.tar")))
+    (Path(temp_dir) / "bad.zip").write_text("NOT A ZIP")
+    with pytest.raises(ValueError, match="INVALID ZIP ARCHIVE"): list(autozip_verify(str(Path(temp_dir) / "bad.zip")))
+    (Path(temp_dir) / "bad.tar.gz").write_text("NOT A GZIP")
+    assert [result['status'] for result in autozip_verify(str(Path(temp_dir) / "bad.tar.gz"))] == ['corrupt']
+
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"), manifest=True)
+    with pytest.raises(FileNotFoundError, match="MANIFEST NOT FOUND"): autozip_verify(archive, manifest="none.json")
+    with pytest.raises(ValueError, match="MANIFEST LAYOUT MISMATCH"): autozip_verify(archive, archive_format="zip", manifest=manifest_path_for(archive))
+
+    archive = Path(temp_dir) / "secret.zip"
+    with zipfile.ZipFile(archive, 'w') as zipf: zipf.writestr("a.txt", "A")
+    data = bytearray(archive.read_bytes())
+    data[data.rindex(b"PK\x01\x02") + 8] |= 1
+    archive.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="ENCRYPTED ZIP MEMBERS"): list(autozip_verify(archive))
+
+# TESTS FOR THE ORDERED WORKER POOL
+
+# TEST FOR RESULTS COMING BACK IN ORDER THROUGH A SMALL WINDOW, AND PENDING CHECKS CANCELLED ON EARLY CLOSE
+def test_run_ordered():
+    checks = [lambda i=i: i for i in range(10)]
+    assert list(_run_ordered(checks, jobs=2, window=3)) == list(range(10))
+    results = _run_ordered(checks, jobs=2, window=3)
+    assert next(results) == 0
+    results.close()
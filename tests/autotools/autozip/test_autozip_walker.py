@@ -0,0 +1,215 @@
+import os
+import stat
+import socket
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from autotools.autozip import walker as walker_module
+from autotools.autozip.core import autozip_compress, _add_tar_entry, _group_name, _tar_info, _user_name
+from autotools.autozip.walker import IgnoreRules, SourceWalker, compile_rule
+
+# FIXTURES
+
+@pytest.fixture
+def project(temp_dir):
+    root = Path(temp_dir) / "project"
+    for directory in ["src/pkg", "node_modules/lib", ".git/objects", "build", "docs"]: (root / directory).mkdir(parents=True)
+    for name in ["src/main.py", "src/main.pyc", "src/pkg/mod.py", "src/pkg/keep.log", "node_modules/lib/index.js",
+                 ".git/HEAD", ".git/objects/ab", "build/out.o", "docs/debug.log", "README.md"]:
+        (root / name).write_text(name)
+    (root / ".gitignore").write_text("# BUILD OUTPUT\n/build/\n*.log\n\nnode_modules/\n")
+    (root / "src" / ".gitignore").write_text("*.pyc\n!keep.log\n")
+    return root
+
+# HELPER FUNCTIONS
+
+def walk_names(root, **kwargs):
+    return [relpath for _, relpath in SourceWalker(**kwargs).walk(root)]
+
+def matches(pattern, path, is_dir=False):
+    return IgnoreRules.from_lines([pattern]).ignores(path, is_dir)
+
+# TESTS FOR IGNORE PATTERNS
+
+# TEST FOR GITIGNORE GLOB SEMANTICS
+@pytest.mark.parametrize("pattern, path, is_dir, expected", [
+    ("*.log", "a.log", False, True),
+    ("*.log", "deep/dir/a.log", False, True),
+    ("*.log", "a.logx", False, False),
+    ("/build", "build", True, True),
+    ("/build", "src/build", True, False),
+    ("build/", "src/build", True, True),
+    ("build/", "src/build", False, False),
+    ("doc/*.txt", "doc/a.txt", False, True),
+    ("doc/*.txt", "doc/sub/a.txt", False, False),
+    ("**/cache", "a/b/cache", True, True),
+    ("logs/**", "logs/a/b.txt", False, True),
+    ("logs/**", "logs", True, False),
+    ("a/**/b", "a/x/y/b", False, True),
+    ("a/**/b", "a/b", False, True),
+    ("file?.txt", "file1.txt", False, True),
+    ("file?.txt", "file/.txt", False, False),
+    ("[!a]*.py", "b.py", False, True),
+    ("[!a]*.py", "a.py", False, False),
+    ("[ab].py", "b.py", False, True),
+    ("[.py", "[.py", False, True),
+    ("\\#notes", "#notes", False, True),
+    ("\\!x", "!x", False, True),
+    ("a\\*b", "a*b", False, True),
+    ("a\\*b", "axb", False, False),
+    ("trailing   ", "trailing", False, True),
+])
+def test_ignore_patterns(pattern, path, is_dir, expected):
+    assert matches(pattern, path, is_dir) is expected
+
+# TEST FOR BLANK LINES AND COMMENTS BEING SKIPPED
+@pytest.mark.parametrize("line", ["", "   ", "# comment", "/", "!\n"])
+def test_compile_rule_empty(line):
+    assert compile_rule(line) is None
+
+# TEST FOR LAST MATCHING RULE WINNING AND RULES SCOPED TO THEIR DIRECTORY
+def test_ignore_rules_order_and_base():
+    rules = IgnoreRules.from_lines(["*.log", "!keep.log"]).extend(["/local.txt", "*.tmp"], base="sub/")
+    assert rules.ignores("a.log", False) and not rules.ignores("keep.log", False)
+    assert rules.ignores("sub/local.txt", False) and not rules.ignores("local.txt", False)
+    assert rules.ignores("sub/x/y.tmp", False) and not rules.ignores("y.tmp", False)
+
+# TESTS FOR THE WALKER
+
+# TEST FOR DEPTH-FIRST, NAME-SORTED ORDER (LIKE tarfile.add)
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_walk_order(project, jobs):
+    names = walk_names(project, jobs=jobs)
+    assert names == sorted(names, key=lambda name: name.split("/"))
+    assert names[:3] == [".git", ".git/HEAD", ".git/objects"]
+    assert "src/pkg/mod.py" in names and "node_modules/lib/index.js" in names
+
+# TEST FOR --exclude GLOBS AND .gitignore RULES (NESTED FILES, NEGATION, .git PRUNED)
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_walk_rules(project, jobs):
+    assert walk_names(project, excludes=["node_modules", ".git", "*.pyc"], jobs=jobs) == [
+        ".gitignore", "README.md", "build", "build/out.o", "docs", "docs/debug.log",
+        "src", "src/.gitignore", "src/main.py", "src/pkg", "src/pkg/keep.log", "src/pkg/mod.py",
+    ]
+    assert walk_names(project, gitignore=True, jobs=jobs) == [
+        ".gitignore", "README.md", "docs", "src", "src/.gitignore", "src/main.py", "src/pkg", "src/pkg/keep.log", "src/pkg/mod.py",
+    ]
+
+# TEST FOR PRUNED DIRECTORIES NEVER BEING LISTED
+def test_walk_prunes_before_scanning(project):
+    scanned = []
+    original = os.scandir
+
+    def spy(path):
+        scanned.append(Path(path).name)
+        return original(path)
+
+    with patch.object(walker_module.os, 'scandir', side_effect=spy):
+        list(SourceWalker(excludes=["node_modules"], gitignore=True).walk(project))
+    assert sorted(scanned) == ["docs", "pkg", "project", "src"]
+    assert not {"node_modules", ".git", "build"} & set(scanned)
+
+# TEST FOR SYMLINKED DIRECTORIES NOT BEING FOLLOWED
+def test_walk_symlinked_dir(project):
+    (project / "link").symlink_to(project / "src", target_is_directory=True)
+    names = walk_names(project)
+    assert "link" in names and "link/main.py" not in names
+
+# TEST FOR STOPPING A PARALLEL WALK EARLY
+def test_walk_early_stop(project):
+    walk = SourceWalker(jobs=4).walk(project)
+    next(walk)
+    walk.close()
+
+# TEST FOR SOURCE LAYOUTS (TOP-LEVEL FILES, DIRECTORIES AND EXCLUDED SOURCES)
+def test_entries_layouts(project):
+    walker = SourceWalker(excludes=["*.md", "node_modules", ".git"])
+    readme, src = str(project / "README.md"), str(project / "src")
+    assert [name for _, name in walker.entries([src], "tar")][:3] == ["src", "src/.gitignore", "src/main.py"]
+    assert [name for _, name in walker.files([src], "zip")] == [".gitignore", "main.py", "main.pyc", "pkg/keep.log", "pkg/mod.py"]
+    assert list(walker.files([readme])) == []
+    with pytest.raises(FileNotFoundError, match="SOURCE PATH NOT FOUND"): list(walker.files([str(project / "none")]))
+
+# TESTS FOR ARCHIVES BUILT FROM THE WALKER
+
+# TEST FOR EXCLUDES AND .gitignore IN EVERY FORMAT
+@pytest.mark.parametrize("name", ["a.zip", "a.tar", "a.tar.gz", "a.tar.xz"])
+def test_autozip_compress_excludes(temp_dir, project, name):
+    archive = autozip_compress([str(project)], str(Path(temp_dir) / name), excludes=["docs"], gitignore=True, jobs=2)
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(archive) as zipf: names = zipf.namelist()
+        assert sorted(names) == [".gitignore", "README.md", "src/.gitignore", "src/main.py", "src/pkg/keep.log", "src/pkg/mod.py"]
+    else:
+        with tarfile.open(archive) as tar: names = tar.getnames()
+        assert "project/src/pkg/mod.py" in names and "project/src/main.pyc" not in names
+        assert not any(part in n for n in names for part in ("node_modules", ".git/", "build", "docs"))
+
+# TEST FOR TAR HEADERS MATCHING tarfile.add (MODE, OWNER, MTIME, SYMLINKS, HARDLINKS)
+def test_tar_headers_match_tarfile(temp_dir, project):
+    (project / "src" / "run.sh").write_text("#!/bin/sh")
+    os.chmod(project / "src" / "run.sh", 0o755)
+    (project / "src" / "link").symlink_to("main.py")
+    os.link(project / "README.md", project / "docs" / "README.hard")
+
+    ours = autozip_compress([str(project)], str(Path(temp_dir) / "ours.tar"))
+    theirs = Path(temp_dir) / "theirs.tar"
+    with tarfile.open(theirs, 'w') as tar: tar.add(project, arcname="project")
+
+    def headers(path):
+        with tarfile.open(path) as tar:
+            return [(m.name, m.type, m.mode, m.uid, m.gid, m.uname, m.gname, m.size, int(m.mtime), m.linkname) for m in tar.getmembers()]
+    assert headers(ours) == headers(theirs)
+
+# TEST FOR ZIP HEADERS MATCHING ZipFile.write (MODE, MTIME, SIZE, SYMLINKS FOLLOWED) ON EVERY WRITER PATH, WITHOUT A NEW stat PER FILE
+@pytest.mark.parametrize("options", [{}, {"jobs": 2}, {"prefetch_depth": 4}, {"fanout": True}])
+def test_zip_headers_match_zipfile(temp_dir, project, options):
+    os.chmod(project / "README.md", 0o600)
+    os.utime(project / "src" / "main.py", (1_000_000_000, 1_000_000_000))
+    (project / "src" / "link").symlink_to("main.py")
+
+    ours = Path(temp_dir) / "ours.zip"
+    outputs = [str(ours), str(Path(temp_dir) / "ours.tar")] if options.pop("fanout", False) else str(ours)
+    with patch.object(zipfile.ZipInfo, 'from_file', side_effect=AssertionError("from_file stats again")):
+        autozip_compress([str(project)], outputs, **options)
+    theirs = Path(temp_dir) / "theirs.zip"
+    with zipfile.ZipFile(theirs, 'w') as zipf:
+        for file_path, arcname in SourceWalker().files([str(project)]): zipf.write(file_path, arcname)
+
+    def headers(path):
+        with zipfile.ZipFile(path) as zipf: return sorted((i.filename, i.date_time, i.external_attr >> 16, i.file_size) for i in zipf.infolist())
+    assert headers(ours) == headers(theirs)
+
+# TEST FOR THE ARCHIVE NOT BEING ADDED TO ITSELF
+def test_tar_skips_own_archive(project):
+    archive = autozip_compress([str(project)], str(project / "self.tar"))
+    with tarfile.open(archive) as tar: assert "project/self.tar" not in tar.getnames()
+
+# TEST FOR SOCKETS BEING SKIPPED
+def test_tar_info_socket(temp_dir):
+    path = Path(temp_dir) / "s.sock"
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(path))
+        with tarfile.open(Path(temp_dir) / "a.tar", 'w') as tar:
+            assert _tar_info(tar, path, "s.sock") is None
+            _add_tar_entry(tar, path, "s.sock")
+            assert tar.getmembers() == []
+
+# TEST FOR DEVICE NUMBERS AND FILES WITHOUT INODE NUMBERS
+def test_tar_info_device_and_no_inode(temp_dir):
+    null = os.stat("/dev/null")
+    no_inode = os.stat_result((stat.S_IFREG | 0o644, 0, 0, 1, 0, 0, 0, 0, 0, 0))
+
+    with tarfile.open(Path(temp_dir) / "a.tar", 'w') as tar:
+        device = _tar_info(tar, SimpleNamespace(stat=lambda follow_symlinks: null), "null")
+        assert device.ischr() and (device.devmajor, device.devminor) == (os.major(null.st_rdev), os.minor(null.st_rdev))
+        _tar_info(tar, SimpleNamespace(stat=lambda follow_symlinks: no_inode), "no-inode")
+        assert tar.inodes == {}
+
+# TEST FOR UNKNOWN OWNERS
+def test_owner_names_unknown():
+    assert _user_name(2 ** 31 - 7) == "" and _group_name(2 ** 31 - 7) == ""
+    with patch.object(tarfile, 'pwd', None), patch.object(tarfile, 'grp', None):
+        assert _user_name(2 ** 31 - 8) == "" and _group_name(2 ** 31 - 8) == ""
@@ -0,0 +1,104 @@
+import io
+import os
+import errno
+import tarfile
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from autotools.autozip import zerocopy_tar as zerocopy_module
+from autotools.autozip.core import autozip_compress
+from autotools.autozip.zerocopy_tar import ZERO_COPY_MIN_SIZE, ZeroCopyTarFile, _copy_file_range, _readinto, _sendfile
+
+# FIXTURES
+
+@pytest.fixture
+def source_dir(temp_dir):
+    root = Path(temp_dir) / "data"
+    root.mkdir()
+    for name, size in [("empty", 0), ("small", 100), ("blocks", ZERO_COPY_MIN_SIZE * 2), ("odd", ZERO_COPY_MIN_SIZE * 3 + 7),
+                       ("large", 3 * 1024 * 1024 + 511)]:
+        (root / name).write_bytes(os.urandom(size))
+    return root
+
+# HELPER FUNCTIONS
+
+def build(cls, source, output, methods=None):
+    with cls.open(output, 'w') as tar:
+        if methods is not None: tar.copy_methods = list(methods)
+        tar.add(source, arcname="data")
+        remaining = list(tar.copy_methods) if methods is not None else None
+    return Path(output).read_bytes(), remaining
+
+def failing(error, after=None):
+    calls = []
+
+    def method(src_fd, dst_fd, count, buffer):
+        if after is not None and not calls:
+            calls.append(1)
+            return after(src_fd, dst_fd, min(count, 1000), buffer or bytearray(1000))
+        raise OSError(error, os.strerror(error))
+
+    return method
+
+class UnreadableFile:
+    def __init__(self, *args, **kwargs): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc_info): return False
+    def readinto(self, view): raise OSError(errno.EINVAL, "INVALID ARGUMENT")
+
+# TESTS FOR COPY METHODS
+
+# TEST FOR BYTE-IDENTICAL OUTPUT WITH EVERY COPY METHOD
+@pytest.mark.parametrize("method", [_copy_file_range, _sendfile, _readinto])
+def test_zero_copy_matches_tarfile(temp_dir, source_dir, method):
+    expected, _ = build(tarfile.TarFile, source_dir, Path(temp_dir) / "expected.tar")
+    actual, remaining = build(ZeroCopyTarFile, source_dir, Path(temp_dir) / "actual.tar", [method])
+    assert actual == expected and remaining == [method]
+
+# TEST FOR FALLING BACK WHEN A METHOD IS UNSUPPORTED (ALSO AFTER A PARTIAL COPY)
+@pytest.mark.parametrize("error", [errno.EXDEV, errno.ENOSYS, errno.EINVAL])
+def test_zero_copy_fallback(temp_dir, source_dir, error):
+    expected, _ = build(tarfile.TarFile, source_dir, Path(temp_dir) / "expected.tar")
+    unsupported = failing(error)
+    partial = failing(error, after=_readinto)
+    actual, remaining = build(ZeroCopyTarFile, source_dir, Path(temp_dir) / "actual.tar", [partial, unsupported, _readinto])
+    assert actual == expected and remaining == [_readinto]
+
+# TEST FOR REAL I/O ERRORS AND UNSUPPORTED LAST-RESORT COPIES BEING RAISED
+@pytest.mark.parametrize("methods", [[failing(errno.EIO), _readinto], "readinto"])
+def test_zero_copy_errors(temp_dir, source_dir, monkeypatch, methods):
+    if methods == "readinto":
+        monkeypatch.setattr(zerocopy_module, 'io', SimpleNamespace(FileIO=UnreadableFile))
+        methods = [_readinto]
+    with pytest.raises(OSError):
+        build(ZeroCopyTarFile, source_dir, Path(temp_dir) / "a.tar", methods)
+
+# TEST FOR FILES SHORTER THAN THEIR HEADER SIZE
+def test_zero_copy_short_file(temp_dir, source_dir):
+    tarinfo = tarfile.TarInfo("large")
+    tarinfo.size = (source_dir / "large").stat().st_size + 1
+    with ZeroCopyTarFile.open(Path(temp_dir) / "a.tar", 'w') as tar, open(source_dir / "large", 'rb') as f:
+        with pytest.raises(OSError, match="unexpected end of data"): tar.addfile(tarinfo, f)
+
+# TEST FOR FILE OBJECTS WITHOUT A DESCRIPTOR USING THE REGULAR PATH
+def test_zero_copy_without_descriptor(temp_dir):
+    data = os.urandom(ZERO_COPY_MIN_SIZE + 1)
+    tarinfo = tarfile.TarInfo("mem.bin")
+    tarinfo.size = len(data)
+    output = io.BytesIO()
+    with ZeroCopyTarFile(fileobj=output, mode='w') as tar: tar.addfile(tarinfo, io.BytesIO(data))
+    with tarfile.open(fileobj=io.BytesIO(output.getvalue())) as tar: assert tar.extractfile("mem.bin").read() == data
+
+# TEST FOR PLATFORMS WITHOUT copy_file_range OR sendfile
+def test_available_methods(monkeypatch):
+    assert zerocopy_module._available_methods()[-1] is _readinto
+    monkeypatch.delattr(os, 'copy_file_range', raising=False)
+    monkeypatch.delattr(os, 'sendfile', raising=False)
+    assert zerocopy_module._available_methods() == [_readinto]
+
+# TEST FOR autozip_compress USING THE FAST PATH FOR TAR
+def test_autozip_compress_tar_zero_copy(temp_dir, source_dir):
+    archive = autozip_compress([str(source_dir)], str(Path(temp_dir) / "a.tar"))
+    with tarfile.open(archive) as tar:
+        for name in ["empty", "small", "blocks", "odd", "large"]:
+            assert tar.extractfile(f"data/{name}").read() == (source_dir / name).read_bytes()
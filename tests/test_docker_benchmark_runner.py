@@ -220,3 +220,28 @@ def test_write_reports_updates_final_result_for_all_existing_runners(tmp_path):
     assert "| Windows Python 3.12 | 1 | 1 | 1 | 3.000 | 3.000 | 4.000 | 5.000 | +1.500 | +100.0% |" in markdown
     assert "| run_01 | Ubuntu Python 3.12 | Windows Python 3.12 | 3.000 | +1.500 | +100.0% | 1 |" in markdown
     assert "| run_01 | autocaps / basic | Ubuntu Python 3.12 (1.500) | Windows Python 3.12 (3.000) | 1.500 | +100.0% |" in markdown
+
+
+# TEST FOR ROW COUNTS DECLARED BY SMOKE TESTS
+def test_smoke_test_rows_reads_dict_items_only():
+    smoke_tests = [{"name": "csv", "args": [], "rows": 5000}, {"name": "plain", "args": []}, ("tuple", [])]
+
+    assert benchmark_runner.smoke_test_rows(smoke_tests) == [5000, None, None]
+    assert benchmark_runner.smoke_test_rows(None) == []
+
+
+# TEST FOR ROW THROUGHPUT IN CASE STATISTICS AND THE MARKDOWN REPORT
+def test_row_throughput_is_reported(tmp_path):
+    stats = benchmark_runner.add_row_throughput(benchmark_runner.summarize_durations([0.4, 0.5, 0.6]), 5000)
+    assert (stats["rows"], stats["rows_per_s"]) == (5000, 10000.0)
+    assert "rows_per_s" not in benchmark_runner.add_row_throughput(benchmark_runner.summarize_durations([]), 5000)
+    assert "rows_per_s" not in benchmark_runner.add_row_throughput(benchmark_runner.summarize_durations([0.5]), None)
+
+    report = make_benchmark_report("run_01", "Ubuntu")
+    markdown = benchmark_runner.render_markdown_report(report)
+    assert "## Row Throughput" not in markdown
+
+    report["results"][0]["stats"] = stats
+    markdown = benchmark_runner.render_markdown_report(report)
+    assert "## Row Throughput" in markdown
+    assert "| autocaps | basic | 5000 | 500.000 | 10000.0 |" in markdown